@@ -0,0 +1,121 @@
+"""Event backfill job checkpoints for COPY-based historical imports.
+
+Revision ID: 202610161000
+Revises: 202603141700
+Create Date: 2026-10-16 10:00:00
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "202610161000"
+down_revision: Union[str, None] = "202603141700"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _grant_if_role_exists(role: str, grant_sql: str) -> None:
+    op.execute(
+        f"""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = '{role}') THEN
+                EXECUTE '{grant_sql}';
+            END IF;
+        END
+        $$;
+        """
+    )
+
+
+def _revoke_if_role_exists(role: str, revoke_sql: str) -> None:
+    op.execute(
+        f"""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = '{role}') THEN
+                EXECUTE '{revoke_sql}';
+            END IF;
+        END
+        $$;
+        """
+    )
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS public.event_backfill_jobs (
+            id uuid NOT NULL DEFAULT gen_random_uuid(),
+            tenant_id uuid NOT NULL REFERENCES public.tenants(id) ON DELETE CASCADE,
+            source text NOT NULL,
+            source_uri text NOT NULL,
+            source_format text NOT NULL,
+            status text NOT NULL DEFAULT 'pending',
+            rows_processed bigint NOT NULL DEFAULT 0,
+            rows_inserted bigint NOT NULL DEFAULT 0,
+            rows_duplicate bigint NOT NULL DEFAULT 0,
+            rows_rejected bigint NOT NULL DEFAULT 0,
+            last_error text NULL,
+            created_at timestamptz NOT NULL DEFAULT now(),
+            updated_at timestamptz NOT NULL DEFAULT now(),
+            completed_at timestamptz NULL,
+            CONSTRAINT pk_event_backfill_jobs PRIMARY KEY (id),
+            CONSTRAINT uq_event_backfill_jobs_tenant_source_uri UNIQUE (tenant_id, source_uri),
+            CONSTRAINT ck_event_backfill_jobs_source_format_valid
+                CHECK (source_format IN ('ndjson', 'csv')),
+            CONSTRAINT ck_event_backfill_jobs_status_valid
+                CHECK (status IN ('pending', 'running', 'completed', 'failed')),
+            CONSTRAINT ck_event_backfill_jobs_counters_non_negative
+                CHECK (
+                    rows_processed >= 0
+                    AND rows_inserted >= 0
+                    AND rows_duplicate >= 0
+                    AND rows_rejected >= 0
+                )
+        )
+        """
+    )
+    op.execute(
+        """
+        COMMENT ON COLUMN public.event_backfill_jobs.rows_processed IS
+            'Checkpoint: source records consumed and committed together with their merge. '
+            'A resumed import skips exactly this many records.'
+        """
+    )
+
+    op.execute("ALTER TABLE public.event_backfill_jobs ENABLE ROW LEVEL SECURITY")
+    op.execute("ALTER TABLE public.event_backfill_jobs FORCE ROW LEVEL SECURITY")
+    op.execute("DROP POLICY IF EXISTS tenant_isolation_policy ON public.event_backfill_jobs")
+    op.execute(
+        """
+        CREATE POLICY tenant_isolation_policy ON public.event_backfill_jobs
+            USING (tenant_id = current_setting('app.current_tenant_id', true)::uuid)
+            WITH CHECK (tenant_id = current_setting('app.current_tenant_id', true)::uuid)
+        """
+    )
+
+    _grant_if_role_exists(
+        "app_user",
+        "GRANT SELECT, INSERT, UPDATE ON TABLE public.event_backfill_jobs TO app_user",
+    )
+    _grant_if_role_exists(
+        "app_rw",
+        "GRANT SELECT, INSERT, UPDATE ON TABLE public.event_backfill_jobs TO app_rw",
+    )
+    _grant_if_role_exists(
+        "app_ro",
+        "GRANT SELECT ON TABLE public.event_backfill_jobs TO app_ro",
+    )
+
+
+def downgrade() -> None:
+    _revoke_if_role_exists("app_ro", "REVOKE ALL ON TABLE public.event_backfill_jobs FROM app_ro")
+    _revoke_if_role_exists("app_rw", "REVOKE ALL ON TABLE public.event_backfill_jobs FROM app_rw")
+    _revoke_if_role_exists("app_user", "REVOKE ALL ON TABLE public.event_backfill_jobs FROM app_user")
+    op.execute("DROP POLICY IF EXISTS tenant_isolation_policy ON public.event_backfill_jobs")
+    op.execute("DROP TABLE IF EXISTS public.event_backfill_jobs")  # CI:DESTRUCTIVE_OK - rollback of backfill checkpoint substrate
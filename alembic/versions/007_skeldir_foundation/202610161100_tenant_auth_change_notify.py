@@ -0,0 +1,70 @@
+"""Notify tenant key/secret rotation for the process-local API key cache.
+
+Revision ID: 202610161100
+Revises: 202610161000
+Create Date: 2026-10-16 11:00:00
+
+Webhook auth resolves api_key_hash -> tenant + secrets from an in-process
+cache (app.security.tenant_key_runtime). Any change to a tenant's API key
+hash or webhook secret columns, or deletion of the tenant, emits a
+pg_notify on skeldir_tenant_auth_changed carrying the tenant id and the
+pre-change key hash so every API process evicts the entry.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "202610161100"
+down_revision: Union[str, None] = "202610161000"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.fn_notify_tenant_auth_changed()
+        RETURNS trigger
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            PERFORM pg_notify(
+                'skeldir_tenant_auth_changed',
+                json_build_object(
+                    'tenant_id', OLD.id,
+                    'api_key_hash', OLD.api_key_hash
+                )::text
+            );
+            RETURN NULL;
+        END;
+        $$
+        """
+    )
+    op.execute("DROP TRIGGER IF EXISTS trg_tenants_notify_auth_changed ON public.tenants")
+    op.execute(
+        """
+        CREATE TRIGGER trg_tenants_notify_auth_changed
+        AFTER DELETE OR UPDATE OF
+            api_key_hash,
+            shopify_webhook_secret_ciphertext,
+            shopify_webhook_secret_key_id,
+            stripe_webhook_secret_ciphertext,
+            stripe_webhook_secret_key_id,
+            paypal_webhook_secret_ciphertext,
+            paypal_webhook_secret_key_id,
+            woocommerce_webhook_secret_ciphertext,
+            woocommerce_webhook_secret_key_id
+        ON public.tenants
+        FOR EACH ROW
+        EXECUTE FUNCTION public.fn_notify_tenant_auth_changed()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_tenants_notify_auth_changed ON public.tenants")
+    op.execute("DROP FUNCTION IF EXISTS public.fn_notify_tenant_auth_changed()")
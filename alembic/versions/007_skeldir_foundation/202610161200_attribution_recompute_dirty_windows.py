@@ -0,0 +1,113 @@
+"""Dirty-window ledger for coalesced post-ingestion attribution recomputes.
+
+Revision ID: 202610161200
+Revises: 202610161100
+Create Date: 2026-10-16 12:00:00
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "202610161200"
+down_revision: Union[str, None] = "202610161100"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _grant_if_role_exists(role: str, grant_sql: str) -> None:
+    op.execute(
+        f"""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = '{role}') THEN
+                EXECUTE '{grant_sql}';
+            END IF;
+        END
+        $$;
+        """
+    )
+
+
+def _revoke_if_role_exists(role: str, revoke_sql: str) -> None:
+    op.execute(
+        f"""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = '{role}') THEN
+                EXECUTE '{revoke_sql}';
+            END IF;
+        END
+        $$;
+        """
+    )
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS public.attribution_recompute_dirty_windows (
+            tenant_id uuid NOT NULL REFERENCES public.tenants(id) ON DELETE CASCADE,
+            window_start timestamptz NOT NULL,
+            window_end timestamptz NOT NULL,
+            model_version text NOT NULL,
+            last_dispatched_at timestamptz NOT NULL DEFAULT now(),
+            dirty_since timestamptz NULL,
+            last_correlation_id text NULL,
+            CONSTRAINT pk_attribution_recompute_dirty_windows
+                PRIMARY KEY (tenant_id, window_start, window_end, model_version),
+            CONSTRAINT ck_attribution_recompute_dirty_windows_bounds_valid
+                CHECK (window_end > window_start)
+        )
+        """
+    )
+    op.execute(
+        """
+        COMMENT ON TABLE public.attribution_recompute_dirty_windows IS
+            'One row per (tenant, window, model_version) that ingestion has touched. '
+            'dirty_since is set when events land within the coalesce interval of the last '
+            'dispatch; the flush task dispatches those windows and clears it.'
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_attribution_recompute_dirty_windows_pending
+            ON public.attribution_recompute_dirty_windows (tenant_id, last_dispatched_at)
+            WHERE dirty_since IS NOT NULL
+        """
+    )
+
+    op.execute("ALTER TABLE public.attribution_recompute_dirty_windows ENABLE ROW LEVEL SECURITY")
+    op.execute("ALTER TABLE public.attribution_recompute_dirty_windows FORCE ROW LEVEL SECURITY")
+    op.execute("DROP POLICY IF EXISTS tenant_isolation_policy ON public.attribution_recompute_dirty_windows")
+    op.execute(
+        """
+        CREATE POLICY tenant_isolation_policy ON public.attribution_recompute_dirty_windows
+            USING (tenant_id = current_setting('app.current_tenant_id', true)::uuid)
+            WITH CHECK (tenant_id = current_setting('app.current_tenant_id', true)::uuid)
+        """
+    )
+
+    _grant_if_role_exists(
+        "app_user",
+        "GRANT SELECT, INSERT, UPDATE, DELETE ON TABLE public.attribution_recompute_dirty_windows TO app_user",
+    )
+    _grant_if_role_exists(
+        "app_rw",
+        "GRANT SELECT, INSERT, UPDATE, DELETE ON TABLE public.attribution_recompute_dirty_windows TO app_rw",
+    )
+    _grant_if_role_exists(
+        "app_ro",
+        "GRANT SELECT ON TABLE public.attribution_recompute_dirty_windows TO app_ro",
+    )
+
+
+def downgrade() -> None:
+    _revoke_if_role_exists("app_ro", "REVOKE ALL ON TABLE public.attribution_recompute_dirty_windows FROM app_ro")
+    _revoke_if_role_exists("app_rw", "REVOKE ALL ON TABLE public.attribution_recompute_dirty_windows FROM app_rw")
+    _revoke_if_role_exists("app_user", "REVOKE ALL ON TABLE public.attribution_recompute_dirty_windows FROM app_user")
+    op.execute("DROP POLICY IF EXISTS tenant_isolation_policy ON public.attribution_recompute_dirty_windows")
+    op.execute("DROP TABLE IF EXISTS public.attribution_recompute_dirty_windows")  # CI:DESTRUCTIVE_OK - rollback of recompute coalescing ledger
@@ -0,0 +1,54 @@
+"""Notify channel_taxonomy changes for the process-local valid-code set.
+
+Revision ID: 202610161300
+Revises: 202610161200
+Create Date: 2026-10-16 13:00:00
+
+Channel normalization validates mapped codes against the active rows of
+channel_taxonomy, held in process (app.ingestion.channel_normalization).
+Any insert, update, delete or truncate of the table emits a pg_notify on
+skeldir_channel_taxonomy_changed so every process reloads the code set.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "202610161300"
+down_revision: Union[str, None] = "202610161200"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.fn_notify_channel_taxonomy_changed()
+        RETURNS trigger
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            PERFORM pg_notify('skeldir_channel_taxonomy_changed', '');
+            RETURN NULL;
+        END;
+        $$
+        """
+    )
+    op.execute("DROP TRIGGER IF EXISTS trg_channel_taxonomy_notify_changed ON public.channel_taxonomy")
+    op.execute(
+        """
+        CREATE TRIGGER trg_channel_taxonomy_notify_changed
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE
+        ON public.channel_taxonomy
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION public.fn_notify_channel_taxonomy_changed()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_channel_taxonomy_notify_changed ON public.channel_taxonomy")
+    op.execute("DROP FUNCTION IF EXISTS public.fn_notify_channel_taxonomy_changed()")
@@ -0,0 +1,72 @@
+"""High-water mark for incremental attribution window recomputes.
+
+Revision ID: 202610161400
+Revises: 202610161300
+Create Date: 2026-10-16 14:00:00
+
+attribution_recompute_jobs records the (created_at, id) of the last event whose
+allocations a successful run has committed, so the next run of the same
+(tenant, window, model_version) only reads events ingested after it. The
+(tenant_id, created_at, id) index makes that read, and the empty "nothing
+changed" case, a short index range scan instead of a scan of the whole window.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "202610161400"
+down_revision: Union[str, None] = "202610161300"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        ALTER TABLE public.attribution_recompute_jobs
+            ADD COLUMN watermark_created_at timestamptz NULL,
+            ADD COLUMN watermark_event_id uuid NULL
+        """
+    )
+    op.execute(
+        """
+        ALTER TABLE public.attribution_recompute_jobs
+            ADD CONSTRAINT ck_attribution_recompute_jobs_watermark_pair
+            CHECK ((watermark_created_at IS NULL) = (watermark_event_id IS NULL))
+        """
+    )
+    op.execute(
+        """
+        COMMENT ON COLUMN public.attribution_recompute_jobs.watermark_created_at IS
+            'created_at of the last event (in (created_at, id) order) whose allocations are committed for this window. '
+            'NULL means the next run is a full rebuild.'
+        """
+    )
+    op.execute(
+        """
+        COMMENT ON COLUMN public.attribution_recompute_jobs.watermark_event_id IS
+            'id of the last event (in (created_at, id) order) whose allocations are committed for this window.'
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX idx_attribution_events_tenant_created_at_id
+        ON public.attribution_events (tenant_id, created_at, id)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS public.idx_attribution_events_tenant_created_at_id")
+    op.execute(
+        """
+        ALTER TABLE public.attribution_recompute_jobs
+            DROP CONSTRAINT IF EXISTS ck_attribution_recompute_jobs_watermark_pair,
+            DROP COLUMN IF EXISTS watermark_event_id,
+            DROP COLUMN IF EXISTS watermark_created_at
+        """
+    )
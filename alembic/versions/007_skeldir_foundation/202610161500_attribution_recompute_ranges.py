@@ -0,0 +1,125 @@
+"""Range-level completion ledger for fanned-out attribution recomputes.
+
+Revision ID: 202610161500
+Revises: 202610161400
+Create Date: 2026-10-16 15:00:00
+
+recompute_range splits a long range into day/hour shards, each of which keeps
+its own attribution_recompute_jobs identity; this table records the range run
+itself so its chord callback has somewhere to record overall completion.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "202610161500"
+down_revision: Union[str, None] = "202610161400"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _grant_if_role_exists(role: str, grant_sql: str) -> None:
+    op.execute(
+        f"""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = '{role}') THEN
+                EXECUTE '{grant_sql}';
+            END IF;
+        END
+        $$;
+        """
+    )
+
+
+def _revoke_if_role_exists(role: str, revoke_sql: str) -> None:
+    op.execute(
+        f"""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = '{role}') THEN
+                EXECUTE '{revoke_sql}';
+            END IF;
+        END
+        $$;
+        """
+    )
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS public.attribution_recompute_ranges (
+            id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+            tenant_id uuid NOT NULL REFERENCES public.tenants(id) ON DELETE CASCADE,
+            range_start timestamptz NOT NULL,
+            range_end timestamptz NOT NULL,
+            shard_unit text NOT NULL,
+            model_version text NOT NULL,
+            shard_count integer NOT NULL,
+            max_concurrency integer NOT NULL,
+            status text NOT NULL DEFAULT 'running',
+            shards_succeeded integer NULL,
+            shards_failed integer NULL,
+            last_correlation_id uuid NULL,
+            created_at timestamptz NOT NULL DEFAULT now(),
+            finished_at timestamptz NULL,
+            CONSTRAINT ck_attribution_recompute_ranges_bounds_valid CHECK (range_end > range_start),
+            CONSTRAINT ck_attribution_recompute_ranges_shard_unit_valid CHECK (shard_unit IN ('day', 'hour')),
+            CONSTRAINT ck_attribution_recompute_ranges_status_valid
+                CHECK (status IN ('running', 'succeeded', 'failed')),
+            CONSTRAINT ck_attribution_recompute_ranges_counts_positive
+                CHECK (shard_count > 0 AND max_concurrency > 0)
+        )
+        """
+    )
+    op.execute(
+        """
+        COMMENT ON TABLE public.attribution_recompute_ranges IS
+            'One row per recompute_range run. Shards are attribution_recompute_jobs rows for the '
+            'day/hour windows of [range_start, range_end); the chord callback sets status, '
+            'shard counts and finished_at once every shard has run.'
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_attribution_recompute_ranges_tenant_created_at
+            ON public.attribution_recompute_ranges (tenant_id, created_at DESC)
+        """
+    )
+
+    op.execute("ALTER TABLE public.attribution_recompute_ranges ENABLE ROW LEVEL SECURITY")
+    op.execute("ALTER TABLE public.attribution_recompute_ranges FORCE ROW LEVEL SECURITY")
+    op.execute("DROP POLICY IF EXISTS tenant_isolation_policy ON public.attribution_recompute_ranges")
+    op.execute(
+        """
+        CREATE POLICY tenant_isolation_policy ON public.attribution_recompute_ranges
+            USING (tenant_id = current_setting('app.current_tenant_id', true)::uuid)
+            WITH CHECK (tenant_id = current_setting('app.current_tenant_id', true)::uuid)
+        """
+    )
+
+    _grant_if_role_exists(
+        "app_user",
+        "GRANT SELECT, INSERT, UPDATE, DELETE ON TABLE public.attribution_recompute_ranges TO app_user",
+    )
+    _grant_if_role_exists(
+        "app_rw",
+        "GRANT SELECT, INSERT, UPDATE, DELETE ON TABLE public.attribution_recompute_ranges TO app_rw",
+    )
+    _grant_if_role_exists(
+        "app_ro",
+        "GRANT SELECT ON TABLE public.attribution_recompute_ranges TO app_ro",
+    )
+
+
+def downgrade() -> None:
+    _revoke_if_role_exists("app_ro", "REVOKE ALL ON TABLE public.attribution_recompute_ranges FROM app_ro")
+    _revoke_if_role_exists("app_rw", "REVOKE ALL ON TABLE public.attribution_recompute_ranges FROM app_rw")
+    _revoke_if_role_exists("app_user", "REVOKE ALL ON TABLE public.attribution_recompute_ranges FROM app_user")
+    op.execute("DROP POLICY IF EXISTS tenant_isolation_policy ON public.attribution_recompute_ranges")
+    op.execute("DROP TABLE IF EXISTS public.attribution_recompute_ranges")  # CI:DESTRUCTIVE_OK - rollback of recompute range ledger
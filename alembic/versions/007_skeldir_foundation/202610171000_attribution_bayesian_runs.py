@@ -0,0 +1,136 @@
+"""Checkpoint and posterior ledger for Bayesian attribution inference runs.
+
+Revision ID: 202610171000
+Revises: 202610161500
+Create Date: 2026-10-17 10:00:00
+
+run_mcmc_inference samples a per-channel posterior for a (tenant, window,
+model_version). Chain states are checkpointed here while it runs so a soft
+timeout resumes instead of restarting, and the finished posterior is kept so
+the next window can warm-start from it.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "202610171000"
+down_revision: Union[str, None] = "202610161500"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _grant_if_role_exists(role: str, grant_sql: str) -> None:
+    op.execute(
+        f"""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = '{role}') THEN
+                EXECUTE '{grant_sql}';
+            END IF;
+        END
+        $$;
+        """
+    )
+
+
+def _revoke_if_role_exists(role: str, revoke_sql: str) -> None:
+    op.execute(
+        f"""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = '{role}') THEN
+                EXECUTE '{revoke_sql}';
+            END IF;
+        END
+        $$;
+        """
+    )
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS public.attribution_bayesian_runs (
+            id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+            tenant_id uuid NOT NULL REFERENCES public.tenants(id) ON DELETE CASCADE,
+            window_start timestamptz NOT NULL,
+            window_end timestamptz NOT NULL,
+            model_version text NOT NULL,
+            status text NOT NULL DEFAULT 'running',
+            channels text[] NOT NULL,
+            data_fingerprint text NOT NULL,
+            sessions bigint NOT NULL,
+            chain_states jsonb NULL,
+            posterior jsonb NULL,
+            converged boolean NULL,
+            r_hat_max double precision NULL,
+            ess_min double precision NULL,
+            draws_per_chain integer NOT NULL DEFAULT 0,
+            warm_start_run_id uuid NULL REFERENCES public.attribution_bayesian_runs(id) ON DELETE SET NULL,
+            attempts integer NOT NULL DEFAULT 1,
+            last_correlation_id uuid NULL,
+            created_at timestamptz NOT NULL DEFAULT now(),
+            updated_at timestamptz NOT NULL DEFAULT now(),
+            finished_at timestamptz NULL,
+            CONSTRAINT uq_attribution_bayesian_runs_identity
+                UNIQUE (tenant_id, window_start, window_end, model_version),
+            CONSTRAINT ck_attribution_bayesian_runs_bounds_valid CHECK (window_end > window_start),
+            CONSTRAINT ck_attribution_bayesian_runs_status_valid
+                CHECK (status IN ('running', 'fallback', 'succeeded')),
+            CONSTRAINT ck_attribution_bayesian_runs_counts_positive
+                CHECK (sessions >= 0 AND draws_per_chain >= 0 AND attempts > 0)
+        )
+        """
+    )
+    op.execute(
+        """
+        COMMENT ON TABLE public.attribution_bayesian_runs IS
+            'One row per Bayesian attribution inference (tenant, window, model_version). '
+            'chain_states is the sampler checkpoint while status is running/fallback and is '
+            'resumed only if data_fingerprint still matches; posterior holds per-channel '
+            'summaries once succeeded and seeds the next window''s prior.'
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_attribution_bayesian_runs_warm_start
+            ON public.attribution_bayesian_runs (tenant_id, model_version, window_end DESC)
+            WHERE status = 'succeeded'
+        """
+    )
+
+    op.execute("ALTER TABLE public.attribution_bayesian_runs ENABLE ROW LEVEL SECURITY")
+    op.execute("ALTER TABLE public.attribution_bayesian_runs FORCE ROW LEVEL SECURITY")
+    op.execute("DROP POLICY IF EXISTS tenant_isolation_policy ON public.attribution_bayesian_runs")
+    op.execute(
+        """
+        CREATE POLICY tenant_isolation_policy ON public.attribution_bayesian_runs
+            USING (tenant_id = current_setting('app.current_tenant_id', true)::uuid)
+            WITH CHECK (tenant_id = current_setting('app.current_tenant_id', true)::uuid)
+        """
+    )
+
+    _grant_if_role_exists(
+        "app_user",
+        "GRANT SELECT, INSERT, UPDATE, DELETE ON TABLE public.attribution_bayesian_runs TO app_user",
+    )
+    _grant_if_role_exists(
+        "app_rw",
+        "GRANT SELECT, INSERT, UPDATE, DELETE ON TABLE public.attribution_bayesian_runs TO app_rw",
+    )
+    _grant_if_role_exists(
+        "app_ro",
+        "GRANT SELECT ON TABLE public.attribution_bayesian_runs TO app_ro",
+    )
+
+
+def downgrade() -> None:
+    _revoke_if_role_exists("app_ro", "REVOKE ALL ON TABLE public.attribution_bayesian_runs FROM app_ro")
+    _revoke_if_role_exists("app_rw", "REVOKE ALL ON TABLE public.attribution_bayesian_runs FROM app_rw")
+    _revoke_if_role_exists("app_user", "REVOKE ALL ON TABLE public.attribution_bayesian_runs FROM app_user")
+    op.execute("DROP POLICY IF EXISTS tenant_isolation_policy ON public.attribution_bayesian_runs")
+    op.execute("DROP TABLE IF EXISTS public.attribution_bayesian_runs")  # CI:DESTRUCTIVE_OK - rollback of Bayesian run ledger
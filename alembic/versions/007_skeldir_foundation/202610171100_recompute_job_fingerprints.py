@@ -0,0 +1,83 @@
+"""Content fingerprint for skip-if-unchanged attribution window recomputes.
+
+Revision ID: 202610171100
+Revises: 202610171000
+Create Date: 2026-10-17 11:00:00
+
+attribution_recompute_jobs records (event count, max event id, sum of
+revenue_cents) of the events a run was started against. A redelivered or
+coalesced recompute of a window that last finished successfully is skipped,
+as status 'skipped_unchanged', when the fingerprint still matches.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "202610171100"
+down_revision: Union[str, None] = "202610171000"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        ALTER TABLE public.attribution_recompute_jobs
+            ADD COLUMN fingerprint_event_count bigint NULL,
+            ADD COLUMN fingerprint_max_event_id uuid NULL,
+            ADD COLUMN fingerprint_revenue_cents bigint NULL
+        """
+    )
+    op.execute(
+        """
+        ALTER TABLE public.attribution_recompute_jobs
+            ADD CONSTRAINT ck_attribution_recompute_jobs_fingerprint_complete
+            CHECK ((fingerprint_event_count IS NULL) = (fingerprint_revenue_cents IS NULL))
+        """
+    )
+    op.execute(
+        """
+        ALTER TABLE public.attribution_recompute_jobs
+            DROP CONSTRAINT ck_attribution_recompute_jobs_status_valid,
+            ADD CONSTRAINT ck_attribution_recompute_jobs_status_valid
+            CHECK (status IN ('pending', 'running', 'succeeded', 'failed', 'skipped_unchanged'))
+        """
+    )
+    op.execute(
+        """
+        COMMENT ON COLUMN public.attribution_recompute_jobs.fingerprint_event_count IS
+            'Number of events the last run was started against (with fingerprint_max_event_id and '
+            'fingerprint_revenue_cents). NULL means the next run never skips.'
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        UPDATE public.attribution_recompute_jobs
+        SET status = 'succeeded'
+        WHERE status = 'skipped_unchanged'
+        """
+    )
+    op.execute(
+        """
+        ALTER TABLE public.attribution_recompute_jobs
+            DROP CONSTRAINT ck_attribution_recompute_jobs_status_valid,
+            ADD CONSTRAINT ck_attribution_recompute_jobs_status_valid
+            CHECK (status IN ('pending', 'running', 'succeeded', 'failed'))
+        """
+    )
+    op.execute(
+        """
+        ALTER TABLE public.attribution_recompute_jobs
+            DROP CONSTRAINT IF EXISTS ck_attribution_recompute_jobs_fingerprint_complete,
+            DROP COLUMN IF EXISTS fingerprint_revenue_cents,
+            DROP COLUMN IF EXISTS fingerprint_max_event_id,
+            DROP COLUMN IF EXISTS fingerprint_event_count
+        """
+    )
@@ -0,0 +1,59 @@
+"""Covering keyset index for paging attribution_allocations.
+
+Revision ID: 202610171200
+Revises: 202610171100
+Create Date: 2026-10-17 12:00:00
+
+GET /api/attribution/allocations pages newest first on (created_at, id) and
+filters on channel_code and model_version. The index orders by the full
+keyset and carries the dashboard columns, so a page is a single index range
+scan (index-only once the visibility map is current) however deep it is.
+It supersedes the (tenant_id, created_at DESC) index, which is a prefix of it.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "202610171200"
+down_revision: Union[str, None] = "202610171100"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE INDEX idx_attribution_allocations_tenant_keyset
+        ON public.attribution_allocations (tenant_id, created_at DESC, id DESC)
+        INCLUDE (
+            event_id,
+            channel_code,
+            model_version,
+            allocated_revenue_cents,
+            allocation_ratio,
+            confidence_score
+        )
+        """
+    )
+    op.execute("DROP INDEX IF EXISTS public.idx_attribution_allocations_tenant_created_at")
+    op.execute(
+        """
+        COMMENT ON INDEX public.idx_attribution_allocations_tenant_keyset IS
+            'Keyset pagination for GET /api/attribution/allocations (created_at, id) with the '
+            'dashboard columns included so channel/model_version filters need no heap lookup.'
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_attribution_allocations_tenant_created_at
+        ON public.attribution_allocations (tenant_id, created_at DESC)
+        """
+    )
+    op.execute("DROP INDEX IF EXISTS public.idx_attribution_allocations_tenant_keyset")
@@ -0,0 +1,108 @@
+"""Per-(tenant, view) refresh ledger for deduplicated matview refresh scheduling.
+
+Revision ID: 202610171300
+Revises: 202610171200
+Create Date: 2026-10-17 13:00:00
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "202610171300"
+down_revision: Union[str, None] = "202610171200"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _grant_if_role_exists(role: str, grant_sql: str) -> None:
+    op.execute(
+        f"""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = '{role}') THEN
+                EXECUTE '{grant_sql}';
+            END IF;
+        END
+        $$;
+        """
+    )
+
+
+def _revoke_if_role_exists(role: str, revoke_sql: str) -> None:
+    op.execute(
+        f"""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = '{role}') THEN
+                EXECUTE '{revoke_sql}';
+            END IF;
+        END
+        $$;
+        """
+    )
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS public.matview_refresh_state (
+            tenant_id uuid NOT NULL REFERENCES public.tenants(id) ON DELETE CASCADE,
+            view_name text NOT NULL,
+            dirty_since timestamptz NULL,
+            last_refreshed_at timestamptz NULL,
+            last_outcome text NULL,
+            CONSTRAINT pk_matview_refresh_state PRIMARY KEY (tenant_id, view_name)
+        )
+        """
+    )
+    op.execute(
+        """
+        COMMENT ON TABLE public.matview_refresh_state IS
+            'One row per (tenant, registered matview). Refresh requests set dirty_since; a '
+            'refresh is claimed at most once per the view''s max_staleness_seconds, which '
+            'stamps last_refreshed_at and clears dirty_since.'
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_matview_refresh_state_dirty
+            ON public.matview_refresh_state (tenant_id, last_refreshed_at)
+            WHERE dirty_since IS NOT NULL
+        """
+    )
+
+    op.execute("ALTER TABLE public.matview_refresh_state ENABLE ROW LEVEL SECURITY")
+    op.execute("ALTER TABLE public.matview_refresh_state FORCE ROW LEVEL SECURITY")
+    op.execute("DROP POLICY IF EXISTS tenant_isolation_policy ON public.matview_refresh_state")
+    op.execute(
+        """
+        CREATE POLICY tenant_isolation_policy ON public.matview_refresh_state
+            USING (tenant_id = current_setting('app.current_tenant_id', true)::uuid)
+            WITH CHECK (tenant_id = current_setting('app.current_tenant_id', true)::uuid)
+        """
+    )
+
+    _grant_if_role_exists(
+        "app_user",
+        "GRANT SELECT, INSERT, UPDATE, DELETE ON TABLE public.matview_refresh_state TO app_user",
+    )
+    _grant_if_role_exists(
+        "app_rw",
+        "GRANT SELECT, INSERT, UPDATE, DELETE ON TABLE public.matview_refresh_state TO app_rw",
+    )
+    _grant_if_role_exists(
+        "app_ro",
+        "GRANT SELECT ON TABLE public.matview_refresh_state TO app_ro",
+    )
+
+
+def downgrade() -> None:
+    _revoke_if_role_exists("app_ro", "REVOKE ALL ON TABLE public.matview_refresh_state FROM app_ro")
+    _revoke_if_role_exists("app_rw", "REVOKE ALL ON TABLE public.matview_refresh_state FROM app_rw")
+    _revoke_if_role_exists("app_user", "REVOKE ALL ON TABLE public.matview_refresh_state FROM app_user")
+    op.execute("DROP POLICY IF EXISTS tenant_isolation_policy ON public.matview_refresh_state")
+    op.execute("DROP TABLE IF EXISTS public.matview_refresh_state")  # CI:DESTRUCTIVE_OK - rollback of matview refresh ledger
@@ -0,0 +1,131 @@
+"""Summary tables for incrementally maintained matview storage.
+
+Revision ID: 202610171400
+Revises: 202610171300
+Create Date: 2026-10-17 14:00:00
+
+attribution_allocation_summary mirrors mv_allocation_summary and
+attribution_channel_daily_summary mirrors mv_channel_performance, column for
+column. They are maintained by delta upserts from the allocation writers when a
+registry entry selects storage="incremental" (app.matviews.summaries).
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "202610171400"
+down_revision: Union[str, None] = "202610171300"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _grant_if_role_exists(role: str, grant_sql: str) -> None:
+    op.execute(
+        f"""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = '{role}') THEN
+                EXECUTE '{grant_sql}';
+            END IF;
+        END
+        $$;
+        """
+    )
+
+
+def _revoke_if_role_exists(role: str, revoke_sql: str) -> None:
+    op.execute(
+        f"""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = '{role}') THEN
+                EXECUTE '{revoke_sql}';
+            END IF;
+        END
+        $$;
+        """
+    )
+
+
+_TABLES = ("attribution_allocation_summary", "attribution_channel_daily_summary")
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS public.attribution_allocation_summary (
+            tenant_id uuid NOT NULL REFERENCES public.tenants(id) ON DELETE CASCADE,
+            event_id uuid NULL,
+            model_version text NOT NULL,
+            total_allocated_cents bigint NOT NULL,
+            event_revenue_cents integer NULL,
+            is_balanced boolean NULL,
+            drift_cents bigint NULL,
+            CONSTRAINT uq_attribution_allocation_summary_key
+                UNIQUE NULLS NOT DISTINCT (tenant_id, event_id, model_version)
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS public.attribution_channel_daily_summary (
+            tenant_id uuid NOT NULL REFERENCES public.tenants(id) ON DELETE CASCADE,
+            channel_code text NOT NULL,
+            allocation_date timestamptz NOT NULL,
+            total_conversions bigint NOT NULL,
+            total_revenue_cents bigint NOT NULL,
+            avg_confidence_score numeric NOT NULL,
+            total_allocations bigint NOT NULL,
+            CONSTRAINT pk_attribution_channel_daily_summary
+                PRIMARY KEY (tenant_id, channel_code, allocation_date)
+        )
+        """
+    )
+    op.execute(
+        """
+        COMMENT ON TABLE public.attribution_allocation_summary IS
+            'Incremental storage for mv_allocation_summary: one row per (tenant, event, model_version), '
+            'maintained by delta upserts from allocation writes and rebuilt by reconciliation.'
+        """
+    )
+    op.execute(
+        """
+        COMMENT ON TABLE public.attribution_channel_daily_summary IS
+            'Incremental storage for mv_channel_performance: one row per (tenant, channel, day) over '
+            'the last 90 days, maintained by delta upserts and rebuilt by reconciliation.'
+        """
+    )
+
+    for table in _TABLES:
+        op.execute(f"ALTER TABLE public.{table} ENABLE ROW LEVEL SECURITY")
+        op.execute(f"ALTER TABLE public.{table} FORCE ROW LEVEL SECURITY")
+        op.execute(f"DROP POLICY IF EXISTS tenant_isolation_policy ON public.{table}")
+        op.execute(
+            f"""
+            CREATE POLICY tenant_isolation_policy ON public.{table}
+                USING (tenant_id = current_setting('app.current_tenant_id', true)::uuid)
+                WITH CHECK (tenant_id = current_setting('app.current_tenant_id', true)::uuid)
+            """
+        )
+        _grant_if_role_exists(
+            "app_user",
+            f"GRANT SELECT, INSERT, UPDATE, DELETE ON TABLE public.{table} TO app_user",
+        )
+        _grant_if_role_exists(
+            "app_rw",
+            f"GRANT SELECT, INSERT, UPDATE, DELETE ON TABLE public.{table} TO app_rw",
+        )
+        _grant_if_role_exists("app_ro", f"GRANT SELECT ON TABLE public.{table} TO app_ro")
+
+
+def downgrade() -> None:
+    for table in reversed(_TABLES):
+        _revoke_if_role_exists("app_ro", f"REVOKE ALL ON TABLE public.{table} FROM app_ro")
+        _revoke_if_role_exists("app_rw", f"REVOKE ALL ON TABLE public.{table} FROM app_rw")
+        _revoke_if_role_exists("app_user", f"REVOKE ALL ON TABLE public.{table} FROM app_user")
+        op.execute(f"DROP POLICY IF EXISTS tenant_isolation_policy ON public.{table}")
+        op.execute(f"DROP TABLE IF EXISTS public.{table}")  # CI:DESTRUCTIVE_OK - rollback of incremental summary storage
@@ -0,0 +1,51 @@
+"""Record matview source-table fingerprints on the refresh ledger.
+
+Revision ID: 202610171500
+Revises: 202610171400
+Create Date: 2026-10-17 15:00:00
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "202610171500"
+down_revision: Union[str, None] = "202610171400"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        ALTER TABLE public.matview_refresh_state
+            ADD COLUMN IF NOT EXISTS source_fingerprint text NULL,
+            ADD COLUMN IF NOT EXISTS current_as_of timestamptz NULL
+        """
+    )
+    op.execute(
+        """
+        COMMENT ON COLUMN public.matview_refresh_state.source_fingerprint IS
+            'Change counters of the view''s source tables, read in the transaction of the '
+            'last successful refresh. A scheduled refresh is skipped while it is unchanged.'
+        """
+    )
+    op.execute(
+        """
+        COMMENT ON COLUMN public.matview_refresh_state.current_as_of IS
+            'When the view was last refreshed or found unchanged for this tenant.'
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        ALTER TABLE public.matview_refresh_state
+            DROP COLUMN IF EXISTS current_as_of,
+            DROP COLUMN IF EXISTS source_fingerprint
+        """
+    )
@@ -0,0 +1,68 @@
+"""Scope a worker-context INSERT grant for the event backfill importer.
+
+Revision ID: 202610171600
+Revises: 202610171500
+Create Date: 2026-10-17 16:00:00
+
+Migration Description:
+- fn_block_worker_ingestion_mutation keeps ingestion tables read-only in
+  worker context, except that INSERTs are allowed in a transaction that set
+  app.worker_ingestion_grant = 'event_backfill' (the historical backfill
+  task). UPDATE and DELETE stay blocked for every worker.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "202610171600"
+down_revision: Union[str, None] = "202610171500"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+GUARD_FN = """
+CREATE OR REPLACE FUNCTION fn_block_worker_ingestion_mutation() RETURNS trigger AS $$
+BEGIN
+    IF current_setting('app.execution_context', true) = 'worker' THEN
+        IF TG_OP = 'INSERT' AND current_setting('app.worker_ingestion_grant', true) = 'event_backfill' THEN
+            RETURN NEW;
+        END IF;
+        RAISE EXCEPTION 'ingestion tables are read-only in worker context (table=%)', TG_TABLE_NAME;
+    END IF;
+
+    IF TG_OP = 'DELETE' THEN
+        RETURN OLD;
+    ELSE
+        RETURN NEW;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+PREVIOUS_GUARD_FN = """
+CREATE OR REPLACE FUNCTION fn_block_worker_ingestion_mutation() RETURNS trigger AS $$
+BEGIN
+    IF current_setting('app.execution_context', true) = 'worker' THEN
+        RAISE EXCEPTION 'ingestion tables are read-only in worker context (table=%)', TG_TABLE_NAME;
+    END IF;
+
+    IF TG_OP = 'DELETE' THEN
+        RETURN OLD;
+    ELSE
+        RETURN NEW;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade() -> None:
+    op.execute(GUARD_FN)
+
+
+def downgrade() -> None:
+    op.execute(PREVIOUS_GUARD_FN)
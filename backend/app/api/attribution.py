@@ -5,11 +5,14 @@ Implements attribution operations defined in api-contracts/dist/openapi/v1/attri
 
 Contract Operations:
 - GET /api/attribution/revenue/realtime: Get realtime revenue attribution data
+- GET /api/attribution/allocations: Page through attribution allocations
 
 All routes use generated Pydantic models from backend/app/schemas/attribution.py
 """
 
-from fastapi import APIRouter, Depends, Header, Request, Response, Security, status
+from datetime import date
+from fastapi import APIRouter, Depends, Header, Query, Request, Response, Security, status
+from fastapi.responses import StreamingResponse
 from uuid import UUID
 from typing import Annotated
 
@@ -18,6 +21,13 @@ from app.schemas.attribution import RealtimeRevenueResponse
 from app.api.problem_details import problem_details_response
 from app.db.deps import get_db_session
 from app.security.auth import AuthContext, get_auth_context
+from app.services.attribution_allocation_query import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    AllocationQueryError,
+    build_page_query,
+    stream_allocation_page,
+)
 from app.services.realtime_revenue_cache import (
     RealtimeRevenueUnavailable,
     get_realtime_revenue_snapshot,
@@ -100,3 +110,63 @@ async def get_realtime_revenue(
     response.headers["ETag"] = etag
     response.headers["Cache-Control"] = "max-age=30"
     return response_data
+
+
+@router.get(
+    "/allocations",
+    status_code=200,
+    operation_id="listAttributionAllocations",
+    summary="List attribution allocations",
+    description="Keyset-paginated, streamed attribution allocations with channel, model and date filters",
+)
+async def list_attribution_allocations(
+    request: Request,
+    x_correlation_id: Annotated[UUID, Header(alias="X-Correlation-ID")],
+    auth_context: Annotated[AuthContext, Security(get_auth_context, scopes=["viewer"])],
+    db_session: Annotated[AsyncSession, Depends(get_db_session)],
+    channel: Annotated[list[str] | None, Query()] = None,
+    model_version: str | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    fields: str | None = None,
+    cursor: str | None = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+):
+    """
+    Page through the tenant's attribution allocations, newest first.
+
+    Contract: GET /api/attribution/allocations
+    Spec: api-contracts/dist/openapi/v1/attribution.bundled.yaml
+
+    Returns:
+        StreamingResponse: ``{"items": [...], "next_cursor": str | null}``
+    """
+    try:
+        page_query = build_page_query(
+            tenant_id=auth_context.tenant_id,
+            fields=fields,
+            channels=channel,
+            model_version=model_version,
+            start_date=start_date,
+            end_date=end_date,
+            cursor=cursor,
+            limit=limit,
+        )
+    except AllocationQueryError as exc:
+        return problem_details_response(
+            request,
+            status_code=status.HTTP_400_BAD_REQUEST,
+            title="Validation Error",
+            detail=str(exc),
+            correlation_id=x_correlation_id,
+            type_url="https://api.skeldir.com/problems/validation-error",
+        )
+
+    return StreamingResponse(
+        stream_allocation_page(db_session, page_query),
+        media_type="application/json",
+        headers={
+            "X-Correlation-ID": str(x_correlation_id),
+            "Cache-Control": "no-store",
+        },
+    )
@@ -6,6 +6,9 @@ Responsibilities:
 - Verify vendor signatures using per-tenant secrets
 - Apply PII stripping (handled by middleware) and ingest via EventIngestionService
 - Return 200 for success and DLQ-routed validation failures; 401 for signature/tenant failures
+- Batch routes (/webhooks/{vendor}/batch) ingest many signed events with set-based SQL
+- Parse once: routes and Pydantic body validation consume the payload the PII middleware
+  already parsed and sanitized (request.state.parsed_body) instead of re-parsing the body
 """
 import logging
 import hashlib
@@ -15,11 +18,12 @@ from decimal import Decimal
 from collections.abc import Callable
 from uuid import uuid4, uuid5, NAMESPACE_URL
 
-from fastapi import APIRouter, Depends, Header, HTTPException, Request, Security, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, Security, status
 from fastapi import Body
+from fastapi.routing import APIRoute
 from fastapi.security import APIKeyHeader
 from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Any, Optional
 
 from app.api.problem_details import ProblemDetails
@@ -27,7 +31,9 @@ from app.core.config import settings
 from app.core.tenant_context import get_tenant_with_webhook_secrets
 from app.db.session import get_session
 from app.ingestion.dlq_handler import DLQHandler
-from app.ingestion.event_service import ingest_with_transaction
+from app.ingestion.event_service import ingest_many_with_transaction, ingest_with_transaction
+from app.ingestion.group_commit import ingest_with_group_commit
+from app.middleware.pii_stripping import PARSED_BODY_STATE_KEY
 from app.models import DeadEvent
 from app.schemas.webhooks_shopify import ShopifyOrderCreateRequest
 from app.schemas.webhooks_stripe import StripePaymentIntentSucceededRequest
@@ -38,8 +44,6 @@ from app.observability.context import (
     set_business_correlation_id,
     get_request_correlation_id,
 )
-from app.tasks.authority import SystemAuthorityEnvelope
-from app.tasks.enqueue import tenant_task_signature
 from app.security.auth import AuthError, unauthorized_auth_error
 from app.privacy.authority import generate_privacy_session_id
 from app.webhooks.signatures import (
@@ -49,7 +53,36 @@ from app.webhooks.signatures import (
     verify_woocommerce_signature,
 )
 
-router = APIRouter()
+_NO_PARSED_BODY = object()
+
+
+def _parsed_body(request: Request) -> Any:
+    return getattr(request.state, PARSED_BODY_STATE_KEY, _NO_PARSED_BODY)
+
+
+class ParsedBodyRequest(Request):
+    """Request whose json() returns the middleware-parsed, PII-stripped payload when present."""
+
+    async def json(self) -> Any:
+        parsed = _parsed_body(self)
+        if parsed is not _NO_PARSED_BODY:
+            return parsed
+        return await super().json()
+
+
+class ParsedBodyRoute(APIRoute):
+    """Feeds ParsedBodyRequest to FastAPI so Body(...) models validate without a second parse."""
+
+    def get_route_handler(self) -> Callable:
+        original_route_handler = super().get_route_handler()
+
+        async def parsed_body_route_handler(request: Request) -> Response:
+            return await original_route_handler(ParsedBodyRequest(request.scope, request.receive))
+
+        return parsed_body_route_handler
+
+
+router = APIRouter(route_class=ParsedBodyRoute)
 logger = logging.getLogger(__name__)
 tenant_key_auth = APIKeyHeader(
     name=settings.TENANT_API_KEY_HEADER,
@@ -67,6 +100,29 @@ class WebhookResponse(BaseModel):
     error: Optional[str] = None
 
 
+class WebhookBatchResponse(BaseModel):
+    status: str
+    results: list[WebhookResponse]
+
+
+# Batch envelopes: the whole body is signed once; each event keeps the
+# single-route payload shape so both paths share one event builder.
+class ShopifyOrderCreateBatchRequest(BaseModel):
+    events: list[ShopifyOrderCreateRequest] = Field(min_length=1)
+
+
+class StripePaymentIntentSucceededBatchRequest(BaseModel):
+    events: list[StripePaymentIntentSucceededRequest] = Field(min_length=1)
+
+
+class PayPalSaleCompletedBatchRequest(BaseModel):
+    events: list[PayPalSaleCompletedRequest] = Field(min_length=1)
+
+
+class WooCommerceOrderCompletedBatchRequest(BaseModel):
+    events: list[WooCommerceOrderCompletedRequest] = Field(min_length=1)
+
+
 UNAUTHORIZED_PROBLEM_RESPONSE = {
     "description": "Unauthorized - invalid or missing authentication",
     "content": {
@@ -241,6 +297,9 @@ def _coerce_event_timestamp(value: str) -> datetime:
     return parsed.astimezone(timezone.utc)
 
 
+_RECOMPUTE_MODEL_VERSION = "1.0.0"
+
+
 def _compute_recompute_window(event_timestamp: str) -> tuple[str, str]:
     """
     Normalize an event timestamp into a UTC day window (start inclusive, end exclusive).
@@ -258,34 +317,16 @@ def _schedule_downstream_tasks(
     *, tenant_id, event_timestamp: str, correlation_id: str
 ) -> None:
     try:
-        from celery import chain
-
-        from app.tasks.attribution import recompute_window
-        from app.tasks.matviews import matview_refresh_all_for_tenant
+        from app.services.attribution import enqueue_recompute_followup
 
         window_start, window_end = _compute_recompute_window(event_timestamp)
-        system_envelope = SystemAuthorityEnvelope(tenant_id=tenant_id)
-        chain(
-            tenant_task_signature(
-                recompute_window,
-                envelope=system_envelope,
-                kwargs={
-                    "window_start": window_start,
-                    "window_end": window_end,
-                    "correlation_id": correlation_id,
-                    "model_version": "1.0.0",
-                },
-            ).set(correlation_id=correlation_id),
-            tenant_task_signature(
-                matview_refresh_all_for_tenant,
-                envelope=system_envelope,
-                kwargs={
-                    "correlation_id": correlation_id,
-                    "schedule_class": "realtime",
-                },
-                immutable=True,
-            ).set(correlation_id=correlation_id),
-        ).apply_async()
+        enqueue_recompute_followup(
+            tenant_id,
+            window_start,
+            window_end,
+            correlation_id,
+            model_version=_RECOMPUTE_MODEL_VERSION,
+        )
         logger.info(
             "ingestion_followup_tasks_enqueued",
             extra={
@@ -306,6 +347,59 @@ def _schedule_downstream_tasks(
         )
 
 
+async def _request_downstream_recompute(
+    *, tenant_id, event_timestamp: str, correlation_id: str
+) -> None:
+    """
+    Coalesce post-ingestion recomputes per (tenant, window, model_version).
+
+    Dispatches immediately for the first event of a quiet window; otherwise the
+    window is only marked dirty and app.tasks.attribution.flush_recompute_windows
+    dispatches it later (see app.services.attribution).
+    """
+    interval_seconds = settings.ATTRIBUTION_RECOMPUTE_COALESCE_INTERVAL_SECONDS
+    if interval_seconds > 0:
+        try:
+            from app.services.attribution import mark_recompute_window_dirty
+
+            window_start, window_end = _compute_recompute_window(event_timestamp)
+            dispatch_now = await mark_recompute_window_dirty(
+                tenant_id=tenant_id,
+                window_start=window_start,
+                window_end=window_end,
+                model_version=_RECOMPUTE_MODEL_VERSION,
+                correlation_id=correlation_id,
+                interval_seconds=interval_seconds,
+            )
+        except Exception:
+            # Fail open towards freshness: an unrecorded window is dispatched directly.
+            logger.exception(
+                "ingestion_followup_coalesce_failed",
+                extra={
+                    "tenant_id": str(tenant_id),
+                    "correlation_id": correlation_id,
+                    "event_timestamp": event_timestamp,
+                },
+            )
+            dispatch_now = True
+        if not dispatch_now:
+            logger.debug(
+                "ingestion_followup_tasks_coalesced",
+                extra={
+                    "tenant_id": str(tenant_id),
+                    "correlation_id": correlation_id,
+                    "window_start": window_start,
+                    "window_end": window_end,
+                },
+            )
+            return
+    _schedule_downstream_tasks(
+        tenant_id=tenant_id,
+        event_timestamp=event_timestamp,
+        correlation_id=correlation_id,
+    )
+
+
 async def _route_to_dlq_direct(
     tenant_id,
     source: str,
@@ -333,10 +427,22 @@ async def _route_to_dlq_direct(
         return dead
 
 
+async def _ingest_single_event(tenant_id, event_data: dict, idempotency_key: str, source: str) -> dict:
+    # Group-commit mode shares one transaction across concurrent requests; the
+    # result is still only returned after that transaction commits.
+    ingest = ingest_with_group_commit if settings.INGESTION_GROUP_COMMIT_ENABLED else ingest_with_transaction
+    return await ingest(
+        tenant_id=tenant_id,
+        event_data=event_data,
+        idempotency_key=idempotency_key,
+        source=source,
+    )
+
+
 async def _handle_ingestion(tenant_id, event_data: dict, idempotency_key: str, source: str):
     event_data = {**event_data, "idempotency_key": idempotency_key}
     # Use transactional helper to preserve DLQ commits on validation errors
-    result = await ingest_with_transaction(
+    result = await _ingest_single_event(
         tenant_id=tenant_id,
         event_data=event_data,
         idempotency_key=idempotency_key,
@@ -346,7 +452,7 @@ async def _handle_ingestion(tenant_id, event_data: dict, idempotency_key: str, s
         correlation_id = get_request_correlation_id() or idempotency_key
         event_timestamp = event_data.get("event_timestamp")
         if event_timestamp:
-            _schedule_downstream_tasks(
+            await _request_downstream_recompute(
                 tenant_id=tenant_id,
                 event_timestamp=str(event_timestamp),
                 correlation_id=str(correlation_id),
@@ -358,6 +464,13 @@ async def _handle_ingestion(tenant_id, event_data: dict, idempotency_key: str, s
             "channel": result.get("channel"),
         }
 
+    if result.get("dead_event_id"):
+        return {
+            "status": "dlq_routed",
+            "dead_event_id": result["dead_event_id"],
+            "error": result.get("error"),
+        }
+
     # Validation errors routed to DLQ: locate the dead_event using correlation_id
     correlation_id = _make_correlation_uuid(idempotency_key)
     async with get_session(tenant_id=tenant_id) as session:
@@ -379,21 +492,77 @@ async def _handle_ingestion(tenant_id, event_data: dict, idempotency_key: str, s
     }
 
 
-@router.post(
-    "/webhooks/shopify/order_create",
-    response_model=WebhookResponse,
-    responses={401: UNAUTHORIZED_PROBLEM_RESPONSE},
-)
-async def shopify_order_create(
-    request: Request,
-    payload: ShopifyOrderCreateRequest = Body(...),
-    tenant_info=Depends(shopify_webhook_auth),
+async def _handle_batch_ingestion(
+    tenant_id,
+    payloads: list,
+    build_event: Callable[[Any], tuple[str, dict]],
+    source: str,
 ):
+    """
+    Ingest a signed batch of vendor payloads; results are returned in request order.
+
+    Items the single-event route would reject with 400 are reported as
+    'rejected' without persistence; schema failures are DLQ-routed.
+    """
+    if len(payloads) > settings.WEBHOOK_BATCH_MAX_EVENTS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=WEBHOOK_PAYLOAD_TOO_LARGE_DETAIL,
+        )
+
+    results: list[Optional[dict]] = [None] * len(payloads)
+    items: list[tuple[dict, str]] = []
+    positions: list[int] = []
+    for position, payload in enumerate(payloads):
+        try:
+            idempotency_key, event_data = build_event(payload)
+        except HTTPException as exc:
+            results[position] = {"status": "rejected", "error": str(exc.detail)}
+            continue
+        items.append(({**event_data, "idempotency_key": idempotency_key}, idempotency_key))
+        positions.append(position)
+
+    ingested = await ingest_many_with_transaction(tenant_id=tenant_id, items=items, source=source) if items else []
+
+    window_timestamps: dict[tuple[str, str], str] = {}
+    for position, (event_data, idempotency_key), result in zip(positions, items, ingested):
+        if result.get("status") == "success":
+            results[position] = {
+                "status": "success",
+                "event_id": result.get("event_id"),
+                "idempotency_key": idempotency_key,
+                "channel": result.get("channel"),
+            }
+            event_timestamp = event_data.get("event_timestamp")
+            if event_timestamp:
+                window = _compute_recompute_window(str(event_timestamp))
+                window_timestamps.setdefault(window, str(event_timestamp))
+        else:
+            results[position] = {
+                "status": "dlq_routed",
+                "dead_event_id": result.get("dead_event_id"),
+                "idempotency_key": idempotency_key,
+                "error": result.get("error"),
+            }
+
+    # One downstream recompute per distinct UTC day window, not per event.
+    correlation_id = get_request_correlation_id() or (items[0][1] if items else None)
+    for event_timestamp in window_timestamps.values():
+        await _request_downstream_recompute(
+            tenant_id=tenant_id,
+            event_timestamp=event_timestamp,
+            correlation_id=str(correlation_id),
+        )
+
+    all_succeeded = all(r["status"] == "success" for r in results)
+    return {"status": "success" if all_succeeded else "partial", "results": results}
+
+
+def _shopify_order_create_event(payload: ShopifyOrderCreateRequest) -> tuple[str, dict]:
     if not payload.id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing order id")
 
     idempotency_key = str(uuid5(NAMESPACE_URL, f"shopify_order_create_{payload.id}"))
-    set_business_correlation_id(idempotency_key)
     event_data = {
         "event_type": "purchase",
         "event_timestamp": (payload.created_at or datetime.now(timezone.utc)).isoformat(),
@@ -405,25 +574,17 @@ async def shopify_order_create(
         "external_event_id": str(payload.id),
         "correlation_id": str(_make_correlation_uuid(idempotency_key)),
     }
-    return await _handle_ingestion(tenant_info["tenant_id"], event_data, idempotency_key, source="shopify")
+    return idempotency_key, event_data
 
 
-@router.post(
-    "/webhooks/stripe/payment_intent_succeeded",
-    response_model=WebhookResponse,
-    responses={401: UNAUTHORIZED_PROBLEM_RESPONSE},
-)
-async def stripe_payment_intent_succeeded(
-    request: Request,
-    payload: StripePaymentIntentSucceededRequest = Body(...),
-    x_idempotency_key: Optional[str] = Header(None, alias="X-Idempotency-Key"),
-    tenant_info=Depends(stripe_webhook_auth),
-):
+def _stripe_payment_intent_succeeded_event(
+    payload: StripePaymentIntentSucceededRequest,
+    x_idempotency_key: Optional[str] = None,
+) -> tuple[str, dict]:
     if not payload.id and not x_idempotency_key:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing payment intent id")
 
     idempotency_key = x_idempotency_key or str(uuid5(NAMESPACE_URL, f"stripe_payment_intent_succeeded_{payload.id}"))
-    set_business_correlation_id(idempotency_key)
     ts = datetime.fromtimestamp(payload.created) if payload.created else datetime.now(timezone.utc)
     # Avoid float conversion issues; ingestion service converts Decimal-string -> cents.
     revenue_amount = "0"
@@ -440,9 +601,110 @@ async def stripe_payment_intent_succeeded(
         "external_event_id": payload.id,
         "correlation_id": str(_make_correlation_uuid(idempotency_key)),
     }
+    return idempotency_key, event_data
+
+
+def _paypal_sale_completed_event(payload: PayPalSaleCompletedRequest) -> tuple[str, dict]:
+    if not payload.id or not payload.amount:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing transaction id or amount")
+
+    idempotency_key = str(uuid5(NAMESPACE_URL, f"paypal_sale_completed_{payload.id}"))
+    ts = payload.create_time or datetime.now(timezone.utc)
+    event_data = {
+        "event_type": "purchase",
+        "event_timestamp": ts.isoformat(),
+        "revenue_amount": payload.amount.total or "0",
+        "currency": payload.amount.currency or "USD",
+        "session_id": str(generate_privacy_session_id()),
+        "vendor": "paypal",
+        "utm_source": "paypal",
+        "external_event_id": payload.id,
+        "correlation_id": str(_make_correlation_uuid(idempotency_key)),
+    }
+    return idempotency_key, event_data
+
+
+def _woocommerce_order_completed_event(payload: WooCommerceOrderCompletedRequest) -> tuple[str, dict]:
+    if not payload.id:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing order id")
+
+    idempotency_key = str(uuid5(NAMESPACE_URL, f"woocommerce_order_completed_{payload.id}"))
+    ts = payload.date_completed or datetime.now(timezone.utc)
+    event_data = {
+        "event_type": "purchase",
+        "event_timestamp": ts.isoformat(),
+        "revenue_amount": payload.total or "0",
+        "currency": payload.currency or "USD",
+        "session_id": str(generate_privacy_session_id()),
+        "vendor": "woocommerce",
+        "utm_source": "woocommerce",
+        "external_event_id": str(payload.id),
+        "correlation_id": str(_make_correlation_uuid(idempotency_key)),
+    }
+    return idempotency_key, event_data
+
+
+@router.post(
+    "/webhooks/shopify/order_create",
+    response_model=WebhookResponse,
+    responses={401: UNAUTHORIZED_PROBLEM_RESPONSE},
+)
+async def shopify_order_create(
+    request: Request,
+    payload: ShopifyOrderCreateRequest = Body(...),
+    tenant_info=Depends(shopify_webhook_auth),
+):
+    idempotency_key, event_data = _shopify_order_create_event(payload)
+    set_business_correlation_id(idempotency_key)
+    return await _handle_ingestion(tenant_info["tenant_id"], event_data, idempotency_key, source="shopify")
+
+
+@router.post(
+    "/webhooks/shopify/batch",
+    response_model=WebhookBatchResponse,
+    responses={401: UNAUTHORIZED_PROBLEM_RESPONSE},
+)
+async def shopify_order_create_batch(
+    request: Request,
+    payload: ShopifyOrderCreateBatchRequest = Body(...),
+    tenant_info=Depends(shopify_webhook_auth),
+):
+    return await _handle_batch_ingestion(
+        tenant_info["tenant_id"], payload.events, _shopify_order_create_event, source="shopify"
+    )
+
+
+@router.post(
+    "/webhooks/stripe/payment_intent_succeeded",
+    response_model=WebhookResponse,
+    responses={401: UNAUTHORIZED_PROBLEM_RESPONSE},
+)
+async def stripe_payment_intent_succeeded(
+    request: Request,
+    payload: StripePaymentIntentSucceededRequest = Body(...),
+    x_idempotency_key: Optional[str] = Header(None, alias="X-Idempotency-Key"),
+    tenant_info=Depends(stripe_webhook_auth),
+):
+    idempotency_key, event_data = _stripe_payment_intent_succeeded_event(payload, x_idempotency_key)
+    set_business_correlation_id(idempotency_key)
     return await _handle_ingestion(tenant_info["tenant_id"], event_data, idempotency_key, source="stripe")
 
 
+@router.post(
+    "/webhooks/stripe/batch",
+    response_model=WebhookBatchResponse,
+    responses={401: UNAUTHORIZED_PROBLEM_RESPONSE},
+)
+async def stripe_payment_intent_succeeded_batch(
+    request: Request,
+    payload: StripePaymentIntentSucceededBatchRequest = Body(...),
+    tenant_info=Depends(stripe_webhook_auth),
+):
+    return await _handle_batch_ingestion(
+        tenant_info["tenant_id"], payload.events, _stripe_payment_intent_succeeded_event, source="stripe"
+    )
+
+
 @router.post(
     "/webhooks/stripe/payment_intent/succeeded",
     response_model=WebhookResponse,
@@ -463,12 +725,14 @@ async def stripe_payment_intent_succeeded_v2(
     - Duplicate valid events: idempotent success (no 5xx)
     """
     raw_body = getattr(request.state, "original_body", None) or await request.body()
-    stripped_body = await request.body()
 
     payload: dict[str, Any] = {}
     payload_parse_error: str | None = None
     try:
-        parsed_payload = json.loads(stripped_body.decode("utf-8"))
+        parsed_payload = _parsed_body(request)
+        if parsed_payload is _NO_PARSED_BODY:
+            stripped_body = await request.body()
+            parsed_payload = json.loads(stripped_body.decode("utf-8"))
         if not isinstance(parsed_payload, dict):
             raise ValueError("payload root must be a JSON object")
         payload = parsed_payload
@@ -618,7 +882,7 @@ async def stripe_payment_intent_succeeded_v2(
     if utm_medium_for_normalization:
         event_data["utm_medium"] = utm_medium_for_normalization
 
-    result = await ingest_with_transaction(
+    result = await _ingest_single_event(
         tenant_id=tenant_info["tenant_id"],
         event_data={**event_data, "idempotency_key": idempotency_key},
         idempotency_key=idempotency_key,
@@ -633,6 +897,13 @@ async def stripe_payment_intent_succeeded_v2(
             "channel": result.get("channel"),
         }
 
+    if result.get("dead_event_id"):
+        return {
+            "status": "dlq_routed",
+            "dead_event_id": result["dead_event_id"],
+            "error": result.get("error_type") or result.get("error"),
+        }
+
     # Validation errors routed to DLQ by service: locate via correlation_id for response
     async with get_session(tenant_id=tenant_info["tenant_id"]) as session:
         from sqlalchemy import select
@@ -658,26 +929,26 @@ async def paypal_sale_completed(
     payload: PayPalSaleCompletedRequest = Body(...),
     tenant_info=Depends(paypal_webhook_auth),
 ):
-    if not payload.id or not payload.amount:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing transaction id or amount")
-
-    idempotency_key = str(uuid5(NAMESPACE_URL, f"paypal_sale_completed_{payload.id}"))
+    idempotency_key, event_data = _paypal_sale_completed_event(payload)
     set_business_correlation_id(idempotency_key)
-    ts = payload.create_time or datetime.now(timezone.utc)
-    event_data = {
-        "event_type": "purchase",
-        "event_timestamp": ts.isoformat(),
-        "revenue_amount": payload.amount.total or "0",
-        "currency": payload.amount.currency or "USD",
-        "session_id": str(generate_privacy_session_id()),
-        "vendor": "paypal",
-        "utm_source": "paypal",
-        "external_event_id": payload.id,
-        "correlation_id": str(_make_correlation_uuid(idempotency_key)),
-    }
     return await _handle_ingestion(tenant_info["tenant_id"], event_data, idempotency_key, source="paypal")
 
 
+@router.post(
+    "/webhooks/paypal/batch",
+    response_model=WebhookBatchResponse,
+    responses={401: UNAUTHORIZED_PROBLEM_RESPONSE},
+)
+async def paypal_sale_completed_batch(
+    request: Request,
+    payload: PayPalSaleCompletedBatchRequest = Body(...),
+    tenant_info=Depends(paypal_webhook_auth),
+):
+    return await _handle_batch_ingestion(
+        tenant_info["tenant_id"], payload.events, _paypal_sale_completed_event, source="paypal"
+    )
+
+
 @router.post(
     "/webhooks/woocommerce/order_completed",
     response_model=WebhookResponse,
@@ -688,21 +959,21 @@ async def woocommerce_order_completed(
     payload: WooCommerceOrderCompletedRequest = Body(...),
     tenant_info=Depends(woocommerce_webhook_auth),
 ):
-    if not payload.id:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing order id")
-
-    idempotency_key = str(uuid5(NAMESPACE_URL, f"woocommerce_order_completed_{payload.id}"))
+    idempotency_key, event_data = _woocommerce_order_completed_event(payload)
     set_business_correlation_id(idempotency_key)
-    ts = payload.date_completed or datetime.now(timezone.utc)
-    event_data = {
-        "event_type": "purchase",
-        "event_timestamp": ts.isoformat(),
-        "revenue_amount": payload.total or "0",
-        "currency": payload.currency or "USD",
-        "session_id": str(generate_privacy_session_id()),
-        "vendor": "woocommerce",
-        "utm_source": "woocommerce",
-        "external_event_id": str(payload.id),
-        "correlation_id": str(_make_correlation_uuid(idempotency_key)),
-    }
     return await _handle_ingestion(tenant_info["tenant_id"], event_data, idempotency_key, source="woocommerce")
+
+
+@router.post(
+    "/webhooks/woocommerce/batch",
+    response_model=WebhookBatchResponse,
+    responses={401: UNAUTHORIZED_PROBLEM_RESPONSE},
+)
+async def woocommerce_order_completed_batch(
+    request: Request,
+    payload: WooCommerceOrderCompletedBatchRequest = Body(...),
+    tenant_info=Depends(woocommerce_webhook_auth),
+):
+    return await _handle_batch_ingestion(
+        tenant_info["tenant_id"], payload.events, _woocommerce_order_completed_event, source="woocommerce"
+    )
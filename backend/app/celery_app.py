@@ -163,6 +163,7 @@ def _ensure_celery_configured():
         "app.tasks.r4_failure_semantics",
         "app.tasks.r6_resource_governance",
         "app.tasks.privacy",
+        "app.tasks.backfill",
     ]
     # B0.5.6.6: Test-only tasks for runtime log proof (never enabled in production).
     if os.getenv("SKELDIR_TEST_TASKS") == "1":
@@ -222,6 +223,7 @@ def _ensure_celery_configured():
             'app.tasks.r4_failure_semantics.*': {'queue': QUEUE_HOUSEKEEPING, 'routing_key': f'{QUEUE_HOUSEKEEPING}.task'},
             'app.tasks.r6_resource_governance.*': {'queue': QUEUE_HOUSEKEEPING, 'routing_key': f'{QUEUE_HOUSEKEEPING}.task'},
             'app.tasks.privacy.*': {'queue': QUEUE_MAINTENANCE, 'routing_key': f'{QUEUE_MAINTENANCE}.task'},
+            'app.tasks.backfill.*': {'queue': QUEUE_MAINTENANCE, 'routing_key': f'{QUEUE_MAINTENANCE}.task'},
         },
         task_default_queue=QUEUE_HOUSEKEEPING,
         task_default_exchange='tasks',
@@ -298,6 +300,9 @@ def _configure_worker_logging(**kwargs):
     from app.security.revocation_runtime import get_revocation_runtime_cache
 
     get_revocation_runtime_cache().ensure_started()
+    from app.ingestion.channel_normalization import get_channel_taxonomy_runtime
+
+    get_channel_taxonomy_runtime().ensure_started()
     logger.info("celery_worker_logging_configured")
 
 
@@ -317,6 +322,13 @@ def _on_worker_process_shutdown(pid=None, **kwargs):
     except Exception:
         logger.exception("multiproc_mark_process_dead_failed", extra={"pid": resolved_pid})
 
+    try:
+        from app.db.sync_pool import close_sync_pools
+
+        close_sync_pools()
+    except Exception:
+        logger.exception("sync_pool_close_failed", extra={"pid": resolved_pid})
+
     try:
         _child_pid_events.put(("dead", resolved_pid))
     except Exception:
@@ -666,10 +678,10 @@ def _on_task_failure(task_id=None, exception=None, args=None, kwargs=None, einfo
     # B0.5.2: Persist task failure to worker DLQ (G4 remediation: sync psycopg2 path)
     try:
         import os
-        import psycopg2
         import psycopg2.extras
         from uuid import UUID, uuid5, NAMESPACE_URL
         from sqlalchemy.engine.url import make_url
+        from app.db.sync_pool import sync_connection
 
         # B0.5.3.3 Gate C: Lazy settings access in DLQ handler
         settings = _get_settings()
@@ -833,8 +845,7 @@ def _on_task_failure(task_id=None, exception=None, args=None, kwargs=None, einfo
 
         # G4-LOOP/G4-JSON: Sync persistence with proper JSONB encoding
         # B0.5.3.1: Write to canonical worker_failed_jobs table
-        conn = psycopg2.connect(dsn)
-        try:
+        with sync_connection(dsn) as conn:
             cur = conn.cursor()
             # G4-JSON: Use psycopg2.extras.Json for JSONB columns to prevent encoding defects
             # B0.5.3.1: Serialize UUIDs to strings before JSON encoding
@@ -902,8 +913,6 @@ def _on_task_failure(task_id=None, exception=None, args=None, kwargs=None, einfo
                     "[G4-AUTH] DB CONNECT OK - DLQ row persisted",
                     extra={"task_id": task_id, "task_name": raw_task_name}
                 )
-        finally:
-            conn.close()
 
     except Exception as dlq_error:
         # DLQ failure should not crash worker
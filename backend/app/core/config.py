@@ -61,6 +61,17 @@ class Settings(BaseSettings):
             "Prevents DB listener swamping under burst."
         ),
     )
+    SYNC_DATABASE_POOL_SIZE: int = Field(
+        5,
+        description=(
+            "Per-process cap for pooled psycopg2 connections used by sync worker paths "
+            "(matview refresh, refresh scheduler, DLQ writer), per DSN."
+        ),
+    )
+    SYNC_DATABASE_POOL_TIMEOUT_SECONDS: float = Field(
+        30.0,
+        description="Seconds to wait for a free pooled psycopg2 connection before failing.",
+    )
 
     # Tenant Authentication
     TENANT_API_KEY_HEADER: str = Field(
@@ -74,10 +85,32 @@ class Settings(BaseSettings):
         2048,
         description="Maximum entries for tenant webhook secret cache.",
     )
+    TENANT_API_KEY_CACHE_TTL_SECONDS: int = Field(
+        300,
+        description=(
+            "In-memory TTL for resolved tenant API key -> tenant/secrets entries (seconds). "
+            "Rotation is pushed over LISTEN/NOTIFY; the TTL only bounds staleness if the listener is down."
+        ),
+    )
+    TENANT_API_KEY_CACHE_MAX_ENTRIES: int = Field(
+        4096,
+        description="Maximum entries for the tenant API key resolution cache.",
+    )
     WEBHOOK_AUTH_MAX_BODY_BYTES: int = Field(
         1_048_576,
         description="Maximum webhook request body size (bytes) allowed before auth signature verification.",
     )
+    WEBHOOK_BATCH_MAX_EVENTS: int = Field(
+        500,
+        description="Maximum events accepted per batched webhook request (/api/webhooks/{vendor}/batch).",
+    )
+    WEBHOOK_JSON_BACKEND: str = Field(
+        "json",
+        description=(
+            "JSON codec for the webhook parse-once pipeline: 'json' (stdlib) or 'orjson' "
+            "(optional dependency; falls back to stdlib when not installed)."
+        ),
+    )
     # JWT Authentication (Phase 1)
     AUTH_JWT_SECRET: Optional[str] = Field(
         None,
@@ -174,6 +207,37 @@ class Settings(BaseSettings):
         False,
         description="Enable synchronous scheduling of downstream ingestion follow-up tasks from webhook requests.",
     )
+    INGESTION_INSERT_FAST_PATH_ENABLED: bool = Field(
+        False,
+        description=(
+            "Ingest single events with one INSERT ... ON CONFLICT DO NOTHING RETURNING round trip; "
+            "the existing row is fetched only when the key already exists."
+        ),
+    )
+    INGESTION_GROUP_COMMIT_ENABLED: bool = Field(
+        False,
+        description=(
+            "Route single-event webhook ingestion through the in-process group-commit buffer "
+            "(app.ingestion.group_commit) so concurrent requests share one transaction per flush."
+        ),
+    )
+    INGESTION_GROUP_COMMIT_MAX_EVENTS: int = Field(
+        256,
+        description="Flush the group-commit buffer once this many events are pending.",
+    )
+    INGESTION_GROUP_COMMIT_FLUSH_INTERVAL_MS: int = Field(
+        5,
+        description="Maximum time (ms) a buffered event waits before the group-commit buffer flushes.",
+    )
+    ATTRIBUTION_RECOMPUTE_COALESCE_INTERVAL_SECONDS: int = Field(
+        60,
+        description=(
+            "Minimum spacing between post-ingestion recompute dispatches for the same "
+            "(tenant, window, model_version). Events inside the interval only mark the window "
+            "dirty; app.tasks.attribution.flush_recompute_windows dispatches it once the interval "
+            "has elapsed. 0 dispatches one recompute per ingested event."
+        ),
+    )
 
     # Celery (Postgres-only broker/result backend)
     CELERY_BROKER_URL: Optional[str] = Field(
@@ -301,11 +365,18 @@ class Settings(BaseSettings):
             raise ValueError("DATABASE_POOL_SIZE must be >= 1")
         return value
 
-    @field_validator("DATABASE_POOL_TIMEOUT_SECONDS")
+    @field_validator("DATABASE_POOL_TIMEOUT_SECONDS", "SYNC_DATABASE_POOL_TIMEOUT_SECONDS")
     @classmethod
-    def validate_pool_timeout(cls, value: float) -> float:
+    def validate_pool_timeout(cls, value: float, info) -> float:
         if value <= 0:
-            raise ValueError("DATABASE_POOL_TIMEOUT_SECONDS must be > 0")
+            raise ValueError(f"{info.field_name} must be > 0")
+        return value
+
+    @field_validator("SYNC_DATABASE_POOL_SIZE")
+    @classmethod
+    def validate_sync_pool_size(cls, value: int) -> int:
+        if value < 1:
+            raise ValueError("SYNC_DATABASE_POOL_SIZE must be >= 1")
         return value
 
     @field_validator("TENANT_API_KEY_HEADER")
@@ -318,10 +389,23 @@ class Settings(BaseSettings):
             raise ValueError("TENANT_API_KEY_HEADER cannot be empty")
         return value.strip()
 
+    @field_validator("WEBHOOK_JSON_BACKEND")
+    @classmethod
+    def validate_webhook_json_backend(cls, value: str) -> str:
+        normalized = (value or "").strip().lower()
+        if normalized not in {"json", "orjson"}:
+            raise ValueError("WEBHOOK_JSON_BACKEND must be 'json' or 'orjson'")
+        return normalized
+
     @field_validator(
         "TENANT_SECRETS_CACHE_TTL_SECONDS",
         "TENANT_SECRETS_CACHE_MAX_ENTRIES",
+        "TENANT_API_KEY_CACHE_TTL_SECONDS",
+        "TENANT_API_KEY_CACHE_MAX_ENTRIES",
         "WEBHOOK_AUTH_MAX_BODY_BYTES",
+        "WEBHOOK_BATCH_MAX_EVENTS",
+        "INGESTION_GROUP_COMMIT_MAX_EVENTS",
+        "INGESTION_GROUP_COMMIT_FLUSH_INTERVAL_MS",
     )
     @classmethod
     def validate_tenant_secret_cache_settings(cls, value: int, info) -> int:
@@ -329,6 +413,13 @@ class Settings(BaseSettings):
             raise ValueError(f"{info.field_name} must be >= 1")
         return value
 
+    @field_validator("ATTRIBUTION_RECOMPUTE_COALESCE_INTERVAL_SECONDS")
+    @classmethod
+    def validate_recompute_coalesce_interval(cls, value: int) -> int:
+        if value < 0:
+            raise ValueError("ATTRIBUTION_RECOMPUTE_COALESCE_INTERVAL_SECONDS must be >= 0")
+        return value
+
     @field_validator(
         "AUTH_JWT_SECRET",
         "AUTH_JWT_PUBLIC_KEY_RING",
@@ -96,6 +96,22 @@ MANAGED_SETTINGS_CONTRACT: dict[str, ManagedSettingContract] = {
         owner="backend-platform",
         call_sites=("backend/app/db/session.py",),
     ),
+    "SYNC_DATABASE_POOL_SIZE": _contract(
+        key="SYNC_DATABASE_POOL_SIZE",
+        classification="config",
+        aws_path_template="/skeldir/{env}/config/database/sync-pool-size",
+        rotation_criticality="none",
+        owner="backend-platform",
+        call_sites=("backend/app/db/sync_pool.py",),
+    ),
+    "SYNC_DATABASE_POOL_TIMEOUT_SECONDS": _contract(
+        key="SYNC_DATABASE_POOL_TIMEOUT_SECONDS",
+        classification="config",
+        aws_path_template="/skeldir/{env}/config/database/sync-pool-timeout-seconds",
+        rotation_criticality="none",
+        owner="backend-platform",
+        call_sites=("backend/app/db/sync_pool.py",),
+    ),
     "TENANT_API_KEY_HEADER": _contract(
         key="TENANT_API_KEY_HEADER",
         classification="config",
@@ -120,6 +136,22 @@ MANAGED_SETTINGS_CONTRACT: dict[str, ManagedSettingContract] = {
         owner="backend-platform",
         call_sites=("backend/app/core/config.py",),
     ),
+    "TENANT_API_KEY_CACHE_TTL_SECONDS": _contract(
+        key="TENANT_API_KEY_CACHE_TTL_SECONDS",
+        classification="config",
+        aws_path_template="/skeldir/{env}/config/tenant/api-key-cache-ttl-seconds",
+        rotation_criticality="none",
+        owner="backend-platform",
+        call_sites=("backend/app/security/tenant_key_runtime.py",),
+    ),
+    "TENANT_API_KEY_CACHE_MAX_ENTRIES": _contract(
+        key="TENANT_API_KEY_CACHE_MAX_ENTRIES",
+        classification="config",
+        aws_path_template="/skeldir/{env}/config/tenant/api-key-cache-max-entries",
+        rotation_criticality="none",
+        owner="backend-platform",
+        call_sites=("backend/app/security/tenant_key_runtime.py",),
+    ),
     "WEBHOOK_AUTH_MAX_BODY_BYTES": _contract(
         key="WEBHOOK_AUTH_MAX_BODY_BYTES",
         classification="config",
@@ -128,6 +160,22 @@ MANAGED_SETTINGS_CONTRACT: dict[str, ManagedSettingContract] = {
         owner="backend-platform",
         call_sites=("backend/app/api/webhooks.py", "backend/app/middleware/pii_stripping.py"),
     ),
+    "WEBHOOK_BATCH_MAX_EVENTS": _contract(
+        key="WEBHOOK_BATCH_MAX_EVENTS",
+        classification="config",
+        aws_path_template="/skeldir/{env}/config/webhooks/batch-max-events",
+        rotation_criticality="none",
+        owner="backend-platform",
+        call_sites=("backend/app/api/webhooks.py",),
+    ),
+    "WEBHOOK_JSON_BACKEND": _contract(
+        key="WEBHOOK_JSON_BACKEND",
+        classification="config",
+        aws_path_template="/skeldir/{env}/config/webhook/json-backend",
+        rotation_criticality="none",
+        owner="backend-platform",
+        call_sites=("backend/app/middleware/pii_stripping.py",),
+    ),
     "AUTH_JWT_SECRET": _contract(
         key="AUTH_JWT_SECRET",
         classification="secret",
@@ -328,6 +376,50 @@ MANAGED_SETTINGS_CONTRACT: dict[str, ManagedSettingContract] = {
         owner="backend-platform",
         call_sites=("backend/app/api/webhooks.py",),
     ),
+    "INGESTION_INSERT_FAST_PATH_ENABLED": _contract(
+        key="INGESTION_INSERT_FAST_PATH_ENABLED",
+        classification="config",
+        aws_path_template="/skeldir/{env}/config/ingestion/insert-fast-path-enabled",
+        rotation_criticality="none",
+        owner="backend-platform",
+        call_sites=("backend/app/ingestion/event_service.py",),
+    ),
+    "INGESTION_GROUP_COMMIT_ENABLED": _contract(
+        key="INGESTION_GROUP_COMMIT_ENABLED",
+        classification="config",
+        aws_path_template="/skeldir/{env}/config/ingestion/group-commit-enabled",
+        rotation_criticality="none",
+        owner="backend-platform",
+        call_sites=("backend/app/api/webhooks.py",),
+    ),
+    "INGESTION_GROUP_COMMIT_MAX_EVENTS": _contract(
+        key="INGESTION_GROUP_COMMIT_MAX_EVENTS",
+        classification="config",
+        aws_path_template="/skeldir/{env}/config/ingestion/group-commit-max-events",
+        rotation_criticality="none",
+        owner="backend-platform",
+        call_sites=("backend/app/ingestion/group_commit.py",),
+    ),
+    "INGESTION_GROUP_COMMIT_FLUSH_INTERVAL_MS": _contract(
+        key="INGESTION_GROUP_COMMIT_FLUSH_INTERVAL_MS",
+        classification="config",
+        aws_path_template="/skeldir/{env}/config/ingestion/group-commit-flush-interval-ms",
+        rotation_criticality="none",
+        owner="backend-platform",
+        call_sites=("backend/app/ingestion/group_commit.py",),
+    ),
+    "ATTRIBUTION_RECOMPUTE_COALESCE_INTERVAL_SECONDS": _contract(
+        key="ATTRIBUTION_RECOMPUTE_COALESCE_INTERVAL_SECONDS",
+        classification="config",
+        aws_path_template="/skeldir/{env}/config/attribution/recompute-coalesce-interval-seconds",
+        rotation_criticality="none",
+        owner="backend-platform",
+        call_sites=(
+            "backend/app/api/webhooks.py",
+            "backend/app/tasks/attribution.py",
+            "backend/app/tasks/beat_schedule.py",
+        ),
+    ),
     "CELERY_BROKER_URL": _contract(
         key="CELERY_BROKER_URL",
         classification="secret",
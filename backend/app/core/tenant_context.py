@@ -23,7 +23,14 @@ from sqlalchemy import text
 
 from app.db.session import engine
 from app.security.auth import unauthorized_auth_error
-from app.services.tenant_webhook_secrets import resolve_tenant_webhook_secrets_from_row
+from app.security.tenant_key_runtime import (
+    CachedTenantKeyResolution,
+    get_tenant_api_key_runtime_cache,
+)
+from app.services.tenant_webhook_secrets import (
+    get_cached_tenant_webhook_secrets,
+    resolve_tenant_webhook_secrets_from_row,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -46,11 +53,25 @@ async def get_tenant_with_webhook_secrets(api_key: str) -> dict:
 
     Raises:
         AuthError(401): if the key is missing/unknown
+
+    Known keys resolve to (tenant_id, version token) from the process-local
+    TenantApiKeyRuntimeCache and their secrets from the tenant webhook secret
+    cache at that version (no DB round trip); rotation of a tenant's key or
+    secrets evicts the entry via LISTEN/NOTIFY. Unknown keys are never cached.
     """
     if not api_key or not api_key.strip():
         raise unauthorized_auth_error()
 
     api_key_hash = hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+    key_cache = get_tenant_api_key_runtime_cache()
+    key_cache.ensure_started()
+    cached = key_cache.get(api_key_hash)
+    if cached is not None:
+        secrets = get_cached_tenant_webhook_secrets(cached.tenant_id, cached.version_token)
+        if secrets is not None:
+            return {"tenant_id": cached.tenant_id, **secrets}
+
+    generation = key_cache.generation()
     async with engine.connect() as conn:
         res = await conn.execute(
             text(
@@ -73,6 +94,15 @@ async def get_tenant_with_webhook_secrets(api_key: str) -> dict:
             row=dict(row),
         )
 
+    version_token = row.get("tenant_updated_at")
+    key_cache.put(
+        api_key_hash,
+        CachedTenantKeyResolution(
+            tenant_id=tenant_id,
+            version_token=str(version_token) if version_token is not None else None,
+        ),
+        generation=generation,
+    )
     return {"tenant_id": tenant_id, **decrypted}
 
 
@@ -11,7 +11,7 @@ from __future__ import annotations
 import os
 import ssl
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Iterator, Sequence
 from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 from uuid import UUID
 
@@ -32,6 +32,9 @@ from app.core.identity import resolve_user_id
 from app.core.secrets import get_database_url
 from app.observability.context import get_tenant_id, get_user_id
 
+# The PostgreSQL wire protocol (and asyncpg) caps one statement at this many bind parameters.
+MAX_BIND_PARAMS_PER_STATEMENT = 32767
+
 _SESSION_INFO_TENANT_ID = "_skeldir_tenant_id"
 _SESSION_INFO_USER_ID = "_skeldir_user_id"
 
@@ -163,6 +166,18 @@ async def get_session(
             raise
 
 
+def multi_row_slices(rows: Sequence[dict]) -> Iterator[Sequence[dict]]:
+    """
+    Split the rows of a multi-row INSERT ... VALUES (one bind parameter per
+    column per row) into slices that each fit in one statement.
+    """
+    if not rows:
+        return
+    rows_per_statement = max(1, MAX_BIND_PARAMS_PER_STATEMENT // len(rows[0]))
+    for start in range(0, len(rows), rows_per_statement):
+        yield rows[start : start + rows_per_statement]
+
+
 async def validate_database_connection() -> None:
     """
     Execute a lightweight connectivity check against the database.
@@ -0,0 +1,164 @@
+"""
+Per-process bounded psycopg2 connection pools for sync database paths.
+
+Worker code that cannot use the async engine (matview refreshes, the refresh
+scheduler, the DLQ writer in the task_failure handler, sync probes) borrows
+connections here instead of opening one per call:
+
+    with sync_connection(dsn) as conn:
+        ...
+        conn.commit()
+
+One pool exists per DSN per process, holding at most
+SYNC_DATABASE_POOL_SIZE connections; a borrower waits up to
+SYNC_DATABASE_POOL_TIMEOUT_SECONDS for a free one and then raises
+SyncPoolTimeout. Connections are pinged on checkout (SELECT 1, like the async
+engine's pool_pre_ping) and replaced when dead. On return they are reset
+(rollback, RESET ALL, default session authorization and autocommit), so
+transaction state and set_config GUCs never leak into the next borrower.
+
+Pools are not shared across fork: a child process drops the inherited pools
+without closing their sockets (they belong to the parent) and builds its own.
+Long-lived LISTEN connections are not pooled.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+import psycopg2
+import psycopg2.extensions
+
+logger = logging.getLogger(__name__)
+
+
+class SyncPoolTimeout(RuntimeError):
+    pass
+
+
+class SyncConnectionPool:
+    def __init__(self, dsn: str, *, max_size: int, timeout_seconds: float) -> None:
+        self._dsn = dsn
+        self._timeout_seconds = timeout_seconds
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._idle: list[psycopg2.extensions.connection] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @contextmanager
+    def connection(self) -> Iterator[psycopg2.extensions.connection]:
+        if not self._slots.acquire(timeout=self._timeout_seconds):
+            raise SyncPoolTimeout(f"No pooled connection available within {self._timeout_seconds}s")
+        conn = None
+        try:
+            conn = self._checkout()
+            yield conn
+        finally:
+            if conn is not None:
+                self._checkin(conn)
+            self._slots.release()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            _close_quietly(conn)
+
+    def idle_count(self) -> int:
+        with self._lock:
+            return len(self._idle)
+
+    def _checkout(self) -> psycopg2.extensions.connection:
+        while True:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                return psycopg2.connect(self._dsn)
+            if _is_alive(conn):
+                return conn
+            _close_quietly(conn)
+
+    def _checkin(self, conn: psycopg2.extensions.connection) -> None:
+        if not conn.closed:
+            try:
+                conn.reset()
+            except psycopg2.Error:
+                logger.warning("sync_pool_reset_failed", exc_info=True)
+        with self._lock:
+            if not conn.closed and not self._closed:
+                self._idle.append(conn)
+                return
+        _close_quietly(conn)
+
+
+def _is_alive(conn: psycopg2.extensions.connection) -> bool:
+    if conn.closed:
+        return False
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT 1")
+        conn.rollback()
+        return True
+    except psycopg2.Error:
+        return False
+
+
+def _close_quietly(conn: psycopg2.extensions.connection) -> None:
+    try:
+        conn.close()
+    except psycopg2.Error:
+        pass
+
+
+_POOLS: dict[str, SyncConnectionPool] = {}
+_POOLS_PID = os.getpid()
+_POOLS_LOCK = threading.Lock()
+
+
+def get_sync_pool(dsn: str) -> SyncConnectionPool:
+    """
+    Return this process's pool for dsn, creating it on first use.
+    """
+    global _POOLS, _POOLS_PID
+    with _POOLS_LOCK:
+        if _POOLS_PID != os.getpid():
+            # Forked: the inherited connections are the parent's; forget them unclosed.
+            _POOLS = {}
+            _POOLS_PID = os.getpid()
+        pool = _POOLS.get(dsn)
+        if pool is None:
+            from app.core.config import settings
+
+            pool = SyncConnectionPool(
+                dsn,
+                max_size=settings.SYNC_DATABASE_POOL_SIZE,
+                timeout_seconds=settings.SYNC_DATABASE_POOL_TIMEOUT_SECONDS,
+            )
+            _POOLS[dsn] = pool
+        return pool
+
+
+@contextmanager
+def sync_connection(dsn: str) -> Iterator[psycopg2.extensions.connection]:
+    """
+    Borrow a pooled connection for dsn; it is reset and returned on exit.
+
+    Callers commit explicitly and must not close the connection.
+    """
+    with get_sync_pool(dsn).connection() as conn:
+        yield conn
+
+
+def close_sync_pools() -> None:
+    """
+    Close this process's idle pooled connections (worker process shutdown).
+    """
+    global _POOLS
+    with _POOLS_LOCK:
+        pools, _POOLS = (_POOLS if _POOLS_PID == os.getpid() else {}), {}
+    for pool in pools.values():
+        pool.close()
@@ -0,0 +1,545 @@
+"""
+COPY-based historical backfill importer for attribution_events.
+
+Streams an NDJSON or CSV export (one canonical event per record, carrying its
+own ``idempotency_key``) into Postgres in chunks. Each chunk:
+
+1. runs the ingestion validation/normalization/minimization steps
+   (EventIngestionService._validate_schema, normalize_many, and
+   EventIngestionService._event_values, which minimizes the payload) over the
+   whole chunk, memoizing channel normalization per (utm_source, utm_medium,
+   vendor); NDJSON lines that are not JSON objects are rejected like invalid
+   records;
+2. binary-COPYs the prepared rows into a transaction-scoped temp staging table
+   via asyncpg ``copy_records_to_table``;
+3. merges staging into attribution_events with
+   ``INSERT ... SELECT ... ON CONFLICT (tenant_id, idempotency_key) DO NOTHING``;
+4. routes rejected records to dead_events, PII keys stripped (backfill does
+   not pass through PIIStrippingMiddleware, and only accepted rows are
+   minimized);
+5. advances the event_backfill_jobs checkpoint.
+
+All five steps share one transaction, so the checkpoint (rows_processed) never
+disagrees with what was merged. The checkpoint only advances from the offset
+the chunk was read at, so two concurrent runs of one job cannot both commit a
+chunk. A re-run of the same (tenant, source_uri) resumes after the last
+committed chunk; completed jobs are a no-op. With max_seconds, a run stops
+after the chunk that exhausts its budget and reports status 'running'.
+
+Run from a Celery worker (worker_context=True), every transaction is marked
+app.execution_context = 'worker' like other worker writes, plus the
+app.worker_ingestion_grant = 'event_backfill' grant: the only exemption from
+the B0.5.3.5 worker ingestion guard, and it covers INSERTs only.
+
+CLI (from backend/):
+    python -m app.ingestion.backfill --tenant-id <uuid> --source shopify exports/orders.ndjson
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, Optional, Sequence, Union
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.ingestion.channel_normalization import normalize_many
+from app.ingestion.dlq_handler import DLQHandler
+from app.ingestion.event_service import (
+    _IDEMPOTENCY_UNIQUE_CONSTRAINT,
+    EventIngestionService,
+    ValidationError,
+)
+from app.middleware.pii_stripping import PIIScanLimitExceeded, redact_pii_keys
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_FORMATS = ("ndjson", "csv")
+DEFAULT_CHUNK_SIZE = 10_000
+_DLQ_SLICE_SIZE = 1_000
+_STAGING_TABLE = "event_backfill_staging"
+_STAGING_COLUMNS = (
+    "id",
+    "tenant_id",
+    "idempotency_key",
+    "channel",
+    "event_type",
+    "event_timestamp",
+    "occurred_at",
+    "session_id",
+    "revenue_cents",
+    "currency",
+    "raw_payload",
+    "correlation_id",
+    "external_event_id",
+    "campaign_id",
+    "conversion_value_cents",
+    "processing_status",
+    "retry_count",
+    "created_at",
+    "updated_at",
+)
+_FORMAT_BY_SUFFIX = {".ndjson": "ndjson", ".jsonl": "ndjson", ".csv": "csv"}
+# Characters of an unparseable NDJSON line kept in its dead_events payload.
+_MALFORMED_LINE_MAX_CHARS = 1_000
+# Value of app.worker_ingestion_grant that lets fn_block_worker_ingestion_mutation
+# accept this importer's INSERTs in worker context.
+WORKER_INGESTION_GRANT = "event_backfill"
+
+
+class BackfillCheckpointConflict(RuntimeError):
+    """Another run advanced the job's checkpoint; this run's chunk was rolled back."""
+
+
+@dataclass(frozen=True)
+class MalformedRecord:
+    """An export line that is not a JSON object; it is rejected, not imported."""
+
+    line_number: int
+    line: str
+    error: str
+
+
+def detect_source_format(path: Path) -> str:
+    """Infer the export format from the file suffix."""
+    source_format = _FORMAT_BY_SUFFIX.get(path.suffix.lower())
+    if source_format is None:
+        raise ValueError(f"cannot infer backfill format from {path.name!r}; pass source_format explicitly")
+    return source_format
+
+
+def iter_export_records(path: Path, source_format: str) -> Iterator[Union[dict, MalformedRecord]]:
+    """
+    Stream records from an export file without loading it into memory.
+
+    CSV cells that are empty are dropped so optional fields behave as absent,
+    matching the NDJSON/webhook shape. An NDJSON line that does not decode to
+    an object is yielded as a MalformedRecord, so it still takes its place in
+    the checkpoint count and a resume never re-reads it.
+    """
+    if source_format not in BACKFILL_FORMATS:
+        raise ValueError(f"unsupported backfill format: {source_format}")
+    with path.open("r", encoding="utf-8", newline="") as handle:
+        if source_format == "ndjson":
+            for line_number, line in enumerate(handle, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as exc:
+                    yield MalformedRecord(line_number, line, f"invalid JSON: {exc}")
+                    continue
+                if isinstance(record, dict):
+                    yield record
+                else:
+                    yield MalformedRecord(line_number, line, f"expected a JSON object, got {type(record).__name__}")
+        else:
+            for row in csv.DictReader(handle):
+                yield {key: value for key, value in row.items() if key and value not in (None, "")}
+
+
+def _chunked(records: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _optional_text(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def _dlq_payload(record: dict) -> dict:
+    """A rejected record with PII keys stripped, as dead_events' guardrail requires."""
+    try:
+        payload, _ = redact_pii_keys(record)
+    except PIIScanLimitExceeded:
+        # Too deep or large to scan: keep the top-level scalars only.
+        payload, _ = redact_pii_keys(
+            {key: value for key, value in record.items() if not isinstance(value, (dict, list))}
+        )
+    return payload
+
+
+def prepare_backfill_chunk(
+    service: EventIngestionService,
+    *,
+    tenant_id: UUID,
+    records: Sequence[Union[dict, MalformedRecord]],
+    source: str,
+    now: datetime,
+    channel_memo: Dict[tuple, str],
+) -> tuple[list[tuple], list[tuple[dict, Exception, Optional[str]]]]:
+    """
+    Turn a chunk of export records into staging tuples plus DLQ entries.
+
+    Column values come from EventIngestionService._event_values, as on the
+    live ingestion path, in _STAGING_COLUMNS order.
+    """
+    accepted: list[tuple[dict, dict, Optional[int], tuple]] = []
+    rejected: list[tuple[dict, Exception, Optional[str]]] = []
+    for record in records:
+        if isinstance(record, MalformedRecord):
+            payload = {"line_number": record.line_number, "raw_line": record.line[:_MALFORMED_LINE_MAX_CHARS]}
+            error = ValidationError(f"Malformed export line {record.line_number}: {record.error}")
+            rejected.append((_dlq_payload(payload), error, None))
+            continue
+        idempotency_key = record.get("idempotency_key")
+        try:
+            if not idempotency_key:
+                raise ValidationError("Missing required field: idempotency_key")
+            validated = service._validate_schema(record)
+            conversion_value_cents = record.get("conversion_value_cents")
+            if conversion_value_cents is not None:
+                try:
+                    conversion_value_cents = int(conversion_value_cents)
+                except (ValueError, TypeError) as exc:
+                    raise ValidationError(f"Invalid conversion_value_cents: {exc}")
+        except ValidationError as exc:
+            rejected.append((_dlq_payload(record), exc, record.get("correlation_id")))
+            continue
+        channel_key = (record.get("utm_source"), record.get("utm_medium"), record.get("vendor", source))
+        accepted.append((record, validated, conversion_value_cents, channel_key))
+
+    # One batch normalization for the triples this job has not seen yet.
+    new_keys = list(dict.fromkeys(key for *_, key in accepted if key not in channel_memo))
+    if new_keys:
+        channel_memo.update(zip(new_keys, normalize_many(new_keys, tenant_id=str(tenant_id))))
+
+    rows: list[tuple] = []
+    for record, validated, conversion_value_cents, channel_key in accepted:
+        values = service._event_values(
+            tenant_id=tenant_id,
+            event_data=record,
+            validated=validated,
+            channel_code=channel_memo[channel_key],
+            idempotency_key=str(record["idempotency_key"]),
+            now=now,
+        )
+        # COPY sends binary values, so each must already have its column's type
+        # (CSV cells arrive as strings).
+        values.update(
+            raw_payload=json.dumps(values["raw_payload"], default=str),
+            external_event_id=_optional_text(values["external_event_id"]),
+            campaign_id=_optional_text(values["campaign_id"]),
+            conversion_value_cents=conversion_value_cents,
+        )
+        rows.append(tuple(values[column] for column in _STAGING_COLUMNS))
+    return rows, rejected
+
+
+@asynccontextmanager
+async def _import_session(tenant_id: UUID, *, worker_context: bool) -> AsyncIterator[AsyncSession]:
+    from app.db.session import get_session
+
+    async with get_session(tenant_id=tenant_id) as session:
+        if worker_context:
+            await session.execute(
+                text(
+                    "SELECT set_config('app.execution_context', 'worker', true), "
+                    "set_config('app.worker_ingestion_grant', :grant, true)"
+                ),
+                {"grant": WORKER_INGESTION_GRANT},
+            )
+        yield session
+
+
+async def _claim_job(
+    tenant_id: UUID, source: str, source_uri: str, source_format: str, *, worker_context: bool
+) -> Dict[str, Any]:
+    async with _import_session(tenant_id, worker_context=worker_context) as session:
+        row = (
+            await session.execute(
+                text(
+                    """
+                    INSERT INTO event_backfill_jobs (tenant_id, source, source_uri, source_format, status)
+                    VALUES (:tenant_id, :source, :source_uri, :source_format, 'running')
+                    ON CONFLICT (tenant_id, source_uri) DO UPDATE
+                    SET status = CASE
+                            WHEN event_backfill_jobs.status = 'completed' THEN 'completed'
+                            ELSE 'running'
+                        END,
+                        last_error = NULL,
+                        updated_at = now()
+                    RETURNING id, status, rows_processed, rows_inserted, rows_duplicate, rows_rejected
+                    """
+                ),
+                {
+                    "tenant_id": str(tenant_id),
+                    "source": source,
+                    "source_uri": source_uri,
+                    "source_format": source_format,
+                },
+            )
+        ).mappings().one()
+    return dict(row)
+
+
+async def _finish_job(
+    tenant_id: UUID, job_id: UUID, *, status: str, worker_context: bool, error: Optional[str] = None
+) -> None:
+    async with _import_session(tenant_id, worker_context=worker_context) as session:
+        await session.execute(
+            text(
+                """
+                UPDATE event_backfill_jobs
+                SET status = :status,
+                    last_error = :error,
+                    updated_at = now(),
+                    completed_at = CASE WHEN :status = 'completed' THEN now() ELSE completed_at END
+                WHERE id = :job_id
+                """
+            ),
+            {"status": status, "error": error, "job_id": str(job_id)},
+        )
+
+
+async def _merge_chunk(
+    session: AsyncSession,
+    *,
+    tenant_id: UUID,
+    job_id: UUID,
+    rows: list[tuple],
+    rejected: list[tuple[dict, Exception, Optional[str]]],
+    records_consumed: int,
+    checkpoint: int,
+    source: str,
+) -> tuple[int, int]:
+    """COPY rows into staging, merge, DLQ rejects, and checkpoint; returns (inserted, duplicate)."""
+    inserted = 0
+    if rows:
+        await session.execute(
+            text(
+                f"CREATE TEMP TABLE {_STAGING_TABLE} "
+                "(LIKE public.attribution_events) ON COMMIT DROP"
+            )
+        )
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            _STAGING_TABLE, records=rows, columns=_STAGING_COLUMNS
+        )
+        column_list = ", ".join(_STAGING_COLUMNS)
+        # The anti-join keeps already-imported keys away from the per-row
+        # BEFORE INSERT guard triggers (they fire even for conflicting rows);
+        # ON CONFLICT still covers in-chunk repeats and concurrent writers.
+        result = await session.execute(
+            text(
+                f"INSERT INTO attribution_events ({column_list}) "
+                f"SELECT {column_list} FROM {_STAGING_TABLE} s "
+                "WHERE NOT EXISTS ("
+                "SELECT 1 FROM attribution_events e "
+                "WHERE e.tenant_id = s.tenant_id AND e.idempotency_key = s.idempotency_key"
+                ") "
+                f"ON CONFLICT ON CONSTRAINT {_IDEMPOTENCY_UNIQUE_CONSTRAINT} DO NOTHING"
+            )
+        )
+        inserted = result.rowcount or 0
+
+    dlq_handler = DLQHandler()
+    for start in range(0, len(rejected), _DLQ_SLICE_SIZE):
+        await dlq_handler.route_many_to_dlq(
+            session, tenant_id, rejected[start : start + _DLQ_SLICE_SIZE], source=source
+        )
+
+    duplicate = len(rows) - inserted
+    advanced = await session.execute(
+        text(
+            """
+            UPDATE event_backfill_jobs
+            SET rows_processed = rows_processed + :consumed,
+                rows_inserted = rows_inserted + :inserted,
+                rows_duplicate = rows_duplicate + :duplicate,
+                rows_rejected = rows_rejected + :rejected,
+                updated_at = now()
+            WHERE id = :job_id AND rows_processed = :checkpoint
+            """
+        ),
+        {
+            "checkpoint": checkpoint,
+            "consumed": records_consumed,
+            "inserted": inserted,
+            "duplicate": duplicate,
+            "rejected": len(rejected),
+            "job_id": str(job_id),
+        },
+    )
+    if advanced.rowcount != 1:
+        raise BackfillCheckpointConflict(f"event backfill job {job_id} moved past row {checkpoint}")
+    return inserted, duplicate
+
+
+async def run_event_backfill(
+    tenant_id: UUID,
+    path: Path | str,
+    source: str,
+    source_format: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    max_seconds: Optional[float] = None,
+    worker_context: bool = False,
+) -> Dict[str, Any]:
+    """
+    Import (or resume importing) an export file for one tenant.
+
+    Returns a summary dict with the job id, status ('completed', or 'running'
+    when max_seconds ran out first), cumulative counters, and throughput for
+    the records processed in this run.
+
+    Raises BackfillCheckpointConflict (leaving the job to the other run) when
+    another run of the same job committed a chunk first.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1")
+    path = Path(path)
+    source_format = source_format or detect_source_format(path)
+    source_uri = str(path.resolve())
+
+    job = await _claim_job(tenant_id, source, source_uri, source_format, worker_context=worker_context)
+    job_id = job["id"]
+    totals = {
+        "rows_processed": job["rows_processed"],
+        "rows_inserted": job["rows_inserted"],
+        "rows_duplicate": job["rows_duplicate"],
+        "rows_rejected": job["rows_rejected"],
+    }
+    summary: Dict[str, Any] = {"job_id": str(job_id), "tenant_id": str(tenant_id), "source_uri": source_uri}
+    if job["status"] == "completed":
+        return {**summary, "status": "completed", **totals, "rows_this_run": 0, "events_per_second": 0.0}
+
+    resume_offset = job["rows_processed"]
+    service = EventIngestionService()
+    channel_memo: Dict[tuple, str] = {}
+    chunks = _chunked(islice(iter_export_records(path, source_format), resume_offset, None), chunk_size)
+
+    def _prepare_next() -> Optional[tuple[int, list[tuple], list[tuple[dict, Exception, Optional[str]]]]]:
+        chunk = next(chunks, None)
+        if chunk is None:
+            return None
+        rows, rejected = prepare_backfill_chunk(
+            service,
+            tenant_id=tenant_id,
+            records=chunk,
+            source=source,
+            now=datetime.now(timezone.utc),
+            channel_memo=channel_memo,
+        )
+        return len(chunk), rows, rejected
+
+    rows_this_run = 0
+    started = time.perf_counter()
+    status = "completed"
+    try:
+        # Parsing/validation of chunk N+1 runs in a worker thread while chunk N
+        # is COPYed and merged, so CPU and database time overlap.
+        prepared = await asyncio.to_thread(_prepare_next)
+        while prepared is not None:
+            next_prepared = asyncio.ensure_future(asyncio.to_thread(_prepare_next))
+            consumed, rows, rejected = prepared
+            try:
+                async with _import_session(tenant_id, worker_context=worker_context) as session:
+                    inserted, duplicate = await _merge_chunk(
+                        session,
+                        tenant_id=tenant_id,
+                        job_id=job_id,
+                        rows=rows,
+                        rejected=rejected,
+                        records_consumed=consumed,
+                        checkpoint=totals["rows_processed"],
+                        source=source,
+                    )
+            except BaseException:
+                await asyncio.gather(next_prepared, return_exceptions=True)
+                raise
+            rows_this_run += consumed
+            totals["rows_processed"] += consumed
+            totals["rows_inserted"] += inserted
+            totals["rows_duplicate"] += duplicate
+            totals["rows_rejected"] += len(rejected)
+            if on_progress is not None:
+                on_progress({**summary, **totals})
+            prepared = await next_prepared
+            if prepared is not None and max_seconds is not None and time.perf_counter() - started >= max_seconds:
+                # The prefetched chunk is dropped; the next run re-reads it from the checkpoint.
+                status = "running"
+                break
+    except BackfillCheckpointConflict:
+        logger.warning(
+            "event_backfill_checkpoint_conflict",
+            extra={"event": "event_backfill_checkpoint_conflict", **summary, **totals},
+        )
+        raise
+    except Exception as exc:
+        await _finish_job(
+            tenant_id, job_id, status="failed", worker_context=worker_context, error=str(exc)[:500]
+        )
+        logger.error(
+            "event_backfill_failed",
+            exc_info=True,
+            extra={"event": "event_backfill_failed", **summary, **totals},
+        )
+        raise
+
+    if status == "completed":
+        await _finish_job(tenant_id, job_id, status="completed", worker_context=worker_context)
+    elapsed = time.perf_counter() - started
+    result = {
+        **summary,
+        "status": status,
+        **totals,
+        "resumed_from": resume_offset,
+        "rows_this_run": rows_this_run,
+        "elapsed_seconds": round(elapsed, 3),
+        "events_per_second": round(rows_this_run / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+    event = "event_backfill_completed" if status == "completed" else "event_backfill_slice_completed"
+    logger.info(event, extra={"event": event, **result})
+    return result
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Import a historical event export into attribution_events.")
+    parser.add_argument("path", type=Path, help="NDJSON (.ndjson/.jsonl) or CSV export file")
+    parser.add_argument("--tenant-id", type=UUID, required=True)
+    parser.add_argument("--source", required=True, help="Source/vendor identifier, e.g. shopify or stripe")
+    parser.add_argument("--format", dest="source_format", choices=BACKFILL_FORMATS, default=None)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    def _print_progress(progress: Dict[str, Any]) -> None:
+        print(
+            f"processed={progress['rows_processed']} inserted={progress['rows_inserted']} "
+            f"duplicate={progress['rows_duplicate']} rejected={progress['rows_rejected']}",
+            flush=True,
+        )
+
+    result = asyncio.run(
+        run_event_backfill(
+            tenant_id=args.tenant_id,
+            path=args.path,
+            source=args.source,
+            source_format=args.source_format,
+            chunk_size=args.chunk_size,
+            on_progress=_print_progress,
+        )
+    )
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -13,19 +13,53 @@ Related Documents:
 - B0.3-P_CHANNEL_GOVERNANCE_REMEDIATION.md (Implementation evidence)
 """
 
+import functools
 import logging
 import os
+import select
+import threading
+import time
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
 
+import psycopg2
 import yaml
 
+from app.core.secrets import get_database_url
+from app.security.revocation_runtime import _to_sync_dsn
+
 # Configure structured logging
 logger = logging.getLogger(__name__)
 
-# Cache for channel mapping and taxonomy codes
+CHANNEL_TAXONOMY_NOTIFY_CHANNEL = "skeldir_channel_taxonomy_changed"
+
+_DISABLE_EVENT_LISTENER = "SKELDIR_CHANNEL_TAXONOMY_DISABLE_EVENT_LISTENER"
+_DEFAULT_POLL_TIMEOUT_SECONDS = 1.0
+# With the event listener disabled, the background thread re-reads the table this often.
+_UNSUBSCRIBED_RELOAD_SECONDS = 60.0
+_CONNECT_TIMEOUT_SECONDS = 2
+_RESOLVER_MEMO_SIZE = 4096
+
+# Last-resort code set when channel_taxonomy cannot be read
+# (current taxonomy state, post-migration 202511161120: 9 original + 'unknown').
+_FALLBACK_TAXONOMY_CODES: FrozenSet[str] = frozenset({
+    'unknown',            # Fallback for unmapped channels
+    'direct',            # Direct traffic
+    'email',             # Email campaigns
+    'facebook_brand',    # Facebook brand awareness
+    'facebook_paid',     # Facebook paid ads
+    'google_display_paid',  # Google Display Network
+    'google_search_paid',   # Google Search Ads
+    'organic',           # Organic search/social
+    'referral',          # Referral traffic
+    'tiktok_paid',       # TikTok paid ads
+})
+
+_ACTIVE_TAXONOMY_CODES_SQL = "SELECT code FROM channel_taxonomy WHERE is_active"
+
+# Cache for channel mapping and its compiled resolver
 _CHANNEL_MAPPING: Optional[Dict] = None
-_VALID_TAXONOMY_CODES: Optional[set] = None
+_RESOLVER: Optional["ChannelResolver"] = None
 
 
 def load_channel_mapping() -> Dict:
@@ -67,41 +101,273 @@ def load_channel_mapping() -> Dict:
     return _CHANNEL_MAPPING
 
 
-def get_valid_taxonomy_codes() -> set:
+class ChannelResolver:
+    """
+    Compiled form of channel_mapping.yaml.
+
+    The per-vendor mappings are flattened once into a single
+    (vendor, indicator) -> code dict, and the full probe sequence for a
+    (vendor, utm_source, utm_medium) triple is memoized (LRU), so hot triples
+    resolve with one lookup. Resolution stops at the mapped code; taxonomy
+    validation happens per call so code-set changes apply immediately.
+    """
+
+    def __init__(self, mapping: Dict, *, memo_size: int = _RESOLVER_MEMO_SIZE) -> None:
+        self._vendors: FrozenSet[str] = frozenset(mapping)
+        self._codes: Dict[Tuple[str, str], str] = {
+            (vendor, indicator): code
+            for vendor, vendor_mapping in mapping.items()
+            for indicator, code in (vendor_mapping or {}).items()
+        }
+        self.resolve = functools.lru_cache(maxsize=memo_size)(self._resolve)
+
+    def has_vendor(self, vendor: str) -> bool:
+        return vendor in self._vendors
+
+    def _resolve(self, vendor: str, utm_source: str, utm_medium: str) -> Optional[str]:
+        """Mapped code for a known vendor, or None. Same probe order as the YAML contract."""
+        codes = self._codes
+        source_upper = utm_source.upper()
+        medium_upper = utm_medium.upper()
+        # Uppercase utm_source, then SOURCE_MEDIUM, then uppercase utm_medium
+        if utm_source:
+            code = codes.get((vendor, source_upper))
+            if code:
+                return code
+            if utm_medium:
+                code = codes.get((vendor, f"{source_upper}_{medium_upper}"))
+                if code:
+                    return code
+        if utm_medium:
+            code = codes.get((vendor, medium_upper))
+            if code:
+                return code
+        # Raw-case keys (some vendors use lowercase)
+        for key in (utm_source, utm_medium, f"{utm_source}_{utm_medium}"):
+            if key:
+                code = codes.get((vendor, key))
+                if code:
+                    return code
+        return None
+
+
+def get_channel_resolver() -> ChannelResolver:
+    """Compiled resolver for the loaded channel mapping (built on first use)."""
+    global _RESOLVER
+
+    resolver = _RESOLVER
+    if resolver is None:
+        resolver = ChannelResolver(load_channel_mapping())
+        _RESOLVER = resolver
+    return resolver
+
+
+class ChannelTaxonomyRuntime:
+    """
+    Process-local set of valid channel codes, read from channel_taxonomy.
+
+    Active codes are loaded by a background LISTEN/NOTIFY loop on subscribe and
+    re-loaded on every notification, so activating or deprecating a code takes
+    effect without a redeploy. With the event listener disabled, the background
+    thread polls the table instead. codes() never touches the database: it is
+    called from async ingestion, so until the first load (starting, or the table
+    is unreadable) it serves the built-in code set, and while reconnecting the
+    last-known set. 'unknown' is always valid because it is the normalization
+    fallback.
+    """
+
+    def __init__(self, *, runtime_name: str = "default") -> None:
+        self._runtime_name = runtime_name
+        self._lock = threading.Lock()
+        self._listener_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._listener_pid: Optional[int] = None
+        self._listening = False
+
+        self._codes: Optional[FrozenSet[str]] = None
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork_in_child)
+
+    def close(self) -> None:
+        self._stop_event.set()
+        listener = self._listener_thread
+        if listener and listener.is_alive():
+            listener.join(timeout=2.0)
+        with self._lock:
+            self._listening = False
+            self._listener_thread = None
+            self._listener_pid = None
+
+    def ensure_started(self) -> None:
+        current_pid = os.getpid()
+        if (
+            self._listener_thread
+            and self._listener_thread.is_alive()
+            and self._listener_pid == current_pid
+        ):
+            return
+        with self._lock:
+            if (
+                self._listener_thread
+                and self._listener_thread.is_alive()
+                and self._listener_pid == current_pid
+            ):
+                return
+            self._stop_event = threading.Event()
+            listen = os.getenv(_DISABLE_EVENT_LISTENER) != "1"
+            thread = threading.Thread(
+                target=self._listen_loop if listen else self._poll_loop,
+                args=(self._stop_event,),
+                name=f"channel-taxonomy-listener-{self._runtime_name}",
+                daemon=True,
+            )
+            thread.start()
+            self._listener_thread = thread
+            self._listener_pid = current_pid
+
+    def runtime_state(self) -> Dict[str, object]:
+        listener = self._listener_thread
+        codes = self._codes
+        return {
+            "runtime_name": self._runtime_name,
+            "process_pid": os.getpid(),
+            "listener_pid": self._listener_pid,
+            "listener_alive": bool(listener and listener.is_alive()),
+            "listening": self._listening,
+            "code_count": len(codes) if codes is not None else 0,
+        }
+
+    def codes(self) -> FrozenSet[str]:
+        self.ensure_started()
+        return self._current_codes()
+
+    def _current_codes(self) -> FrozenSet[str]:
+        codes = self._codes
+        return codes if codes is not None else _FALLBACK_TAXONOMY_CODES
+
+    def reload(self) -> FrozenSet[str]:
+        """
+        Re-read active codes now. If the read fails, the last-known set (or the
+        built-in set, before any successful load) stays in effect.
+
+        Blocking (connect + query): not for use on the ingestion path.
+        """
+        try:
+            conn = psycopg2.connect(
+                _to_sync_dsn(get_database_url()), connect_timeout=_CONNECT_TIMEOUT_SECONDS
+            )
+            try:
+                conn.set_session(autocommit=True)
+                codes = self._read_codes(conn.cursor())
+            finally:
+                conn.close()
+        except Exception as exc:
+            logger.warning(
+                "channel_taxonomy_load_failed",
+                extra={"runtime_name": self._runtime_name, "error": str(exc)},
+            )
+            return self._current_codes()
+        self._publish(codes)
+        return codes
+
+    @staticmethod
+    def _read_codes(cur) -> FrozenSet[str]:
+        cur.execute(_ACTIVE_TAXONOMY_CODES_SQL)
+        return frozenset(row[0] for row in cur.fetchall()) | {'unknown'}
+
+    def _publish(self, codes: FrozenSet[str]) -> None:
+        with self._lock:
+            changed = codes != self._codes
+            self._codes = codes
+        if changed:
+            logger.info(
+                "Loaded valid taxonomy codes",
+                extra={"taxonomy_code_count": len(codes), "runtime_name": self._runtime_name},
+            )
+
+    def _set_listening(self, stop_event: threading.Event, listening: bool) -> None:
+        with self._lock:
+            if stop_event is not self._stop_event:
+                # A superseded listener thread must not flip the current one's state.
+                return
+            self._listening = listening
+
+    def _poll_loop(self, stop_event: threading.Event) -> None:
+        while not stop_event.is_set():
+            self.reload()
+            stop_event.wait(_UNSUBSCRIBED_RELOAD_SECONDS)
+
+    def _listen_loop(self, stop_event: threading.Event) -> None:
+        dsn = _to_sync_dsn(get_database_url())
+        backoff_seconds = 0.5
+        while not stop_event.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(dsn, connect_timeout=_CONNECT_TIMEOUT_SECONDS)
+                conn.set_session(autocommit=True)
+                cur = conn.cursor()
+                cur.execute(f"LISTEN {CHANNEL_TAXONOMY_NOTIFY_CHANNEL};")
+                # Changes made while disconnected were not notified: re-read after LISTEN.
+                self._publish(self._read_codes(cur))
+                self._set_listening(stop_event, True)
+                logger.info(
+                    "channel_taxonomy_listener_started",
+                    extra={"runtime_name": self._runtime_name, "listener_pid": os.getpid()},
+                )
+                backoff_seconds = 0.5
+
+                while not stop_event.is_set():
+                    ready, _, _ = select.select([conn], [], [], _DEFAULT_POLL_TIMEOUT_SECONDS)
+                    if not ready:
+                        continue
+                    conn.poll()
+                    if conn.notifies:
+                        # Payload-free: one re-read covers any burst of changes.
+                        conn.notifies.clear()
+                        self._publish(self._read_codes(cur))
+            except Exception:
+                logger.exception(
+                    "channel_taxonomy_listener_error",
+                    extra={"runtime_name": self._runtime_name},
+                )
+                self._set_listening(stop_event, False)
+                time.sleep(backoff_seconds)
+                backoff_seconds = min(backoff_seconds * 2.0, 5.0)
+            finally:
+                try:
+                    if conn is not None:
+                        conn.close()
+                except Exception:
+                    pass
+        self._set_listening(stop_event, False)
+
+    def _after_fork_in_child(self) -> None:
+        # The child must never reuse the parent's listener thread.
+        self._lock = threading.Lock()
+        self._listener_thread = None
+        self._listener_pid = None
+        self._listening = False
+        self._stop_event = threading.Event()
+
+
+_DEFAULT_TAXONOMY_RUNTIME = ChannelTaxonomyRuntime()
+
+
+def get_channel_taxonomy_runtime() -> ChannelTaxonomyRuntime:
+    return _DEFAULT_TAXONOMY_RUNTIME
+
+
+def get_valid_taxonomy_codes() -> FrozenSet[str]:
     """
     Get the set of valid canonical channel codes from channel_taxonomy.
     
-    In production, this would query the database. For now, we hardcode the
-    canonical set based on current taxonomy state (post-migration 202511161120).
+    Returns the active codes held by the process-local taxonomy runtime, which
+    is refreshed on skeldir_channel_taxonomy_changed notifications.
     
     Returns:
         Set of valid channel taxonomy codes
     """
-    global _VALID_TAXONOMY_CODES
-    
-    if _VALID_TAXONOMY_CODES is not None:
-        return _VALID_TAXONOMY_CODES
-    
-    # Canonical codes from channel_taxonomy (9 original + 1 'unknown')
-    _VALID_TAXONOMY_CODES = {
-        'unknown',            # Fallback for unmapped channels
-        'direct',            # Direct traffic
-        'email',             # Email campaigns
-        'facebook_brand',    # Facebook brand awareness
-        'facebook_paid',     # Facebook paid ads
-        'google_display_paid',  # Google Display Network
-        'google_search_paid',   # Google Search Ads
-        'organic',           # Organic search/social
-        'referral',          # Referral traffic
-        'tiktok_paid',       # TikTok paid ads
-    }
-    
-    logger.info(
-        "Loaded valid taxonomy codes",
-        extra={"taxonomy_code_count": len(_VALID_TAXONOMY_CODES)}
-    )
-    
-    return _VALID_TAXONOMY_CODES
+    return get_channel_taxonomy_runtime().codes()
 
 
 def log_unmapped_channel(
@@ -171,12 +437,11 @@ def normalize_channel(
     It implements the channel governance contract defined in db/docs/channel_contract.md.
     
     Algorithm:
-    1. Load channel_mapping.yaml (cached after first load)
-    2. Build raw key from vendor/utm_source/utm_medium
-    3. Lookup in vendor-specific mapping
-    4. Validate that mapped value exists in channel_taxonomy
-    5. If mapped and valid: return canonical code
-    6. If unmapped: log occurrence, emit metric, return 'unknown' fallback
+    1. Load the compiled resolver for channel_mapping.yaml (cached after first load)
+    2. Resolve the (vendor, utm_source, utm_medium) triple (memoized per triple)
+    3. Validate that mapped value is an active channel_taxonomy code
+    4. If mapped and valid: return canonical code
+    5. If unmapped: log occurrence, emit metric, return 'unknown' fallback
     
     Args:
         utm_source: UTM source parameter from tracking URL (e.g., "google", "facebook")
@@ -201,9 +466,9 @@ def normalize_channel(
         >>> normalize_channel(utm_source=None, utm_medium=None, vendor=None)
         'unknown'  # No indicators provided
     """
-    # Load mapping and taxonomy (cached)
+    # Load compiled resolver and taxonomy (cached)
     try:
-        mapping = load_channel_mapping()
+        resolver = get_channel_resolver()
         valid_codes = get_valid_taxonomy_codes()
     except Exception as e:
         logger.error(
@@ -213,7 +478,56 @@ def normalize_channel(
         )
         # Fail-safe: return 'unknown' if we can't load configuration
         return 'unknown'
-    
+
+    return _normalize(resolver, valid_codes, utm_source, utm_medium, vendor, tenant_id)
+
+
+def normalize_many(
+    triples: Iterable[Tuple[Optional[str], Optional[str], Optional[str]]],
+    tenant_id: Optional[str] = None,
+) -> List[str]:
+    """
+    Batch form of normalize_channel() for bulk ingestion paths.
+
+    Args:
+        triples: (utm_source, utm_medium, vendor) per event
+        tenant_id: Optional tenant ID for logging context
+
+    Returns:
+        Canonical channel codes, positionally aligned with ``triples``. Each
+        distinct triple is resolved (and, if unmapped, logged) once per call.
+    """
+    triples = list(triples)
+    try:
+        resolver = get_channel_resolver()
+        valid_codes = get_valid_taxonomy_codes()
+    except Exception as e:
+        logger.error(
+            "Failed to load channel mapping or taxonomy codes",
+            extra={"error": str(e)},
+            exc_info=True
+        )
+        return ['unknown'] * len(triples)
+
+    resolved: Dict[Tuple[Optional[str], Optional[str], Optional[str]], str] = {}
+    codes: List[str] = []
+    for triple in triples:
+        code = resolved.get(triple)
+        if code is None:
+            code = _normalize(resolver, valid_codes, triple[0], triple[1], triple[2], tenant_id)
+            resolved[triple] = code
+        codes.append(code)
+    return codes
+
+
+def _normalize(
+    resolver: ChannelResolver,
+    valid_codes: FrozenSet[str],
+    utm_source: Optional[str],
+    utm_medium: Optional[str],
+    vendor: Optional[str],
+    tenant_id: Optional[str],
+) -> str:
     # Handle None inputs by converting to empty string for consistent key building
     utm_source = utm_source or ""
     utm_medium = utm_medium or ""
@@ -231,38 +545,13 @@ def normalize_channel(
         return 'unknown'
     
     # Check if vendor exists in mapping
-    if vendor not in mapping:
+    if not resolver.has_vendor(vendor):
         raw_key = f"{vendor}/{utm_source}/{utm_medium}"
         log_unmapped_channel(raw_key, utm_source, utm_medium, vendor, tenant_id)
         increment_unmapped_channel_metric(vendor, raw_key)
         return 'unknown'
     
-    vendor_mapping = mapping[vendor]
-    
-    # Try to find canonical code using various key patterns
-    # Pattern 1: Direct vendor indicator lookup (e.g., "FB_ADS", "SEARCH")
-    canonical_code = None
-    
-    # Check uppercase utm_source first (common pattern in mapping)
-    if utm_source:
-        canonical_code = vendor_mapping.get(utm_source.upper())
-    
-    # Check combination keys (e.g., "GOOGLE_SEARCH", "FACEBOOK_ADS")
-    if not canonical_code and utm_source and utm_medium:
-        combined_key = f"{utm_source.upper()}_{utm_medium.upper()}"
-        canonical_code = vendor_mapping.get(combined_key)
-    
-    # Check utm_medium alone
-    if not canonical_code and utm_medium:
-        canonical_code = vendor_mapping.get(utm_medium.upper())
-    
-    # Check lowercase versions (some vendors use lowercase)
-    if not canonical_code:
-        for key in [utm_source, utm_medium, f"{utm_source}_{utm_medium}"]:
-            if key:
-                canonical_code = vendor_mapping.get(key)
-                if canonical_code:
-                    break
+    canonical_code = resolver.resolve(vendor, utm_source, utm_medium)
     
     # If we found a mapping, validate it exists in taxonomy
     if canonical_code:
@@ -302,28 +591,21 @@ def reload_channel_mapping() -> None:
     Force reload of channel mapping from disk.
     
     Use this in development or after deploying updated channel_mapping.yaml
-    to ensure the service picks up new mappings without restart.
+    to ensure the service picks up new mappings without restart. The compiled
+    resolver (and its memo) is rebuilt from the new mapping.
     """
-    global _CHANNEL_MAPPING
+    global _CHANNEL_MAPPING, _RESOLVER
     _CHANNEL_MAPPING = None
-    load_channel_mapping()
+    _RESOLVER = None
+    get_channel_resolver()
     logger.info("Channel mapping reloaded from disk")
 
 
 def reload_taxonomy_codes() -> None:
     """
-    Force reload of valid taxonomy codes.
+    Force reload of valid taxonomy codes from channel_taxonomy.
     
-    In production, this would re-query the database. For now, it clears the cache
-    so the next call to get_valid_taxonomy_codes() will reload the hardcoded set.
+    Normally unnecessary: the taxonomy runtime reloads on NOTIFY.
     """
-    global _VALID_TAXONOMY_CODES
-    _VALID_TAXONOMY_CODES = None
-    get_valid_taxonomy_codes()
+    get_channel_taxonomy_runtime().reload()
     logger.info("Taxonomy codes reloaded")
-
-
-
-
-
-
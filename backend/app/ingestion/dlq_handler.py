@@ -9,7 +9,7 @@ Related: B0.4.4 DLQ Handler Enhancement
 import traceback
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Optional
+from typing import Optional, Sequence
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -17,7 +17,7 @@ from sqlalchemy.exc import IntegrityError, OperationalError
 
 from app.observability.context import log_context
 from app.observability.api_metrics import events_dlq_total
-from app.db.session import engine
+from app.db.session import engine, multi_row_slices
 from sqlalchemy import text
 
 try:
@@ -260,6 +260,91 @@ class DLQHandler:
 
         return dead_event
 
+    async def route_many_to_dlq(
+        self,
+        session: AsyncSession,
+        tenant_id: UUID,
+        entries: Sequence[tuple[dict, Exception, Optional[str]]],
+        source: str = "ingestion_service",
+    ) -> list[UUID]:
+        """
+        Route many failed events to dead_events with one multi-row INSERT
+        (split only past the per-statement bind parameter limit).
+
+        Row contents and classification match route_to_dlq(); used by batch
+        ingestion so N validation failures cost one round trip.
+
+        Args:
+            session: Database session (tenant context already set)
+            tenant_id: Tenant UUID
+            entries: (original_payload, error, correlation_id) triples
+            source: Source system identifier
+
+        Returns:
+            Dead event UUIDs in the same order as entries
+        """
+        from app.models.dead_event import DeadEvent
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        from uuid import uuid4
+
+        if not entries:
+            return []
+
+        now = datetime.now(timezone.utc)
+        rows = []
+        for original_payload, error, correlation_id in entries:
+            error_type, _ = classify_error(error)
+            correlation_uuid = None
+            if correlation_id:
+                try:
+                    correlation_uuid = (
+                        correlation_id if isinstance(correlation_id, UUID) else UUID(str(correlation_id))
+                    )
+                except (ValueError, TypeError):
+                    correlation_uuid = None
+            error_traceback = None
+            if error.__traceback__ is not None:
+                error_traceback = "".join(
+                    traceback.format_exception(type(error), error, error.__traceback__)
+                )[:2000]
+            rows.append(
+                {
+                    "id": uuid4(),
+                    "tenant_id": tenant_id,
+                    "source": source,
+                    "raw_payload": original_payload,
+                    "correlation_id": correlation_uuid,
+                    "error_type": error_type.value,
+                    "error_code": type(error).__name__,
+                    "error_detail": {"error": str(error)[:500]},
+                    "error_message": str(error)[:500],
+                    "error_traceback": error_traceback,
+                    "event_type": original_payload.get("event_type", "unknown"),
+                    "retry_count": 0,
+                    "remediation_status": RemediationStatus.PENDING.value,
+                    "ingested_at": now,
+                }
+            )
+
+        for statement_rows in multi_row_slices(rows):
+            await session.execute(pg_insert(DeadEvent).values(statement_rows))
+
+        # B0.5.6.3: No labels on event metrics (bounded cardinality)
+        events_dlq_total.inc(len(rows))
+
+        ctx = log_context()
+        ctx.update(
+            {
+                "tenant_id": str(tenant_id),
+                "event": "events_routed_to_dlq",
+                "vendor": source or "unknown",
+                "dead_event_count": len(rows),
+            }
+        )
+        logger.debug("events_routed_to_dlq", extra=ctx)
+
+        return [row["id"] for row in rows]
+
 
     async def retry_dead_event(
         self,
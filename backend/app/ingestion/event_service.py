@@ -5,20 +5,27 @@ Provides idempotent event ingestion with channel normalization, validation,
 and dead-letter queue routing for failed events.
 
 B0.4.4 Enhancement: Integrated DLQHandler with error classification and retry logic.
+
+Batch ingestion: ingest_many() applies the same validation/normalization per
+event but resolves idempotency, inserts, and DLQ routing with set-based SQL so
+a webhook burst costs a constant number of round trips.
 """
 
 import logging
 from datetime import datetime, timezone
 from decimal import Decimal, InvalidOperation
 import time
-from typing import Dict, Optional
+from typing import Any, Dict, Optional, Sequence
 from uuid import UUID, uuid4
 
-from sqlalchemy import select
+from sqlalchemy import Text, any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.ingestion.channel_normalization import normalize_channel
+from app.core.config import settings
+from app.db.session import multi_row_slices
+from app.ingestion.channel_normalization import normalize_channel, normalize_many
 from app.ingestion.dlq_handler import DLQHandler
 from app.models import AttributionEvent, DeadEvent
 from app.observability.context import log_context
@@ -34,6 +41,14 @@ logger = logging.getLogger(__name__)
 
 _IDEMPOTENCY_UNIQUE_CONSTRAINT = "uq_attribution_events_tenant_idempotency_key"
 
+# Built once so SQLAlchemy's compiled cache and asyncpg's per-connection
+# prepared statement are reused; values are supplied as execute() parameters.
+_FAST_PATH_INSERT = (
+    pg_insert(AttributionEvent.__table__)
+    .on_conflict_do_nothing(constraint=_IDEMPOTENCY_UNIQUE_CONSTRAINT)
+    .returning(AttributionEvent.__table__.c.id, AttributionEvent.__table__.c.channel)
+)
+
 
 def _integrity_error_sqlstate(error: IntegrityError) -> str | None:
     orig = getattr(error, "orig", None)
@@ -98,6 +113,26 @@ async def _fetch_existing_event_for_key(
     return res.scalar_one_or_none()
 
 
+async def _fetch_existing_events_for_keys(
+    session: AsyncSession, *, tenant_id: UUID, idempotency_keys: Sequence[str]
+) -> dict[str, Any]:
+    """Resolve many idempotency keys in one `= ANY(:keys)` round trip."""
+    if not idempotency_keys:
+        return {}
+    res = await session.execute(
+        select(
+            AttributionEvent.id,
+            AttributionEvent.channel,
+            AttributionEvent.idempotency_key,
+        ).where(
+            AttributionEvent.tenant_id == tenant_id,
+            AttributionEvent.idempotency_key
+            == any_(bindparam("idempotency_keys", list(idempotency_keys), type_=ARRAY(Text))),
+        )
+    )
+    return {row.idempotency_key: row for row in res}
+
+
 class ValidationError(Exception):
     """Raised when event data fails validation"""
     pass
@@ -153,64 +188,39 @@ class EventIngestionService:
         Idempotency Guarantee:
             Duplicate idempotency_key returns existing event without insert.
             Database UNIQUE constraint enforces deduplication at persistence layer.
+
+        With INGESTION_INSERT_FAST_PATH_ENABLED the pre-check SELECT is skipped;
+        see _ingest_event_fast_path().
         """
+        if settings.INGESTION_INSERT_FAST_PATH_ENABLED:
+            return await self._ingest_event_fast_path(
+                session=session,
+                tenant_id=tenant_id,
+                event_data=event_data,
+                idempotency_key=idempotency_key,
+                source=source,
+            )
+
         # 1. Idempotency check - return existing event if duplicate
         existing = await self._check_duplicate(session, tenant_id, idempotency_key)
         if existing:
-            logger.info(
-                "duplicate_event_detected",
-                extra={
-                    "event": "duplicate_event_detected",
-                    "idempotency_key": idempotency_key,
-                    "existing_event_id": str(existing.id),
-                    "tenant_id": str(tenant_id),
-                    "vendor": event_data.get("vendor", source),
-                    "event_type": event_data.get("event_type"),
-                    **log_context(),
-                }
+            self._record_duplicate(
+                "duplicate_event_detected", existing, tenant_id, event_data, idempotency_key, source
             )
-            # B0.5.6.3: No labels on event metrics (bounded cardinality)
-            events_duplicate_total.inc()
             return existing
 
         start_time = time.perf_counter()
         try:
-            # 2. Validate event schema
-            validated = self._validate_schema(event_data)
-
-            # 3. Normalize channel (vendor indicator → canonical code)
-            channel_code = normalize_channel(
-                utm_source=event_data.get("utm_source"),
-                utm_medium=event_data.get("utm_medium"),
-                vendor=event_data.get("vendor", source),
-                tenant_id=str(tenant_id)
-            )
-
-            # 4. Create event entity
-            durable_payload = minimize_event_payload_for_storage(
-                {**event_data, "channel": channel_code}
-            )
-            event = AttributionEvent(
-                id=uuid4(),
+            # 2-4. Validate, normalize channel, and build the event entity
+            values = self._build_event_values(
                 tenant_id=tenant_id,
+                event_data=event_data,
                 idempotency_key=idempotency_key,
-                channel=channel_code,
-                event_type=validated["event_type"],
-                event_timestamp=validated["event_timestamp"],
-                occurred_at=validated["event_timestamp"],
-                session_id=validated["session_id"],
-                revenue_cents=validated["revenue_cents"],
-                currency=validated.get("currency", "USD"),
-                raw_payload=durable_payload,
-                correlation_id=validated.get("correlation_id"),
-                external_event_id=event_data.get("external_event_id"),
-                campaign_id=event_data.get("campaign_id"),
-                conversion_value_cents=event_data.get("conversion_value_cents"),
-                processing_status="pending",
-                retry_count=0,
-                created_at=datetime.now(timezone.utc),
-                updated_at=datetime.now(timezone.utc),
+                source=source,
+                now=datetime.now(timezone.utc),
             )
+            channel_code = values["channel"]
+            event = AttributionEvent(**values)
 
             # 5. Persist to database
             session.add(event)
@@ -239,33 +249,9 @@ class EventIngestionService:
             return event
 
         except ValidationError as e:
-            # Route validation failures to dead-letter queue
-            logger.warning(
-                "validation_error_routed_to_dlq",
-                extra={
-                    "event": "validation_error_routed_to_dlq",
-                    "error": str(e),
-                    "idempotency_key": idempotency_key,
-                    "source": source,
-                    "tenant_id": str(tenant_id),
-                    "vendor": event_data.get("vendor", source),
-                    "event_type": event_data.get("event_type"),
-                    "correlation_id_business": idempotency_key,
-                    **log_context(),
-                }
-            )
-            await self._route_to_dlq(
-                session=session,
-                tenant_id=tenant_id,
-                event_data=event_data,
-                error_type="validation_error",
-                error_message=str(e),
-                source=source,
+            await self._handle_validation_failure(
+                session, tenant_id, event_data, idempotency_key, source, e, start_time
             )
-            duration = time.perf_counter() - start_time
-            # B0.5.6.3: No labels on event metrics (bounded cardinality)
-            events_dlq_total.inc()
-            ingestion_duration_seconds.observe(duration)
             raise  # Re-raise to signal failure to caller
 
         except IntegrityError as e:
@@ -278,24 +264,405 @@ class EventIngestionService:
                 session, tenant_id=tenant_id, idempotency_key=idempotency_key
             )
             if existing_after_race:
-                logger.info(
+                self._record_duplicate(
                     "duplicate_event_detected_race",
-                    extra={
-                        "event": "duplicate_event_detected_race",
-                        "idempotency_key": idempotency_key,
-                        "existing_event_id": str(existing_after_race.id),
-                        "tenant_id": str(tenant_id),
-                        "vendor": event_data.get("vendor", source),
-                        "event_type": event_data.get("event_type"),
-                        **log_context(),
-                    },
+                    existing_after_race,
+                    tenant_id,
+                    event_data,
+                    idempotency_key,
+                    source,
                 )
-                # B0.5.6.3: No labels on event metrics (bounded cardinality)
-                events_duplicate_total.inc()
                 return existing_after_race
 
             raise
 
+    async def _ingest_event_fast_path(
+        self,
+        session: AsyncSession,
+        tenant_id: UUID,
+        event_data: dict,
+        idempotency_key: str,
+        source: str,
+    ) -> AttributionEvent:
+        """
+        Single-round-trip variant of ingest_event().
+
+        New keys cost one `INSERT ... ON CONFLICT (tenant_id, idempotency_key)
+        DO NOTHING RETURNING id, channel` (prepared and cached per connection
+        by asyncpg). Only when nothing comes back is the existing row fetched.
+        Conflicts never abort the transaction, so there is no rollback path.
+
+        Validation runs before the insert; an invalid payload for a key that
+        already exists still returns the existing event, as on the default path.
+        """
+        start_time = time.perf_counter()
+        try:
+            values = self._build_event_values(
+                tenant_id=tenant_id,
+                event_data=event_data,
+                idempotency_key=idempotency_key,
+                source=source,
+                now=datetime.now(timezone.utc),
+            )
+        except ValidationError as e:
+            existing = await self._check_duplicate(session, tenant_id, idempotency_key)
+            if existing:
+                self._record_duplicate(
+                    "duplicate_event_detected", existing, tenant_id, event_data, idempotency_key, source
+                )
+                return existing
+            await self._handle_validation_failure(
+                session, tenant_id, event_data, idempotency_key, source, e, start_time
+            )
+            raise
+
+        inserted = (await session.execute(_FAST_PATH_INSERT, values)).first()
+        if inserted is None:
+            existing = await _fetch_existing_event_for_key(
+                session, tenant_id=tenant_id, idempotency_key=idempotency_key
+            )
+            if existing is None:
+                raise RuntimeError("idempotency conflict could not be resolved")
+            self._record_duplicate(
+                "duplicate_event_detected", existing, tenant_id, event_data, idempotency_key, source
+            )
+            return existing
+
+        # Transient entity carrying the inserted values; not attached to the session.
+        event = AttributionEvent(**values)
+        logger.info(
+            "event_ingested",
+            extra={
+                "event": "event_ingested",
+                "event_id": str(event.id),
+                "idempotency_key": idempotency_key,
+                "channel": event.channel,
+                "event_type": event.event_type,
+                "revenue_cents": event.revenue_cents,
+                "tenant_id": str(tenant_id),
+                "vendor": event_data.get("vendor", source),
+                "correlation_id_business": idempotency_key,
+                **log_context(),
+            }
+        )
+        # B0.5.6.3: No labels on event metrics (bounded cardinality)
+        events_ingested_total.inc()
+        ingestion_duration_seconds.observe(time.perf_counter() - start_time)
+        return event
+
+    def _record_duplicate(
+        self,
+        log_event: str,
+        existing: AttributionEvent,
+        tenant_id: UUID,
+        event_data: dict,
+        idempotency_key: str,
+        source: str,
+    ) -> None:
+        logger.info(
+            log_event,
+            extra={
+                "event": log_event,
+                "idempotency_key": idempotency_key,
+                "existing_event_id": str(existing.id),
+                "tenant_id": str(tenant_id),
+                "vendor": event_data.get("vendor", source),
+                "event_type": event_data.get("event_type"),
+                **log_context(),
+            },
+        )
+        # B0.5.6.3: No labels on event metrics (bounded cardinality)
+        events_duplicate_total.inc()
+
+    async def _handle_validation_failure(
+        self,
+        session: AsyncSession,
+        tenant_id: UUID,
+        event_data: dict,
+        idempotency_key: str,
+        source: str,
+        error: ValidationError,
+        start_time: float,
+    ) -> None:
+        """Route a validation failure to the dead-letter queue and record metrics."""
+        logger.warning(
+            "validation_error_routed_to_dlq",
+            extra={
+                "event": "validation_error_routed_to_dlq",
+                "error": str(error),
+                "idempotency_key": idempotency_key,
+                "source": source,
+                "tenant_id": str(tenant_id),
+                "vendor": event_data.get("vendor", source),
+                "event_type": event_data.get("event_type"),
+                "correlation_id_business": idempotency_key,
+                **log_context(),
+            }
+        )
+        await self._route_to_dlq(
+            session=session,
+            tenant_id=tenant_id,
+            event_data=event_data,
+            error_type="validation_error",
+            error_message=str(error),
+            source=source,
+        )
+        duration = time.perf_counter() - start_time
+        # B0.5.6.3: No labels on event metrics (bounded cardinality)
+        events_dlq_total.inc()
+        ingestion_duration_seconds.observe(duration)
+
+    async def ingest_many(
+        self,
+        session: AsyncSession,
+        tenant_id: UUID,
+        items: Sequence[tuple[dict, str]],
+        source: str = "webhook",
+    ) -> list[dict]:
+        """
+        Ingest a batch of events with set-based idempotency, insert, and DLQ routing.
+
+        Per-event semantics match ingest_event(); only the SQL shape differs:
+            1. One `idempotency_key = ANY(:keys)` lookup for the whole batch
+            2. One multi-row INSERT ... ON CONFLICT DO NOTHING RETURNING
+            3. One multi-row INSERT into dead_events for validation failures
+        Steps 2 and 3 are split into more statements only when the rows would
+        exceed the per-statement bind parameter limit (MAX_BIND_PARAMS_PER_STATEMENT).
+        Keys that lose a concurrent insert race are re-resolved with one more
+        ANY lookup. Repeated keys inside the batch resolve to the first item.
+
+        Args:
+            session: Database session with RLS context set (app.current_tenant_id)
+            tenant_id: Tenant UUID for event ownership
+            items: (event_data, idempotency_key) pairs in request order
+            source: Event source identifier (e.g., 'shopify', 'stripe')
+
+        Returns:
+            One result dict per item, in request order:
+                - status='success': event_id, channel, idempotency_key, duplicate
+                - status='error': error_type, error, dead_event_id, idempotency_key
+        """
+        if not items:
+            return []
+
+        start_time = time.perf_counter()
+        first_index_by_key: dict[str, int] = {}
+        for index, (_, idempotency_key) in enumerate(items):
+            first_index_by_key.setdefault(idempotency_key, index)
+
+        # 1. Idempotency check for the whole batch
+        existing_by_key = await _fetch_existing_events_for_keys(
+            session, tenant_id=tenant_id, idempotency_keys=list(first_index_by_key)
+        )
+
+        # 2. Validate + normalize new keys; collect failures for the DLQ
+        now = datetime.now(timezone.utc)
+        validated_by_key: dict[str, tuple[dict, dict]] = {}
+        failures: dict[str, ValidationError] = {}
+        for idempotency_key, index in first_index_by_key.items():
+            if idempotency_key in existing_by_key:
+                continue
+            event_data = items[index][0]
+            try:
+                validated_by_key[idempotency_key] = (event_data, self._validate_schema(event_data))
+            except ValidationError as e:
+                failures[idempotency_key] = e
+        channel_codes = normalize_many(
+            (
+                (event_data.get("utm_source"), event_data.get("utm_medium"), event_data.get("vendor", source))
+                for event_data, _ in validated_by_key.values()
+            ),
+            tenant_id=str(tenant_id),
+        )
+        pending_rows = [
+            self._event_values(
+                tenant_id=tenant_id,
+                event_data=event_data,
+                validated=validated,
+                channel_code=channel_code,
+                idempotency_key=idempotency_key,
+                now=now,
+            )
+            for (idempotency_key, (event_data, validated)), channel_code in zip(
+                validated_by_key.items(), channel_codes
+            )
+        ]
+
+        # 3. Multi-row insert; conflicts are idempotency races resolved below
+        inserted_by_key: dict[str, Any] = {}
+        if pending_rows:
+            for rows in multi_row_slices(pending_rows):
+                res = await session.execute(
+                    pg_insert(AttributionEvent)
+                    .values(rows)
+                    .on_conflict_do_nothing(constraint=_IDEMPOTENCY_UNIQUE_CONSTRAINT)
+                    .returning(
+                        AttributionEvent.id,
+                        AttributionEvent.channel,
+                        AttributionEvent.idempotency_key,
+                    )
+                )
+                inserted_by_key.update((row.idempotency_key, row) for row in res)
+            raced_keys = [
+                row["idempotency_key"]
+                for row in pending_rows
+                if row["idempotency_key"] not in inserted_by_key
+            ]
+            if raced_keys:
+                existing_by_key.update(
+                    await _fetch_existing_events_for_keys(
+                        session, tenant_id=tenant_id, idempotency_keys=raced_keys
+                    )
+                )
+                unresolved = [key for key in raced_keys if key not in existing_by_key]
+                if unresolved:
+                    raise RuntimeError(
+                        f"idempotency conflict could not be resolved for {len(unresolved)} key(s)"
+                    )
+
+        # 4. Route validation failures to the DLQ in one statement
+        dead_event_ids: dict[str, UUID] = {}
+        if failures:
+            entries = []
+            for idempotency_key, error in failures.items():
+                event_data = items[first_index_by_key[idempotency_key]][0]
+                correlation_id = (
+                    event_data.get("correlation_id")
+                    or event_data.get("idempotency_key")
+                    or event_data.get("external_event_id")
+                    or str(uuid4())
+                )
+                entries.append((event_data, error, correlation_id))
+            dead_ids = await self.dlq_handler.route_many_to_dlq(
+                session=session,
+                tenant_id=tenant_id,
+                entries=entries,
+                source=source,
+            )
+            dead_event_ids = dict(zip(failures, dead_ids))
+
+        # 5. Per-item results in request order
+        results: list[dict] = []
+        for index, (_, idempotency_key) in enumerate(items):
+            if idempotency_key in failures:
+                results.append(
+                    {
+                        "status": "error",
+                        "error_type": "validation_error",
+                        "error": str(failures[idempotency_key]),
+                        "dead_event_id": str(dead_event_ids[idempotency_key]),
+                        "idempotency_key": idempotency_key,
+                    }
+                )
+                continue
+            row = inserted_by_key.get(idempotency_key)
+            duplicate = row is None or first_index_by_key[idempotency_key] != index
+            if row is None:
+                row = existing_by_key[idempotency_key]
+            results.append(
+                {
+                    "status": "success",
+                    "event_id": str(row.id),
+                    "channel": row.channel,
+                    "idempotency_key": idempotency_key,
+                    "duplicate": duplicate,
+                }
+            )
+
+        duplicate_count = sum(1 for r in results if r.get("duplicate"))
+        logger.info(
+            "event_batch_ingested",
+            extra={
+                "event": "event_batch_ingested",
+                "tenant_id": str(tenant_id),
+                "vendor": source,
+                "batch_size": len(items),
+                "inserted": len(inserted_by_key),
+                "duplicates": duplicate_count,
+                "dlq_routed": len(failures),
+                **log_context(),
+            },
+        )
+        # B0.5.6.3: No labels on event metrics (bounded cardinality)
+        if inserted_by_key:
+            events_ingested_total.inc(len(inserted_by_key))
+        if duplicate_count:
+            events_duplicate_total.inc(duplicate_count)
+        if failures:
+            events_dlq_total.inc(len(failures))
+        ingestion_duration_seconds.observe(time.perf_counter() - start_time)
+
+        return results
+
+    def _build_event_values(
+        self,
+        *,
+        tenant_id: UUID,
+        event_data: dict,
+        idempotency_key: str,
+        source: str,
+        now: datetime,
+    ) -> dict:
+        """
+        Validate, normalize, and minimize one event into AttributionEvent column values.
+
+        Raises:
+            ValidationError: Event data fails schema validation
+        """
+        validated = self._validate_schema(event_data)
+
+        # Normalize channel (vendor indicator → canonical code)
+        channel_code = normalize_channel(
+            utm_source=event_data.get("utm_source"),
+            utm_medium=event_data.get("utm_medium"),
+            vendor=event_data.get("vendor", source),
+            tenant_id=str(tenant_id)
+        )
+        return self._event_values(
+            tenant_id=tenant_id,
+            event_data=event_data,
+            validated=validated,
+            channel_code=channel_code,
+            idempotency_key=idempotency_key,
+            now=now,
+        )
+
+    @staticmethod
+    def _event_values(
+        *,
+        tenant_id: UUID,
+        event_data: dict,
+        validated: dict,
+        channel_code: str,
+        idempotency_key: str,
+        now: datetime,
+    ) -> dict:
+        """Assemble AttributionEvent column values from a validated, normalized event."""
+        durable_payload = minimize_event_payload_for_storage(
+            {**event_data, "channel": channel_code}
+        )
+        return dict(
+            id=uuid4(),
+            tenant_id=tenant_id,
+            idempotency_key=idempotency_key,
+            channel=channel_code,
+            event_type=validated["event_type"],
+            event_timestamp=validated["event_timestamp"],
+            occurred_at=validated["event_timestamp"],
+            session_id=validated["session_id"],
+            revenue_cents=validated["revenue_cents"],
+            currency=validated.get("currency", "USD"),
+            raw_payload=durable_payload,
+            correlation_id=validated.get("correlation_id"),
+            external_event_id=event_data.get("external_event_id"),
+            campaign_id=event_data.get("campaign_id"),
+            conversion_value_cents=event_data.get("conversion_value_cents"),
+            processing_status="pending",
+            retry_count=0,
+            created_at=now,
+            updated_at=now,
+        )
+
     async def _check_duplicate(
         self, session: AsyncSession, tenant_id: UUID, idempotency_key: str
     ) -> Optional[AttributionEvent]:
@@ -555,3 +922,46 @@ async def ingest_with_transaction(
                 exc_info=True,
             )
             raise
+
+
+async def ingest_many_with_transaction(
+    tenant_id: UUID,
+    items: Sequence[tuple[dict, str]],
+    source: str = "webhook",
+) -> list[Dict[str, Any]]:
+    """
+    Transactional wrapper for batch ingestion.
+
+    One session/transaction covers the idempotency lookup, the multi-row event
+    insert, and the DLQ insert; everything commits together or not at all.
+
+    Args:
+        tenant_id: Tenant UUID (from auth context or API key)
+        items: (event_data, idempotency_key) pairs in request order
+        source: Event source identifier
+
+    Returns:
+        Per-item result dicts in request order (see EventIngestionService.ingest_many)
+
+    Raises:
+        Exception: Database errors, unexpected failures
+    """
+    from app.db.session import get_session
+
+    async with get_session(tenant_id=tenant_id) as session:
+        try:
+            service = EventIngestionService()
+            return await service.ingest_many(
+                session=session,
+                tenant_id=tenant_id,
+                items=items,
+                source=source,
+            )
+        except Exception as e:
+            await session.rollback()
+            logger.error(
+                "Batch ingestion failed - unexpected error",
+                extra={"error": str(e), "tenant_id": str(tenant_id), "batch_size": len(items)},
+                exc_info=True,
+            )
+            raise
@@ -0,0 +1,231 @@
+"""
+Group-commit write-behind buffer for single-event ingestion.
+
+With INGESTION_GROUP_COMMIT_ENABLED, webhook handlers hand validated-shape
+events to an in-process buffer instead of opening their own transaction.
+A flusher task drains the buffer every INGESTION_GROUP_COMMIT_FLUSH_INTERVAL_MS
+milliseconds (or as soon as INGESTION_GROUP_COMMIT_MAX_EVENTS are pending) and
+writes the whole batch in ONE transaction through EventIngestionService.ingest_many.
+
+Durability is unchanged from the caller's point of view: each request awaits a
+future that is resolved only after the shared transaction has committed, so a
+success response still implies the row is durable. If the shared transaction
+fails, the batch is retried one event per transaction so a single bad row
+cannot fail its neighbours.
+
+Tenant isolation: a flush may span tenants. The tenant GUC is re-bound
+(transaction-local) before each tenant's slice is written, so RLS policies see
+the correct tenant for every INSERT.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from app.core.config import settings
+from app.db.session import get_session, set_tenant_guc_async
+from app.ingestion.event_service import EventIngestionService, ingest_many_with_transaction
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingIngest:
+    tenant_id: UUID
+    event_data: dict
+    idempotency_key: str
+    source: str
+    future: asyncio.Future = field(repr=False)
+
+
+class GroupCommitBuffer:
+    """
+    Event-loop-bound buffer that coalesces concurrent ingests into one transaction.
+
+    Results use the per-item shape of EventIngestionService.ingest_many().
+    """
+
+    def __init__(self, *, max_events: int, flush_interval_ms: int) -> None:
+        if max_events < 1:
+            raise ValueError("max_events must be >= 1")
+        if flush_interval_ms < 1:
+            raise ValueError("flush_interval_ms must be >= 1")
+        self._max_events = max_events
+        self._flush_interval = flush_interval_ms / 1000.0
+        self._pending: list[_PendingIngest] = []
+        self._has_items = asyncio.Event()
+        self._full = asyncio.Event()
+        self._closed = False
+        self._flusher: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        return self._loop
+
+    async def submit(
+        self,
+        tenant_id: UUID,
+        event_data: dict,
+        idempotency_key: str,
+        source: str,
+    ) -> Dict[str, Any]:
+        """Buffer one event and wait until the batch containing it has committed."""
+        if self._closed:
+            raise RuntimeError("group-commit buffer is closed")
+        loop = asyncio.get_running_loop()
+        if self._loop is None:
+            self._loop = loop
+        elif self._loop is not loop:
+            raise RuntimeError("group-commit buffer is bound to a different event loop")
+
+        future = loop.create_future()
+        self._pending.append(
+            _PendingIngest(
+                tenant_id=tenant_id,
+                event_data=event_data,
+                idempotency_key=idempotency_key,
+                source=source,
+                future=future,
+            )
+        )
+        self._has_items.set()
+        if len(self._pending) >= self._max_events:
+            self._full.set()
+        if self._flusher is None or self._flusher.done():
+            self._flusher = loop.create_task(self._run(), name="ingestion-group-commit-flusher")
+        return await future
+
+    async def close(self) -> None:
+        """Flush everything still pending and stop the flusher."""
+        self._closed = True
+        self._has_items.set()
+        self._full.set()
+        if self._flusher is not None:
+            await self._flusher
+            self._flusher = None
+
+    async def _run(self) -> None:
+        while True:
+            if not self._pending:
+                if self._closed:
+                    return
+                self._has_items.clear()
+                await self._has_items.wait()
+                continue
+            if len(self._pending) < self._max_events and not self._closed:
+                self._full.clear()
+                try:
+                    await asyncio.wait_for(self._full.wait(), timeout=self._flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            batch = self._pending[: self._max_events]
+            del self._pending[: self._max_events]
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[_PendingIngest]) -> None:
+        groups: dict[tuple[UUID, str], list[_PendingIngest]] = {}
+        for entry in batch:
+            groups.setdefault((entry.tenant_id, entry.source), []).append(entry)
+
+        resolved: list[tuple[_PendingIngest, Dict[str, Any]]] = []
+        try:
+            async with get_session(tenant_id=batch[0].tenant_id) as session:
+                service = EventIngestionService()
+                for (tenant_id, source), entries in groups.items():
+                    await set_tenant_guc_async(session, tenant_id)
+                    results = await service.ingest_many(
+                        session=session,
+                        tenant_id=tenant_id,
+                        items=[(entry.event_data, entry.idempotency_key) for entry in entries],
+                        source=source,
+                    )
+                    resolved.extend(zip(entries, results))
+        except Exception as exc:
+            logger.warning(
+                "group_commit_flush_failed",
+                extra={
+                    "event": "group_commit_flush_failed",
+                    "batch_size": len(batch),
+                    "tenant_count": len({key[0] for key in groups}),
+                    "error": str(exc),
+                },
+            )
+            await self._flush_individually(batch)
+            return
+
+        for entry, result in resolved:
+            if not entry.future.done():
+                entry.future.set_result(result)
+        logger.debug(
+            "group_commit_flushed",
+            extra={
+                "event": "group_commit_flushed",
+                "batch_size": len(batch),
+                "tenant_count": len({key[0] for key in groups}),
+            },
+        )
+
+    async def _flush_individually(self, batch: list[_PendingIngest]) -> None:
+        for entry in batch:
+            if entry.future.done():
+                continue
+            try:
+                results = await ingest_many_with_transaction(
+                    tenant_id=entry.tenant_id,
+                    items=[(entry.event_data, entry.idempotency_key)],
+                    source=entry.source,
+                )
+            except Exception as exc:
+                if not entry.future.done():
+                    entry.future.set_exception(exc)
+                continue
+            if not entry.future.done():
+                entry.future.set_result(results[0])
+
+
+_buffer: Optional[GroupCommitBuffer] = None
+
+
+def get_group_commit_buffer() -> GroupCommitBuffer:
+    """Return the buffer for the running event loop, creating it on first use."""
+    global _buffer
+    loop = asyncio.get_running_loop()
+    if _buffer is None or _buffer._closed or (_buffer.loop is not None and _buffer.loop is not loop):
+        _buffer = GroupCommitBuffer(
+            max_events=settings.INGESTION_GROUP_COMMIT_MAX_EVENTS,
+            flush_interval_ms=settings.INGESTION_GROUP_COMMIT_FLUSH_INTERVAL_MS,
+        )
+    return _buffer
+
+
+async def ingest_with_group_commit(
+    tenant_id: UUID,
+    event_data: dict,
+    idempotency_key: str,
+    source: str = "webhook",
+) -> Dict[str, Any]:
+    """
+    Group-commit counterpart of ingest_with_transaction().
+
+    Returns the ingest_many() per-item dict; error results already carry
+    dead_event_id, so callers need no follow-up DLQ lookup.
+    """
+    return await get_group_commit_buffer().submit(
+        tenant_id=tenant_id,
+        event_data=event_data,
+        idempotency_key=idempotency_key,
+        source=source,
+    )
+
+
+async def shutdown_group_commit_buffer() -> None:
+    """Drain the buffer on application shutdown."""
+    global _buffer
+    buffer, _buffer = _buffer, None
+    if buffer is not None:
+        await buffer.close()
@@ -50,6 +50,7 @@ from app.middleware import PIIStrippingMiddleware
 from app.middleware.observability import ObservabilityMiddleware
 from app.security.auth import AuthError, forbidden_auth_error, unauthorized_auth_error
 from app.core.secrets import assert_runtime_secret_contract
+from app.ingestion.group_commit import shutdown_group_commit_buffer
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -111,6 +112,20 @@ async def _startup_secret_contract_guard() -> None:
     assert_runtime_secret_contract("api")
 
 
+@app.on_event("startup")
+async def _startup_channel_taxonomy_runtime() -> None:
+    """Load channel taxonomy codes in the background before the first event."""
+    from app.ingestion.channel_normalization import get_channel_taxonomy_runtime
+
+    get_channel_taxonomy_runtime().ensure_started()
+
+
+@app.on_event("shutdown")
+async def _shutdown_group_commit_buffer() -> None:
+    """Commit any events still buffered in group-commit mode before exit."""
+    await shutdown_group_commit_buffer()
+
+
 @app.get("/")
 async def root():
     """Root endpoint - redirects to documentation."""
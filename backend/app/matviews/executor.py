@@ -3,35 +3,85 @@ Unified materialized view refresh executor.
 
 Enforces registry validation, xact-scoped advisory locks, and standardized
 RefreshResult telemetry for all refresh paths.
+
+refresh_all_for_tenant refreshes the registry one dependency level at a time:
+views in the same level do not depend on each other and are refreshed
+concurrently, each on its own connection and under its own advisory lock,
+with at most MATVIEW_REFRESH_CONCURRENCY refreshes in flight.
+
+Tenant-scoped refreshes read a change fingerprint of the view's registry
+source_tables (pg_stat_user_tables insert/update/delete counters) in the
+refresh transaction and store it on the tenant's matview_refresh_state row
+with the refresh.
+With skip_unchanged=True a refresh whose fingerprint matches the stored one
+only stamps current_as_of and returns SKIPPED_UNCHANGED. The counters are
+database-wide, so another tenant's writes also count as a change, and they
+are published with the statistics flush delay; the scheduler confirms a skip
+with a second check one staleness budget later.
 """
 from __future__ import annotations
 
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import functools
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from enum import Enum
 import logging
+import os
 from typing import Iterable, Optional
 from uuid import UUID
 
 from sqlalchemy import text
 from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import psycopg2 as postgresql_psycopg2
 from sqlalchemy.engine.url import make_url
 from sqlalchemy.sql.compiler import IdentifierPreparer
 
 from app.core.pg_locks import RefreshLockKey, build_refresh_lock_key, try_acquire_refresh_xact_lock
 from app.core.secrets import get_database_url
 from app.db.session import engine, set_tenant_guc
+from app.db.sync_pool import sync_connection
 from app.matviews import registry
 
 logger = logging.getLogger(__name__)
 _IDENTIFIER_PREPARER = IdentifierPreparer(postgresql.dialect())
 _PUBLIC_SCHEMA = _IDENTIFIER_PREPARER.quote_schema("public")
+_SYNC_DIALECT = postgresql_psycopg2.dialect()
+
+_SOURCE_COUNTERS_SQL = """
+    SELECT string_agg(
+               relname || ':' || n_tup_ins || ':' || n_tup_upd || ':' || n_tup_del,
+               ',' ORDER BY relname
+           ),
+           CURRENT_DATE::text
+    FROM pg_stat_user_tables
+    WHERE schemaname = 'public'
+      AND relname::text = ANY(CAST(:source_tables AS text[]))
+"""
+_MARK_UNCHANGED_SQL = """
+    UPDATE matview_refresh_state
+    SET current_as_of = now()
+    WHERE tenant_id = :tenant_id
+      AND view_name = :view_name
+      AND source_fingerprint = :fingerprint
+    RETURNING 1
+"""
+# Ledger rows are created by app.matviews.scheduler; views it does not track are not recorded.
+_RECORD_FINGERPRINT_SQL = """
+    UPDATE matview_refresh_state
+    SET source_fingerprint = :fingerprint,
+        current_as_of = now()
+    WHERE tenant_id = :tenant_id
+      AND view_name = :view_name
+"""
 
 
 class RefreshOutcome(str, Enum):
     SUCCESS = "SUCCESS"
     SKIPPED_LOCK_HELD = "SKIPPED_LOCK_HELD"
+    SKIPPED_UNCHANGED = "SKIPPED_UNCHANGED"
     FAILED = "FAILED"
 
 
@@ -94,6 +144,18 @@ def _build_sync_dsn() -> str:
     return "".join(dsn_parts)
 
 
+def _pyformat(sql: str) -> str:
+    """Render a named-bind statement with psycopg2 placeholders."""
+    return str(text(sql).compile(dialect=_SYNC_DIALECT))
+
+
+def _source_fingerprint(entry: registry.MatviewRegistryEntry, counters_row) -> Optional[str]:
+    counters, current_date = counters_row
+    if counters is None:
+        return None
+    return f"{counters}|{current_date}" if entry.date_windowed else counters
+
+
 def _topological_order(entries: Iterable[registry.MatviewRegistryEntry]) -> list[registry.MatviewRegistryEntry]:
     graph = {entry.name: set(entry.dependencies) for entry in entries}
     ordered: list[registry.MatviewRegistryEntry] = []
@@ -113,13 +175,45 @@ def _topological_order(entries: Iterable[registry.MatviewRegistryEntry]) -> list
     return ordered
 
 
+def _dependency_levels(
+    ordered: Iterable[registry.MatviewRegistryEntry],
+) -> list[list[registry.MatviewRegistryEntry]]:
+    """
+    Group topologically ordered entries by dependency depth, keeping order.
+
+    A view's depth is one more than its deepest registered dependency, so every
+    view in a level only depends on views in earlier levels.
+    """
+    depth: dict[str, int] = {}
+    levels: list[list[registry.MatviewRegistryEntry]] = []
+    for entry in ordered:
+        level = 1 + max((depth[name] for name in entry.dependencies if name in depth), default=-1)
+        depth[entry.name] = level
+        if level == len(levels):
+            levels.append([])
+        levels[level].append(entry)
+    return levels
+
+
+def _refresh_concurrency() -> int:
+    try:
+        return max(1, int(os.getenv("MATVIEW_REFRESH_CONCURRENCY", "4")))
+    except ValueError:
+        return 4
+
+
 async def refresh_single_async(
     view_name: str,
     tenant_id: Optional[UUID],
     correlation_id: Optional[str] = None,
+    *,
+    skip_unchanged: bool = False,
 ) -> RefreshResult:
     """
     Refresh a single materialized view with registry validation and xact lock.
+
+    skip_unchanged skips the refresh when the source fingerprint matches the
+    one stored with the tenant's last refresh.
     """
     entry = registry.get_entry(view_name)
     started_at = _now_utc()
@@ -145,7 +239,33 @@ async def refresh_single_async(
                     lock_key_debug=lock_key,
                 )
 
-            if entry.refresh_fn:
+            fingerprint: Optional[str] = None
+            if tenant_id and entry.source_tables:
+                counters = await conn.execute(
+                    text(_SOURCE_COUNTERS_SQL), {"source_tables": list(entry.source_tables)}
+                )
+                fingerprint = _source_fingerprint(entry, counters.one())
+                state_params = {"tenant_id": tenant_id, "view_name": view_name, "fingerprint": fingerprint}
+                if skip_unchanged and fingerprint is not None:
+                    unchanged = await conn.execute(text(_MARK_UNCHANGED_SQL), state_params)
+                    if unchanged.first() is not None:
+                        return RefreshResult(
+                            view_name=view_name,
+                            tenant_id=tenant_id,
+                            correlation_id=correlation_id,
+                            outcome=RefreshOutcome.SKIPPED_UNCHANGED,
+                            started_at=started_at,
+                            duration_ms=int((_now_utc() - started_at).total_seconds() * 1000),
+                            error_type=None,
+                            error_message=None,
+                            lock_key_debug=lock_key,
+                        )
+
+            if entry.storage == registry.STORAGE_INCREMENTAL:
+                # Reconciliation: rebuild the tenant's summary rows (RLS-scoped, like REFRESH).
+                for statement in entry.incremental.rebuild_sql:
+                    await conn.execute(text(statement))
+            elif entry.refresh_fn:
                 result = entry.refresh_fn()
                 if asyncio.iscoroutine(result):
                     await result
@@ -155,6 +275,12 @@ async def refresh_single_async(
                 refresh_sql = entry.refresh_sql.format(qualified_name=qualified_view)
                 await conn.execute(text(refresh_sql))
 
+            if tenant_id:
+                await conn.execute(
+                    text(_RECORD_FINGERPRINT_SQL),
+                    {"tenant_id": tenant_id, "view_name": view_name, "fingerprint": fingerprint},
+                )
+
         duration_ms = int((_now_utc() - started_at).total_seconds() * 1000)
         return RefreshResult(
             view_name=view_name,
@@ -195,21 +321,19 @@ def refresh_single(
     view_name: str,
     tenant_id: Optional[UUID],
     correlation_id: Optional[str] = None,
+    *,
+    skip_unchanged: bool = False,
 ) -> RefreshResult:
     """
-    Synchronous wrapper for refresh_single_async.
+    Synchronous wrapper for refresh_single_async, on a pooled psycopg2 connection.
     """
-    import psycopg2
-
     entry = registry.get_entry(view_name)
     started_at = _now_utc()
     lock_key: Optional[RefreshLockKey] = None
 
     try:
         qualified_view = _qualified_matview_identifier(view_name)
-        dsn = _build_sync_dsn()
-        conn = psycopg2.connect(dsn)
-        try:
+        with sync_connection(_build_sync_dsn()) as conn:
             cur = conn.cursor()
             if tenant_id:
                 cur.execute(
@@ -240,7 +364,33 @@ def refresh_single(
                     lock_key_debug=lock_key,
                 )
 
-            if entry.refresh_fn:
+            fingerprint: Optional[str] = None
+            if tenant_id and entry.source_tables:
+                cur.execute(_pyformat(_SOURCE_COUNTERS_SQL), {"source_tables": list(entry.source_tables)})
+                fingerprint = _source_fingerprint(entry, cur.fetchone())
+                if skip_unchanged and fingerprint is not None:
+                    cur.execute(
+                        _pyformat(_MARK_UNCHANGED_SQL),
+                        {"tenant_id": str(tenant_id), "view_name": view_name, "fingerprint": fingerprint},
+                    )
+                    if cur.fetchone() is not None:
+                        conn.commit()
+                        return RefreshResult(
+                            view_name=view_name,
+                            tenant_id=tenant_id,
+                            correlation_id=correlation_id,
+                            outcome=RefreshOutcome.SKIPPED_UNCHANGED,
+                            started_at=started_at,
+                            duration_ms=int((_now_utc() - started_at).total_seconds() * 1000),
+                            error_type=None,
+                            error_message=None,
+                            lock_key_debug=lock_key,
+                        )
+
+            if entry.storage == registry.STORAGE_INCREMENTAL:
+                for statement in entry.incremental.rebuild_sql:
+                    cur.execute(statement)
+            elif entry.refresh_fn:
                 result = entry.refresh_fn()
                 if asyncio.iscoroutine(result):
                     raise RuntimeError("refresh_fn returned coroutine in sync executor")
@@ -250,9 +400,13 @@ def refresh_single(
                 refresh_sql = entry.refresh_sql.format(qualified_name=qualified_view)
                 cur.execute(refresh_sql)
 
+            if tenant_id:
+                cur.execute(
+                    _pyformat(_RECORD_FINGERPRINT_SQL),
+                    {"tenant_id": str(tenant_id), "view_name": view_name, "fingerprint": fingerprint},
+                )
+
             conn.commit()
-        finally:
-            conn.close()
 
         duration_ms = int((_now_utc() - started_at).total_seconds() * 1000)
         return RefreshResult(
@@ -294,10 +448,15 @@ async def refresh_all_for_tenant_async(
     tenant_id: UUID,
     correlation_id: Optional[str] = None,
 ) -> list[RefreshResult]:
-    entries = _topological_order(registry.list_entries())
+    slots = asyncio.Semaphore(_refresh_concurrency())
+
+    async def _refresh(entry: registry.MatviewRegistryEntry) -> RefreshResult:
+        async with slots:
+            return await refresh_single_async(entry.name, tenant_id, correlation_id)
+
     results: list[RefreshResult] = []
-    for entry in entries:
-        results.append(await refresh_single_async(entry.name, tenant_id, correlation_id))
+    for level in _dependency_levels(_topological_order(registry.list_entries())):
+        results.extend(await asyncio.gather(*(_refresh(entry) for entry in level)))
     return results
 
 
@@ -308,8 +467,47 @@ def refresh_all_for_tenant(
     """
     Synchronous wrapper to refresh all matviews for a tenant.
     """
-    entries = _topological_order(registry.list_entries())
+    return refresh_views(None, tenant_id, correlation_id)
+
+
+def refresh_views(
+    view_names: Optional[Iterable[str]],
+    tenant_id: Optional[UUID],
+    correlation_id: Optional[str] = None,
+    *,
+    skip_unchanged: bool = False,
+) -> list[RefreshResult]:
+    """
+    Refresh the given views (all registered views when None) for a tenant.
+
+    Each dependency level is refreshed on a bounded thread pool; every
+    refresh_single call holds its own connection and advisory lock. Results
+    keep topological order. skip_unchanged is passed to refresh_single.
+    """
+    selected = None if view_names is None else set(view_names)
     results: list[RefreshResult] = []
-    for entry in entries:
-        results.append(refresh_single(entry.name, tenant_id, correlation_id))
+    levels = _dependency_levels(
+        entry
+        for entry in _topological_order(registry.list_entries())
+        if selected is None or entry.name in selected
+    )
+    if not levels:
+        return results
+    with ThreadPoolExecutor(
+        max_workers=min(_refresh_concurrency(), max(len(level) for level in levels)),
+        thread_name_prefix="matview-refresh",
+    ) as pool:
+        for level in levels:
+            # copy_context keeps tenant/correlation log context in the workers.
+            futures = [
+                pool.submit(
+                    contextvars.copy_context().run,
+                    functools.partial(refresh_single, skip_unchanged=skip_unchanged),
+                    entry.name,
+                    tenant_id,
+                    correlation_id,
+                )
+                for entry in level
+            ]
+            results.extend(future.result() for future in futures)
     return results
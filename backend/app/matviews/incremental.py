@@ -0,0 +1,69 @@
+"""
+Delta maintenance for registry views with storage="incremental".
+
+Allocation writers call lock_allocation_summaries before their first write
+and apply_allocation_deltas in the transaction that wrote the rows, so a summary table never lags the allocations it summarises. Only
+the summary keys reachable from the written events (and from the allocation
+rows the write deleted) are re-aggregated; rows of other tenants, days and
+events are not read. Writers that bypass this hook (Bayesian enrichment,
+channel corrections, retention) are picked up by the periodic rebuild that
+the refresh scheduler runs for incremental views.
+
+Event ingestion needs no hook: allocations are only written by recompute,
+after their events exist, and attribution_events is append-only.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Iterable, Sequence
+from uuid import UUID
+
+from sqlalchemy import text
+
+from app.matviews import registry
+
+
+async def lock_allocation_summaries(conn, *, tenant_id: UUID) -> None:
+    """
+    Take the tenant's summary locks (each summary's lock_sql, in registry order).
+
+    Run before the transaction's first allocation write: the locks are held
+    until the transaction ends, so concurrent writers of a tenant's summaries
+    write and re-aggregate one after the other. Taking them again later in the
+    same transaction returns at once.
+    """
+    for entry in registry.incremental_entries():
+        if entry.incremental.lock_sql is not None:
+            await conn.execute(text(entry.incremental.lock_sql), {"tenant_id": tenant_id})
+
+
+async def apply_allocation_deltas(
+    conn,
+    *,
+    tenant_id: UUID,
+    event_ids: Iterable[UUID],
+    removed_rows: Sequence[tuple[datetime, str]] = (),
+) -> dict[str, tuple[int, int]]:
+    """
+    Re-aggregate the summary keys touched by an allocation write.
+
+    removed_rows are (created_at, channel_code) of allocation rows the write
+    deleted. The caller holds lock_allocation_summaries' locks. Returns
+    {table: (upserted, removed)} per incremental view; empty when no view uses
+    incremental storage.
+    """
+    entries = registry.incremental_entries()
+    event_ids = list(dict.fromkeys(event_ids))
+    if not entries or not (event_ids or removed_rows):
+        return {}
+    params = {
+        "tenant_id": tenant_id,
+        "event_ids": event_ids,
+        "removed_created_ats": [row[0] for row in removed_rows],
+        "removed_channel_codes": [row[1] for row in removed_rows],
+    }
+    applied: dict[str, tuple[int, int]] = {}
+    for entry in entries:
+        upserted, removed = (await conn.execute(text(entry.incremental.delta_sql), params)).one()
+        applied[entry.incremental.table] = (int(upserted), int(removed))
+    return applied
@@ -2,14 +2,29 @@
 Authoritative registry of refreshable materialized views.
 
 Closed set: only entries defined here are refreshable.
+
+storage selects how a view is kept: "matview" refreshes the materialized view;
+"incremental" keeps its IncrementalSummary table current with delta upserts
+from allocation writes, and a refresh is a full rebuild of that table
+(reconciliation). Only entries with an incremental definition may select it.
+
+source_tables lists the tables a view reads; scheduled refreshes are skipped
+while their change counters are unchanged (see app.matviews.executor). Views
+filtering on CURRENT_DATE set date_windowed so the fingerprint also changes
+daily; views without source_tables are always refreshed.
 """
 from __future__ import annotations
 
 from dataclasses import dataclass
 from typing import Callable, Iterable, Optional, Sequence
 
+from app.matviews.summaries import ALLOCATION_SUMMARY, CHANNEL_DAILY_SUMMARY, IncrementalSummary
+
 KIND_MATERIALIZED_VIEW = "materialized_view"
 
+STORAGE_MATVIEW = "matview"
+STORAGE_INCREMENTAL = "incremental"
+
 SCHEDULE_CLASS_REALTIME = "realtime"
 SCHEDULE_CLASS_MINUTE = "minute"
 SCHEDULE_CLASS_HOURLY = "hourly"
@@ -27,6 +42,16 @@ class MatviewRegistryEntry:
     max_staleness_seconds: int
     schedule_class: str
     schedule_source: str
+    storage: str = STORAGE_MATVIEW
+    incremental: Optional[IncrementalSummary] = None
+    source_tables: Sequence[str] = ()
+    date_windowed: bool = False
+
+    def __post_init__(self) -> None:
+        if self.storage not in (STORAGE_MATVIEW, STORAGE_INCREMENTAL):
+            raise ValueError(f"View '{self.name}' has unknown storage '{self.storage}'")
+        if self.storage == STORAGE_INCREMENTAL and self.incremental is None:
+            raise ValueError(f"View '{self.name}' has no incremental summary definition")
 
 
 _REGISTRY: dict[str, MatviewRegistryEntry] = {
@@ -39,6 +64,8 @@ _REGISTRY: dict[str, MatviewRegistryEntry] = {
         max_staleness_seconds=60,
         schedule_class=SCHEDULE_CLASS_REALTIME,
         schedule_source="alembic/versions/003_data_governance/202511161110_fix_mv_allocation_summary_left_join.py:93-96",
+        incremental=ALLOCATION_SUMMARY,
+        source_tables=("attribution_allocations", "attribution_events"),
     ),
     "mv_channel_performance": MatviewRegistryEntry(
         name="mv_channel_performance",
@@ -49,6 +76,9 @@ _REGISTRY: dict[str, MatviewRegistryEntry] = {
         max_staleness_seconds=3600,
         schedule_class=SCHEDULE_CLASS_HOURLY,
         schedule_source="alembic/versions/003_data_governance/202511151500_add_mv_channel_performance.py:101",
+        incremental=CHANNEL_DAILY_SUMMARY,
+        source_tables=("attribution_allocations",),
+        date_windowed=True,
     ),
     "mv_daily_revenue_summary": MatviewRegistryEntry(
         name="mv_daily_revenue_summary",
@@ -59,6 +89,7 @@ _REGISTRY: dict[str, MatviewRegistryEntry] = {
         max_staleness_seconds=3600,
         schedule_class=SCHEDULE_CLASS_HOURLY,
         schedule_source="alembic/versions/003_data_governance/202511151510_add_mv_daily_revenue_summary.py:103",
+        source_tables=("revenue_ledger",),
     ),
     "mv_realtime_revenue": MatviewRegistryEntry(
         name="mv_realtime_revenue",
@@ -69,6 +100,7 @@ _REGISTRY: dict[str, MatviewRegistryEntry] = {
         max_staleness_seconds=60,
         schedule_class=SCHEDULE_CLASS_REALTIME,
         schedule_source="alembic/versions/001_core_schema/202511131119_add_materialized_views.py:63",
+        # No source_tables: data_freshness_seconds is computed against now() at refresh time.
     ),
     "mv_reconciliation_status": MatviewRegistryEntry(
         name="mv_reconciliation_status",
@@ -79,6 +111,7 @@ _REGISTRY: dict[str, MatviewRegistryEntry] = {
         max_staleness_seconds=60,
         schedule_class=SCHEDULE_CLASS_REALTIME,
         schedule_source="alembic/versions/001_core_schema/202511131119_add_materialized_views.py:90",
+        source_tables=("reconciliation_runs",),
     ),
 }
 
@@ -107,6 +140,13 @@ def list_names() -> list[str]:
     return list(_REGISTRY.keys())
 
 
+def incremental_entries() -> list[MatviewRegistryEntry]:
+    """
+    Return entries whose storage is "incremental", in deterministic order.
+    """
+    return [entry for entry in _REGISTRY.values() if entry.storage == STORAGE_INCREMENTAL]
+
+
 def all_entries() -> Iterable[MatviewRegistryEntry]:
     """
     Iterator over registry entries.
@@ -0,0 +1,244 @@
+"""
+Deduplicated matview refresh scheduling.
+
+matview_refresh_state holds one row per (tenant, registered view). Refresh
+requests only mark rows dirty; request_refresh hands a dirty view out for
+refresh at most once per its registry max_staleness_seconds, however many
+requests arrived in between. Claiming stamps last_refreshed_at and clears
+dirty_since in one UPDATE, so concurrent claimers cannot both win, and marks
+that land while a refresh runs leave the row dirty for the next claim.
+
+State is per tenant rather than global because REFRESH MATERIALIZED VIEW runs
+under the refreshing tenant's RLS context: two tenants' refreshes of the same
+view are different refreshes.
+
+Views that are never marked dirty are still refreshed once their last refresh
+is older than MATVIEW_IDLE_REFRESH_SECONDS (and their staleness budget), which
+covers writers that do not request refreshes. Views with incremental storage
+are kept current by delta upserts, so their refresh (a reconciliation rebuild)
+is only due on that idle cadence.
+
+Claimed refreshes run with skip_unchanged, so a view whose source fingerprint
+has not moved is not rebuilt. Fingerprint counters are published with the
+statistics flush delay, so the first SKIPPED_UNCHANGED after a real refresh
+leaves the view dirty; the skip is trusted once a second check, one staleness
+budget later, still finds it unchanged.
+"""
+from __future__ import annotations
+
+import os
+from typing import Iterable, Optional
+from uuid import UUID
+
+from app.db.sync_pool import sync_connection
+from app.matviews import registry
+from app.matviews.executor import RefreshOutcome, RefreshResult, _build_sync_dsn
+
+_DEFAULT_IDLE_REFRESH_SECONDS = 3600
+
+# A (tenant, view) row is due when it was never refreshed, when it is dirty and
+# its staleness budget has elapsed, or when it is idle past the backstop.
+_DUE_PREDICATE = """
+    (
+        s.last_refreshed_at IS NULL
+        OR (
+            s.dirty_since IS NOT NULL
+            AND s.last_refreshed_at <= now() - make_interval(secs => b.max_staleness_seconds)
+        )
+        OR s.last_refreshed_at
+            <= now() - make_interval(secs => GREATEST(b.max_staleness_seconds, %(idle_seconds)s))
+    )
+"""
+
+
+def _idle_refresh_seconds() -> int:
+    try:
+        return max(0, int(os.getenv("MATVIEW_IDLE_REFRESH_SECONDS", str(_DEFAULT_IDLE_REFRESH_SECONDS))))
+    except ValueError:
+        return _DEFAULT_IDLE_REFRESH_SECONDS
+
+
+def _budget_params(view_names: Optional[Iterable[str]] = None) -> dict:
+    entries = registry.list_entries()
+    if view_names is not None:
+        wanted = set(view_names)
+        entries = [entry for entry in entries if entry.name in wanted]
+    idle_seconds = _idle_refresh_seconds()
+    return {
+        "view_names": [entry.name for entry in entries],
+        "max_staleness": [
+            int(entry.max_staleness_seconds)
+            if entry.storage == registry.STORAGE_MATVIEW
+            else max(int(entry.max_staleness_seconds), idle_seconds)
+            for entry in entries
+        ],
+        "idle_seconds": idle_seconds,
+    }
+
+
+def _connect():
+    return sync_connection(_build_sync_dsn())
+
+
+def _set_tenant(cur, tenant_id: UUID) -> None:
+    cur.execute("SELECT set_config('app.current_tenant_id', %s, true)", (str(tenant_id),))
+
+
+def request_refresh(
+    tenant_id: UUID,
+    view_names: Optional[Iterable[str]] = None,
+    *,
+    mark_dirty: bool = True,
+) -> list[str]:
+    """
+    Mark views dirty for a tenant (all registered views when None) and claim the due ones.
+
+    Returns the claimed view names; the caller must refresh them and report
+    back through record_refresh_results. Views that are dirty but inside their
+    staleness budget are left for a later claim (pulse_matviews_global).
+    With mark_dirty=False only missing rows are created, so a scheduler pass
+    claims what is already due without adding demand.
+    """
+    params = {**_budget_params(view_names), "tenant_id": str(tenant_id)}
+    with _connect() as conn:
+        with conn:
+            cur = conn.cursor()
+            _set_tenant(cur, tenant_id)
+            # One statement; rows that are already dirty are not rewritten.
+            cur.execute(
+                f"""
+                INSERT INTO matview_refresh_state AS s (tenant_id, view_name, dirty_since)
+                SELECT %(tenant_id)s, view_name, {"now()" if mark_dirty else "NULL"}
+                FROM unnest(%(view_names)s::text[]) AS v(view_name)
+                ON CONFLICT (tenant_id, view_name) DO UPDATE
+                SET dirty_since = EXCLUDED.dirty_since
+                WHERE s.dirty_since IS NULL AND EXCLUDED.dirty_since IS NOT NULL
+                """,
+                params,
+            )
+            cur.execute(
+                f"""
+                UPDATE matview_refresh_state AS s
+                SET dirty_since = NULL,
+                    last_refreshed_at = now()
+                FROM unnest(%(view_names)s::text[], %(max_staleness)s::int[]) AS b(view_name, max_staleness_seconds)
+                WHERE s.tenant_id = %(tenant_id)s
+                  AND s.view_name = b.view_name
+                  AND {_DUE_PREDICATE}
+                RETURNING s.view_name
+                """,
+                params,
+            )
+            claimed = {row[0] for row in cur.fetchall()}
+    return [name for name in params["view_names"] if name in claimed]
+
+
+def record_refresh_results(tenant_id: UUID, results: Iterable[RefreshResult]) -> None:
+    """
+    Store each claimed refresh's outcome; a view that did not refresh is marked dirty again.
+
+    last_refreshed_at keeps the claim time, so a failing view is retried at
+    most once per its staleness budget. An unconfirmed SKIPPED_UNCHANGED (the
+    previous outcome was not a skip) also stays dirty for one more check.
+    """
+    outcomes = [(result.view_name, result.outcome.value) for result in results]
+    if not outcomes:
+        return
+    with _connect() as conn:
+        with conn:
+            cur = conn.cursor()
+            _set_tenant(cur, tenant_id)
+            cur.execute(
+                """
+                UPDATE matview_refresh_state AS s
+                SET last_outcome = r.outcome,
+                    dirty_since = CASE
+                        WHEN r.outcome = %(success)s THEN s.dirty_since
+                        WHEN r.outcome = %(unchanged)s AND s.last_outcome = %(unchanged)s THEN s.dirty_since
+                        ELSE COALESCE(s.dirty_since, now()) END
+                FROM unnest(%(view_names)s::text[], %(outcomes)s::text[]) AS r(view_name, outcome)
+                WHERE s.tenant_id = %(tenant_id)s AND s.view_name = r.view_name
+                """,
+                {
+                    "tenant_id": str(tenant_id),
+                    "view_names": [name for name, _ in outcomes],
+                    "outcomes": [outcome for _, outcome in outcomes],
+                    "success": RefreshOutcome.SUCCESS.value,
+                    "unchanged": RefreshOutcome.SKIPPED_UNCHANGED.value,
+                },
+            )
+
+
+def tenants_with_due_views(tenant_ids: Iterable[UUID]) -> list[UUID]:
+    """
+    Return the tenants with at least one due view (a view with no row yet counts as due).
+
+    One connection for the whole pass; the tenant GUC is switched per tenant
+    because matview_refresh_state is RLS-scoped.
+    """
+    params = _budget_params()
+    due: list[UUID] = []
+    with _connect() as conn:
+        with conn:
+            cur = conn.cursor()
+            for tenant_id in tenant_ids:
+                _set_tenant(cur, tenant_id)
+                cur.execute(
+                    f"""
+                    SELECT EXISTS (
+                        SELECT 1
+                        FROM unnest(%(view_names)s::text[], %(max_staleness)s::int[])
+                            AS b(view_name, max_staleness_seconds)
+                        LEFT JOIN matview_refresh_state AS s
+                            ON s.tenant_id = %(tenant_id)s AND s.view_name = b.view_name
+                        WHERE s.view_name IS NULL OR {_DUE_PREDICATE}
+                    )
+                    """,
+                    {**params, "tenant_id": str(tenant_id)},
+                )
+                if cur.fetchone()[0]:
+                    due.append(tenant_id)
+    return due
+
+
+def view_freshness(tenant_ids: Iterable[UUID]) -> dict[str, tuple[Optional[float], Optional[float]]]:
+    """
+    Return {view_name: (age_seconds, skip_ratio)} across tenants for every registered view.
+
+    age_seconds is the largest time since a tenant's copy was last refreshed
+    or found unchanged; skip_ratio is the share of tenants whose latest
+    refresh outcome was SKIPPED_UNCHANGED. Either is None when no tenant has
+    a value yet.
+    """
+    view_names = registry.list_names()
+    ages: dict[str, list[float]] = {name: [] for name in view_names}
+    outcomes: dict[str, list[str]] = {name: [] for name in view_names}
+    with _connect() as conn:
+        with conn:
+            cur = conn.cursor()
+            for tenant_id in tenant_ids:
+                _set_tenant(cur, tenant_id)
+                cur.execute(
+                    """
+                    SELECT view_name,
+                           EXTRACT(EPOCH FROM now() - current_as_of)::float8,
+                           last_outcome
+                    FROM matview_refresh_state
+                    WHERE tenant_id = %(tenant_id)s
+                      AND view_name = ANY(%(view_names)s::text[])
+                    """,
+                    {"tenant_id": str(tenant_id), "view_names": view_names},
+                )
+                for view_name, age_seconds, last_outcome in cur.fetchall():
+                    if age_seconds is not None:
+                        ages[view_name].append(age_seconds)
+                    if last_outcome is not None:
+                        outcomes[view_name].append(last_outcome)
+    unchanged = RefreshOutcome.SKIPPED_UNCHANGED.value
+    return {
+        name: (
+            max(ages[name], default=None),
+            outcomes[name].count(unchanged) / len(outcomes[name]) if outcomes[name] else None,
+        )
+        for name in view_names
+    }
@@ -0,0 +1,203 @@
+"""
+Summary-table definitions for registry views with storage="incremental".
+
+Each IncrementalSummary mirrors one materialized view's query in a plain
+table that allocation writers keep current with key-scoped delta statements
+(app.matviews.incremental). rebuild_sql is the reconciliation path: it
+recomputes the whole table for the tenant in the RLS context, exactly as
+REFRESH MATERIALIZED VIEW does for the matview.
+
+Delta statements take :tenant_id, :event_ids (events whose allocations were
+written) and :removed_created_ats / :removed_channel_codes (allocation rows
+the write deleted), re-aggregate only the summary keys those rows map to,
+upsert the keys that still have rows (skipping unchanged ones) and delete
+the keys that no longer do.
+
+lock_sql, when set, takes :tenant_id and one transaction-scoped advisory
+lock for (tenant, summary). Writers run it before their first allocation
+write (app.matviews.incremental.lock_allocation_summaries), so concurrent
+writers of a tenant's summary run one after the other: under READ COMMITTED
+each delta statement then sees every allocation committed by the writer
+before it, instead of overwriting that writer's result with an aggregate
+from an older snapshot.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class IncrementalSummary:
+    table: str
+    key_columns: tuple[str, ...]
+    rebuild_sql: tuple[str, ...]
+    delta_sql: str
+    lock_sql: Optional[str] = None
+
+
+_ALLOCATION_SUMMARY_SELECT = """
+    SELECT aa.tenant_id,
+        aa.event_id,
+        aa.model_version,
+        sum(aa.allocated_revenue_cents) AS total_allocated_cents,
+        e.revenue_cents AS event_revenue_cents,
+        CASE
+            WHEN e.revenue_cents IS NULL THEN NULL::boolean
+            ELSE sum(aa.allocated_revenue_cents) = e.revenue_cents
+        END AS is_balanced,
+        CASE
+            WHEN e.revenue_cents IS NULL THEN NULL::bigint
+            ELSE abs(sum(aa.allocated_revenue_cents) - e.revenue_cents)
+        END AS drift_cents
+    FROM attribution_allocations aa
+    LEFT JOIN attribution_events e ON aa.event_id = e.id
+"""
+_ALLOCATION_SUMMARY_GROUP_BY = "GROUP BY aa.tenant_id, aa.event_id, aa.model_version, e.revenue_cents"
+
+ALLOCATION_SUMMARY = IncrementalSummary(
+    table="attribution_allocation_summary",
+    key_columns=("tenant_id", "event_id", "model_version"),
+    rebuild_sql=(
+        "DELETE FROM attribution_allocation_summary",
+        f"""
+        INSERT INTO attribution_allocation_summary (
+            tenant_id, event_id, model_version, total_allocated_cents,
+            event_revenue_cents, is_balanced, drift_cents
+        )
+        {_ALLOCATION_SUMMARY_SELECT}
+        {_ALLOCATION_SUMMARY_GROUP_BY}
+        """,
+    ),
+    delta_sql=f"""
+    WITH fresh AS (
+        {_ALLOCATION_SUMMARY_SELECT}
+        WHERE aa.tenant_id = :tenant_id
+          AND aa.event_id = ANY(CAST(:event_ids AS uuid[]))
+        {_ALLOCATION_SUMMARY_GROUP_BY}
+    ),
+    upserted AS (
+        INSERT INTO attribution_allocation_summary AS s (
+            tenant_id, event_id, model_version, total_allocated_cents,
+            event_revenue_cents, is_balanced, drift_cents
+        )
+        SELECT * FROM fresh
+        ON CONFLICT (tenant_id, event_id, model_version) DO UPDATE SET
+            total_allocated_cents = EXCLUDED.total_allocated_cents,
+            event_revenue_cents = EXCLUDED.event_revenue_cents,
+            is_balanced = EXCLUDED.is_balanced,
+            drift_cents = EXCLUDED.drift_cents
+        WHERE (s.total_allocated_cents, s.event_revenue_cents, s.is_balanced, s.drift_cents)
+            IS DISTINCT FROM (
+                EXCLUDED.total_allocated_cents, EXCLUDED.event_revenue_cents,
+                EXCLUDED.is_balanced, EXCLUDED.drift_cents
+            )
+        RETURNING 1
+    ),
+    removed AS (
+        DELETE FROM attribution_allocation_summary s
+        WHERE s.tenant_id = :tenant_id
+          AND s.event_id = ANY(CAST(:event_ids AS uuid[]))
+          AND NOT EXISTS (
+              SELECT 1 FROM fresh f WHERE f.event_id = s.event_id AND f.model_version = s.model_version
+          )
+        RETURNING 1
+    )
+    SELECT (SELECT count(*) FROM upserted), (SELECT count(*) FROM removed)
+    """,
+)
+
+_CHANNEL_DAILY_SELECT = """
+    SELECT aa.tenant_id,
+        aa.channel_code,
+        date_trunc('day', aa.created_at) AS allocation_date,
+        count(DISTINCT aa.event_id) AS total_conversions,
+        sum(aa.allocated_revenue_cents) AS total_revenue_cents,
+        avg(aa.confidence_score) AS avg_confidence_score,
+        count(*) AS total_allocations
+    FROM attribution_allocations aa
+"""
+_CHANNEL_DAILY_WINDOW = "aa.created_at >= (CURRENT_DATE - '90 days'::interval)"
+_CHANNEL_DAILY_GROUP_BY = "GROUP BY aa.tenant_id, aa.channel_code, date_trunc('day', aa.created_at)"
+# One lock per tenant, not per summary key: a writer's rows can map to several
+# days (rows of other model versions, created_at kept on conflict), and
+# per-key locks taken batch by batch would deadlock two writers that reach the
+# same keys in different orders.
+_CHANNEL_DAILY_LOCK_SQL = """
+    SELECT pg_advisory_xact_lock(
+        hashtext('attribution_channel_daily_summary:' || CAST(CAST(:tenant_id AS uuid) AS text))
+    )
+"""
+
+CHANNEL_DAILY_SUMMARY = IncrementalSummary(
+    table="attribution_channel_daily_summary",
+    key_columns=("tenant_id", "channel_code", "allocation_date"),
+    rebuild_sql=(
+        "DELETE FROM attribution_channel_daily_summary",
+        f"""
+        INSERT INTO attribution_channel_daily_summary (
+            tenant_id, channel_code, allocation_date, total_conversions,
+            total_revenue_cents, avg_confidence_score, total_allocations
+        )
+        {_CHANNEL_DAILY_SELECT}
+        WHERE {_CHANNEL_DAILY_WINDOW}
+        {_CHANNEL_DAILY_GROUP_BY}
+        """,
+    ),
+    delta_sql=f"""
+    WITH keys AS (
+        SELECT DISTINCT aa.channel_code, date_trunc('day', aa.created_at) AS allocation_date
+        FROM attribution_allocations aa
+        WHERE aa.tenant_id = :tenant_id
+          AND aa.event_id = ANY(CAST(:event_ids AS uuid[]))
+        UNION
+        SELECT r.channel_code, date_trunc('day', r.created_at)
+        FROM unnest(
+            CAST(:removed_created_ats AS timestamptz[]),
+            CAST(:removed_channel_codes AS text[])
+        ) AS r(created_at, channel_code)
+    ),
+    fresh AS (
+        {_CHANNEL_DAILY_SELECT}
+        JOIN keys k
+          ON aa.channel_code = k.channel_code
+         AND aa.created_at >= k.allocation_date
+         AND aa.created_at < k.allocation_date + '1 day'::interval
+        WHERE aa.tenant_id = :tenant_id
+          AND {_CHANNEL_DAILY_WINDOW}
+        {_CHANNEL_DAILY_GROUP_BY}
+    ),
+    upserted AS (
+        INSERT INTO attribution_channel_daily_summary AS s (
+            tenant_id, channel_code, allocation_date, total_conversions,
+            total_revenue_cents, avg_confidence_score, total_allocations
+        )
+        SELECT * FROM fresh
+        ON CONFLICT (tenant_id, channel_code, allocation_date) DO UPDATE SET
+            total_conversions = EXCLUDED.total_conversions,
+            total_revenue_cents = EXCLUDED.total_revenue_cents,
+            avg_confidence_score = EXCLUDED.avg_confidence_score,
+            total_allocations = EXCLUDED.total_allocations
+        WHERE (s.total_conversions, s.total_revenue_cents, s.avg_confidence_score, s.total_allocations)
+            IS DISTINCT FROM (
+                EXCLUDED.total_conversions, EXCLUDED.total_revenue_cents,
+                EXCLUDED.avg_confidence_score, EXCLUDED.total_allocations
+            )
+        RETURNING 1
+    ),
+    removed AS (
+        DELETE FROM attribution_channel_daily_summary s
+        USING keys k
+        WHERE s.tenant_id = :tenant_id
+          AND s.channel_code = k.channel_code
+          AND s.allocation_date = k.allocation_date
+          AND NOT EXISTS (
+              SELECT 1 FROM fresh f
+              WHERE f.channel_code = s.channel_code AND f.allocation_date = s.allocation_date
+          )
+        RETURNING 1
+    )
+    SELECT (SELECT count(*) FROM upserted), (SELECT count(*) FROM removed)
+    """,
+    lock_sql=_CHANNEL_DAILY_LOCK_SQL,
+)
@@ -1,30 +1,43 @@
 import uuid
-from typing import Callable
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.observability.context import (
     set_request_correlation_id,
     set_business_correlation_id,
     set_tenant_id,
-    get_request_correlation_id,
 )
 
 
-class ObservabilityMiddleware(BaseHTTPMiddleware):
+class ObservabilityMiddleware:
     """
     Captures correlation_id from header (X-Correlation-ID) or generates one.
     Adds the correlation_id to response headers and initializes tenant_id context (filled later).
+
+    Raw ASGI middleware: the header is injected into http.response.start, so
+    responses are streamed through untouched.
     """
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        correlation_id = request.headers.get("X-Correlation-ID") or str(uuid.uuid4())
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        correlation_id = Headers(scope=scope).get("X-Correlation-ID") or str(uuid.uuid4())
         set_request_correlation_id(correlation_id)
         # business correlation is set later (idempotency key)
         set_business_correlation_id(None)
         set_tenant_id(None)
 
-        response = await call_next(request)
-        response.headers["X-Correlation-ID"] = get_request_correlation_id() or correlation_id
-        return response
+        async def send_with_correlation_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Echo the request-scoped ID. Downstream code (e.g. eagerly run tasks)
+                # may rebind the contextvar; that must not leak into the response.
+                MutableHeaders(scope=message)["X-Correlation-ID"] = correlation_id
+            await send(message)
+
+        await self.app(scope, receive, send_with_correlation_id)
@@ -19,19 +19,30 @@ PII Keys Detected:
 - passport: Passport numbers
 
 Behavior:
-- Recursively traverses incoming JSON payloads
+- Scans incoming JSON payloads (bounded depth/size) and copies only the
+  branches that contain PII keys
 - Replaces values of PII keys with "[REDACTED]"
 - Logs redaction events for monitoring
 - Allows request to proceed (does not block)
+- Leaves the parsed, sanitized payload on request.state.parsed_body so webhook
+  routes and schema validation reuse it instead of re-parsing the body
 """
 
 import json
 import logging
 import os
+import re
 from typing import Any, Dict, Set
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import JSONResponse, Response
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+try:
+    import orjson
+except ImportError:  # optional dependency; stdlib json is the default backend
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
@@ -73,8 +84,43 @@ except ValueError:
     WEBHOOK_AUTH_MAX_BODY_BYTES = _WEBHOOK_AUTH_MAX_BODY_BYTES_DEFAULT
 
 
-def _content_length_header(request: Request) -> int | None:
-    raw = request.headers.get("content-length")
+# request.state attribute carrying the sanitized JSON payload (parse-once pipeline).
+PARSED_BODY_STATE_KEY = "parsed_body"
+
+
+# orjson decodes integers beyond 64 bits as floats; bodies with digit runs that
+# long go through the stdlib so parsed values never depend on the backend.
+_ORJSON_UNSAFE_DIGITS = re.compile(rb"\d{19,}")
+
+
+def _json_loads(body: bytes) -> tuple[Any, bool]:
+    """
+    Parse a JSON body with the configured backend.
+
+    Returns (payload, used_orjson). Inputs orjson rejects (NaN/Infinity
+    literals) or would decode differently (oversized integers) fall back to the
+    stdlib, so the accepted payloads and their values never change with the backend.
+    """
+    if (
+        orjson is not None
+        and settings.WEBHOOK_JSON_BACKEND == "orjson"
+        and not _ORJSON_UNSAFE_DIGITS.search(body)
+    ):
+        try:
+            return orjson.loads(body), True
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(body), False
+
+
+def _json_dumps(payload: Any, *, use_orjson: bool) -> bytes:
+    if use_orjson:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode("utf-8")
+
+
+def _content_length_header(headers: Headers) -> int | None:
+    raw = headers.get("content-length")
     if raw is None:
         return None
     try:
@@ -129,119 +175,241 @@ def strip_pii_keys_recursive(data: Any, path: str = "root") -> tuple[Any, list[s
         return data, redacted_keys
 
 
-class PIIStrippingMiddleware(BaseHTTPMiddleware):
+# Precompiled lookup set for the path-lazy engine below.
+_PII_KEYS_LOWER: frozenset[str] = frozenset(key.lower() for key in PII_KEYS)
+
+# Bounds on what the PII scanner will walk. A 1 MiB body cannot legitimately
+# nest 64 containers deep or hold a quarter of a million values.
+PII_SCAN_MAX_DEPTH = 64
+PII_SCAN_MAX_NODES = 250_000
+
+
+class PIIScanLimitExceeded(ValueError):
+    """Payload nesting depth or node count exceeds the PII scanner's bounds."""
+
+
+def redact_pii_keys(
+    data: Any,
+    *,
+    max_depth: int = PII_SCAN_MAX_DEPTH,
+    max_nodes: int = PII_SCAN_MAX_NODES,
+) -> tuple[Any, list[str]]:
     """
-    FastAPI middleware that strips PII from incoming request payloads.
-    
+    Path-lazy equivalent of strip_pii_keys_recursive.
+
+    A read-only pre-scan marks every container whose subtree holds a PII key;
+    only those containers are copied, every other branch is shared with the
+    input (the input itself is never mutated). Path strings are rendered only
+    for stripped keys. Serializes byte-identically to strip_pii_keys_recursive
+    and returns the same redacted paths in the same order.
+
+    Raises:
+        PIIScanLimitExceeded: nesting deeper than max_depth containers or more
+            than max_nodes values in total.
+    """
+    hit_ids: set[int] = set()
+    if not _scan_for_pii(data, 0, max_depth, [max_nodes], hit_ids):
+        return data, []
+    redacted_keys: list[str] = []
+    return _copy_pii_branches(data, [], hit_ids, redacted_keys), redacted_keys
+
+
+def _scan_for_pii(data: Any, depth: int, max_depth: int, budget: list[int], hit_ids: set[int]) -> bool:
+    if isinstance(data, dict):
+        hit = not _PII_KEYS_LOWER.isdisjoint(map(str.lower, data))
+        children = data.values()
+    elif isinstance(data, list):
+        hit = False
+        children = data
+    else:
+        return False
+
+    if depth >= max_depth:
+        raise PIIScanLimitExceeded(f"payload nesting exceeds {max_depth} levels")
+    budget[0] -= len(data)
+    if budget[0] < 0:
+        raise PIIScanLimitExceeded("payload exceeds PII scan node budget")
+
+    for child in children:
+        if isinstance(child, (dict, list)) and _scan_for_pii(child, depth + 1, max_depth, budget, hit_ids):
+            hit = True
+    if hit:
+        hit_ids.add(id(data))
+    return hit
+
+
+def _copy_pii_branches(data: Any, segments: list[Any], hit_ids: set[int], redacted_keys: list[str]) -> Any:
+    # Only called for containers in hit_ids; segments holds dict keys (str) and
+    # list indices (int) from the root, rendered only when a key is stripped.
+    if isinstance(data, dict):
+        sanitized: dict[str, Any] = {}
+        for key, value in data.items():
+            if key.lower() in _PII_KEYS_LOWER:
+                redacted_keys.append(f"{_render_path(segments)}.{key}")
+                continue
+            if id(value) in hit_ids:
+                segments.append(key)
+                value = _copy_pii_branches(value, segments, hit_ids, redacted_keys)
+                segments.pop()
+            sanitized[key] = value
+        return sanitized
+
+    sanitized_list = list(data)
+    for index, item in enumerate(data):
+        if id(item) in hit_ids:
+            segments.append(index)
+            sanitized_list[index] = _copy_pii_branches(item, segments, hit_ids, redacted_keys)
+            segments.pop()
+    return sanitized_list
+
+
+def _render_path(segments: list[Any]) -> str:
+    return "root" + "".join(f"[{s}]" if type(s) is int else f".{s}" for s in segments)
+
+
+class PIIStrippingMiddleware:
+    """
+    ASGI middleware that strips PII from incoming request payloads.
+
     Executes before Pydantic validation to ensure PII never reaches
-    application logic or database layer.
-    
+    application logic or database layer. Implemented as a raw ASGI middleware
+    (no BaseHTTPMiddleware task/stream per request); non-ingestion requests pass
+    straight through.
+
+    Request state set for ingestion JSON requests:
+        original_body: raw bytes as received (signature verification input)
+        pii_redacted_paths: paths of stripped keys
+        parsed_body: sanitized payload (see PARSED_BODY_STATE_KEY)
+
     Usage:
         app.add_middleware(PIIStrippingMiddleware)
     """
-    
-    async def dispatch(self, request: Request, call_next):
-        """
-        Process request and strip PII from JSON payloads.
-        
-        Args:
-            request: Incoming HTTP request
-            call_next: Next middleware/handler in chain
-        
-        Returns:
-            HTTP response from downstream handler
-        """
-        # Only process ingestion-boundary requests.
-        if not any(request.url.path.startswith(prefix) for prefix in PII_STRIP_PATH_PREFIXES):
-            return await call_next(request)
-
-        # Only process POST/PUT/PATCH requests with JSON content
-        if request.method in ["POST", "PUT", "PATCH"]:
-            content_type = request.headers.get("content-type", "")
-            content_length = _content_length_header(request)
-            if content_length == -1 or (content_length is not None and content_length < 0):
-                return JSONResponse(
-                    status_code=400,
-                    content={"detail": WEBHOOK_INVALID_PAYLOAD_DETAIL},
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Only process ingestion-boundary POST/PUT/PATCH requests.
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in ("POST", "PUT", "PATCH")
+            or not any(scope["path"].startswith(prefix) for prefix in PII_STRIP_PATH_PREFIXES)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        content_type = headers.get("content-type", "")
+        content_length = _content_length_header(headers)
+        if content_length == -1 or (content_length is not None and content_length < 0):
+            response = JSONResponse(status_code=400, content={"detail": WEBHOOK_INVALID_PAYLOAD_DETAIL})
+            await response(scope, receive, send)
+            return
+        if content_length is not None and content_length > WEBHOOK_AUTH_MAX_BODY_BYTES:
+            response = JSONResponse(status_code=413, content={"detail": WEBHOOK_PAYLOAD_TOO_LARGE_DETAIL})
+            await response(scope, receive, send)
+            return
+
+        if "application/json" not in content_type:
+            await self.app(scope, receive, send)
+            return
+
+        # Read request body with a strict upper bound to prevent oversized
+        # payloads from forcing unbounded parse/HMAC work.
+        chunks: list[bytes] = []
+        body_size = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunk = message.get("body", b"")
+            body_size += len(chunk)
+            if body_size > WEBHOOK_AUTH_MAX_BODY_BYTES:
+                response = JSONResponse(status_code=413, content={"detail": WEBHOOK_PAYLOAD_TOO_LARGE_DETAIL})
+                await response(scope, receive, send)
+                return
+            chunks.append(chunk)
+            more_body = message.get("more_body", False)
+        body = b"".join(chunks)
+
+        state = scope.setdefault("state", {})
+        state["original_body"] = body
+        downstream_body = body
+        if body:
+            try:
+                downstream_body = self._strip_body(scope, state, body)
+            except PIIScanLimitExceeded as e:
+                # Never forward a payload the scanner could not fully inspect.
+                logger.warning(
+                    "PII scan limit exceeded, rejecting ingestion request",
+                    extra={
+                        "event_type": "pii_scan_limit_exceeded",
+                        "path": scope["path"],
+                        "method": scope["method"],
+                        "error": str(e),
+                    },
                 )
-            if content_length is not None and content_length > WEBHOOK_AUTH_MAX_BODY_BYTES:
-                return JSONResponse(
-                    status_code=413,
-                    content={"detail": WEBHOOK_PAYLOAD_TOO_LARGE_DETAIL},
+                response = JSONResponse(status_code=400, content={"detail": WEBHOOK_INVALID_PAYLOAD_DETAIL})
+                await response(scope, receive, send)
+                return
+            except Exception as e:
+                logger.error(
+                    f"Error during PII redaction: {e}",
+                    extra={
+                        "event_type": "pii_redaction_error",
+                        "path": scope["path"],
+                        "method": scope["method"],
+                        "error": str(e)
+                    }
                 )
+                # Continue processing request despite error
 
-            if "application/json" in content_type:
-                try:
-                    # Read request body with a strict upper bound to prevent oversized
-                    # payloads from forcing unbounded parse/HMAC work.
-                    chunks: list[bytes] = []
-                    body_size = 0
-                    async for chunk in request.stream():
-                        body_size += len(chunk)
-                        if body_size > WEBHOOK_AUTH_MAX_BODY_BYTES:
-                            return JSONResponse(
-                                status_code=413,
-                                content={"detail": WEBHOOK_PAYLOAD_TOO_LARGE_DETAIL},
-                            )
-                        chunks.append(chunk)
-                    body = b"".join(chunks)
-
-                    async def _restore_receive():
-                        return {"type": "http.request", "body": body, "more_body": False}
-
-                    request._receive = _restore_receive
-                    request._body = body
-                    setattr(request.state, "original_body", body)
-                    
-                    if body:
-                        # Parse JSON
-                        try:
-                            payload = json.loads(body)
-                        except json.JSONDecodeError:
-                            # Invalid JSON - let it pass through for proper error handling
-                            logger.warning("Invalid JSON in request body, skipping PII redaction")
-                            return await call_next(request)
-                        
-                        # Strip PII keys
-                        redacted_payload, redacted_keys = strip_pii_keys_recursive(payload)
-                        setattr(request.state, "pii_redacted_paths", redacted_keys)
-                        
-                        # Log redaction events
-                        if redacted_keys:
-                            logger.info(
-                                "PII keys stripped from ingestion request",
-                                extra={
-                                    "event_type": "pii_redaction",
-                                    "path": request.url.path,
-                                    "method": request.method,
-                                    "redacted_keys": redacted_keys,
-                                    "redaction_count": len(redacted_keys)
-                                }
-                            )
-                        
-                        # Replace request body with redacted version
-                        redacted_body = json.dumps(redacted_payload).encode('utf-8')
-                        
-                        # Create new request with redacted body
-                        async def receive():
-                            return {"type": "http.request", "body": redacted_body}
-                        
-                        request._receive = receive
-                        # Starlette caches request.body() on first read; override cache too.
-                        request._body = redacted_body
-                
-                except Exception as e:
-                    logger.error(
-                        f"Error during PII redaction: {e}",
-                        extra={
-                            "event_type": "pii_redaction_error",
-                            "path": request.url.path,
-                            "method": request.method,
-                            "error": str(e)
-                        }
-                    )
-                    # Continue processing request despite error
-        
-        # Continue to next middleware/handler
-        response = await call_next(request)
-        return response
+        await self.app(scope, _replay_receive(downstream_body, receive), send)
+
+    @staticmethod
+    def _strip_body(scope: Scope, state: dict, body: bytes) -> bytes:
+        # Parse JSON (the only parse for this request; see PARSED_BODY_STATE_KEY)
+        try:
+            payload, used_orjson = _json_loads(body)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            # Invalid JSON - let it pass through for proper error handling
+            logger.warning("Invalid JSON in request body, skipping PII redaction")
+            return body
+
+        # Strip PII keys (raises PIIScanLimitExceeded for pathological nesting/size)
+        redacted_payload, redacted_keys = redact_pii_keys(payload)
+        state["pii_redacted_paths"] = redacted_keys
+
+        # Log redaction events
+        if redacted_keys:
+            logger.info(
+                "PII keys stripped from ingestion request",
+                extra={
+                    "event_type": "pii_redaction",
+                    "path": scope["path"],
+                    "method": scope["method"],
+                    "redacted_keys": redacted_keys,
+                    "redaction_count": len(redacted_keys)
+                }
+            )
+
+        # Replace request body with redacted version. Raw-body readers
+        # see the redacted bytes; JSON consumers take the object below.
+        redacted_body = _json_dumps(redacted_payload, use_orjson=used_orjson)
+        state[PARSED_BODY_STATE_KEY] = redacted_payload
+        return redacted_body
+
+
+def _replay_receive(body: bytes, receive: Receive) -> Receive:
+    """Serve the (redacted) body once, then defer to the server for disconnects."""
+    sent = False
+
+    async def replay() -> Message:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return replay
@@ -12,6 +12,7 @@ B0.5.6.7 topology guardrail:
 Label policy enforcement:
 - Celery task metrics: task_name only (bounded by ALLOWED_TASK_NAMES)
 - Matview metrics: view_name + outcome (bounded by ALLOWED_VIEW_NAMES × ALLOWED_OUTCOMES)
+- Matview freshness gauges: view_name only (bounded by ALLOWED_VIEW_NAMES)
 
 Multiprocess Mode (B0.5.6.5: worker/exporter):
     For pre-forked Celery workers, set
@@ -26,7 +27,7 @@ Multiprocess Mode (B0.5.6.5: worker/exporter):
     
     Without PROMETHEUS_MULTIPROC_DIR, metrics are process-local to the worker process.
 """
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Gauge, Histogram
 
 
 # =============================================================================
@@ -86,6 +87,27 @@ matview_refresh_failures_total = Counter(
 )
 
 
+# =============================================================================
+# Materialized View Freshness Gauges (view_name only)
+# =============================================================================
+# Set by pulse_matviews_global from matview_refresh_state, aggregated across
+# tenants. mostrecent: the last pulse wins, whichever worker process ran it.
+
+matview_refresh_age_seconds = Gauge(
+    "matview_refresh_age_seconds",
+    "Largest time across tenants since the view was last refreshed or found unchanged",
+    ["view_name"],
+    multiprocess_mode="mostrecent",
+)
+
+matview_refresh_skip_ratio = Gauge(
+    "matview_refresh_skip_ratio",
+    "Share of tenants whose latest view refresh was skipped because its sources were unchanged",
+    ["view_name"],
+    multiprocess_mode="mostrecent",
+)
+
+
 # =============================================================================
 # Multiprocess Shard Hygiene (B0.5.6.5: parent-owned pruning)
 # =============================================================================
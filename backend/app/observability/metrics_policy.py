@@ -98,6 +98,8 @@ ALLOWED_TASK_NAMES: frozenset[str] = frozenset({
     "app.tasks.maintenance.enforce_data_retention",
     # attribution
     "app.tasks.attribution.recompute_window",
+    "app.tasks.attribution.recompute_range",
+    "app.tasks.attribution.finalize_recompute_range",
     # r4_failure_semantics
     "app.tasks.r4_failure_semantics.poison_pill",
     "app.tasks.r4_failure_semantics.crash_after_write_pre_ack",
@@ -211,12 +213,14 @@ def compute_series_budget() -> dict[str, int | dict[str, int]]:
     # - events_* metrics: no labels (aggregate only, tenant_id removed)
     # - celery_task_* metrics: task_name only
     # - matview_refresh_* metrics: view_name, outcome
+    # - matview_refresh_* gauges: view_name
     # - celery_queue_* metrics: queue,state and queue
     # - multiproc_* metrics: no labels (operational counters only)
     
     events_series = 1  # No labels after B0.5.6.3
     celery_task_series = dim_task_names  # task_name only
     matview_series = dim_view_names * dim_outcomes  # view_name × outcome
+    matview_gauge_series = dim_view_names  # view_name
     celery_queue_messages_series = dim_queues * dim_queue_states  # queue × state
     celery_queue_max_age_series = dim_queues  # queue
     celery_queue_ops_series = 1  # no labels
@@ -224,12 +228,12 @@ def compute_series_budget() -> dict[str, int | dict[str, int]]:
     # Number of metric families per category (counters + histograms)
     # Events: 4 families (ingested, duplicate, dlq, duration)
     # Celery: 4 families (started, success, failure, duration)
-    # Matview: 3 families (total, duration, failures)
+    # Matview: 3 families (total, duration, failures) + 2 gauges (age, skip_ratio)
     # Multiproc: 3 families (orphan_detected, pruned, overflow)
     
     events_total = 4 * events_series
     celery_total = 4 * celery_task_series
-    matview_total = 3 * matview_series
+    matview_total = 3 * matview_series + 2 * matview_gauge_series
     multiproc_total = 3 * 1
     celery_queue_total = (
         1 * celery_queue_messages_series
@@ -49,6 +49,16 @@ def _payload_forbidden() -> set[str]:
     return _as_string_set(list(forbidden))
 
 
+@lru_cache(maxsize=1)
+def _storage_key_policy() -> tuple[frozenset[str], frozenset[str]]:
+    # Derived from the (cached) authority artifact; hot ingestion/backfill loops
+    # call minimize_event_payload_for_storage once per event.
+    return (
+        frozenset(_payload_allowlist()),
+        frozenset(_payload_forbidden() | banned_identifier_key_set()),
+    )
+
+
 def minimize_event_payload_for_storage(event_data: Mapping[str, Any]) -> dict[str, Any]:
     """
     Build a durable, minimized payload for immutable attribution events.
@@ -56,8 +66,7 @@ def minimize_event_payload_for_storage(event_data: Mapping[str, Any]) -> dict[st
     The durable payload is intentionally constrained so raw provider envelopes and
     identity proxies do not persist on append-only event rows.
     """
-    allowlist = _payload_allowlist()
-    forbidden = _payload_forbidden() | banned_identifier_key_set()
+    allowlist, forbidden = _storage_key_policy()
     minimized: dict[str, Any] = {}
     for key, value in event_data.items():
         normalized = str(key).strip().lower()
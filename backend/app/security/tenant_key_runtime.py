@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import select
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from uuid import UUID
+
+import psycopg2
+
+from app.core.config import settings
+from app.core.secrets import get_database_url
+from app.security.revocation_runtime import _parse_uuid, _to_sync_dsn
+
+logger = logging.getLogger(__name__)
+
+TENANT_AUTH_NOTIFY_CHANNEL = "skeldir_tenant_auth_changed"
+
+_DISABLE_EVENT_LISTENER = "SKELDIR_TENANT_KEY_DISABLE_EVENT_LISTENER"
+_DEFAULT_POLL_TIMEOUT_SECONDS = 1.0
+
+
+@dataclass(frozen=True)
+class CachedTenantKeyResolution:
+    tenant_id: UUID
+    version_token: str | None
+
+
+@dataclass
+class _Entry:
+    resolution: CachedTenantKeyResolution
+    expires_at_monotonic: float
+
+
+class TenantApiKeyRuntimeCache:
+    """
+    Process-local tenant API key resolution cache.
+
+    Maps api_key_hash -> (tenant_id, version token). Decrypted webhook secrets
+    stay in the tenant webhook secret cache, addressed by that version token, so
+    a hit in both skips security.resolve_tenant_webhook_secrets entirely.
+    Entries are bounded (LRU + TTL) and evicted by a background LISTEN/NOTIFY loop
+    when a tenant's key or secrets change. Hits are only served while the listener
+    is subscribed; the cache is flushed on every (re)subscribe because notifications
+    sent while disconnected are lost.
+    """
+
+    def __init__(self, *, runtime_name: str = "default") -> None:
+        self._runtime_name = runtime_name
+        self._lock = threading.Lock()
+        self._listener_thread: threading.Thread | None = None
+        self._stop_event = threading.Event()
+        self._listener_pid: int | None = None
+        self._listener_conn_fd: int | None = None
+        self._listening = False
+
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        # Bumped on every invalidation; a miss that started before an invalidation
+        # must not publish the (possibly pre-rotation) row it read.
+        self._generation = 0
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork_in_child)
+
+    @staticmethod
+    def _now() -> float:
+        return time.monotonic()
+
+    def close(self) -> None:
+        self._stop_event.set()
+        listener = self._listener_thread
+        if listener and listener.is_alive():
+            listener.join(timeout=2.0)
+        with self._lock:
+            self._listening = False
+            self._listener_conn_fd = None
+            self._listener_thread = None
+            self._listener_pid = None
+            self._entries.clear()
+            self._generation += 1
+
+    def ensure_started(self) -> None:
+        if os.getenv(_DISABLE_EVENT_LISTENER) == "1":
+            return
+        current_pid = os.getpid()
+        if (
+            self._listener_thread
+            and self._listener_thread.is_alive()
+            and self._listener_pid == current_pid
+        ):
+            return
+        with self._lock:
+            if (
+                self._listener_thread
+                and self._listener_thread.is_alive()
+                and self._listener_pid == current_pid
+            ):
+                return
+            self._stop_event = threading.Event()
+            thread = threading.Thread(
+                target=self._listen_loop,
+                args=(self._stop_event,),
+                name=f"tenant-key-listener-{self._runtime_name}",
+                daemon=True,
+            )
+            thread.start()
+            self._listener_thread = thread
+            self._listener_pid = current_pid
+
+    def runtime_state(self) -> dict[str, object]:
+        listener = self._listener_thread
+        return {
+            "runtime_name": self._runtime_name,
+            "process_pid": os.getpid(),
+            "listener_pid": self._listener_pid,
+            "listener_alive": bool(listener and listener.is_alive()),
+            "listening": self._listening,
+            "entries": len(self._entries),
+        }
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def get(self, api_key_hash: str) -> CachedTenantKeyResolution | None:
+        now = self._now()
+        with self._lock:
+            if not self._listening:
+                return None
+            entry = self._entries.get(api_key_hash)
+            if entry is None:
+                return None
+            if entry.expires_at_monotonic <= now:
+                self._entries.pop(api_key_hash, None)
+                return None
+            self._entries.move_to_end(api_key_hash)
+            return entry.resolution
+
+    def put(
+        self,
+        api_key_hash: str,
+        resolution: CachedTenantKeyResolution,
+        *,
+        generation: int,
+    ) -> bool:
+        ttl = max(1, int(settings.TENANT_API_KEY_CACHE_TTL_SECONDS))
+        max_entries = max(1, int(settings.TENANT_API_KEY_CACHE_MAX_ENTRIES))
+        expires = self._now() + float(ttl)
+        with self._lock:
+            if not self._listening or generation != self._generation:
+                return False
+            self._entries[api_key_hash] = _Entry(resolution=resolution, expires_at_monotonic=expires)
+            self._entries.move_to_end(api_key_hash)
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+            return True
+
+    def evict_tenant(self, tenant_id: UUID) -> None:
+        with self._lock:
+            self._generation += 1
+            for key in [k for k, e in self._entries.items() if e.resolution.tenant_id == tenant_id]:
+                self._entries.pop(key, None)
+
+    def evict_api_key_hash(self, api_key_hash: str) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(api_key_hash, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def _set_listening(
+        self,
+        stop_event: threading.Event,
+        listening: bool,
+        *,
+        conn_fd: int | None = None,
+    ) -> None:
+        with self._lock:
+            if stop_event is not self._stop_event:
+                # A superseded listener thread must not flip the current one's state.
+                return
+            self._listening = listening
+            self._listener_conn_fd = conn_fd
+            self._generation += 1
+            self._entries.clear()
+
+    def _listen_loop(self, stop_event: threading.Event) -> None:
+        dsn = _to_sync_dsn(get_database_url())
+        backoff_seconds = 0.5
+        while not stop_event.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(dsn)
+                conn.set_session(autocommit=True)
+                cur = conn.cursor()
+                cur.execute(f"LISTEN {TENANT_AUTH_NOTIFY_CHANNEL};")
+                self._set_listening(stop_event, True, conn_fd=conn.fileno())
+                logger.info(
+                    "tenant_key_listener_started",
+                    extra={"runtime_name": self._runtime_name, "listener_pid": os.getpid()},
+                )
+                backoff_seconds = 0.5
+
+                while not stop_event.is_set():
+                    ready, _, _ = select.select([conn], [], [], _DEFAULT_POLL_TIMEOUT_SECONDS)
+                    if not ready:
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        self._apply_notification(notify.payload)
+            except Exception:
+                logger.exception(
+                    "tenant_key_listener_error",
+                    extra={"runtime_name": self._runtime_name},
+                )
+                self._set_listening(stop_event, False)
+                time.sleep(backoff_seconds)
+                backoff_seconds = min(backoff_seconds * 2.0, 5.0)
+            finally:
+                try:
+                    if conn is not None:
+                        conn.close()
+                except Exception:
+                    pass
+        self._set_listening(stop_event, False)
+
+    def _apply_notification(self, payload: str | None) -> None:
+        body: dict = {}
+        if payload:
+            try:
+                body = json.loads(payload)
+            except json.JSONDecodeError:
+                body = {}
+        tenant_id = _parse_uuid(body.get("tenant_id"))
+        api_key_hash = body.get("api_key_hash")
+        if tenant_id is None and not api_key_hash:
+            # Unattributable change: drop everything rather than risk a stale key.
+            self.clear()
+            return
+        if tenant_id is not None:
+            self.evict_tenant(tenant_id)
+        if api_key_hash:
+            self.evict_api_key_hash(str(api_key_hash))
+
+    def _after_fork_in_child(self) -> None:
+        # The child must never reuse the parent's listener thread or cached entries.
+        self._lock = threading.Lock()
+        self._listener_thread = None
+        self._listener_pid = None
+        self._listener_conn_fd = None
+        self._listening = False
+        self._stop_event = threading.Event()
+        self._entries = OrderedDict()
+        self._generation += 1
+
+
+_DEFAULT_CACHE = TenantApiKeyRuntimeCache()
+
+
+def get_tenant_api_key_runtime_cache() -> TenantApiKeyRuntimeCache:
+    return _DEFAULT_CACHE
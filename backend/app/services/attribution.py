@@ -5,15 +5,24 @@ B0.5.3.6 closes the ingestion → scheduling gap by providing a single entry poi
 for enqueueing recompute_window on the real Celery worker, with deterministic
 window validation and correlation propagation.
 """
-from datetime import datetime, timezone
-from typing import Optional, Union
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional, Union
 from uuid import UUID, uuid4
 
 from celery.result import AsyncResult
+from sqlalchemy import text
 
+from app.core.db import engine
+from app.db.session import set_tenant_guc
 from app.tasks.authority import SystemAuthorityEnvelope
-from app.tasks.enqueue import enqueue_tenant_task
-from app.tasks.attribution import _normalize_timestamp, recompute_window
+from app.tasks.enqueue import enqueue_tenant_task, tenant_task_signature
+from app.tasks.attribution import (
+    _normalize_timestamp,
+    finalize_recompute_range,
+    recompute_range,
+    recompute_window,
+)
 
 WindowBoundary = Union[str, datetime]
 
@@ -75,3 +84,435 @@ def schedule_recompute_window(
         },
         correlation_id=str(correlation_uuid),
     )
+
+
+def enqueue_recompute_followup(
+    tenant_id: UUID,
+    window_start: WindowBoundary,
+    window_end: WindowBoundary,
+    correlation_id: str,
+    model_version: str = "1.0.0",
+) -> None:
+    """
+    Enqueue the post-ingestion recompute_window -> matview_refresh_all_for_tenant chain.
+    """
+    from celery import chain
+
+    from app.tasks.matviews import matview_refresh_all_for_tenant
+
+    system_envelope = SystemAuthorityEnvelope(tenant_id=tenant_id)
+    chain(
+        tenant_task_signature(
+            recompute_window,
+            envelope=system_envelope,
+            kwargs={
+                "window_start": _isoformat_utc(_normalize_window_boundary(window_start)),
+                "window_end": _isoformat_utc(_normalize_window_boundary(window_end)),
+                "correlation_id": correlation_id,
+                "model_version": model_version,
+            },
+        ).set(correlation_id=correlation_id),
+        tenant_task_signature(
+            matview_refresh_all_for_tenant,
+            envelope=system_envelope,
+            kwargs={
+                "correlation_id": correlation_id,
+                "schedule_class": "realtime",
+            },
+            immutable=True,
+        ).set(correlation_id=correlation_id),
+    ).apply_async()
+
+
+# Post-ingestion recompute coalescing.
+#
+# attribution_recompute_dirty_windows holds one row per (tenant, window,
+# model_version) that ingestion has touched. The first event for a window (or
+# the first after a quiet interval) dispatches immediately; events arriving
+# within interval_seconds of the last dispatch only set dirty_since, and
+# flush_due_recompute_windows dispatches those windows once the interval has
+# elapsed. Dispatches per window are therefore at least interval_seconds apart
+# regardless of event volume.
+
+_RECOMPUTE_FLUSH_SINGLEFLIGHT_LOCK_KEY = 1205101
+# Clean rows untouched for this long are deleted by the flush (re-created on the next event).
+_DIRTY_WINDOW_RETENTION_SECONDS = 7 * 24 * 3600
+
+
+@dataclass(frozen=True)
+class DueRecomputeWindow:
+    tenant_id: UUID
+    window_start: datetime
+    window_end: datetime
+    model_version: str
+    correlation_id: Optional[str]
+
+
+async def mark_recompute_window_dirty(
+    *,
+    tenant_id: UUID,
+    window_start: WindowBoundary,
+    window_end: WindowBoundary,
+    model_version: str,
+    correlation_id: Optional[str],
+    interval_seconds: int,
+) -> bool:
+    """
+    Record that ingestion touched a window; one statement, no row rewrite while already dirty.
+
+    Returns True when the caller should dispatch the recompute now (first event
+    for the window, or the last dispatch is older than interval_seconds), False
+    when the window was marked dirty for the flush task instead.
+    """
+    async with engine.begin() as conn:
+        await set_tenant_guc(conn, tenant_id, local=True)
+        result = await conn.execute(
+            text(
+                """
+                INSERT INTO attribution_recompute_dirty_windows AS w (
+                    tenant_id, window_start, window_end, model_version,
+                    last_dispatched_at, dirty_since, last_correlation_id
+                ) VALUES (
+                    :tenant_id, :window_start, :window_end, :model_version,
+                    now(), NULL, :correlation_id
+                )
+                ON CONFLICT (tenant_id, window_start, window_end, model_version)
+                DO UPDATE SET
+                    last_dispatched_at = CASE
+                        WHEN w.last_dispatched_at <= now() - make_interval(secs => :interval_seconds)
+                        THEN now() ELSE w.last_dispatched_at END,
+                    dirty_since = CASE
+                        WHEN w.last_dispatched_at <= now() - make_interval(secs => :interval_seconds)
+                        THEN NULL ELSE now() END,
+                    last_correlation_id = EXCLUDED.last_correlation_id
+                WHERE w.dirty_since IS NULL
+                RETURNING dirty_since IS NULL AS dispatch_now
+                """
+            ),
+            {
+                "tenant_id": tenant_id,
+                "window_start": _normalize_window_boundary(window_start),
+                "window_end": _normalize_window_boundary(window_end),
+                "model_version": model_version,
+                "correlation_id": correlation_id,
+                "interval_seconds": int(interval_seconds),
+            },
+        )
+        row = result.fetchone()
+    # No row: the window was already dirty and the pending flush covers this event.
+    return bool(row is not None and row[0])
+
+
+async def flush_due_recompute_windows(
+    *,
+    interval_seconds: int,
+    dispatch: Callable[[DueRecomputeWindow], None],
+) -> dict[str, int]:
+    """
+    Dispatch every dirty window whose last dispatch is at least interval_seconds old.
+
+    Single-flight across workers (xact advisory lock). Claims are cleared in the
+    same transaction that dispatches them, so a dispatch failure rolls the
+    claims back for the next flush.
+    """
+    dispatched = 0
+    scanned_tenants = 0
+    async with engine.begin() as conn:
+        lock_row = (
+            await conn.execute(
+                text("SELECT pg_try_advisory_xact_lock(:lock_key) AS acquired"),
+                {"lock_key": _RECOMPUTE_FLUSH_SINGLEFLIGHT_LOCK_KEY},
+            )
+        ).mappings().one()
+        if not lock_row["acquired"]:
+            return {"dispatched": 0, "scanned_tenants": 0, "lock_acquired": 0}
+
+        tenants_result = await conn.execute(text("SELECT id FROM public.tenants ORDER BY id"))
+        tenant_rows = [row[0] for row in tenants_result]
+
+        for tenant_id in tenant_rows:
+            scanned_tenants += 1
+            await set_tenant_guc(conn, tenant_id, local=True)
+            claimed = await conn.execute(
+                text(
+                    """
+                    UPDATE attribution_recompute_dirty_windows
+                    SET dirty_since = NULL,
+                        last_dispatched_at = now()
+                    WHERE tenant_id = :tenant_id
+                      AND dirty_since IS NOT NULL
+                      AND last_dispatched_at <= now() - make_interval(secs => :interval_seconds)
+                    RETURNING window_start, window_end, model_version, last_correlation_id
+                    """
+                ),
+                {"tenant_id": tenant_id, "interval_seconds": int(interval_seconds)},
+            )
+            for window_start, window_end, model_version, correlation_id in claimed.fetchall():
+                dispatch(
+                    DueRecomputeWindow(
+                        tenant_id=UUID(str(tenant_id)),
+                        window_start=window_start,
+                        window_end=window_end,
+                        model_version=model_version,
+                        correlation_id=correlation_id,
+                    )
+                )
+                dispatched += 1
+            await conn.execute(
+                text(
+                    """
+                    DELETE FROM attribution_recompute_dirty_windows
+                    WHERE tenant_id = :tenant_id
+                      AND dirty_since IS NULL
+                      AND last_dispatched_at < now() - make_interval(secs => :retention_seconds)
+                    """
+                ),
+                {"tenant_id": tenant_id, "retention_seconds": _DIRTY_WINDOW_RETENTION_SECONDS},
+            )
+
+    return {"dispatched": dispatched, "scanned_tenants": scanned_tenants, "lock_acquired": 1}
+
+
+# Range recompute fan-out.
+#
+# recompute_range splits [range_start, range_end) into UTC day or hour shards
+# (aligned to unit boundaries so day shards share job identity, and therefore
+# watermarks, with post-ingestion windows) and runs each shard as its own
+# recompute_window task. Shards are dealt round-robin into at most
+# max_concurrency lanes; each lane is a chain, the lanes are a group, so at most
+# max_concurrency shards of one range run at a time however many workers
+# consume the attribution queue. The chord callback (also linked as the error
+# callback) records the outcome in attribution_recompute_ranges.
+
+RECOMPUTE_RANGE_SHARD_UNITS: dict[str, timedelta] = {
+    "day": timedelta(days=1),
+    "hour": timedelta(hours=1),
+}
+
+
+def recompute_range_shards(
+    range_start: datetime,
+    range_end: datetime,
+    shard_unit: str,
+) -> list[tuple[datetime, datetime]]:
+    """
+    Split [range_start, range_end) at UTC day/hour boundaries.
+
+    The first and last shards are clipped to the range, so unaligned bounds
+    produce partial shards rather than widening the range.
+    """
+    step = RECOMPUTE_RANGE_SHARD_UNITS.get(shard_unit)
+    if step is None:
+        raise ValueError(f"shard_unit must be one of {sorted(RECOMPUTE_RANGE_SHARD_UNITS)}, got {shard_unit!r}")
+    if range_start >= range_end:
+        raise ValueError(f"range_start ({range_start}) must be < range_end ({range_end})")
+    boundary = range_start.replace(minute=0, second=0, microsecond=0)
+    if shard_unit == "day":
+        boundary = boundary.replace(hour=0)
+    boundary += step
+    shards: list[tuple[datetime, datetime]] = []
+    cursor = range_start
+    while cursor < range_end:
+        shard_end = min(boundary, range_end)
+        shards.append((cursor, shard_end))
+        cursor, boundary = shard_end, boundary + step
+    return shards
+
+
+async def create_recompute_range_run(
+    *,
+    tenant_id: UUID,
+    range_start: datetime,
+    range_end: datetime,
+    shard_unit: str,
+    model_version: str,
+    shard_count: int,
+    max_concurrency: int,
+    correlation_id: Optional[str],
+) -> UUID:
+    async with engine.begin() as conn:
+        await set_tenant_guc(conn, tenant_id, local=True)
+        result = await conn.execute(
+            text(
+                """
+                INSERT INTO attribution_recompute_ranges (
+                    tenant_id, range_start, range_end, shard_unit, model_version,
+                    shard_count, max_concurrency, last_correlation_id
+                ) VALUES (
+                    :tenant_id, :range_start, :range_end, :shard_unit, :model_version,
+                    :shard_count, :max_concurrency, :correlation_id
+                )
+                RETURNING id
+                """
+            ),
+            {
+                "tenant_id": tenant_id,
+                "range_start": range_start,
+                "range_end": range_end,
+                "shard_unit": shard_unit,
+                "model_version": model_version,
+                "shard_count": shard_count,
+                "max_concurrency": max_concurrency,
+                "correlation_id": correlation_id,
+            },
+        )
+        return result.scalar_one()
+
+
+async def finalize_recompute_range_run(*, tenant_id: UUID, range_id: UUID) -> Optional[dict]:
+    """
+    Record a range run's outcome from its shards' attribution_recompute_jobs rows.
+
+    A shard counts as succeeded when its job row finished successfully (or was
+    skipped as unchanged) after the range run was created. First writer wins:
+    returns None if the run was already finalized (e.g. the error callback ran
+    before the chord callback).
+    """
+    async with engine.begin() as conn:
+        await set_tenant_guc(conn, tenant_id, local=True)
+        run = (
+            await conn.execute(
+                text(
+                    """
+                    SELECT range_start, range_end, shard_unit, model_version, created_at
+                    FROM attribution_recompute_ranges
+                    WHERE id = :range_id AND tenant_id = :tenant_id
+                    """
+                ),
+                {"range_id": range_id, "tenant_id": tenant_id},
+            )
+        ).one()
+        shards = recompute_range_shards(run.range_start, run.range_end, run.shard_unit)
+        result = await conn.execute(
+            text(
+                """
+                WITH shards AS (
+                    SELECT *
+                    FROM unnest(CAST(:shard_starts AS timestamptz[]), CAST(:shard_ends AS timestamptz[]))
+                        AS s(window_start, window_end)
+                ),
+                succeeded AS (
+                    SELECT count(*) AS shards_succeeded
+                    FROM shards
+                    JOIN attribution_recompute_jobs j
+                      ON j.tenant_id = :tenant_id
+                     AND j.window_start = shards.window_start
+                     AND j.window_end = shards.window_end
+                     AND j.model_version = :model_version
+                    WHERE j.status IN ('succeeded', 'skipped_unchanged')
+                      AND j.finished_at >= :created_at
+                )
+                UPDATE attribution_recompute_ranges r
+                SET status = CASE WHEN succeeded.shards_succeeded = r.shard_count
+                                  THEN 'succeeded' ELSE 'failed' END,
+                    shards_succeeded = succeeded.shards_succeeded,
+                    shards_failed = r.shard_count - succeeded.shards_succeeded,
+                    finished_at = now()
+                FROM succeeded
+                WHERE r.id = :range_id
+                  AND r.status = 'running'
+                RETURNING r.status, r.shard_count, r.shards_succeeded, r.shards_failed
+                """
+            ),
+            {
+                "tenant_id": tenant_id,
+                "range_id": range_id,
+                "model_version": run.model_version,
+                "created_at": run.created_at,
+                "shard_starts": [start for start, _ in shards],
+                "shard_ends": [end for _, end in shards],
+            },
+        )
+        row = result.mappings().fetchone()
+    return dict(row) if row is not None else None
+
+
+def dispatch_recompute_range(
+    *,
+    tenant_id: UUID,
+    range_id: UUID,
+    shards: list[tuple[datetime, datetime]],
+    model_version: str,
+    correlation_id: str,
+    full_rebuild: bool,
+    max_concurrency: int,
+) -> int:
+    """
+    Enqueue the shard lanes as a chord whose callback finalizes the range run.
+
+    Returns the number of lanes (the range's effective concurrency).
+    """
+    from celery import chain, chord, group
+
+    system_envelope = SystemAuthorityEnvelope(tenant_id=tenant_id)
+    lane_count = min(max_concurrency, len(shards))
+    lanes = [
+        chain(
+            *[
+                tenant_task_signature(
+                    recompute_window,
+                    envelope=system_envelope,
+                    kwargs={
+                        "window_start": _isoformat_utc(shard_start),
+                        "window_end": _isoformat_utc(shard_end),
+                        "correlation_id": correlation_id,
+                        "model_version": model_version,
+                        "full_rebuild": full_rebuild,
+                    },
+                    immutable=True,
+                ).set(correlation_id=correlation_id)
+                for shard_start, shard_end in shards[lane::lane_count]
+            ]
+        )
+        for lane in range(lane_count)
+    ]
+
+    def _finalize():
+        return tenant_task_signature(
+            finalize_recompute_range,
+            envelope=system_envelope,
+            kwargs={"range_id": str(range_id), "correlation_id": correlation_id},
+            immutable=True,
+        ).set(correlation_id=correlation_id)
+
+    callback = _finalize()
+    callback.link_error(_finalize())
+    chord(group(lanes), callback).apply_async()
+    return lane_count
+
+
+def schedule_recompute_range(
+    tenant_id: UUID,
+    range_start: WindowBoundary,
+    range_end: WindowBoundary,
+    *,
+    shard_unit: str = "day",
+    model_version: str = "1.0.0",
+    full_rebuild: bool = False,
+    max_concurrency: Optional[int] = None,
+    correlation_id: Optional[str] = None,
+) -> AsyncResult:
+    """
+    Enqueue recompute_range for [range_start, range_end) (e.g. re-attribution after a model change).
+    """
+    start_dt = _normalize_window_boundary(range_start)
+    end_dt = _normalize_window_boundary(range_end)
+    recompute_range_shards(start_dt, end_dt, shard_unit)
+
+    correlation_uuid = UUID(str(correlation_id)) if correlation_id else uuid4()
+    kwargs = {
+        "range_start": _isoformat_utc(start_dt),
+        "range_end": _isoformat_utc(end_dt),
+        "shard_unit": shard_unit,
+        "model_version": model_version,
+        "full_rebuild": full_rebuild,
+        "correlation_id": str(correlation_uuid),
+    }
+    if max_concurrency is not None:
+        kwargs["max_concurrency"] = max_concurrency
+    return enqueue_tenant_task(
+        recompute_range,
+        envelope=SystemAuthorityEnvelope(tenant_id=tenant_id),
+        kwargs=kwargs,
+        correlation_id=str(correlation_uuid),
+    )
@@ -0,0 +1,200 @@
+"""
+Keyset-paginated reads of attribution_allocations for the dashboard API.
+
+Pages are ordered newest first on (created_at, id) and each page starts
+strictly after the last row of the previous one, so a page is one range scan
+of idx_attribution_allocations_tenant_keyset at any depth (no OFFSET). The
+cursor handed to clients is an opaque base64url token over that pair.
+Rows are streamed from a server-side cursor and written out as JSON as they
+arrive, so response memory does not grow with the page size.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from typing import AsyncIterator, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Projectable fields (``fields=``) in response order. Every name is a plain
+# attribution_allocations column, so the list doubles as the SELECT allowlist.
+ALLOCATION_FIELDS: tuple[str, ...] = (
+    "id",
+    "event_id",
+    "channel_code",
+    "model_version",
+    "model_type",
+    "allocated_revenue_cents",
+    "allocation_ratio",
+    "confidence_score",
+    "credible_interval_lower_cents",
+    "credible_interval_upper_cents",
+    "convergence_r_hat",
+    "verified",
+    "created_at",
+)
+_KEYSET_FIELDS = ("created_at", "id")
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+class AllocationQueryError(ValueError):
+    """Raised for a malformed cursor, unknown projection field or bad range."""
+
+
+@dataclass(frozen=True)
+class AllocationCursor:
+    """Position after the last row of a page: its (created_at, id)."""
+
+    created_at: datetime
+    id: UUID
+
+    def encode(self) -> str:
+        payload = json.dumps([self.created_at.isoformat(), str(self.id)], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "AllocationCursor":
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            cursor = cls(created_at=datetime.fromisoformat(created_at), id=UUID(row_id))
+        except (binascii.Error, UnicodeError, ValueError, TypeError) as exc:
+            raise AllocationQueryError("Invalid cursor.") from exc
+        if cursor.created_at.tzinfo is None:
+            raise AllocationQueryError("Invalid cursor.")
+        return cursor
+
+
+@dataclass(frozen=True)
+class AllocationPageQuery:
+    """Validated filters, projection and position of one page request."""
+
+    tenant_id: UUID
+    fields: tuple[str, ...] = ALLOCATION_FIELDS
+    channels: tuple[str, ...] = ()
+    model_version: Optional[str] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    cursor: Optional[AllocationCursor] = None
+    limit: int = DEFAULT_PAGE_SIZE
+
+
+def parse_fields(raw: Optional[str]) -> tuple[str, ...]:
+    """Resolve a comma-separated ``fields=`` value to allowlisted columns, in response order."""
+    if raw is None or not raw.strip():
+        return ALLOCATION_FIELDS
+    requested = {item.strip() for item in raw.split(",") if item.strip()}
+    unknown = sorted(requested.difference(ALLOCATION_FIELDS))
+    if unknown:
+        raise AllocationQueryError(f"Unknown allocation fields: {', '.join(unknown)}")
+    return tuple(name for name in ALLOCATION_FIELDS if name in requested)
+
+
+def build_page_query(
+    *,
+    tenant_id: UUID,
+    fields: Optional[str] = None,
+    channels: Optional[Sequence[str]] = None,
+    model_version: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> AllocationPageQuery:
+    """Validate raw request parameters; raises AllocationQueryError before any I/O."""
+    if start_date and end_date and end_date < start_date:
+        raise AllocationQueryError("end_date must not be before start_date.")
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise AllocationQueryError(f"limit must be between 1 and {MAX_PAGE_SIZE}.")
+    return AllocationPageQuery(
+        tenant_id=tenant_id,
+        fields=parse_fields(fields),
+        channels=tuple(dict.fromkeys(channel for channel in channels or () if channel)),
+        model_version=model_version,
+        start_date=start_date,
+        end_date=end_date,
+        cursor=AllocationCursor.decode(cursor) if cursor else None,
+        limit=limit,
+    )
+
+
+def _page_sql(query: AllocationPageQuery) -> tuple[str, dict]:
+    selected = list(dict.fromkeys((*query.fields, *_KEYSET_FIELDS)))
+    predicates = ["tenant_id = :tenant_id"]
+    params: dict = {"tenant_id": query.tenant_id, "limit": query.limit + 1}
+    if query.channels:
+        predicates.append("channel_code = ANY(:channels)")
+        params["channels"] = list(query.channels)
+    if query.model_version is not None:
+        predicates.append("model_version = :model_version")
+        params["model_version"] = query.model_version
+    if query.start_date is not None:
+        predicates.append("created_at >= :created_from")
+        params["created_from"] = datetime.combine(query.start_date, time.min, tzinfo=timezone.utc)
+    if query.end_date is not None:
+        predicates.append("created_at < :created_before")
+        params["created_before"] = datetime.combine(query.end_date + timedelta(days=1), time.min, tzinfo=timezone.utc)
+    if query.cursor is not None:
+        # Row comparison matches the (created_at DESC, id DESC) index order, so
+        # the cursor is an index bound rather than a filter.
+        predicates.append("(created_at, id) < (:cursor_created_at, :cursor_id)")
+        params["cursor_created_at"] = query.cursor.created_at
+        params["cursor_id"] = query.cursor.id
+    sql = f"""
+        SELECT {", ".join(selected)}
+        FROM attribution_allocations
+        WHERE {" AND ".join(predicates)}
+        ORDER BY created_at DESC, id DESC
+        LIMIT :limit
+    """
+    return sql, params
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat().replace("+00:00", "Z")
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Unserializable allocation value: {type(value).__name__}")
+
+
+def _encode_row(row, fields: tuple[str, ...]) -> bytes:
+    return json.dumps({name: row[name] for name in fields}, default=_json_default, separators=(",", ":")).encode(
+        "utf-8"
+    )
+
+
+async def stream_allocation_page(session: AsyncSession, query: AllocationPageQuery) -> AsyncIterator[bytes]:
+    """
+    Yield one page as a JSON document: ``{"items": [...], "next_cursor": ...}``.
+
+    One row beyond ``limit`` is read to decide whether a next page exists; it
+    is never emitted. ``next_cursor`` is null on the last page.
+    """
+    sql, params = _page_sql(query)
+    result = await session.stream(text(sql), params)
+    yield b'{"items":['
+    emitted = 0
+    last = None
+    has_more = False
+    async for row in result.mappings():
+        if emitted == query.limit:
+            has_more = True
+            break
+        yield (b"," if emitted else b"") + _encode_row(row, query.fields)
+        emitted += 1
+        last = row
+    await result.close()
+    next_cursor = AllocationCursor(created_at=last["created_at"], id=last["id"]).encode() if has_more else None
+    yield b'],"next_cursor":' + json.dumps(next_cursor).encode("utf-8") + b"}"
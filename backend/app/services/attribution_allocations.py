@@ -0,0 +1,187 @@
+"""
+Columnar allocation builder for attribution recompute.
+
+Builds the column arrays bound into the attribution_allocations ``unnest``
+upsert for a whole batch of events at once: revenue splits are computed with
+NumPy over (events x channels) matrices and deterministic allocation IDs are
+derived in bulk, byte-identical to ``uuid5(ALLOCATION_ID_NAMESPACE,
+f"{tenant_id}:{event_id}:{model_version}:{channel_code}")``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime
+from decimal import Decimal
+from typing import Sequence
+from uuid import NAMESPACE_URL, UUID, uuid5
+
+import numpy as np
+
+ALLOCATION_ID_NAMESPACE = uuid5(NAMESPACE_URL, "skeldir:attribution_allocations:id:v1")
+
+
+def deterministic_allocation_ids(
+    *,
+    tenant_id: UUID,
+    event_ids: Sequence[UUID],
+    model_version: str,
+    channel_codes: Sequence[str],
+) -> list[str]:
+    """
+    uuid5 allocation IDs for every (event, channel) pair, event-major.
+
+    Returns 32-char hex strings (accepted by Postgres/asyncpg as uuid); the
+    RFC 4122 version/variant bits are applied to the whole SHA-1 digest matrix
+    at once instead of constructing a UUID object per row.
+    """
+    if not event_ids or not channel_codes:
+        return []
+    prefix = ALLOCATION_ID_NAMESPACE.bytes + f"{tenant_id}:".encode("utf-8")
+    suffixes = [f":{model_version}:{channel_code}".encode("utf-8") for channel_code in channel_codes]
+    sha1 = hashlib.sha1
+    digests = b"".join(
+        [
+            sha1(name + suffix).digest()[:16]
+            for name in [prefix + str(event_id).encode("ascii") for event_id in event_ids]
+            for suffix in suffixes
+        ]
+    )
+    return _uuid5_hex_from_digests(digests)
+
+
+def pairwise_allocation_ids(
+    *,
+    tenant_id: UUID,
+    event_ids: Sequence[UUID],
+    model_version: str,
+    channel_codes: Sequence[str],
+) -> list[str]:
+    """
+    uuid5 allocation IDs for the aligned pairs ``zip(event_ids, channel_codes)``.
+
+    Same IDs as ``deterministic_allocation_ids`` for rows whose channel set
+    varies per event (multi-touch models).
+    """
+    if not event_ids:
+        return []
+    prefix = ALLOCATION_ID_NAMESPACE.bytes + f"{tenant_id}:".encode("utf-8")
+    suffixes = {
+        channel_code: f":{model_version}:{channel_code}".encode("utf-8") for channel_code in set(channel_codes)
+    }
+    sha1 = hashlib.sha1
+    digests = b"".join(
+        [
+            sha1(prefix + str(event_id).encode("ascii") + suffixes[channel_code]).digest()[:16]
+            for event_id, channel_code in zip(event_ids, channel_codes, strict=True)
+        ]
+    )
+    return _uuid5_hex_from_digests(digests)
+
+
+def _uuid5_hex_from_digests(digests: bytes) -> list[str]:
+    matrix = np.frombuffer(digests, dtype=np.uint8).reshape(-1, 16).copy()
+    matrix[:, 6] = (matrix[:, 6] & 0x0F) | 0x50  # version 5
+    matrix[:, 8] = (matrix[:, 8] & 0x3F) | 0x80  # RFC 4122 variant
+    hex_ids = matrix.tobytes().hex()
+    return [hex_ids[offset : offset + 32] for offset in range(0, len(hex_ids), 32)]
+
+
+def split_revenue_cents_evenly(revenue_cents: np.ndarray, parts: int) -> np.ndarray:
+    """
+    Even split of each event's revenue into ``parts`` integer shares.
+
+    Row i is ``[base + 1] * remainder + [base] * (parts - remainder)`` where
+    ``base, remainder = divmod(revenue_cents[i], parts)``, so every row sums
+    back to its revenue exactly.
+    """
+    if parts < 1:
+        raise ValueError("parts must be >= 1")
+    revenue = np.asarray(revenue_cents, dtype=np.int64)
+    if revenue.size and revenue.min() < 0:
+        raise ValueError("revenue_cents must be >= 0")
+    base, remainder = np.divmod(revenue, parts)
+    return base[:, None] + (np.arange(parts, dtype=np.int64)[None, :] < remainder[:, None])
+
+
+def build_even_split_allocation_rows(
+    *,
+    tenant_id: UUID,
+    event_ids: Sequence[UUID],
+    revenue_cents: Sequence[int],
+    channel_codes: Sequence[str],
+    model_version: str,
+    model_type: str,
+    allocation_ratio: Decimal,
+    confidence_score: Decimal,
+    timestamp: datetime,
+) -> dict[str, list]:
+    """
+    Column arrays for the allocation upsert, one row per (event, channel).
+
+    Keys match the ``unnest`` bind parameters of the recompute upsert; rows are
+    event-major in ``channel_codes`` order.
+    """
+    event_count = len(event_ids)
+    parts = len(channel_codes)
+    row_count = event_count * parts
+    allocated = split_revenue_cents_evenly(np.fromiter(revenue_cents, dtype=np.int64, count=event_count), parts)
+    return {
+        "ids": deterministic_allocation_ids(
+            tenant_id=tenant_id,
+            event_ids=event_ids,
+            model_version=model_version,
+            channel_codes=channel_codes,
+        ),
+        "tenant_ids": [tenant_id] * row_count,
+        "event_ids": [event_id for event_id in event_ids for _ in range(parts)],
+        "channel_codes": list(channel_codes) * event_count,
+        "allocation_ratios": [str(allocation_ratio)] * row_count,
+        "model_versions": [model_version] * row_count,
+        "model_types": [model_type] * row_count,
+        "confidence_scores": [str(confidence_score)] * row_count,
+        "verifieds": [False] * row_count,
+        "allocated_revenue_cents": allocated.ravel().tolist(),
+        "created_ats": [timestamp] * row_count,
+        "updated_ats": [timestamp] * row_count,
+    }
+
+
+def build_allocation_rows(
+    *,
+    tenant_id: UUID,
+    event_ids: Sequence[UUID],
+    channel_codes: Sequence[str],
+    allocated_revenue_cents: np.ndarray,
+    allocation_ratios: np.ndarray,
+    model_version: str,
+    model_type: str,
+    timestamp: datetime,
+) -> dict[str, list]:
+    """
+    Column arrays for the allocation upsert from aligned per-row arrays.
+
+    Ratios are rounded to the column scale (5 places); confidence_score is the
+    ratio at 3 places, as for the even split.
+    """
+    row_count = len(event_ids)
+    ratios = np.round(np.asarray(allocation_ratios, dtype=np.float64), 5)
+    return {
+        "ids": pairwise_allocation_ids(
+            tenant_id=tenant_id,
+            event_ids=event_ids,
+            model_version=model_version,
+            channel_codes=channel_codes,
+        ),
+        "tenant_ids": [tenant_id] * row_count,
+        "event_ids": list(event_ids),
+        "channel_codes": list(channel_codes),
+        "allocation_ratios": [f"{ratio:.5f}" for ratio in ratios.tolist()],
+        "model_versions": [model_version] * row_count,
+        "model_types": [model_type] * row_count,
+        "confidence_scores": [f"{ratio:.3f}" for ratio in ratios.tolist()],
+        "verifieds": [False] * row_count,
+        "allocated_revenue_cents": np.asarray(allocated_revenue_cents, dtype=np.int64).tolist(),
+        "created_ats": [timestamp] * row_count,
+        "updated_ats": [timestamp] * row_count,
+    }
@@ -0,0 +1,191 @@
+"""
+Vectorised multi-touch attribution models.
+
+A conversion (an event with revenue) is credited to the touchpoints of its
+session that occurred at or before it and no more than the lookback before it.
+Touchpoints are grouped by session with one stable sort over (session, time)
+and every conversion's path is a contiguous slice of the sorted arrays, so the
+models below are expressed as NumPy operations over all (conversion, touch)
+pairs of a batch at once instead of per-event Python.
+
+Models (selected by ``model_version``, see ``MULTI_TOUCH_MODELS``):
+    last_touch      all credit to the last touch of the path
+    linear          equal credit to every touch
+    time_decay      credit halves every ``half_life_seconds`` before the conversion
+    position_based  40% first touch, 40% last touch, 20% shared by the middle
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+MULTI_TOUCH_MODELS: dict[str, str] = {
+    "last_touch-1.0.0": "last_touch",
+    "linear-1.0.0": "linear",
+    "time_decay-1.0.0": "time_decay",
+    "position_based-1.0.0": "position_based",
+}
+
+_POSITION_BASED_ENDPOINT_SHARE = 0.4
+
+
+@dataclass(frozen=True)
+class ChannelCredit:
+    """
+    One row per (conversion, channel) with non-zero credit, conversion-major and
+    channel-index ascending within a conversion.
+
+    ``credit`` sums to 1 per conversion; ``allocated_revenue_cents`` sums to the
+    conversion's revenue exactly.
+    """
+
+    conversion_index: np.ndarray
+    channel_index: np.ndarray
+    credit: np.ndarray
+    allocated_revenue_cents: np.ndarray
+
+
+def _path_bounds(
+    touch_session: np.ndarray,
+    touch_time: np.ndarray,
+    conversion_session: np.ndarray,
+    conversion_time: np.ndarray,
+    lookback_seconds: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    [start, end) of every conversion's path in the (session, time)-sorted touches.
+
+    Conversions and lookback cut-offs are merged into the touch stream as
+    markers; the number of touches sorted before a marker is its index in the
+    sorted touches. Cut-off markers sort before touches with the same time and
+    conversion markers after them, so both bounds are inclusive.
+    """
+    conversions = conversion_session.size
+    sessions = np.concatenate((touch_session, conversion_session, conversion_session))
+    times = np.concatenate((touch_time, conversion_time, conversion_time - lookback_seconds))
+    kinds = np.concatenate(
+        (
+            np.zeros(touch_session.size, dtype=np.int8),
+            np.ones(conversions, dtype=np.int8),
+            np.full(conversions, -1, dtype=np.int8),
+        )
+    )
+    order = np.lexsort((kinds, times, sessions))
+    touches_before = np.cumsum(kinds[order] == 0)
+    position = np.empty_like(order)
+    position[order] = np.arange(order.size)
+    end = touches_before[position[touch_session.size : touch_session.size + conversions]]
+    start = touches_before[position[touch_session.size + conversions :]]
+    return start, end
+
+
+def _touch_weights(
+    model_type: str,
+    *,
+    position: np.ndarray,
+    path_length: np.ndarray,
+    age_seconds: np.ndarray,
+    half_life_seconds: float,
+) -> np.ndarray:
+    if model_type == "last_touch":
+        return (position == path_length - 1).astype(np.float64)
+    if model_type == "linear":
+        return 1.0 / path_length
+    if model_type == "time_decay":
+        return np.exp2(-age_seconds / half_life_seconds)
+    if model_type == "position_based":
+        middle = np.maximum(path_length - 2, 1)
+        endpoint = (position == 0) | (position == path_length - 1)
+        weights = np.where(endpoint, _POSITION_BASED_ENDPOINT_SHARE, (1.0 - 2 * _POSITION_BASED_ENDPOINT_SHARE) / middle)
+        return np.where(path_length <= 2, 1.0 / path_length, weights)
+    raise ValueError(f"Unknown multi-touch model_type: {model_type}")
+
+
+def _split_revenue_by_credit(
+    conversion_index: np.ndarray,
+    credit: np.ndarray,
+    revenue_cents: np.ndarray,
+) -> np.ndarray:
+    """
+    Integer split of each conversion's revenue proportional to ``credit``.
+
+    Rounds the running (cumulative) share within each conversion and takes
+    differences, so shares are non-negative and sum to the revenue exactly.
+    """
+    if not credit.size:
+        return np.zeros(0, dtype=np.int64)
+    first = np.flatnonzero(np.r_[True, conversion_index[1:] != conversion_index[:-1]])
+    last = np.r_[first[1:], credit.size] - 1
+    running = np.cumsum(credit)
+    running -= np.repeat(running[first] - credit[first], np.diff(np.r_[first, credit.size]))
+    revenue = revenue_cents[conversion_index].astype(np.float64)
+    boundary = np.rint(running * revenue).astype(np.int64)
+    boundary[last] = revenue_cents[conversion_index[last]]
+    previous = np.r_[0, boundary[:-1]]
+    previous[first] = 0
+    return np.maximum(boundary - previous, 0)
+
+
+def allocate_multi_touch(
+    model_type: str,
+    *,
+    touch_session: np.ndarray,
+    touch_time: np.ndarray,
+    touch_channel: np.ndarray,
+    conversion_session: np.ndarray,
+    conversion_time: np.ndarray,
+    conversion_revenue_cents: np.ndarray,
+    lookback_seconds: float,
+    half_life_seconds: float,
+) -> ChannelCredit:
+    """
+    Credit every conversion's revenue to the channels of its session path.
+
+    Sessions are integer codes, times are seconds (any common epoch) and
+    channels are integer codes; touches with equal (session, time) keep their
+    input order. Conversions without a touch in their path get no rows.
+    """
+    touch_session = np.asarray(touch_session, dtype=np.int64)
+    touch_time = np.asarray(touch_time, dtype=np.float64)
+    touch_channel = np.asarray(touch_channel, dtype=np.int64)
+    conversion_session = np.asarray(conversion_session, dtype=np.int64)
+    conversion_time = np.asarray(conversion_time, dtype=np.float64)
+    revenue_cents = np.asarray(conversion_revenue_cents, dtype=np.int64)
+    if half_life_seconds <= 0:
+        raise ValueError("half_life_seconds must be > 0")
+
+    order = np.lexsort((touch_time, touch_session))
+    touch_session, touch_time, touch_channel = touch_session[order], touch_time[order], touch_channel[order]
+
+    start, end = _path_bounds(touch_session, touch_time, conversion_session, conversion_time, lookback_seconds)
+    path_length = np.maximum(end - start, 0)
+    pairs = int(path_length.sum())
+    pair_conversion = np.repeat(np.arange(conversion_session.size), path_length)
+    position = np.arange(pairs) - np.repeat(np.cumsum(path_length) - path_length, path_length)
+    pair_touch = np.repeat(start, path_length) + position
+    pair_length = np.repeat(path_length, path_length)
+
+    weights = _touch_weights(
+        model_type,
+        position=position,
+        path_length=pair_length,
+        age_seconds=conversion_time[pair_conversion] - touch_time[pair_touch],
+        half_life_seconds=half_life_seconds,
+    )
+    keep = weights > 0
+    pair_conversion, pair_touch, weights = pair_conversion[keep], pair_touch[keep], weights[keep]
+
+    channels = int(touch_channel.max()) + 1 if touch_channel.size else 1
+    keys, inverse = np.unique(pair_conversion * channels + touch_channel[pair_touch], return_inverse=True)
+    credit = np.bincount(inverse, weights=weights)
+    conversion_index = keys // channels
+    credit /= np.bincount(conversion_index, weights=credit, minlength=conversion_session.size)[conversion_index]
+
+    return ChannelCredit(
+        conversion_index=conversion_index,
+        channel_index=keys % channels,
+        credit=credit,
+        allocated_revenue_cents=_split_revenue_by_credit(conversion_index, credit, revenue_cents),
+    )
@@ -0,0 +1,444 @@
+"""
+Bayesian channel attribution: a noisy-OR conversion model sampled with HMC.
+
+Every touch of a session on channel c independently converts it with
+probability q_c, so a session with per-channel touch counts n converts with
+
+    P(convert) = 1 - prod_c (1 - q_c) ** n_c
+
+theta = logit(q) has an independent Normal prior per channel (the previous
+window's posterior, widened, when warm-starting) and is sampled with
+Hamiltonian Monte Carlo: a diagonal mass matrix and step size are adapted in
+warmup (dual averaging), and the log posterior and its gradient are NumPy
+expressions over the distinct session patterns, so a step costs
+O(distinct patterns x channels) however many sessions a tenant has.
+
+A conversion's revenue is credited to channel c in proportion to
+1 - (1 - q_c) ** n_c (the chance its touches on c alone would have converted
+the session), averaged over posterior draws, with per-allocation credible
+intervals from the same draws.
+
+ChainState is plain data: chains advance in blocks (one process per chain),
+and a run can be checkpointed between blocks and resumed elsewhere.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import asdict, dataclass, field
+from typing import Mapping, Optional, Sequence
+
+import numpy as np
+
+from app.services.attribution_models import ChannelCredit, _split_revenue_by_credit
+
+BAYESIAN_MODEL_VERSION = "bayesian-1.0.0"
+BAYESIAN_MODEL_TYPE = "bayesian_noisy_or"
+
+# logit(q) ~ Normal(-3, 2.5): a touch converts ~5% of the time, within a wide range.
+_DEFAULT_PRIOR_MEAN = -3.0
+_DEFAULT_PRIOR_SD = 2.5
+_MIN_WARM_START_SD = 0.05
+
+_TARGET_ACCEPTANCE = 0.8
+_DUAL_AVERAGING_GAMMA = 0.05
+_DUAL_AVERAGING_T0 = 10.0
+_DUAL_AVERAGING_KAPPA = 0.75
+# Trajectory length in whitened units (posterior sd after mass adaptation).
+_TRAJECTORY_LENGTH = 1.5
+_MAX_LEAPFROG_STEPS = 64
+_CREDIT_DRAWS = 200
+
+
+@dataclass(frozen=True)
+class SessionExposure:
+    """
+    Distinct (per-channel touch counts, converted) session patterns and how
+    many sessions share each. Counts are float64 for the matrix products.
+    """
+
+    counts: np.ndarray
+    converted: np.ndarray
+    weight: np.ndarray
+
+    @property
+    def sessions(self) -> int:
+        return int(self.weight.sum())
+
+    def fingerprint(self, channels: Sequence[str]) -> str:
+        digest = hashlib.sha256("\x1f".join(channels).encode())
+        for array in (self.counts, self.converted, self.weight):
+            digest.update(np.ascontiguousarray(array).tobytes())
+        return digest.hexdigest()
+
+
+def session_exposure(counts, converted, weight=None) -> SessionExposure:
+    """
+    Collapse sessions with identical patterns into weighted rows, sorted.
+
+    Sessions without touches carry no information about any channel and are
+    dropped.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    converted = np.asarray(converted, dtype=bool)
+    weight = np.ones(converted.size) if weight is None else np.asarray(weight, dtype=np.float64)
+    keep = counts.sum(axis=1) > 0
+    keys = np.column_stack((counts[keep], converted[keep]))
+    unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+    return SessionExposure(
+        counts=unique[:, :-1].astype(np.float64),
+        converted=unique[:, -1].astype(bool),
+        weight=np.bincount(inverse.ravel(), weights=weight[keep], minlength=unique.shape[0]),
+    )
+
+
+@dataclass(frozen=True)
+class NormalPrior:
+    mean: np.ndarray
+    sd: np.ndarray
+
+
+def default_prior(channels: int) -> NormalPrior:
+    return NormalPrior(mean=np.full(channels, _DEFAULT_PRIOR_MEAN), sd=np.full(channels, _DEFAULT_PRIOR_SD))
+
+
+def prior_from_posterior(
+    channels: Sequence[str],
+    posterior: Mapping[str, Mapping[str, float]],
+    *,
+    sd_inflation: float = 2.0,
+) -> NormalPrior:
+    """
+    Warm-start prior: the previous window's theta posterior, sd widened by
+    ``sd_inflation`` so the new window's data can move it. Channels the
+    previous posterior does not cover get the default prior.
+    """
+    prior = default_prior(len(channels))
+    for index, channel in enumerate(channels):
+        summary = posterior.get(channel)
+        if summary is not None:
+            prior.mean[index] = summary["mean"]
+            prior.sd[index] = max(summary["sd"] * sd_inflation, _MIN_WARM_START_SD)
+    return prior
+
+
+def log_posterior(theta: np.ndarray, data: SessionExposure, prior: NormalPrior) -> tuple[float, np.ndarray]:
+    """
+    Log posterior density (up to a constant) and its gradient at theta.
+
+    Far-off positions (early warmup) may overflow to a non-finite value, which
+    the sampler rejects.
+    """
+    with np.errstate(all="ignore"):
+        log_not_q = -np.logaddexp(0.0, theta)
+        log_none = data.counts @ log_not_q
+        log_converted = np.log(-np.expm1(log_none))
+        # d log(1 - exp(L)) / dL = -1 / expm1(-L); d L / d theta_c = -n_c * q_c.
+        factor = np.where(data.converted, 1.0 / np.expm1(-log_none), -1.0) * data.weight
+        z = (theta - prior.mean) / prior.sd
+        value = float(data.weight @ np.where(data.converted, log_converted, log_none)) - 0.5 * float(z @ z)
+        gradient = np.exp(-np.logaddexp(0.0, -theta)) * (factor @ data.counts) - z / prior.sd
+    return value, gradient
+
+
+@dataclass
+class ChainState:
+    """
+    One chain's sampler state, JSON-serialisable via ``to_dict``.
+
+    ``draws`` holds post-warmup draws of theta, thinned by ``thin`` (doubled
+    whenever ``max_draws`` would be exceeded).
+    """
+
+    theta: list[float]
+    inverse_mass: list[float]
+    warmup: int
+    rng_state: dict
+    iteration: int = 0
+    log_step: float = 0.0
+    log_step_bar: float = 0.0
+    step_mu: float = 0.0
+    h_bar: float = 0.0
+    adapt_count: int = 0
+    window_count: int = 0
+    window_mean: list[float] = field(default_factory=list)
+    window_m2: list[float] = field(default_factory=list)
+    accepted: float = 0.0
+    thin: int = 1
+    draws: list[list[float]] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, payload: Mapping) -> "ChainState":
+        return cls(**payload)
+
+    @property
+    def post_warmup_iterations(self) -> int:
+        return max(self.iteration - self.warmup, 0)
+
+
+def init_chain(
+    prior: NormalPrior,
+    *,
+    seed: int,
+    chain: int,
+    warmup: int,
+    start: Optional[np.ndarray] = None,
+    spread: Optional[np.ndarray] = None,
+) -> ChainState:
+    """
+    Chain started at ``start`` (default: the prior mean) plus Normal jitter of
+    ``spread`` (default: half the prior sd), which is also the initial
+    mass-matrix scale.
+    """
+    rng = np.random.Generator(np.random.PCG64([seed, chain]))
+    center = prior.mean if start is None else np.asarray(start, dtype=np.float64)
+    spread = 0.5 * prior.sd if spread is None else np.asarray(spread, dtype=np.float64)
+    theta = center + spread * rng.standard_normal(center.size)
+    step = 1.0 / np.sqrt(center.size)
+    return ChainState(
+        theta=theta.tolist(),
+        inverse_mass=(spread**2).tolist(),
+        warmup=warmup,
+        rng_state=rng.bit_generator.state,
+        log_step=float(np.log(step)),
+        step_mu=float(np.log(10.0 * step)),
+        window_mean=[0.0] * center.size,
+        window_m2=[0.0] * center.size,
+    )
+
+
+def _hmc_transition(theta, value, gradient, *, step, inverse_mass, rng, data, prior):
+    leapfrog_steps = int(
+        np.clip(np.ceil(rng.uniform(0.5, 1.5) * _TRAJECTORY_LENGTH / step), 1, _MAX_LEAPFROG_STEPS)
+    )
+    momentum = rng.standard_normal(theta.size) / np.sqrt(inverse_mass)
+    initial_energy = -value + 0.5 * float(momentum @ (inverse_mass * momentum))
+    position, new_value, new_gradient = theta, value, gradient
+    half_momentum = momentum + 0.5 * step * new_gradient
+    for leapfrog in range(leapfrog_steps):
+        position = position + step * inverse_mass * half_momentum
+        new_value, new_gradient = log_posterior(position, data, prior)
+        if not np.isfinite(new_value):
+            break
+        half_momentum = half_momentum + (step if leapfrog < leapfrog_steps - 1 else 0.5 * step) * new_gradient
+    energy = -new_value + 0.5 * float(half_momentum @ (inverse_mass * half_momentum))
+    log_accept = initial_energy - energy
+    accept_probability = float(np.exp(min(log_accept, 0.0))) if np.isfinite(log_accept) else 0.0
+    if np.log(rng.random()) < log_accept:
+        return position, new_value, new_gradient, accept_probability
+    return theta, value, gradient, accept_probability
+
+
+def advance_chain(
+    state: ChainState,
+    data: SessionExposure,
+    prior: NormalPrior,
+    *,
+    steps: int,
+    max_draws: int,
+) -> ChainState:
+    """
+    Run ``steps`` more HMC iterations; a pure function of its arguments.
+
+    Warmup (the first ``state.warmup`` iterations) adapts the step size by
+    dual averaging toward 80% acceptance; the diagonal inverse mass matrix is
+    re-estimated once, from the draws of the warmup's second quarter, after
+    which step-size adaptation restarts.
+    """
+    rng = np.random.Generator(np.random.PCG64())
+    rng.bit_generator.state = state.rng_state
+    theta = np.asarray(state.theta, dtype=np.float64)
+    inverse_mass = np.asarray(state.inverse_mass, dtype=np.float64)
+    window_mean = np.asarray(state.window_mean, dtype=np.float64)
+    window_m2 = np.asarray(state.window_m2, dtype=np.float64)
+    value, gradient = log_posterior(theta, data, prior)
+    warmup = state.warmup
+    window_start, window_end = warmup // 4, warmup // 2
+    iteration, log_step, log_step_bar = state.iteration, state.log_step, state.log_step_bar
+    step_mu, h_bar, adapt_count = state.step_mu, state.h_bar, state.adapt_count
+    window_count, accepted, thin = state.window_count, state.accepted, state.thin
+    draws = list(state.draws)
+
+    for _ in range(steps):
+        theta, value, gradient, accept_probability = _hmc_transition(
+            theta,
+            value,
+            gradient,
+            step=float(np.exp(log_step)),
+            inverse_mass=inverse_mass,
+            rng=rng,
+            data=data,
+            prior=prior,
+        )
+        if iteration < warmup:
+            adapt_count += 1
+            weight = 1.0 / (adapt_count + _DUAL_AVERAGING_T0)
+            h_bar = (1.0 - weight) * h_bar + weight * (_TARGET_ACCEPTANCE - accept_probability)
+            log_step = step_mu - np.sqrt(adapt_count) / _DUAL_AVERAGING_GAMMA * h_bar
+            decay = adapt_count**-_DUAL_AVERAGING_KAPPA
+            log_step_bar = decay * log_step + (1.0 - decay) * log_step_bar
+            if window_start <= iteration < window_end:
+                window_count += 1
+                delta = theta - window_mean
+                window_mean = window_mean + delta / window_count
+                window_m2 = window_m2 + delta * (theta - window_mean)
+            if iteration == window_end - 1 and window_count > 1:
+                variance = window_m2 / (window_count - 1)
+                # Regularise toward a small constant, as Stan does for short windows.
+                inverse_mass = (window_count / (window_count + 5.0)) * variance + 1e-3 * (5.0 / (window_count + 5.0))
+                step_mu, h_bar, adapt_count, log_step_bar = float(np.log(10.0 * np.exp(log_step))), 0.0, 0, 0.0
+            if iteration == warmup - 1:
+                log_step = log_step_bar
+        else:
+            accepted += accept_probability
+            if (iteration - warmup) % thin == 0:
+                draws.append(theta.tolist())
+                if len(draws) > max_draws:
+                    draws = draws[::2]
+                    thin *= 2
+        iteration += 1
+
+    return ChainState(
+        theta=theta.tolist(),
+        inverse_mass=inverse_mass.tolist(),
+        warmup=warmup,
+        rng_state=rng.bit_generator.state,
+        iteration=iteration,
+        log_step=float(log_step),
+        log_step_bar=float(log_step_bar),
+        step_mu=float(step_mu),
+        h_bar=float(h_bar),
+        adapt_count=adapt_count,
+        window_count=window_count,
+        window_mean=window_mean.tolist(),
+        window_m2=window_m2.tolist(),
+        accepted=float(accepted),
+        thin=thin,
+        draws=draws,
+    )
+
+
+# Process-pool plumbing: the run's data and prior are shipped to each worker
+# process once (initializer) rather than pickled with every block.
+_PROCESS_MODEL: Optional[tuple[SessionExposure, NormalPrior]] = None
+
+
+def init_sampler_process(data: SessionExposure, prior: NormalPrior) -> None:
+    global _PROCESS_MODEL
+    _PROCESS_MODEL = (data, prior)
+
+
+def advance_chain_in_process(state: ChainState, *, steps: int, max_draws: int) -> ChainState:
+    if _PROCESS_MODEL is None:
+        raise RuntimeError("init_sampler_process was not run in this process")
+    data, prior = _PROCESS_MODEL
+    return advance_chain(state, data, prior, steps=steps, max_draws=max_draws)
+
+
+def pooled_draws(states: Sequence[ChainState]) -> np.ndarray:
+    """Post-warmup draws as a (chains, draws, channels) array, truncated to the shortest chain."""
+    length = min(len(state.draws) for state in states)
+    return np.asarray([state.draws[len(state.draws) - length :] for state in states], dtype=np.float64)
+
+
+def split_r_hat(draws: np.ndarray) -> np.ndarray:
+    """Split-R-hat per dimension of (chains, draws, dims); inf until there are enough draws."""
+    half = draws.shape[1] // 2
+    if half < 2:
+        return np.full(draws.shape[2], np.inf)
+    halves = np.concatenate((draws[:, :half], draws[:, -half:]), axis=0)
+    within = halves.var(axis=1, ddof=1).mean(axis=0)
+    between = half * halves.mean(axis=1).var(axis=0, ddof=1)
+    pooled = (half - 1) / half * within + between / half
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(within > 0, np.sqrt(pooled / within), np.inf)
+
+
+def effective_sample_size(draws: np.ndarray) -> np.ndarray:
+    """Multi-chain effective sample size per dimension (Geyer initial monotone sequence)."""
+    chains, length, dims = draws.shape
+    if length < 4:
+        return np.zeros(dims)
+    centered = draws - draws.mean(axis=1, keepdims=True)
+    size = 1 << int(np.ceil(np.log2(2 * length)))
+    spectrum = np.fft.rfft(centered, n=size, axis=1)
+    autocovariance = np.fft.irfft(spectrum * np.conj(spectrum), n=size, axis=1)[:, :length] / length
+    within = (autocovariance[:, 0] * length / (length - 1)).mean(axis=0)
+    pooled = within * (length - 1) / length
+    if chains > 1:
+        pooled = pooled + draws.mean(axis=1).var(axis=0, ddof=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rho = 1.0 - (within - autocovariance.mean(axis=0)) / pooled
+    rho[0] = 1.0
+    pairs = rho[: (length // 2) * 2].reshape(length // 2, 2, dims).sum(axis=1)
+    positive = np.cumprod(pairs > 0, axis=0).astype(bool)
+    pairs = np.minimum.accumulate(np.where(positive, pairs, np.inf), axis=0)
+    tau = -1.0 + 2.0 * np.where(positive, pairs, 0.0).sum(axis=0)
+    total = chains * length
+    tau = np.maximum(tau, 1.0 / np.log10(max(total, 10)))
+    return np.where(pooled > 0, total / tau, 0.0)
+
+
+def posterior_summary(draws: np.ndarray, channels: Sequence[str]) -> dict[str, dict[str, float]]:
+    """Per-channel theta mean/sd (the warm-start prior input) and q quantiles."""
+    flat = draws.reshape(-1, draws.shape[2])
+    q = np.exp(-np.logaddexp(0.0, -flat))
+    r_hat, ess = split_r_hat(draws), effective_sample_size(draws)
+    return {
+        channel: {
+            "mean": float(flat[:, index].mean()),
+            "sd": float(flat[:, index].std(ddof=1)) if flat.shape[0] > 1 else _DEFAULT_PRIOR_SD,
+            "q_mean": float(q[:, index].mean()),
+            "q_p05": float(np.quantile(q[:, index], 0.05)),
+            "q_p95": float(np.quantile(q[:, index], 0.95)),
+            "r_hat": float(r_hat[index]),
+            "ess": float(ess[index]),
+        }
+        for index, channel in enumerate(channels)
+    }
+
+
+@dataclass(frozen=True)
+class CredibleChannelCredit(ChannelCredit):
+    """ChannelCredit plus each row's 90% credible interval of allocated revenue."""
+
+    credible_lower_cents: np.ndarray
+    credible_upper_cents: np.ndarray
+
+
+def posterior_credit(
+    theta_draws: np.ndarray,
+    path_counts: np.ndarray,
+    revenue_cents: np.ndarray,
+) -> CredibleChannelCredit:
+    """
+    Credit conversions with per-channel touch counts ``path_counts`` (K, C)
+    from theta draws (S, C). At most _CREDIT_DRAWS evenly spaced draws are used.
+    """
+    theta_draws = np.asarray(theta_draws, dtype=np.float64)
+    path_counts = np.asarray(path_counts, dtype=np.int64)
+    revenue_cents = np.asarray(revenue_cents, dtype=np.int64)
+    if theta_draws.shape[0] > _CREDIT_DRAWS:
+        theta_draws = theta_draws[np.linspace(0, theta_draws.shape[0] - 1, _CREDIT_DRAWS).astype(np.int64)]
+    log_not_q = -np.logaddexp(0.0, theta_draws)
+    contribution = -np.expm1(path_counts[None, :, :] * log_not_q[:, None, :])
+    total = contribution.sum(axis=2, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        share = np.where(total > 0, contribution / total, 0.0)
+
+    conversion_index, channel_index = np.nonzero(path_counts > 0)
+    credit = share.mean(axis=0)[conversion_index, channel_index]
+    credit /= np.bincount(conversion_index, weights=credit, minlength=path_counts.shape[0])[conversion_index]
+    revenue = revenue_cents[conversion_index].astype(np.float64)
+    draws = share[:, conversion_index, channel_index] * revenue
+    return CredibleChannelCredit(
+        conversion_index=conversion_index,
+        channel_index=channel_index,
+        credit=credit,
+        allocated_revenue_cents=_split_revenue_by_credit(conversion_index, credit, revenue_cents),
+        credible_lower_cents=np.floor(np.quantile(draws, 0.05, axis=0)).astype(np.int64),
+        credible_upper_cents=np.ceil(np.quantile(draws, 0.95, axis=0)).astype(np.int64),
+    )
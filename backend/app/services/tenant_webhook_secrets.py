@@ -21,6 +21,7 @@ from app.core.secrets import (
     resolve_platform_encryption_key_by_id,
 )
 from app.db.session import engine as db_engine
+from app.security.tenant_key_runtime import get_tenant_api_key_runtime_cache
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +46,9 @@ class _TenantWebhookSecretCache:
         self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
         self._lock = Lock()
         self._tenant_versions: dict[str, str] = {}
+        # tenant -> (version token, provider secret field -> entry key or None);
+        # addresses the entries of a full resolution without holding plaintext.
+        self._resolutions: dict[str, tuple[str, dict[str, str | None]]] = {}
 
     @staticmethod
     def _now() -> float:
@@ -76,6 +80,7 @@ class _TenantWebhookSecretCache:
         with self._lock:
             self._entries.clear()
             self._tenant_versions.clear()
+            self._resolutions.clear()
 
     def evict_tenant(self, tenant_id: UUID) -> None:
         prefix = f"{tenant_id}:"
@@ -83,6 +88,7 @@ class _TenantWebhookSecretCache:
             for key in [k for k in self._entries.keys() if k.startswith(prefix)]:
                 self._entries.pop(key, None)
             self._tenant_versions.pop(str(tenant_id), None)
+            self._resolutions.pop(str(tenant_id), None)
 
     def sync_tenant_version(self, tenant_id: UUID, version_token: str | None) -> None:
         if not version_token:
@@ -99,8 +105,39 @@ class _TenantWebhookSecretCache:
             prefix = f"{tenant_id}:"
             for key in [k for k in self._entries.keys() if k.startswith(prefix)]:
                 self._entries.pop(key, None)
+            self._resolutions.pop(tenant_key, None)
             self._tenant_versions[tenant_key] = version_token
 
+    def remember_resolution(
+        self, tenant_id: UUID, version_token: str | None, entry_keys: dict[str, str | None]
+    ) -> None:
+        if not version_token:
+            return
+        tenant_key = str(tenant_id)
+        with self._lock:
+            if self._tenant_versions.get(tenant_key) == version_token:
+                self._resolutions[tenant_key] = (version_token, dict(entry_keys))
+
+    def get_resolution(self, tenant_id: UUID, version_token: str | None) -> dict[str, str | None] | None:
+        """All of a tenant's secrets at version_token, or None unless every entry is still cached."""
+        if not version_token:
+            return None
+        with self._lock:
+            resolution = self._resolutions.get(str(tenant_id))
+            if resolution is None or resolution[0] != version_token:
+                return None
+            entry_keys = resolution[1]
+        secrets: dict[str, str | None] = {}
+        for field, entry_key in entry_keys.items():
+            if entry_key is None:
+                secrets[field] = None
+                continue
+            value = self.get(entry_key)
+            if value is None:
+                return None
+            secrets[field] = value
+        return secrets
+
 
 _CACHE = _TenantWebhookSecretCache()
 _DECRYPT_COUNTER = 0
@@ -116,8 +153,17 @@ def get_tenant_webhook_secret_internal_stats_for_testing() -> dict[str, int]:
     return {"decrypt_count": _DECRYPT_COUNTER}
 
 
+def get_cached_tenant_webhook_secrets(tenant_id: UUID, version_token: str | None) -> dict[str, str | None] | None:
+    """
+    Decrypted secrets of the tenant's last resolution at version_token, from
+    this cache only (no DB access); None when any of them is no longer cached.
+    """
+    return _CACHE.get_resolution(tenant_id, version_token)
+
+
 def invalidate_tenant_webhook_secret_cache(tenant_id: UUID) -> None:
     _CACHE.evict_tenant(tenant_id)
+    get_tenant_api_key_runtime_cache().evict_tenant(tenant_id)
 
 
 def _bytes_from_db(value: Any) -> bytes | None:
@@ -206,9 +252,11 @@ async def resolve_tenant_webhook_secrets_from_row(
     row: dict[str, Any],
 ) -> dict[str, str | None]:
     version_token = row.get("tenant_updated_at")
-    _CACHE.sync_tenant_version(tenant_id, str(version_token) if version_token is not None else None)
+    version = str(version_token) if version_token is not None else None
+    _CACHE.sync_tenant_version(tenant_id, version)
 
     resolved: dict[str, str | None] = {}
+    entry_keys: dict[str, str | None] = {}
     for provider in PROVIDERS:
         ciphertext_raw = row.get(f"{provider}_webhook_secret_ciphertext")
         key_id_raw = row.get(f"{provider}_webhook_secret_key_id")
@@ -217,6 +265,7 @@ async def resolve_tenant_webhook_secrets_from_row(
 
         if not ciphertext or not key_id:
             resolved[f"{provider}_webhook_secret"] = None
+            entry_keys[f"{provider}_webhook_secret"] = None
             continue
 
         cache_key = _cache_key(
@@ -225,6 +274,7 @@ async def resolve_tenant_webhook_secrets_from_row(
             key_id=key_id,
             ciphertext=ciphertext,
         )
+        entry_keys[f"{provider}_webhook_secret"] = cache_key
         cached = _CACHE.get(cache_key)
         if cached is not None:
             resolved[f"{provider}_webhook_secret"] = cached
@@ -242,4 +292,5 @@ async def resolve_tenant_webhook_secrets_from_row(
             plaintext_secret=plaintext,
             old_key_id=key_id,
         )
+    _CACHE.remember_resolution(tenant_id, version, entry_keys)
     return resolved
@@ -11,18 +11,29 @@ table and deterministic baseline allocation proof harness.
 import asyncio
 import logging
 import os
-from datetime import datetime, timezone
+import time
+from contextlib import asynccontextmanager, nullcontext
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal, ROUND_HALF_UP
 from typing import Optional
-from uuid import NAMESPACE_URL, UUID, uuid4, uuid5
+from uuid import UUID, uuid4, uuid5
 
+import numpy as np
 from pydantic import BaseModel, Field
-from sqlalchemy import text
+from sqlalchemy import event, text
 
 from app.celery_app import celery_app
 from app.core.db import engine
 from app.db.session import set_tenant_guc
+from app.matviews import registry
+from app.matviews.incremental import apply_allocation_deltas, lock_allocation_summaries
 from app.observability.context import set_request_correlation_id, set_tenant_id
+from app.services.attribution_allocations import (
+    ALLOCATION_ID_NAMESPACE,
+    build_allocation_rows,
+    build_even_split_allocation_rows,
+)
+from app.services.attribution_models import MULTI_TOUCH_MODELS, allocate_multi_touch
 from app.tasks.context import run_in_worker_loop
 from app.tasks.tenant_base import TenantTask, task_tenant_id
 
@@ -31,7 +42,6 @@ logger = logging.getLogger(__name__)
 # B0.5.3.6: Canonical deterministic channel ordering for baseline allocations.
 # NOTE: `attribution_allocations` uses `channel_code` with FK to `channel_taxonomy.code`.
 BASELINE_CHANNELS = ["direct", "email", "google_search_paid"]
-_ALLOCATION_ID_NAMESPACE = uuid5(NAMESPACE_URL, "skeldir:attribution_allocations:id:v1")
 _R5_FAILED_ONCE_KEYS: set[str] = set()
 
 
@@ -103,7 +113,7 @@ def _deterministic_allocation_id(
     channel_code: str,
 ) -> UUID:
     return uuid5(
-        _ALLOCATION_ID_NAMESPACE,
+        ALLOCATION_ID_NAMESPACE,
         f"{tenant_id}:{event_id}:{model_version}:{channel_code}",
     )
 
@@ -118,12 +128,112 @@ def _split_revenue_cents_evenly(revenue_cents: int, parts: int) -> list[int]:
     return [base + (1 if i < remainder else 0) for i in range(parts)]
 
 
+@asynccontextmanager
+async def _tenant_transaction(tenant_id: UUID, conn=None):
+    """
+    Yield conn if given (the caller's tenant-scoped transaction), else a new
+    engine.begin() transaction with the tenant GUC set.
+    """
+    if conn is not None:
+        yield conn
+        return
+    async with engine.begin() as new_conn:
+        # Ensure tenant-scoped RLS context for this transaction
+        await set_tenant_guc(new_conn, tenant_id, local=True)
+        yield new_conn
+
+
+_WINDOW_FINGERPRINT_SQL = text(
+    """
+    SELECT count(*), max(id::text)::uuid, coalesce(sum(revenue_cents), 0)
+    FROM attribution_events
+    WHERE tenant_id = :tenant_id
+      AND occurred_at >= :window_start
+      AND occurred_at < :window_end
+    """
+)
+
+
+async def _window_fingerprint(
+    conn, *, tenant_id: UUID, window_start: datetime, window_end: datetime
+) -> tuple[int, Optional[UUID], int]:
+    """(event count, max event id, sum of revenue_cents) of the events in [window_start, window_end)."""
+    row = (
+        await conn.execute(
+            _WINDOW_FINGERPRINT_SQL,
+            {"tenant_id": tenant_id, "window_start": window_start, "window_end": window_end},
+        )
+    ).one()
+    return (row[0], row[1], row[2])
+
+
+async def _skip_unchanged_job(
+    tenant_id: UUID,
+    window_start: datetime,
+    window_end: datetime,
+    model_version: str,
+    correlation_id: str,
+    *,
+    fingerprint_start: datetime,
+    conn=None,
+) -> tuple[Optional[tuple[UUID, int]], tuple[int, Optional[UUID], int]]:
+    """
+    Skip-if-unchanged gate, run before the job identity upsert.
+
+    Fingerprints the events in [fingerprint_start, window_end) and, if the job's
+    last run finished successfully against the same fingerprint, marks it
+    'skipped_unchanged' (run_count is not incremented).
+
+    Returns:
+        Tuple of ((job_id, run_count) if skipped else None, fingerprint); the
+        fingerprint is passed on to _upsert_job_identity when not skipped
+    """
+    async with _tenant_transaction(tenant_id, conn) as conn:
+        fingerprint = await _window_fingerprint(
+            conn, tenant_id=tenant_id, window_start=fingerprint_start, window_end=window_end
+        )
+        row = (
+            await conn.execute(
+                text("""
+                    UPDATE attribution_recompute_jobs
+                    SET status = 'skipped_unchanged',
+                        last_correlation_id = :correlation_id,
+                        updated_at = CURRENT_TIMESTAMP,
+                        finished_at = CURRENT_TIMESTAMP
+                    WHERE tenant_id = :tenant_id
+                      AND window_start = :window_start
+                      AND window_end = :window_end
+                      AND model_version = :model_version
+                      AND status IN ('succeeded', 'skipped_unchanged')
+                      AND fingerprint_event_count = :event_count
+                      AND fingerprint_max_event_id IS NOT DISTINCT FROM :max_event_id
+                      AND fingerprint_revenue_cents = :revenue_cents
+                    RETURNING id, run_count
+                """),
+                {
+                    "tenant_id": tenant_id,
+                    "window_start": window_start,
+                    "window_end": window_end,
+                    "model_version": model_version,
+                    "correlation_id": uuid4() if correlation_id is None else UUID(correlation_id),
+                    "event_count": fingerprint[0],
+                    "max_event_id": fingerprint[1],
+                    "revenue_cents": fingerprint[2],
+                },
+            )
+        ).fetchone()
+    return ((row[0], row[1]) if row is not None else None), fingerprint
+
+
 async def _upsert_job_identity(
     tenant_id: UUID,
     window_start: datetime,
     window_end: datetime,
     model_version: str,
     correlation_id: str,
+    *,
+    fingerprint: Optional[tuple[int, Optional[UUID], int]] = None,
+    conn=None,
 ) -> tuple[UUID, int, str]:
     """
     Upsert job identity row in attribution_recompute_jobs table.
@@ -132,25 +242,31 @@ async def _upsert_job_identity(
     (tenant_id, window_start, window_end, model_version). Rerunning the same
     window will update the existing row, not create a duplicate.
 
+    fingerprint (from _skip_unchanged_job) is stored for the next run's skip
+    check; without one the stored fingerprint is cleared, so the next run
+    never skips.
+
+    With conn, runs in the caller's transaction; otherwise in its own.
+
     Returns:
         Tuple of (job_id, run_count, previous_status)
 
     Raises:
         Exception: On database errors
     """
-    async with engine.begin() as conn:
-        # Ensure tenant-scoped RLS context for this transaction
-        await set_tenant_guc(conn, tenant_id, local=True)
+    async with _tenant_transaction(tenant_id, conn) as conn:
         # Attempt INSERT to create new job identity
         # If UNIQUE constraint violation occurs, UPDATE existing row instead
         result = await conn.execute(
             text("""
                 INSERT INTO attribution_recompute_jobs (
                     id, tenant_id, window_start, window_end, model_version,
-                    status, run_count, last_correlation_id, created_at, updated_at
+                    status, run_count, last_correlation_id, created_at, updated_at,
+                    fingerprint_event_count, fingerprint_max_event_id, fingerprint_revenue_cents
                 ) VALUES (
                     :job_id, :tenant_id, :window_start, :window_end, :model_version,
-                    'running', 1, :correlation_id, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+                    'running', 1, :correlation_id, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP,
+                    :event_count, :max_event_id, :revenue_cents
                 )
                 ON CONFLICT (tenant_id, window_start, window_end, model_version)
                 DO UPDATE SET
@@ -158,7 +274,10 @@ async def _upsert_job_identity(
                     run_count = attribution_recompute_jobs.run_count + 1,
                     last_correlation_id = EXCLUDED.last_correlation_id,
                     updated_at = CURRENT_TIMESTAMP,
-                    started_at = CURRENT_TIMESTAMP
+                    started_at = CURRENT_TIMESTAMP,
+                    fingerprint_event_count = EXCLUDED.fingerprint_event_count,
+                    fingerprint_max_event_id = EXCLUDED.fingerprint_max_event_id,
+                    fingerprint_revenue_cents = EXCLUDED.fingerprint_revenue_cents
                 RETURNING id, run_count, NULL as previous_status
             """),
             {
@@ -168,6 +287,9 @@ async def _upsert_job_identity(
                 "window_end": window_end,
                 "model_version": model_version,
                 "correlation_id": uuid4() if correlation_id is None else UUID(correlation_id),
+                "event_count": None if fingerprint is None else fingerprint[0],
+                "max_event_id": None if fingerprint is None else fingerprint[1],
+                "revenue_cents": None if fingerprint is None else fingerprint[2],
             }
         )
         row = result.fetchone()
@@ -201,6 +323,7 @@ async def _mark_job_status(
     tenant_id: UUID,
     status: str,
     error_message: Optional[str] = None,
+    conn=None,
 ) -> None:
     """
     Update job status in attribution_recompute_jobs table.
@@ -212,10 +335,9 @@ async def _mark_job_status(
         tenant_id: Tenant UUID (for RLS enforcement)
         status: New status (succeeded|failed)
         error_message: Error message (if status=failed)
+        conn: Caller's tenant-scoped transaction (default: a new one)
     """
-    async with engine.begin() as conn:
-        # Ensure tenant-scoped RLS context for this transaction
-        await set_tenant_guc(conn, tenant_id, local=True)
+    async with _tenant_transaction(tenant_id, conn) as conn:
         await conn.execute(
             text("""
                 UPDATE attribution_recompute_jobs
@@ -243,21 +365,428 @@ async def _mark_job_status(
     )
 
 
+_WINDOW_EVENTS_FIRST_PAGE_SQL = text(
+    """
+    SELECT id, revenue_cents, occurred_at, created_at, session_id
+    FROM attribution_events
+    WHERE tenant_id = :tenant_id
+      AND occurred_at >= :window_start
+      AND occurred_at < :window_end
+    ORDER BY occurred_at ASC, id ASC
+    LIMIT :page_size
+    """
+)
+_WINDOW_EVENTS_NEXT_PAGE_SQL = text(
+    """
+    SELECT id, revenue_cents, occurred_at, created_at, session_id
+    FROM attribution_events
+    WHERE tenant_id = :tenant_id
+      AND occurred_at >= :after_occurred_at
+      AND (occurred_at, id) > (:after_occurred_at, :after_id)
+      AND occurred_at < :window_end
+    ORDER BY occurred_at ASC, id ASC
+    LIMIT :page_size
+    """
+)
+_WINDOW_EVENTS_AFTER_WATERMARK_SQL = text(
+    """
+    SELECT id, revenue_cents, occurred_at, created_at, session_id
+    FROM attribution_events
+    WHERE tenant_id = :tenant_id
+      AND created_at >= :after_created_at
+      AND (created_at, id) > (:after_created_at, :after_id)
+      AND occurred_at >= :window_start
+      AND occurred_at < :window_end
+    ORDER BY created_at ASC, id ASC
+    LIMIT :page_size
+    """
+)
+
+
+async def _iter_window_event_batches(
+    conn,
+    *,
+    tenant_id: UUID,
+    window_start: datetime,
+    window_end: datetime,
+    batch_size: int,
+    after_watermark: Optional[tuple[datetime, UUID]] = None,
+):
+    """
+    Yield the window's events as (id, revenue_cents, occurred_at, created_at,
+    session_id) rows, at most batch_size per batch.
+
+    Keyset pagination: each page resumes strictly after the last row of the
+    previous one, so only one page is ever held in memory and every page is an
+    index range scan regardless of how deep into the window it is. Pages follow
+    (occurred_at, id); with after_watermark=(created_at, id) only events
+    ingested after the watermark are read, paged on (created_at, id).
+    """
+    params = {
+        "tenant_id": tenant_id,
+        "window_start": window_start,
+        "window_end": window_end,
+        "page_size": batch_size,
+    }
+    if after_watermark is None:
+        statement = _WINDOW_EVENTS_FIRST_PAGE_SQL
+    else:
+        statement = _WINDOW_EVENTS_AFTER_WATERMARK_SQL
+        params["after_created_at"], params["after_id"] = after_watermark
+    while True:
+        rows = (await conn.execute(statement, params)).fetchall()
+        if not rows:
+            return
+        yield rows
+        if len(rows) < batch_size:
+            return
+        last_event_id, _, last_occurred_at, last_created_at, _ = rows[-1]
+        params["after_id"] = last_event_id
+        if after_watermark is None:
+            params["after_occurred_at"] = last_occurred_at
+            statement = _WINDOW_EVENTS_NEXT_PAGE_SQL
+        else:
+            params["after_created_at"] = last_created_at
+
+
+async def _read_job_watermark(
+    conn,
+    *,
+    tenant_id: UUID,
+    window_start: datetime,
+    window_end: datetime,
+    model_version: str,
+) -> Optional[tuple[datetime, UUID]]:
+    row = (
+        await conn.execute(
+            text(
+                """
+                SELECT watermark_created_at, watermark_event_id
+                FROM attribution_recompute_jobs
+                WHERE tenant_id = :tenant_id
+                  AND window_start = :window_start
+                  AND window_end = :window_end
+                  AND model_version = :model_version
+                """
+            ),
+            {
+                "tenant_id": tenant_id,
+                "window_start": window_start,
+                "window_end": window_end,
+                "model_version": model_version,
+            },
+        )
+    ).fetchone()
+    if row is None or row[0] is None:
+        return None
+    return (row[0], row[1])
+
+
+def _watermark_lag_seconds() -> int:
+    lag_seconds = int(os.getenv("ATTRIBUTION_RECOMPUTE_WATERMARK_LAG_SECONDS", "300"))
+    if lag_seconds < 0:
+        raise ValueError("ATTRIBUTION_RECOMPUTE_WATERMARK_LAG_SECONDS must be >= 0")
+    return lag_seconds
+
+
+async def _watermark_cutoff(conn, lag_seconds: int) -> datetime:
+    return (
+        await conn.execute(
+            text("SELECT now() - make_interval(secs => :lag_seconds)"),
+            {"lag_seconds": lag_seconds},
+        )
+    ).scalar_one()
+
+
+def _settled_watermark(
+    rows, cutoff: datetime, current: Optional[tuple[datetime, UUID]]
+) -> Optional[tuple[datetime, UUID]]:
+    """Max of current and the (created_at, id) of reader rows created at or before cutoff."""
+    settled = [(row[3], row[0]) for row in rows if row[3] <= cutoff]
+    if not settled:
+        return current
+    batch_max = max(settled)
+    return batch_max if current is None or batch_max > current else current
+
+
+async def _advance_job_watermark(
+    conn,
+    *,
+    tenant_id: UUID,
+    window_start: datetime,
+    window_end: datetime,
+    model_version: str,
+    watermark: tuple[datetime, UUID],
+) -> None:
+    # Forward-only: an overlapping run that read an older snapshot must not rewind it.
+    await conn.execute(
+        text(
+            """
+            UPDATE attribution_recompute_jobs
+            SET watermark_created_at = :watermark_created_at,
+                watermark_event_id = :watermark_event_id
+            WHERE tenant_id = :tenant_id
+              AND window_start = :window_start
+              AND window_end = :window_end
+              AND model_version = :model_version
+              AND (
+                  watermark_created_at IS NULL
+                  OR (watermark_created_at, watermark_event_id)
+                     < (:watermark_created_at, :watermark_event_id)
+              )
+            """
+        ),
+        {
+            "tenant_id": tenant_id,
+            "window_start": window_start,
+            "window_end": window_end,
+            "model_version": model_version,
+            "watermark_created_at": watermark[0],
+            "watermark_event_id": watermark[1],
+        },
+    )
+
+
+# Allocation writers.
+#
+# Both write paths end in the same INSERT ... ON CONFLICT (id) DO UPDATE ... IS
+# DISTINCT FROM statement, so determinism and the statement-level allocation
+# sum triggers behave identically; they differ only in how the rows reach it.
+# Small batches bind twelve parallel arrays into unnest(); batches of at least
+# ATTRIBUTION_ALLOCATION_COPY_MIN_ROWS rows are binary-COPYed into a
+# transaction-scoped temp table first, which avoids encoding, sending and
+# re-parsing the arrays as bind parameters.
+
+_ALLOCATION_COLUMNS = (
+    "id",
+    "tenant_id",
+    "event_id",
+    "channel_code",
+    "allocation_ratio",
+    "model_version",
+    "model_type",
+    "confidence_score",
+    "verified",
+    "allocated_revenue_cents",
+    "created_at",
+    "updated_at",
+)
+# Row-dict keys (build_*_allocation_rows) in _ALLOCATION_COLUMNS order.
+_ALLOCATION_ROW_KEYS = (
+    "ids",
+    "tenant_ids",
+    "event_ids",
+    "channel_codes",
+    "allocation_ratios",
+    "model_versions",
+    "model_types",
+    "confidence_scores",
+    "verifieds",
+    "allocated_revenue_cents",
+    "created_ats",
+    "updated_ats",
+)
+_ALLOCATION_STAGING_TABLE = "attribution_allocations_staging"
+
+_UNNEST_ALLOCATION_ROWS = """
+    SELECT *
+    FROM unnest(
+        CAST(:ids AS uuid[]),
+        CAST(:tenant_ids AS uuid[]),
+        CAST(:event_ids AS uuid[]),
+        CAST(:channel_codes AS text[]),
+        CAST(:allocation_ratios AS numeric[]),
+        CAST(:model_versions AS text[]),
+        CAST(:model_types AS text[]),
+        CAST(:confidence_scores AS numeric[]),
+        CAST(:verifieds AS bool[]),
+        CAST(:allocated_revenue_cents AS int[]),
+        CAST(:created_ats AS timestamptz[]),
+        CAST(:updated_ats AS timestamptz[])
+    ) AS t(
+        id, tenant_id, event_id, channel_code, allocation_ratio, model_version, model_type,
+        confidence_score, verified, allocated_revenue_cents, created_at, updated_at
+    )
+"""
+_STAGED_ALLOCATION_ROWS = f"SELECT * FROM {_ALLOCATION_STAGING_TABLE}"
+
+_UPSERT_ALLOCATIONS_FROM = """
+    INSERT INTO attribution_allocations (
+        id, tenant_id, event_id, channel_code, allocation_ratio, model_version, model_type,
+        confidence_score, verified, allocated_revenue_cents, created_at, updated_at
+    )
+    SELECT
+        id, tenant_id, event_id, channel_code, allocation_ratio, model_version, model_type,
+        confidence_score, verified, allocated_revenue_cents, created_at, updated_at
+    FROM rows
+    ORDER BY id ASC
+    ON CONFLICT (id)
+    DO UPDATE SET
+        allocation_ratio = EXCLUDED.allocation_ratio,
+        model_type = EXCLUDED.model_type,
+        confidence_score = EXCLUDED.confidence_score,
+        verified = EXCLUDED.verified,
+        allocated_revenue_cents = EXCLUDED.allocated_revenue_cents,
+        updated_at = EXCLUDED.updated_at
+    WHERE
+        attribution_allocations.allocation_ratio IS DISTINCT FROM EXCLUDED.allocation_ratio
+        OR attribution_allocations.model_type IS DISTINCT FROM EXCLUDED.model_type
+        OR attribution_allocations.confidence_score IS DISTINCT FROM EXCLUDED.confidence_score
+        OR attribution_allocations.verified IS DISTINCT FROM EXCLUDED.verified
+        OR attribution_allocations.allocated_revenue_cents IS DISTINCT FROM EXCLUDED.allocated_revenue_cents
+"""
+
+
+def _upsert_allocations_sql(rows_source: str) -> str:
+    return f"WITH rows AS ({rows_source}){_UPSERT_ALLOCATIONS_FROM}"
+
+
+def _replace_allocations_sql(rows_source: str) -> str:
+    # Upserts the events' new (event, channel) rows and deletes the channels they
+    # no longer credit in one statement: the statement-level allocation sum
+    # triggers fire once at its end and see only the final per-event sums.
+    return f"""
+    WITH rows AS ({rows_source}),
+    upserted AS ({_UPSERT_ALLOCATIONS_FROM}
+        RETURNING 1
+    ),
+    superseded AS (
+        DELETE FROM attribution_allocations aa
+        WHERE aa.tenant_id = :tenant_id
+          AND aa.model_version = :model_version
+          AND aa.event_id = ANY(CAST(:replace_event_ids AS uuid[]))
+          AND NOT EXISTS (SELECT 1 FROM rows WHERE rows.id = aa.id)
+        RETURNING aa.created_at, aa.channel_code
+    )
+    SELECT
+        (SELECT count(*) FROM upserted),
+        (SELECT count(*) FROM superseded),
+        ARRAY(SELECT created_at FROM superseded),
+        ARRAY(SELECT channel_code FROM superseded)
+    """
+
+
+_UPSERT_ALLOCATIONS_UNNEST_SQL = text(_upsert_allocations_sql(_UNNEST_ALLOCATION_ROWS))
+_UPSERT_ALLOCATIONS_STAGED_SQL = text(_upsert_allocations_sql(_STAGED_ALLOCATION_ROWS))
+_REPLACE_ALLOCATIONS_UNNEST_SQL = text(_replace_allocations_sql(_UNNEST_ALLOCATION_ROWS))
+_REPLACE_ALLOCATIONS_STAGED_SQL = text(_replace_allocations_sql(_STAGED_ALLOCATION_ROWS))
+
+
+def _allocation_copy_min_rows() -> int:
+    min_rows = int(os.getenv("ATTRIBUTION_ALLOCATION_COPY_MIN_ROWS", "2000"))
+    if min_rows < 1:
+        raise ValueError("ATTRIBUTION_ALLOCATION_COPY_MIN_ROWS must be >= 1")
+    return min_rows
+
+
+async def _stage_allocation_rows(conn, rows: dict[str, list]) -> None:
+    """Binary-COPY rows into the transaction's (emptied) allocation staging table."""
+    await conn.execute(
+        text(
+            f"""
+            CREATE TEMP TABLE IF NOT EXISTS {_ALLOCATION_STAGING_TABLE} (
+                id uuid,
+                tenant_id uuid,
+                event_id uuid,
+                channel_code text,
+                allocation_ratio numeric(6,5),
+                model_version text,
+                model_type varchar(50),
+                confidence_score numeric(4,3),
+                verified boolean,
+                allocated_revenue_cents integer,
+                created_at timestamptz,
+                updated_at timestamptz
+            ) ON COMMIT DROP
+            """
+        )
+    )
+    await conn.execute(text(f"TRUNCATE {_ALLOCATION_STAGING_TABLE}"))
+    raw_connection = await conn.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        _ALLOCATION_STAGING_TABLE,
+        records=zip(*(rows[key] for key in _ALLOCATION_ROW_KEYS)),
+        columns=_ALLOCATION_COLUMNS,
+    )
+
+
+async def _write_allocation_rows(
+    conn,
+    rows: dict[str, list],
+    *,
+    replace_event_ids: Optional[list] = None,
+    tenant_id: Optional[UUID] = None,
+    model_version: Optional[str] = None,
+    writer: Optional[str] = None,
+) -> str:
+    """
+    Upsert allocation rows, choosing the unnest or COPY writer by batch size.
+
+    With replace_event_ids, those events' rows for (tenant_id, model_version)
+    that are not in this batch are deleted in the same statement. writer forces
+    "unnest" or "copy". Summary tables of views with incremental storage are
+    updated for the written events in the same transaction. Returns the writer
+    used ("none" for an empty batch without replacements). The tenant's
+    summary locks are taken before the write, so they are held from the
+    transaction's first batch on.
+    """
+    if not rows["ids"] and not replace_event_ids:
+        return "none"
+    if writer is None:
+        writer = "copy" if len(rows["ids"]) >= _allocation_copy_min_rows() else "unnest"
+    if writer not in ("unnest", "copy"):
+        raise ValueError(f"Unknown allocation writer: {writer}")
+
+    incremental = bool(registry.incremental_entries())
+    summary_tenant_id = tenant_id or rows["tenant_ids"][0]
+    if incremental:
+        await lock_allocation_summaries(conn, tenant_id=summary_tenant_id)
+
+    params: dict = {}
+    if writer == "copy":
+        await _stage_allocation_rows(conn, rows)
+    else:
+        params.update(rows)
+    if replace_event_ids is None:
+        statement = _UPSERT_ALLOCATIONS_STAGED_SQL if writer == "copy" else _UPSERT_ALLOCATIONS_UNNEST_SQL
+    else:
+        statement = _REPLACE_ALLOCATIONS_STAGED_SQL if writer == "copy" else _REPLACE_ALLOCATIONS_UNNEST_SQL
+        params.update(
+            {"tenant_id": tenant_id, "model_version": model_version, "replace_event_ids": replace_event_ids}
+        )
+    result = await conn.execute(statement, params)
+    removed_rows = []
+    if replace_event_ids is not None:
+        _, _, removed_created_ats, removed_channel_codes = result.one()
+        removed_rows = list(zip(removed_created_ats, removed_channel_codes))
+    if incremental:
+        await apply_allocation_deltas(
+            conn,
+            tenant_id=summary_tenant_id,
+            event_ids=[*rows["event_ids"], *(replace_event_ids or ())],
+            removed_rows=removed_rows,
+        )
+    return writer
+
+
 async def _compute_allocations_deterministic_baseline(
     tenant_id: UUID,
     window_start: datetime,
     window_end: datetime,
     model_version: str = "1.0.0",
     *,
+    incremental: bool = False,
     inject_fail_once_key: Optional[str] = None,
     inject_fail_after_batches: int = 1,
+    conn=None,
 ) -> dict:
     """
     Deterministic baseline attribution allocation proof harness.
 
     B0.5.3.2: This is NOT the final attribution model. This is a minimal
     deterministic proof harness that:
-    1. Reads events in [window_start, window_end] from attribution_events (read-only)
+    1. Reads events in [window_start, window_end) from attribution_events (read-only),
+       streamed in keyset pages of ATTRIBUTION_BASELINE_BATCH_EVENTS rows
     2. Writes derived rows into attribution_allocations using the existing
        event-scoped overwrite strategy (upsert on unique key)
 
@@ -265,12 +794,25 @@ async def _compute_allocations_deterministic_baseline(
     a fixed set of channels. Rerunning the same window MUST produce identical
     allocations (same rows + same values).
 
+    Watermark: the (created_at, id) of the last processed event is advanced on
+    the window's attribution_recompute_jobs row in the same transaction as the
+    allocation writes. With incremental=True and a recorded watermark, only
+    events ingested after it are read; allocations are per event, so the
+    result is identical to a full rebuild. The watermark stops
+    ATTRIBUTION_RECOMPUTE_WATERMARK_LAG_SECONDS short of now() so events from
+    ingestion transactions still in flight (created_at is set before commit)
+    are picked up by the next run. With conn, everything runs in the caller's
+    transaction.
+
     Returns:
-        Dict with metadata (event_count, allocation_count)
+        Dict with metadata (event_count, allocation_count, mode), where
+        event_count counts the events allocated by this run and mode is
+        "full", "incremental" or "unchanged" (incremental, no new events)
     """
     batch_events = int(os.getenv("ATTRIBUTION_BASELINE_BATCH_EVENTS", "2000"))
     if batch_events < 1:
         raise ValueError("ATTRIBUTION_BASELINE_BATCH_EVENTS must be >= 1")
+    watermark_lag_seconds = _watermark_lag_seconds()
 
     if inject_fail_once_key is not None:
         if os.getenv("ENABLE_R5_RETRY_INJECTION", "") != "1":
@@ -285,174 +827,47 @@ async def _compute_allocations_deterministic_baseline(
     confidence_score = allocation_ratio.quantize(Decimal("0.001"), rounding=ROUND_HALF_UP)
     model_type = "deterministic_baseline"
 
-    async with engine.begin() as conn:
-        # Set tenant context for RLS policy
-        await set_tenant_guc(conn, tenant_id, local=True)
-
-        async def _upsert_allocations_bulk(*, rows: dict[str, list]) -> None:
-            if not rows["ids"]:
-                return
-
-            await conn.execute(
-                text(
-                    """
-                    WITH rows AS (
-                        SELECT *
-                        FROM unnest(
-                            CAST(:ids AS uuid[]),
-                            CAST(:tenant_ids AS uuid[]),
-                            CAST(:event_ids AS uuid[]),
-                            CAST(:channel_codes AS text[]),
-                            CAST(:allocation_ratios AS numeric[]),
-                            CAST(:model_versions AS text[]),
-                            CAST(:model_types AS text[]),
-                            CAST(:confidence_scores AS numeric[]),
-                            CAST(:verifieds AS bool[]),
-                            CAST(:allocated_revenue_cents AS int[]),
-                            CAST(:created_ats AS timestamptz[]),
-                            CAST(:updated_ats AS timestamptz[])
-                        ) AS t(
-                            id,
-                            tenant_id,
-                            event_id,
-                            channel_code,
-                            allocation_ratio,
-                            model_version,
-                            model_type,
-                            confidence_score,
-                            verified,
-                            allocated_revenue_cents,
-                            created_at,
-                            updated_at
-                        )
-                    )
-                    INSERT INTO attribution_allocations (
-                        id,
-                        tenant_id,
-                        event_id,
-                        channel_code,
-                        allocation_ratio,
-                        model_version,
-                        model_type,
-                        confidence_score,
-                        verified,
-                        allocated_revenue_cents,
-                        created_at,
-                        updated_at
-                    )
-                    SELECT
-                        id,
-                        tenant_id,
-                        event_id,
-                        channel_code,
-                        allocation_ratio,
-                        model_version,
-                        model_type,
-                        confidence_score,
-                        verified,
-                        allocated_revenue_cents,
-                        created_at,
-                        updated_at
-                    FROM rows
-                    ORDER BY id ASC
-                    ON CONFLICT (id)
-                    DO UPDATE SET
-                        allocation_ratio = EXCLUDED.allocation_ratio,
-                        model_type = EXCLUDED.model_type,
-                        confidence_score = EXCLUDED.confidence_score,
-                        verified = EXCLUDED.verified,
-                        allocated_revenue_cents = EXCLUDED.allocated_revenue_cents,
-                        updated_at = EXCLUDED.updated_at
-                    WHERE
-                        attribution_allocations.allocation_ratio IS DISTINCT FROM EXCLUDED.allocation_ratio
-                        OR attribution_allocations.model_type IS DISTINCT FROM EXCLUDED.model_type
-                        OR attribution_allocations.confidence_score IS DISTINCT FROM EXCLUDED.confidence_score
-                        OR attribution_allocations.verified IS DISTINCT FROM EXCLUDED.verified
-                        OR attribution_allocations.allocated_revenue_cents IS DISTINCT FROM EXCLUDED.allocated_revenue_cents;
-                    """
-                ),
-                rows,
-            )
-
-        events_result = await conn.execute(
-            text(
-                """
-                SELECT id, revenue_cents, occurred_at
-                FROM attribution_events
-                WHERE tenant_id = :tenant_id
-                  AND occurred_at >= :window_start
-                  AND occurred_at < :window_end
-                ORDER BY occurred_at ASC, id ASC
-                """
-            ),
-            {
-                "tenant_id": tenant_id,
-                "window_start": window_start,
-                "window_end": window_end,
-            },
-        )
-        events = events_result.fetchall()
-        if not events:
-            logger.info(
-                "attribution_baseline_no_events_in_window",
-                extra={
-                    "tenant_id": str(tenant_id),
-                    "window_start": window_start.isoformat(),
-                    "window_end": window_end.isoformat(),
-                    "model_version": model_version,
-                },
-            )
-            return {"event_count": 0, "allocation_count": 0}
+    async with _tenant_transaction(tenant_id, conn) as conn:
+        job_identity = {
+            "tenant_id": tenant_id,
+            "window_start": window_start,
+            "window_end": window_end,
+            "model_version": model_version,
+        }
+        watermark = await _read_job_watermark(conn, **job_identity) if incremental else None
+        mode = "full" if watermark is None else "incremental"
+        watermark_cutoff = await _watermark_cutoff(conn, watermark_lag_seconds)
+        next_watermark = watermark
 
-        event_count = len(events)
+        event_count = 0
         allocation_count = 0
         batches_written = 0
 
-        for offset in range(0, len(events), batch_events):
-            batch = events[offset : offset + batch_events]
-
-            batch_rows: dict[str, list] = {
-                "ids": [],
-                "tenant_ids": [],
-                "event_ids": [],
-                "channel_codes": [],
-                "allocation_ratios": [],
-                "model_versions": [],
-                "model_types": [],
-                "confidence_scores": [],
-                "verifieds": [],
-                "allocated_revenue_cents": [],
-                "created_ats": [],
-                "updated_ats": [],
-            }
+        async for batch in _iter_window_event_batches(
+            conn,
+            tenant_id=tenant_id,
+            window_start=window_start,
+            window_end=window_end,
+            batch_size=batch_events,
+            after_watermark=watermark,
+        ):
+            event_count += len(batch)
+            next_watermark = _settled_watermark(batch, watermark_cutoff, next_watermark)
+
+            batch_rows = build_even_split_allocation_rows(
+                tenant_id=tenant_id,
+                event_ids=[row[0] for row in batch],
+                revenue_cents=[row[1] for row in batch],
+                channel_codes=BASELINE_CHANNELS,
+                model_version=model_version,
+                model_type=model_type,
+                allocation_ratio=allocation_ratio,
+                confidence_score=confidence_score,
+                timestamp=fixed_ts,
+            )
+            allocation_count += len(batch_rows["ids"])
 
-            for event_id, revenue_cents, _occurred_at in batch:
-                allocated = _split_revenue_cents_evenly(int(revenue_cents), len(BASELINE_CHANNELS))
-                for channel_code, allocated_revenue_cents in zip(
-                    BASELINE_CHANNELS, allocated, strict=True
-                ):
-                    batch_rows["ids"].append(
-                        _deterministic_allocation_id(
-                            tenant_id=tenant_id,
-                            event_id=event_id,
-                            model_version=model_version,
-                            channel_code=channel_code,
-                        )
-                    )
-                    batch_rows["tenant_ids"].append(tenant_id)
-                    batch_rows["event_ids"].append(event_id)
-                    batch_rows["channel_codes"].append(channel_code)
-                    batch_rows["allocation_ratios"].append(str(allocation_ratio))
-                    batch_rows["model_versions"].append(model_version)
-                    batch_rows["model_types"].append(model_type)
-                    batch_rows["confidence_scores"].append(str(confidence_score))
-                    batch_rows["verifieds"].append(False)
-                    batch_rows["allocated_revenue_cents"].append(int(allocated_revenue_cents))
-                    batch_rows["created_ats"].append(fixed_ts)
-                    batch_rows["updated_ats"].append(fixed_ts)
-                    allocation_count += 1
-
-            await _upsert_allocations_bulk(rows=batch_rows)
+            await _write_allocation_rows(conn, batch_rows)
             batches_written += 1
 
             if inject_fail_once_key is not None:
@@ -470,6 +885,33 @@ async def _compute_allocations_deterministic_baseline(
                     )
                     raise RuntimeError("R5 retry injection: transient failure")
 
+        if next_watermark is not None and next_watermark != watermark:
+            await _advance_job_watermark(conn, **job_identity, watermark=next_watermark)
+
+        if not event_count:
+            if mode == "incremental":
+                logger.info(
+                    "attribution_baseline_window_unchanged",
+                    extra={
+                        "tenant_id": str(tenant_id),
+                        "window_start": window_start.isoformat(),
+                        "window_end": window_end.isoformat(),
+                        "model_version": model_version,
+                        "watermark_created_at": watermark[0].isoformat(),
+                    },
+                )
+                return {"event_count": 0, "allocation_count": 0, "mode": "unchanged"}
+            logger.info(
+                "attribution_baseline_no_events_in_window",
+                extra={
+                    "tenant_id": str(tenant_id),
+                    "window_start": window_start.isoformat(),
+                    "window_end": window_end.isoformat(),
+                    "model_version": model_version,
+                },
+            )
+            return {"event_count": 0, "allocation_count": 0, "mode": mode}
+
         logger.info(
             "attribution_baseline_allocations_computed",
             extra={
@@ -479,15 +921,400 @@ async def _compute_allocations_deterministic_baseline(
                 "model_version": model_version,
                 "event_count": event_count,
                 "allocation_count": allocation_count,
+                "mode": mode,
             }
         )
 
         return {
             "event_count": event_count,
             "allocation_count": allocation_count,
+            "mode": mode,
+        }
+
+
+_SESSION_CONVERSIONS_SQL = text(
+    """
+    SELECT id, revenue_cents, occurred_at, created_at, session_id
+    FROM attribution_events
+    WHERE tenant_id = :tenant_id
+      AND session_id = ANY(CAST(:session_ids AS uuid[]))
+      AND occurred_at >= :window_start
+      AND occurred_at < :window_end
+      AND revenue_cents > 0
+    ORDER BY occurred_at ASC, id ASC
+    """
+)
+_SESSION_TOUCHPOINTS_SQL = text(
+    """
+    SELECT session_id, occurred_at, channel
+    FROM attribution_events
+    WHERE tenant_id = :tenant_id
+      AND session_id = ANY(CAST(:session_ids AS uuid[]))
+      AND occurred_at >= :lookback_start
+      AND occurred_at < :window_end
+    ORDER BY session_id ASC, occurred_at ASC, id ASC
+    """
+)
+
+
+def _multi_touch_allocation_rows(
+    *,
+    tenant_id: UUID,
+    model_version: str,
+    model_type: str,
+    conversions: list,
+    touchpoints: list,
+    lookback_seconds: float,
+    half_life_seconds: float,
+    timestamp: datetime,
+) -> dict[str, list]:
+    """Encode reader rows as session/channel codes and run the vectorised model."""
+    session_codes: dict[UUID, int] = {}
+    channels = sorted({row[2] for row in touchpoints})
+    channel_codes = {channel: index for index, channel in enumerate(channels)}
+    touch_count, conversion_count = len(touchpoints), len(conversions)
+    credit = allocate_multi_touch(
+        model_type,
+        touch_session=np.fromiter(
+            (session_codes.setdefault(row[0], len(session_codes)) for row in touchpoints),
+            dtype=np.int64,
+            count=touch_count,
+        ),
+        touch_time=np.fromiter((row[1].timestamp() for row in touchpoints), dtype=np.float64, count=touch_count),
+        touch_channel=np.fromiter((channel_codes[row[2]] for row in touchpoints), dtype=np.int64, count=touch_count),
+        conversion_session=np.fromiter(
+            (session_codes.get(row[4], -1) for row in conversions), dtype=np.int64, count=conversion_count
+        ),
+        conversion_time=np.fromiter(
+            (row[2].timestamp() for row in conversions), dtype=np.float64, count=conversion_count
+        ),
+        conversion_revenue_cents=np.fromiter(
+            (row[1] for row in conversions), dtype=np.int64, count=conversion_count
+        ),
+        lookback_seconds=lookback_seconds,
+        half_life_seconds=half_life_seconds,
+    )
+    return build_allocation_rows(
+        tenant_id=tenant_id,
+        event_ids=[conversions[index][0] for index in credit.conversion_index.tolist()],
+        channel_codes=[channels[index] for index in credit.channel_index.tolist()],
+        allocated_revenue_cents=credit.allocated_revenue_cents,
+        allocation_ratios=credit.credit,
+        model_version=model_version,
+        model_type=model_type,
+        timestamp=timestamp,
+    )
+
+
+def _positive_days_env(name: str, default: str) -> float:
+    days = float(os.getenv(name, default))
+    if days <= 0:
+        raise ValueError(f"{name} must be > 0")
+    return days * 86400.0
+
+
+async def _compute_allocations_multi_touch(
+    tenant_id: UUID,
+    window_start: datetime,
+    window_end: datetime,
+    model_version: str,
+    *,
+    incremental: bool = False,
+    conn=None,
+) -> dict:
+    """
+    Multi-touch attribution for the conversions in [window_start, window_end).
+
+    Every event with revenue_cents > 0 is a conversion; its revenue is credited
+    to the channels of its session's events in
+    [occurred_at - ATTRIBUTION_MULTI_TOUCH_LOOKBACK_DAYS, occurred_at] by the
+    model MULTI_TOUCH_MODELS[model_version] (app.services.attribution_models).
+    Conversions are streamed in keyset pages of ATTRIBUTION_BASELINE_BATCH_EVENTS
+    events; each page's session paths are fetched and attributed in one
+    vectorised call, and each conversion's allocation rows are replaced
+    (upsert plus delete of channels it no longer credits).
+
+    Incremental runs use the job watermark like the baseline, but a late
+    touchpoint changes the credit of its session's later conversions, so the
+    sessions of all events ingested after the watermark (including lookback
+    touches before window_start) are recomputed rather than just the new events.
+    With conn, everything runs in the caller's transaction.
+
+    Returns:
+        Dict with metadata (event_count, allocation_count, mode), where
+        event_count counts the conversions allocated by this run
+    """
+    model_type = MULTI_TOUCH_MODELS.get(model_version)
+    if model_type is None:
+        raise ValueError(f"model_version {model_version!r} is not a multi-touch model")
+    batch_events = int(os.getenv("ATTRIBUTION_BASELINE_BATCH_EVENTS", "2000"))
+    if batch_events < 1:
+        raise ValueError("ATTRIBUTION_BASELINE_BATCH_EVENTS must be >= 1")
+    lookback_seconds = _positive_days_env("ATTRIBUTION_MULTI_TOUCH_LOOKBACK_DAYS", "30")
+    half_life_seconds = _positive_days_env("ATTRIBUTION_TIME_DECAY_HALF_LIFE_DAYS", "7")
+    watermark_lag_seconds = _watermark_lag_seconds()
+    lookback_start = window_start - timedelta(seconds=lookback_seconds)
+
+    async with _tenant_transaction(tenant_id, conn) as conn:
+
+        job_identity = {
+            "tenant_id": tenant_id,
+            "window_start": window_start,
+            "window_end": window_end,
+            "model_version": model_version,
+        }
+        watermark = await _read_job_watermark(conn, **job_identity) if incremental else None
+        mode = "full" if watermark is None else "incremental"
+        watermark_cutoff = await _watermark_cutoff(conn, watermark_lag_seconds)
+        next_watermark = watermark
+
+        events_read = 0
+        conversion_count = 0
+        allocation_count = 0
+        recomputed_sessions: set[UUID] = set()
+
+        async for batch in _iter_window_event_batches(
+            conn,
+            tenant_id=tenant_id,
+            window_start=window_start if watermark is None else lookback_start,
+            window_end=window_end,
+            batch_size=batch_events,
+            after_watermark=watermark,
+        ):
+            events_read += len(batch)
+            next_watermark = _settled_watermark(batch, watermark_cutoff, next_watermark)
+
+            if watermark is None:
+                conversions = [row for row in batch if row[1] > 0]
+            else:
+                sessions = {row[4] for row in batch} - recomputed_sessions
+                if not sessions:
+                    continue
+                recomputed_sessions |= sessions
+                conversions = (
+                    await conn.execute(
+                        _SESSION_CONVERSIONS_SQL,
+                        {
+                            "tenant_id": tenant_id,
+                            "session_ids": list(sessions),
+                            "window_start": window_start,
+                            "window_end": window_end,
+                        },
+                    )
+                ).fetchall()
+            if not conversions:
+                continue
+
+            touchpoints = (
+                await conn.execute(
+                    _SESSION_TOUCHPOINTS_SQL,
+                    {
+                        "tenant_id": tenant_id,
+                        "session_ids": list({row[4] for row in conversions}),
+                        "lookback_start": lookback_start,
+                        "window_end": window_end,
+                    },
+                )
+            ).fetchall()
+            rows = _multi_touch_allocation_rows(
+                tenant_id=tenant_id,
+                model_version=model_version,
+                model_type=model_type,
+                conversions=conversions,
+                touchpoints=touchpoints,
+                lookback_seconds=lookback_seconds,
+                half_life_seconds=half_life_seconds,
+                timestamp=window_end,
+            )
+            await _write_allocation_rows(
+                conn,
+                rows,
+                replace_event_ids=[row[0] for row in conversions],
+                tenant_id=tenant_id,
+                model_version=model_version,
+            )
+            conversion_count += len(conversions)
+            allocation_count += len(rows["ids"])
+
+        if next_watermark is not None and next_watermark != watermark:
+            await _advance_job_watermark(conn, **job_identity, watermark=next_watermark)
+
+        if mode == "incremental" and not events_read:
+            mode = "unchanged"
+
+        logger.info(
+            "attribution_multi_touch_allocations_computed",
+            extra={
+                "tenant_id": str(tenant_id),
+                "window_start": window_start.isoformat(),
+                "window_end": window_end.isoformat(),
+                "model_version": model_version,
+                "model_type": model_type,
+                "event_count": conversion_count,
+                "allocation_count": allocation_count,
+                "recomputed_sessions": len(recomputed_sessions),
+                "mode": mode,
+            },
+        )
+
+        return {
+            "event_count": conversion_count,
+            "allocation_count": allocation_count,
+            "mode": mode,
         }
 
 
+def _single_transaction_recompute() -> bool:
+    return os.getenv("ATTRIBUTION_RECOMPUTE_SINGLE_TRANSACTION", "0") == "1"
+
+
+class _RecomputeWindowRun:
+    """
+    The database phases of one recompute_window run, driven from one worker-loop hop.
+
+    Phases are fingerprint (skip-if-unchanged gate), identity (job upsert),
+    compute (allocations) and status. By default every phase commits its own
+    transaction, so the job row reads 'running' while allocations are computed.
+    With single_transaction all phases share one connection checkout and one
+    transaction: the tenant GUC is set once and the job row lock taken by the
+    identity upsert is held until commit, so a concurrent run of the same window
+    waits and then skips as unchanged. A failure rolls everything back and is
+    then recorded in a transaction of its own.
+
+    round_trips counts statements sent through SQLAlchemy on the run's
+    connections; an allocation COPY goes through the driver and is not counted.
+    """
+
+    def __init__(
+        self,
+        *,
+        tenant_id: UUID,
+        window_start: datetime,
+        window_end: datetime,
+        model_version: str,
+        correlation_id: str,
+        single_transaction: bool,
+    ) -> None:
+        self.tenant_id = tenant_id
+        self.window_start = window_start
+        self.window_end = window_end
+        self.model_version = model_version
+        self.correlation_id = correlation_id
+        self.single_transaction = single_transaction
+        self.job_id: Optional[UUID] = None
+        self.run_count: Optional[int] = None
+        self.previous_status: Optional[str] = None
+        self.round_trips = 0
+        self.transactions = 0
+        self.phase_ms: dict[str, float] = {}
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "transaction_mode": "single" if self.single_transaction else "per_phase",
+            "transactions": self.transactions,
+            "round_trips": self.round_trips,
+            "phase_ms": dict(self.phase_ms),
+        }
+
+    def _count_round_trip(self, *_args) -> None:
+        self.round_trips += 1
+
+    @asynccontextmanager
+    async def _transaction(self):
+        async with engine.begin() as conn:
+            event.listen(conn.sync_connection, "before_cursor_execute", self._count_round_trip)
+            self.transactions += 1
+            await set_tenant_guc(conn, self.tenant_id, local=True)
+            yield conn
+
+    @asynccontextmanager
+    async def _phase(self, name: str, shared_conn):
+        started = time.perf_counter()
+        try:
+            if shared_conn is not None:
+                yield shared_conn
+            else:
+                async with self._transaction() as conn:
+                    yield conn
+        finally:
+            self.phase_ms[name] = round((time.perf_counter() - started) * 1000.0, 3)
+
+    def _job_identity(self) -> dict:
+        return {
+            "tenant_id": self.tenant_id,
+            "window_start": self.window_start,
+            "window_end": self.window_end,
+            "model_version": self.model_version,
+            "correlation_id": self.correlation_id,
+        }
+
+    async def run(self, *, full_rebuild: bool) -> Optional[dict]:
+        """Run every phase; returns the compute result, or None if skipped as unchanged."""
+        async with self._transaction() if self.single_transaction else nullcontext() as shared_conn:
+            fingerprint = None
+            if not full_rebuild:
+                # Multi-touch credit also depends on the lookback touches before window_start.
+                fingerprint_start = (
+                    self.window_start
+                    - timedelta(seconds=_positive_days_env("ATTRIBUTION_MULTI_TOUCH_LOOKBACK_DAYS", "30"))
+                    if self.model_version in MULTI_TOUCH_MODELS
+                    else self.window_start
+                )
+                async with self._phase("fingerprint", shared_conn) as conn:
+                    skipped, fingerprint = await _skip_unchanged_job(
+                        **self._job_identity(), fingerprint_start=fingerprint_start, conn=conn
+                    )
+                if skipped is not None:
+                    self.job_id, self.run_count = skipped
+                    return None
+
+            async with self._phase("identity", shared_conn) as conn:
+                self.job_id, self.run_count, self.previous_status = await _upsert_job_identity(
+                    **self._job_identity(), fingerprint=fingerprint, conn=conn
+                )
+
+            # B0.5.3.2: Compute allocations (multi-touch models by model_version, else the
+            # deterministic baseline proof harness)
+            compute = (
+                _compute_allocations_multi_touch
+                if self.model_version in MULTI_TOUCH_MODELS
+                else _compute_allocations_deterministic_baseline
+            )
+            async with self._phase("compute", shared_conn) as conn:
+                result = await compute(
+                    tenant_id=self.tenant_id,
+                    window_start=self.window_start,
+                    window_end=self.window_end,
+                    model_version=self.model_version,
+                    incremental=not full_rebuild,
+                    conn=conn,
+                )
+
+            async with self._phase("status", shared_conn) as conn:
+                await _mark_job_status(job_id=self.job_id, tenant_id=self.tenant_id, status="succeeded", conn=conn)
+        return result
+
+    async def record_failure(self, error_message: str) -> None:
+        """Mark the job failed; after a single-transaction rollback its identity is claimed again first."""
+        if self.job_id is None:
+            return
+        if not self.single_transaction:
+            await _mark_job_status(
+                job_id=self.job_id, tenant_id=self.tenant_id, status="failed", error_message=error_message
+            )
+            return
+        async with self._transaction() as conn:
+            self.job_id, self.run_count, _ = await _upsert_job_identity(**self._job_identity(), conn=conn)
+            await _mark_job_status(
+                job_id=self.job_id,
+                tenant_id=self.tenant_id,
+                status="failed",
+                error_message=error_message,
+                conn=conn,
+            )
+
+
 @celery_app.task(
     bind=True,
     base=TenantTask,
@@ -503,6 +1330,7 @@ def recompute_window(
     correlation_id: Optional[str] = None,
     model_version: str = "1.0.0",
     fail: bool = False,
+    full_rebuild: bool = False,
 ):
     """
     Attribution recompute window task with window-scoped idempotency.
@@ -514,15 +1342,32 @@ def recompute_window(
     2. Increment run_count for observability
     3. Produce identical allocations (deterministic baseline proof harness)
 
+    Reruns are incremental: only events ingested after the job row's watermark
+    are allocated (see _compute_allocations_deterministic_baseline). The first
+    run of a window, and any run with full_rebuild=True, reads the whole window.
+    Before that, a rerun whose window fingerprint (event count, max event id,
+    revenue sum; for multi-touch models including the lookback) matches the
+    last successful run returns status "skipped_unchanged" without reading
+    events or incrementing run_count.
+
+    All database phases run in one worker-loop hop (see _RecomputeWindowRun);
+    ATTRIBUTION_RECOMPUTE_SINGLE_TRANSACTION=1 runs them in one transaction
+    instead of one per phase.
+
     Args:
         window_start: Start of attribution window (ISO timestamp, inclusive)
         window_end: End of attribution window (ISO timestamp, exclusive)
         correlation_id: Request correlation for observability
-        model_version: Attribution model version (default: 1.0.0)
+        model_version: Attribution model version (default: 1.0.0, the deterministic
+            baseline); a MULTI_TOUCH_MODELS key selects that multi-touch model
         fail: If True, deliberately raise an error for DLQ testing
+        full_rebuild: If True, ignore the watermark and the fingerprint and
+            recompute the whole window
 
     Returns:
-        Dict with status and metadata (job_id, run_count, event_count, allocation_count)
+        Dict with status ("succeeded" or "skipped_unchanged") and metadata
+        (job_id, run_count, event_count, allocation_count, mode), plus
+        transaction_mode, transactions, round_trips and per-phase phase_ms
 
     Raises:
         ValueError: If fail=True (for DLQ testing) or invalid window bounds
@@ -573,113 +1418,312 @@ def recompute_window(
     if window_start_dt >= window_end_dt:
         raise ValueError(f"window_start ({window_start}) must be < window_end ({window_end})")
 
-    # B0.5.3.2: Upsert job identity (idempotency gate)
-    try:
-        job_id, run_count, previous_status = _run_async(
-            _upsert_job_identity,
-            tenant_id=model.tenant_id,
-            window_start=window_start_dt,
-            window_end=window_end_dt,
-            model_version=model_version,
-            correlation_id=correlation,
-        )
-    except Exception as exc:
-        logger.error(
-            "attribution_recompute_window_job_identity_failed",
-            exc_info=exc,
-            extra={
-                "task_id": self.request.id,
-                "tenant_id": str(model.tenant_id),
-                "window_start": window_start,
-                "window_end": window_end,
-                "model_version": model_version,
-            },
-        )
-        raise
-
     logger.info(
         "attribution_recompute_window_started",
         extra={
             "task_id": self.request.id,
-            "job_id": str(job_id),
             "tenant_id": str(model.tenant_id),
             "correlation_id": correlation,
             "window_start": window_start,
             "window_end": window_end,
             "model_version": model_version,
-            "run_count": run_count,
-            "previous_status": previous_status,
+            "full_rebuild": full_rebuild,
         },
     )
 
-    # B0.5.3.2: Compute allocations (deterministic baseline proof harness)
+    # B0.5.3.2: Skip-if-unchanged gate, job identity upsert (idempotency gate),
+    # allocation compute and status mark, in one worker-loop hop
+    run = _RecomputeWindowRun(
+        tenant_id=model.tenant_id,
+        window_start=window_start_dt,
+        window_end=window_end_dt,
+        model_version=model_version,
+        correlation_id=correlation,
+        single_transaction=_single_transaction_recompute(),
+    )
     try:
-        result = _run_async(
-            _compute_allocations_deterministic_baseline,
-            tenant_id=model.tenant_id,
-            window_start=window_start_dt,
-            window_end=window_end_dt,
-            model_version=model_version,
-        )
+        result = _run_async(run.run, full_rebuild=full_rebuild)
+    except Exception as exc:
+        if run.job_id is None:
+            logger.error(
+                "attribution_recompute_window_job_identity_failed",
+                exc_info=exc,
+                extra={
+                    "task_id": self.request.id,
+                    "tenant_id": str(model.tenant_id),
+                    "window_start": window_start,
+                    "window_end": window_end,
+                    "model_version": model_version,
+                    **run.stats,
+                },
+            )
+            raise
+
+        # Mark job as failed
+        _run_async(run.record_failure, str(exc))
 
-        # Mark job as succeeded
-        _run_async(
-            _mark_job_status,
-            job_id=job_id,
-            tenant_id=model.tenant_id,
-            status="succeeded",
+        logger.error(
+            "attribution_recompute_window_failed",
+            exc_info=exc,
+            extra={
+                "task_id": self.request.id,
+                "job_id": str(run.job_id),
+                "tenant_id": str(model.tenant_id),
+                "correlation_id": correlation,
+                "window_start": window_start,
+                "window_end": window_end,
+                "model_version": model_version,
+                **run.stats,
+            },
         )
+        raise
 
+    if result is None:
         logger.info(
-            "attribution_recompute_window_succeeded",
+            "attribution_recompute_window_skipped_unchanged",
             extra={
                 "task_id": self.request.id,
-                "job_id": str(job_id),
+                "job_id": str(run.job_id),
                 "tenant_id": str(model.tenant_id),
                 "correlation_id": correlation,
                 "window_start": window_start,
                 "window_end": window_end,
                 "model_version": model_version,
-                "run_count": run_count,
-                "event_count": result["event_count"],
-                "allocation_count": result["allocation_count"],
+                "run_count": run.run_count,
+                **run.stats,
             },
         )
-
         return {
-            "status": "succeeded",
-            "job_id": str(job_id),
-            "run_count": run_count,
+            "status": "skipped_unchanged",
+            "job_id": str(run.job_id),
+            "run_count": run.run_count,
             "window_start": window_start,
             "window_end": window_end,
             "model_version": model_version,
-            "event_count": result["event_count"],
-            "allocation_count": result["allocation_count"],
+            "event_count": 0,
+            "allocation_count": 0,
+            "mode": "skipped",
             "request_id": model.request_id,
             "correlation_id": correlation,
+            **run.stats,
         }
 
-    except Exception as exc:
-        # Mark job as failed
-        _run_async(
-            _mark_job_status,
-            job_id=job_id,
-            tenant_id=model.tenant_id,
-            status="failed",
-            error_message=str(exc),
+    logger.info(
+        "attribution_recompute_window_succeeded",
+        extra={
+            "task_id": self.request.id,
+            "job_id": str(run.job_id),
+            "tenant_id": str(model.tenant_id),
+            "correlation_id": correlation,
+            "window_start": window_start,
+            "window_end": window_end,
+            "model_version": model_version,
+            "run_count": run.run_count,
+            "previous_status": run.previous_status,
+            "event_count": result["event_count"],
+            "allocation_count": result["allocation_count"],
+            "mode": result["mode"],
+            **run.stats,
+        },
+    )
+
+    return {
+        "status": "succeeded",
+        "job_id": str(run.job_id),
+        "run_count": run.run_count,
+        "window_start": window_start,
+        "window_end": window_end,
+        "model_version": model_version,
+        "event_count": result["event_count"],
+        "allocation_count": result["allocation_count"],
+        "mode": result["mode"],
+        "request_id": model.request_id,
+        "correlation_id": correlation,
+        **run.stats,
+    }
+
+@celery_app.task(
+    bind=True,
+    base=TenantTask,
+    name="app.tasks.attribution.recompute_range",
+    routing_key="attribution.task",
+    max_retries=3,
+    default_retry_delay=30,
+)
+def recompute_range(
+    self,
+    range_start: str,
+    range_end: str,
+    shard_unit: str = "day",
+    model_version: str = "1.0.0",
+    correlation_id: Optional[str] = None,
+    full_rebuild: bool = False,
+    max_concurrency: Optional[int] = None,
+):
+    """
+    Recompute [range_start, range_end) as parallel day/hour shards.
+
+    Each shard is a recompute_window task with its own attribution_recompute_jobs
+    identity; shards run in at most max_concurrency parallel lanes
+    (ATTRIBUTION_RECOMPUTE_RANGE_MAX_CONCURRENCY, default 8) across the
+    attribution queue, and a chord callback records the range outcome in
+    attribution_recompute_ranges. See app.services.attribution.
+
+    Returns:
+        Dict with status "dispatched", range_id, shard_count and lane_count
+    """
+    from app.services.attribution import (
+        create_recompute_range_run,
+        dispatch_recompute_range,
+        recompute_range_shards,
+    )
+
+    tenant_id = task_tenant_id(self)
+    model = AttributionTaskPayload(
+        tenant_id=tenant_id,
+        correlation_id=correlation_id,
+        window_start=range_start,
+        window_end=range_end,
+    )
+    correlation = _prepare_context(model)
+
+    if max_concurrency is None:
+        max_concurrency = int(os.getenv("ATTRIBUTION_RECOMPUTE_RANGE_MAX_CONCURRENCY", "8"))
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be >= 1")
+    range_start_dt = _normalize_timestamp(range_start)
+    range_end_dt = _normalize_timestamp(range_end)
+    shards = recompute_range_shards(range_start_dt, range_end_dt, shard_unit)
+
+    range_id = _run_async(
+        create_recompute_range_run,
+        tenant_id=model.tenant_id,
+        range_start=range_start_dt,
+        range_end=range_end_dt,
+        shard_unit=shard_unit,
+        model_version=model_version,
+        shard_count=len(shards),
+        max_concurrency=max_concurrency,
+        correlation_id=correlation,
+    )
+    lane_count = dispatch_recompute_range(
+        tenant_id=model.tenant_id,
+        range_id=range_id,
+        shards=shards,
+        model_version=model_version,
+        correlation_id=correlation,
+        full_rebuild=full_rebuild,
+        max_concurrency=max_concurrency,
+    )
+
+    logger.info(
+        "attribution_recompute_range_dispatched",
+        extra={
+            "task_id": self.request.id,
+            "range_id": str(range_id),
+            "tenant_id": str(model.tenant_id),
+            "correlation_id": correlation,
+            "range_start": range_start,
+            "range_end": range_end,
+            "shard_unit": shard_unit,
+            "model_version": model_version,
+            "shard_count": len(shards),
+            "lane_count": lane_count,
+        },
+    )
+    return {
+        "status": "dispatched",
+        "range_id": str(range_id),
+        "shard_count": len(shards),
+        "lane_count": lane_count,
+        "correlation_id": correlation,
+    }
+
+
+@celery_app.task(
+    bind=True,
+    base=TenantTask,
+    name="app.tasks.attribution.finalize_recompute_range",
+    routing_key="attribution.task",
+    max_retries=3,
+    default_retry_delay=30,
+)
+def finalize_recompute_range(self, range_id: str, correlation_id: Optional[str] = None):
+    """
+    Chord callback (and error callback) of recompute_range: record the range outcome.
+    """
+    from app.services.attribution import finalize_recompute_range_run
+
+    tenant_id = task_tenant_id(self)
+    result = _run_async(finalize_recompute_range_run, tenant_id=tenant_id, range_id=UUID(range_id))
+    if result is None:
+        return {"status": "already_finalized", "range_id": range_id}
+
+    log = logger.info if result["status"] == "succeeded" else logger.error
+    log(
+        "attribution_recompute_range_completed",
+        extra={
+            "task_id": self.request.id,
+            "range_id": range_id,
+            "tenant_id": str(tenant_id),
+            "correlation_id": correlation_id,
+            **result,
+        },
+    )
+    return {"range_id": range_id, **result}
+
+
+@celery_app.task(
+    bind=True,
+    name="app.tasks.attribution.flush_recompute_windows",
+    routing_key="attribution.task",
+    max_retries=3,
+    default_retry_delay=30,
+)
+def flush_recompute_windows(self) -> dict:
+    """
+    Dispatch coalesced post-ingestion recomputes (beat-driven, all tenants).
+
+    Webhook ingestion marks windows dirty in attribution_recompute_dirty_windows
+    instead of enqueueing one recompute chain per event; this task enqueues one
+    chain per dirty window whose coalesce interval has elapsed.
+    """
+    from app.core.config import settings
+    from app.services.attribution import enqueue_recompute_followup, flush_due_recompute_windows
+
+    correlation_id = str(uuid4())
+    set_request_correlation_id(correlation_id)
+
+    def _dispatch(window) -> None:
+        enqueue_recompute_followup(
+            window.tenant_id,
+            window.window_start,
+            window.window_end,
+            window.correlation_id or correlation_id,
+            model_version=window.model_version,
         )
 
-        logger.error(
-            "attribution_recompute_window_failed",
-            exc_info=exc,
+    try:
+        result = _run_async(
+            flush_due_recompute_windows,
+            interval_seconds=settings.ATTRIBUTION_RECOMPUTE_COALESCE_INTERVAL_SECONDS,
+            dispatch=_dispatch,
+        )
+        logger.info(
+            "attribution_recompute_flush_completed",
             extra={
                 "task_id": self.request.id,
-                "job_id": str(job_id),
-                "tenant_id": str(model.tenant_id),
-                "correlation_id": correlation,
-                "window_start": window_start,
-                "window_end": window_end,
-                "model_version": model_version,
+                "correlation_id": correlation_id,
+                **result,
             },
         )
-        raise
+        return result
+    except Exception as exc:
+        logger.error(
+            "attribution_recompute_flush_failed",
+            exc_info=exc,
+            extra={"task_id": self.request.id, "correlation_id": correlation_id},
+        )
+        raise self.retry(exc=exc, countdown=30)
+    finally:
+        set_request_correlation_id(None)
@@ -0,0 +1,103 @@
+"""
+Historical event backfill worker task.
+
+Wraps app.ingestion.backfill.run_event_backfill for onboarding imports. The
+task runs in worker execution context like every other worker write, and
+holds the one scoped exemption from the ingestion-table worker guard: its
+transactions carry app.worker_ingestion_grant = 'event_backfill', which lets
+them INSERT into attribution_events and dead_events (never UPDATE or DELETE).
+
+Each run imports for at most half the task soft time limit and then enqueues a
+continuation that resumes from the event_backfill_jobs checkpoint, so a
+multi-hour import never outlives its worker-loop bridge. A bridge timeout or
+soft limit cancels the import coroutine (rolling back its open chunk) before
+the task retries.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Optional
+from uuid import uuid4
+
+from app.celery_app import celery_app
+from app.core.config import settings
+from app.ingestion.backfill import DEFAULT_CHUNK_SIZE, BackfillCheckpointConflict, run_event_backfill
+from app.observability.context import set_request_correlation_id, set_tenant_id
+from app.tasks.context import run_in_worker_loop
+from app.tasks.enqueue import enqueue_tenant_task
+from app.tasks.tenant_base import TenantTask, task_tenant_id
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(
+    bind=True,
+    base=TenantTask,
+    name="app.tasks.backfill.import_events",
+    routing_key="maintenance.task",
+    max_retries=5,
+    default_retry_delay=60,
+)
+def import_events_backfill_task(
+    self,
+    source_uri: str,
+    source: str,
+    source_format: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    correlation_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Import (or resume) an NDJSON/CSV export visible to the worker at source_uri."""
+    tenant_id = task_tenant_id(self)
+    correlation_id = correlation_id or str(uuid4())
+    set_request_correlation_id(correlation_id)
+    set_tenant_id(tenant_id)
+    soft_limit_s = float(settings.CELERY_TASK_SOFT_TIME_LIMIT_S)
+    log_context = {
+        "tenant_id": str(tenant_id),
+        "task_id": self.request.id,
+        "correlation_id": correlation_id,
+        "source_uri": source_uri,
+    }
+    try:
+        result = run_in_worker_loop(
+            run_event_backfill(
+                tenant_id=tenant_id,
+                path=source_uri,
+                source=source,
+                source_format=source_format,
+                chunk_size=chunk_size,
+                max_seconds=soft_limit_s / 2,
+                worker_context=True,
+            ),
+            timeout=soft_limit_s,
+            cancel_on_timeout=True,
+        )
+    except (FileNotFoundError, ValueError):
+        # Bad input is not retryable; the job row already records the failure.
+        raise
+    except BackfillCheckpointConflict:
+        # Another run of this job is importing it; leave the job to that run.
+        logger.warning("event_backfill_task_superseded", extra=log_context)
+        return {"status": "superseded", "tenant_id": str(tenant_id), "source_uri": source_uri}
+    except Exception as exc:
+        logger.error("event_backfill_task_failed", exc_info=exc, extra=log_context)
+        raise self.retry(exc=exc)
+    if result["status"] == "running":
+        continuation = enqueue_tenant_task(
+            import_events_backfill_task,
+            envelope=self.request.authority_envelope,
+            kwargs={
+                "source_uri": source_uri,
+                "source": source,
+                "source_format": source_format,
+                "chunk_size": chunk_size,
+                "correlation_id": correlation_id,
+            },
+        )
+        result["continuation_task_id"] = continuation.id
+    logger.info(
+        "event_backfill_task_completed",
+        extra={"task_id": self.request.id, "correlation_id": correlation_id, **result},
+    )
+    return result
@@ -5,6 +5,15 @@ Phase 5 contract:
 - Production defaults are explicit: soft=270s, hard=300s.
 - Deterministic fallback is emitted on soft timeout before hard kill.
 - A health probe task is provided to prove worker liveness after timeout events.
+
+run_mcmc_inference fits the noisy-OR channel model
+(app.services.bayesian_attribution) for one (tenant, window): chains run in
+parallel in a billiard process pool (in-process when the pool cannot start),
+chain states are checkpointed to attribution_bayesian_runs so a soft timeout
+resumes (a continuation task is enqueued) instead of discarding the draws, and
+a window warm-starts from the tenant's latest succeeded posterior before it.
+Allocations are written under model_version bayesian-1.0.0 with credible
+intervals and chain diagnostics.
 """
 
 from __future__ import annotations
@@ -13,13 +22,43 @@ import json
 import logging
 import os
 import time
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import Optional
 from uuid import UUID
 
+import billiard
+import numpy as np
+from billiard.exceptions import WorkerLostError
 from celery.exceptions import SoftTimeLimitExceeded
+from sqlalchemy import text
 
 from app.celery_app import celery_app
 from app.core.config import settings
+from app.core.db import engine
+from app.db.session import set_tenant_guc
+from app.services.attribution_allocations import build_allocation_rows
+from app.services.bayesian_attribution import (
+    BAYESIAN_MODEL_TYPE,
+    BAYESIAN_MODEL_VERSION,
+    ChainState,
+    NormalPrior,
+    SessionExposure,
+    advance_chain,
+    advance_chain_in_process,
+    default_prior,
+    effective_sample_size,
+    init_chain,
+    init_sampler_process,
+    pooled_draws,
+    posterior_credit,
+    posterior_summary,
+    prior_from_posterior,
+    session_exposure,
+    split_r_hat,
+)
+from app.tasks.attribution import _iter_window_event_batches, _write_allocation_rows
+from app.tasks.context import WORKER_LOOP_CANCEL_GRACE_SECONDS, run_in_worker_loop
 
 logger = logging.getLogger(__name__)
 
@@ -55,8 +94,11 @@ def _as_uuid(raw: str | UUID) -> UUID:
     return UUID(str(raw))
 
 
-def _build_fallback_payload(*, task_id: str, tenant_id: UUID, correlation_id: UUID, elapsed_ms: int) -> dict:
+def _build_fallback_payload(
+    *, task_id: str, tenant_id: UUID, correlation_id: UUID, elapsed_ms: int, checkpoint: Optional[dict] = None
+) -> dict:
     return {
+        **(checkpoint or {}),
         "status": "fallback",
         "reason": "bayesian_soft_time_limit_exceeded",
         "task_id": task_id,
@@ -69,12 +111,15 @@ def _build_fallback_payload(*, task_id: str, tenant_id: UUID, correlation_id: UU
     }
 
 
-def _emit_fallback_event(*, task_id: str, tenant_id: UUID, correlation_id: UUID, elapsed_ms: int) -> dict:
+def _emit_fallback_event(
+    *, task_id: str, tenant_id: UUID, correlation_id: UUID, elapsed_ms: int, checkpoint: Optional[dict] = None
+) -> dict:
     fallback_payload = _build_fallback_payload(
         task_id=task_id,
         tenant_id=tenant_id,
         correlation_id=correlation_id,
         elapsed_ms=elapsed_ms,
+        checkpoint=checkpoint,
     )
     logger.warning(
         "bayesian_soft_timeout_fallback",
@@ -96,6 +141,492 @@ def _emit_fallback_event(*, task_id: str, tenant_id: UUID, correlation_id: UUID,
     return fallback_payload
 
 
+def _env_int(name: str, default: int) -> int:
+    value = int(os.getenv(name, str(default)))
+    if value < 1:
+        raise ValueError(f"{name} must be >= 1")
+    return value
+
+
+def _env_float(name: str, default: float) -> float:
+    value = float(os.getenv(name, str(default)))
+    if value <= 0:
+        raise ValueError(f"{name} must be > 0")
+    return value
+
+
+# Iterations per block: the unit of parallel work, deadline checks and checkpoints.
+_BLOCK_STEPS = 25
+# Post-warmup iterations per chain before convergence is assessed.
+_MIN_POST_WARMUP_STEPS = 100
+_R_HAT_COLUMN_MAX = 9.9999
+# Floor for database calls issued at or past a deadline (the fallback checkpoint).
+_MIN_BRIDGE_TIMEOUT_S = 1.0
+
+
+def _bridge_timeout(deadline: float) -> float:
+    """How long a run_in_worker_loop call may wait so that it returns by ``deadline`` (monotonic)."""
+    return max(deadline - time.monotonic(), _MIN_BRIDGE_TIMEOUT_S)
+
+
+_SESSION_EXPOSURE_SQL = text(
+    """
+    WITH session_channels AS (
+        SELECT session_id, channel, count(*) AS touches, bool_or(revenue_cents > 0) AS converted
+        FROM attribution_events
+        WHERE tenant_id = :tenant_id
+          AND occurred_at >= :window_start
+          AND occurred_at < :window_end
+        GROUP BY session_id, channel
+    ),
+    sessions AS (
+        SELECT
+            array_agg(channel ORDER BY channel) AS channels,
+            array_agg(touches ORDER BY channel) AS touches,
+            bool_or(converted) AS converted
+        FROM session_channels
+        GROUP BY session_id
+    )
+    SELECT channels, touches, converted, count(*) AS sessions
+    FROM sessions
+    GROUP BY channels, touches, converted
+    """
+)
+_SESSION_CHANNEL_COUNTS_SQL = text(
+    """
+    SELECT session_id, channel, count(*)
+    FROM attribution_events
+    WHERE tenant_id = :tenant_id
+      AND session_id = ANY(CAST(:session_ids AS uuid[]))
+      AND occurred_at >= :window_start
+      AND occurred_at < :window_end
+    GROUP BY session_id, channel
+    """
+)
+_SET_ALLOCATION_DIAGNOSTICS_SQL = text(
+    """
+    UPDATE attribution_allocations aa
+    SET
+        credible_interval_lower_cents = d.lower_cents,
+        credible_interval_upper_cents = d.upper_cents,
+        convergence_r_hat = d.r_hat,
+        effective_sample_size = d.ess
+    FROM unnest(
+        CAST(:ids AS uuid[]),
+        CAST(:lower_cents AS int[]),
+        CAST(:upper_cents AS int[]),
+        CAST(:r_hats AS numeric[]),
+        CAST(:esses AS int[])
+    ) AS d(id, lower_cents, upper_cents, r_hat, ess)
+    WHERE aa.id = d.id
+      AND (
+        aa.credible_interval_lower_cents IS DISTINCT FROM d.lower_cents
+        OR aa.credible_interval_upper_cents IS DISTINCT FROM d.upper_cents
+        OR aa.convergence_r_hat IS DISTINCT FROM d.r_hat
+        OR aa.effective_sample_size IS DISTINCT FROM d.ess
+      )
+    """
+)
+
+
+async def _load_session_exposure(
+    tenant_id: UUID, window_start: datetime, window_end: datetime
+) -> tuple[list[str], SessionExposure]:
+    """The window's sessions as distinct (per-channel touch counts, converted) patterns, grouped in SQL."""
+    async with engine.begin() as conn:
+        await set_tenant_guc(conn, tenant_id, local=True)
+        rows = (
+            await conn.execute(
+                _SESSION_EXPOSURE_SQL,
+                {"tenant_id": tenant_id, "window_start": window_start, "window_end": window_end},
+            )
+        ).fetchall()
+    channels = sorted({channel for row in rows for channel in row[0]})
+    channel_index = {channel: index for index, channel in enumerate(channels)}
+    counts = np.zeros((len(rows), len(channels)), dtype=np.int64)
+    for position, row in enumerate(rows):
+        counts[position, [channel_index[channel] for channel in row[0]]] = row[1]
+    return channels, session_exposure(counts, [row[2] for row in rows], [row[3] for row in rows])
+
+
+async def _prepare_run(
+    *,
+    tenant_id: UUID,
+    window_start: datetime,
+    window_end: datetime,
+    model_version: str,
+    channels: list[str],
+    fingerprint: str,
+    sessions: int,
+    correlation_id: UUID,
+) -> dict:
+    """
+    Upsert the run row for this attempt.
+
+    Returns its id and attempt number, the checkpoint to resume (only if the
+    previous attempt did not finish and the data fingerprint is unchanged)
+    and otherwise the posterior to warm-start from.
+    """
+    identity = {
+        "tenant_id": tenant_id,
+        "window_start": window_start,
+        "window_end": window_end,
+        "model_version": model_version,
+    }
+    async with engine.begin() as conn:
+        await set_tenant_guc(conn, tenant_id, local=True)
+        previous = (
+            await conn.execute(
+                text(
+                    """
+                    SELECT status, data_fingerprint, chain_states
+                    FROM attribution_bayesian_runs
+                    WHERE tenant_id = :tenant_id
+                      AND window_start = :window_start
+                      AND window_end = :window_end
+                      AND model_version = :model_version
+                    FOR UPDATE
+                    """
+                ),
+                identity,
+            )
+        ).one_or_none()
+        checkpoint = None
+        if (
+            previous is not None
+            and previous.status != "succeeded"
+            and previous.chain_states is not None
+            and previous.data_fingerprint == fingerprint
+        ):
+            checkpoint = previous.chain_states
+            if isinstance(checkpoint, str):
+                checkpoint = json.loads(checkpoint)
+
+        warm_start = None
+        if checkpoint is None:
+            warm_start = (
+                await conn.execute(
+                    text(
+                        """
+                        SELECT id, posterior
+                        FROM attribution_bayesian_runs
+                        WHERE tenant_id = :tenant_id
+                          AND model_version = :model_version
+                          AND status = 'succeeded'
+                          AND window_end <= :window_start
+                        ORDER BY window_end DESC
+                        LIMIT 1
+                        """
+                    ),
+                    identity,
+                )
+            ).one_or_none()
+
+        run = (
+            await conn.execute(
+                text(
+                    """
+                    INSERT INTO attribution_bayesian_runs (
+                        tenant_id, window_start, window_end, model_version, channels,
+                        data_fingerprint, sessions, warm_start_run_id, last_correlation_id
+                    ) VALUES (
+                        :tenant_id, :window_start, :window_end, :model_version, :channels,
+                        :data_fingerprint, :sessions, :warm_start_run_id, :correlation_id
+                    )
+                    ON CONFLICT (tenant_id, window_start, window_end, model_version)
+                    DO UPDATE SET
+                        status = 'running',
+                        attempts = attribution_bayesian_runs.attempts + 1,
+                        channels = EXCLUDED.channels,
+                        data_fingerprint = EXCLUDED.data_fingerprint,
+                        sessions = EXCLUDED.sessions,
+                        chain_states = CASE
+                            WHEN CAST(:resume AS boolean) THEN attribution_bayesian_runs.chain_states
+                        END,
+                        warm_start_run_id = CASE
+                            WHEN CAST(:resume AS boolean) THEN attribution_bayesian_runs.warm_start_run_id
+                            ELSE EXCLUDED.warm_start_run_id
+                        END,
+                        last_correlation_id = EXCLUDED.last_correlation_id,
+                        updated_at = now(),
+                        finished_at = NULL
+                    RETURNING id, attempts
+                    """
+                ),
+                {
+                    **identity,
+                    "channels": channels,
+                    "data_fingerprint": fingerprint,
+                    "sessions": sessions,
+                    "warm_start_run_id": warm_start.id if warm_start is not None else None,
+                    "correlation_id": correlation_id,
+                    "resume": checkpoint is not None,
+                },
+            )
+        ).one()
+
+    posterior = None
+    if warm_start is not None:
+        posterior = warm_start.posterior
+        if isinstance(posterior, str):
+            posterior = json.loads(posterior)
+    return {"run_id": run.id, "attempts": run.attempts, "checkpoint": checkpoint, "warm_start_posterior": posterior}
+
+
+async def _save_checkpoint(
+    *, tenant_id: UUID, run_id: UUID, prior: NormalPrior, states: list[ChainState], status: str = "running"
+) -> None:
+    checkpoint = {
+        "prior": {"mean": prior.mean.tolist(), "sd": prior.sd.tolist()},
+        "chains": [state.to_dict() for state in states],
+    }
+    async with engine.begin() as conn:
+        await set_tenant_guc(conn, tenant_id, local=True)
+        await conn.execute(
+            text(
+                """
+                UPDATE attribution_bayesian_runs
+                SET chain_states = CAST(:chain_states AS jsonb),
+                    draws_per_chain = :draws_per_chain,
+                    status = :status,
+                    updated_at = now()
+                WHERE id = :run_id
+                """
+            ),
+            {
+                "run_id": run_id,
+                "chain_states": json.dumps(checkpoint),
+                "draws_per_chain": min(len(state.draws) for state in states),
+                "status": status,
+            },
+        )
+
+
+async def _finish_run(
+    *, tenant_id: UUID, run_id: UUID, posterior: dict, r_hat_max: float, ess_min: float, draws_per_chain: int
+) -> None:
+    async with engine.begin() as conn:
+        await set_tenant_guc(conn, tenant_id, local=True)
+        await conn.execute(
+            text(
+                """
+                UPDATE attribution_bayesian_runs
+                SET status = 'succeeded',
+                    chain_states = NULL,
+                    posterior = CAST(:posterior AS jsonb),
+                    converged = true,
+                    r_hat_max = :r_hat_max,
+                    ess_min = :ess_min,
+                    draws_per_chain = :draws_per_chain,
+                    updated_at = now(),
+                    finished_at = now()
+                WHERE id = :run_id
+                """
+            ),
+            {
+                "run_id": run_id,
+                "posterior": json.dumps(posterior),
+                "r_hat_max": r_hat_max,
+                "ess_min": ess_min,
+                "draws_per_chain": draws_per_chain,
+            },
+        )
+
+
+async def _write_posterior_allocations(
+    *,
+    tenant_id: UUID,
+    window_start: datetime,
+    window_end: datetime,
+    model_version: str,
+    channels: list[str],
+    theta_draws: np.ndarray,
+    r_hat: np.ndarray,
+    ess: np.ndarray,
+) -> tuple[int, int]:
+    """
+    Replace the window conversions' allocations with their posterior credit.
+
+    Conversions are streamed in keyset pages of ATTRIBUTION_BASELINE_BATCH_EVENTS
+    events like the recompute; each is credited from its session's window touch
+    counts. Conversions whose session only touched channels unknown to the
+    posterior (ingested after sampling) are left as they are.
+    """
+    batch_events = _env_int("ATTRIBUTION_BASELINE_BATCH_EVENTS", 2000)
+    channel_index = {channel: index for index, channel in enumerate(channels)}
+    r_hats = [f"{min(value, _R_HAT_COLUMN_MAX):.4f}" for value in r_hat.tolist()]
+    esses = [int(value) for value in ess.tolist()]
+    event_count = allocation_count = 0
+
+    async with engine.begin() as conn:
+        await set_tenant_guc(conn, tenant_id, local=True)
+        async for batch in _iter_window_event_batches(
+            conn,
+            tenant_id=tenant_id,
+            window_start=window_start,
+            window_end=window_end,
+            batch_size=batch_events,
+        ):
+            conversions = [row for row in batch if row[1] > 0]
+            if not conversions:
+                continue
+            session_index: dict[UUID, int] = {}
+            for row in conversions:
+                session_index.setdefault(row[4], len(session_index))
+            session_counts = np.zeros((len(session_index), len(channels)))
+            for session_id, channel, touches in (
+                await conn.execute(
+                    _SESSION_CHANNEL_COUNTS_SQL,
+                    {
+                        "tenant_id": tenant_id,
+                        "session_ids": list(session_index),
+                        "window_start": window_start,
+                        "window_end": window_end,
+                    },
+                )
+            ).fetchall():
+                if channel in channel_index:
+                    session_counts[session_index[session_id], channel_index[channel]] = touches
+
+            credit = posterior_credit(
+                theta_draws,
+                session_counts[[session_index[row[4]] for row in conversions]],
+                np.fromiter((row[1] for row in conversions), dtype=np.int64, count=len(conversions)),
+            )
+            credited = np.unique(credit.conversion_index).tolist()
+            rows = build_allocation_rows(
+                tenant_id=tenant_id,
+                event_ids=[conversions[index][0] for index in credit.conversion_index.tolist()],
+                channel_codes=[channels[index] for index in credit.channel_index.tolist()],
+                allocated_revenue_cents=credit.allocated_revenue_cents,
+                allocation_ratios=credit.credit,
+                model_version=model_version,
+                model_type=BAYESIAN_MODEL_TYPE,
+                timestamp=window_end,
+            )
+            await _write_allocation_rows(
+                conn,
+                rows,
+                replace_event_ids=[conversions[index][0] for index in credited],
+                tenant_id=tenant_id,
+                model_version=model_version,
+            )
+            await conn.execute(
+                _SET_ALLOCATION_DIAGNOSTICS_SQL,
+                {
+                    "ids": rows["ids"],
+                    "lower_cents": credit.credible_lower_cents.tolist(),
+                    "upper_cents": credit.credible_upper_cents.tolist(),
+                    "r_hats": [r_hats[index] for index in credit.channel_index.tolist()],
+                    "esses": [esses[index] for index in credit.channel_index.tolist()],
+                },
+            )
+            event_count += len(credited)
+            allocation_count += len(rows["ids"])
+    return event_count, allocation_count
+
+
+def _initial_chains(
+    *, chains: int, warmup: int, seed: int, channels: list[str], warm_start_posterior: Optional[dict]
+) -> tuple[NormalPrior, list[ChainState]]:
+    """
+    Fresh chains. Warm-started chains begin at the previous posterior mean
+    with its sd as the initial mass-matrix scale, so half the warmup suffices.
+    """
+    if not warm_start_posterior:
+        prior = default_prior(len(channels))
+        return prior, [init_chain(prior, seed=seed, chain=chain, warmup=warmup) for chain in range(chains)]
+    prior = prior_from_posterior(
+        channels,
+        warm_start_posterior,
+        sd_inflation=_env_float("BAYESIAN_WARM_START_SD_INFLATION", 2.0),
+    )
+    start = np.array([warm_start_posterior.get(channel, {}).get("mean", prior.mean[i]) for i, channel in enumerate(channels)])
+    spread = np.array(
+        [warm_start_posterior.get(channel, {}).get("sd", prior.sd[i] / 2) for i, channel in enumerate(channels)]
+    )
+    states = [
+        init_chain(prior, seed=seed, chain=chain, warmup=max(warmup // 2, 1), start=start, spread=np.maximum(spread, 1e-3))
+        for chain in range(chains)
+    ]
+    return prior, states
+
+
+class _SamplerPool:
+    """
+    billiard spawn pool with one sampler process per chain.
+
+    Celery prefork children are daemonic, and the stdlib refuses to start
+    processes from daemonic ones; billiard (Celery's own fork of
+    multiprocessing) does not, so prefork workers sample chains in parallel.
+    """
+
+    def __init__(self, processes: int, data: SessionExposure, prior: NormalPrior) -> None:
+        self.processes = processes
+        self._pool = billiard.get_context("spawn").Pool(
+            processes=processes,
+            initializer=init_sampler_process,
+            initargs=(data, prior),
+        )
+
+    def map(self, fn, states: list[ChainState]) -> list[ChainState]:
+        return self._pool.map(fn, states)
+
+    def shutdown(self) -> None:
+        self._pool.terminate()
+        self._pool.join()
+
+
+def _sampler_executor(chains: int, data: SessionExposure, prior: NormalPrior) -> Optional[_SamplerPool]:
+    """One process per chain (up to BAYESIAN_INFERENCE_WORKERS); None runs chains in-process."""
+    workers = min(chains, _env_int("BAYESIAN_INFERENCE_WORKERS", os.cpu_count() or 1))
+    if workers < 2:
+        return None
+    try:
+        return _SamplerPool(workers, data, prior)
+    except OSError as exc:
+        _log_pool_unavailable(exc)
+        return None
+
+
+def _log_pool_unavailable(exc: BaseException) -> None:
+    logger.warning(
+        "bayesian_sampler_pool_unavailable",
+        extra={"event_type": "bayesian.compute", "error_type": type(exc).__name__, "error": str(exc)},
+    )
+
+
+def _advance_chains(
+    states: list[ChainState],
+    data: SessionExposure,
+    prior: NormalPrior,
+    *,
+    max_draws: int,
+    executor: Optional[_SamplerPool],
+) -> tuple[list[ChainState], Optional[_SamplerPool]]:
+    """
+    Advance every chain one block; returns the new states and the pool to use
+    for the next block.
+
+    If the pool breaks (a sampler process dies or cannot be started) it is shut
+    down and the block is rerun in-process; advance_chain is a pure function of
+    the input states, so no draws are lost.
+    """
+    if executor is not None:
+        try:
+            advanced = executor.map(partial(advance_chain_in_process, steps=_BLOCK_STEPS, max_draws=max_draws), states)
+            return list(advanced), executor
+        except (AssertionError, OSError, WorkerLostError) as exc:
+            _log_pool_unavailable(exc)
+            executor.shutdown()
+    return [advance_chain(state, data, prior, steps=_BLOCK_STEPS, max_draws=max_draws) for state in states], None
+
+
+def _diagnostics(states: list[ChainState]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    draws = pooled_draws(states)
+    return draws, split_r_hat(draws), effective_sample_size(draws)
+
+
 @celery_app.task(
     bind=True,
     name="app.tasks.bayesian.run_mcmc_inference",
@@ -110,16 +641,63 @@ def run_mcmc_inference(
     *,
     tenant_id: str,
     correlation_id: str,
-    run_seconds: int = 900,
+    window_start: Optional[str] = None,
+    window_end: Optional[str] = None,
+    model_version: str = BAYESIAN_MODEL_VERSION,
+    run_seconds: Optional[int] = None,
     continue_after_soft_timeout: bool = False,
 ) -> dict:
     """
-    Simulate a long Bayesian/MCMC workload with deterministic timeout fallback behavior.
+    Sample the tenant's channel posterior for [window_start, window_end)
+    (default: the previous UTC day) and write its allocations.
+
+    Chains (BAYESIAN_INFERENCE_CHAINS, default 4) advance in blocks until
+    split-R-hat <= BAYESIAN_INFERENCE_TARGET_R_HAT (1.01) and effective sample
+    size >= BAYESIAN_INFERENCE_TARGET_ESS (400) for every channel. Chain states
+    are checkpointed every BAYESIAN_CHECKPOINT_INTERVAL_SECONDS (15); when the
+    soft limit would be reached the checkpoint is saved, the deterministic
+    fallback is emitted and, up to BAYESIAN_INFERENCE_MAX_RESUMES (2) times,
+    a continuation task resumes from the checkpoint.
+
+    Chains run in a billiard spawn pool of up to BAYESIAN_INFERENCE_WORKERS
+    processes. billiard, unlike the stdlib, starts children from daemonic
+    Celery prefork workers, so chains are sampled in parallel in production;
+    they run in-process only when the pool cannot start or breaks.
+
+    run_seconds is a minimum run time (sampling continues, or the task idles
+    when there is no data); continue_after_soft_timeout holds the worker slot
+    after fallback until the hard limit. Both exist for the timeout-contract probe.
+
+    Every database call waits at most until the soft deadline (not the 60s
+    run_in_worker_loop default) with cancel_on_timeout; one still running then
+    is cancelled and the fallback path above is taken.
     """
     tenant = _as_uuid(tenant_id)
     correlation = _as_uuid(correlation_id)
     task_id = str(self.request.id)
     started_at = time.monotonic()
+    soft_deadline = started_at + float(_TASK_SOFT_LIMIT_S)
+    # A cancelled bridge call may take WORKER_LOOP_CANCEL_GRACE_SECONDS to unwind;
+    # the fallback checkpoint must be saved before the hard limit kills the process.
+    fallback_deadline = started_at + float(_TASK_HARD_LIMIT_S) - WORKER_LOOP_CANCEL_GRACE_SECONDS
+
+    if window_end is None:
+        window_end_dt = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    else:
+        window_end_dt = datetime.fromisoformat(window_end.replace("Z", "+00:00"))
+    window_start_dt = (
+        window_end_dt - timedelta(days=1)
+        if window_start is None
+        else datetime.fromisoformat(window_start.replace("Z", "+00:00"))
+    )
+    if window_start_dt >= window_end_dt:
+        raise ValueError(f"window_start ({window_start_dt}) must be < window_end ({window_end_dt})")
+
+    chains = _env_int("BAYESIAN_INFERENCE_CHAINS", 4)
+    max_draws = _env_int("BAYESIAN_INFERENCE_MAX_DRAWS", 1000)
+    target_r_hat = _env_float("BAYESIAN_INFERENCE_TARGET_R_HAT", 1.01)
+    target_ess = _env_float("BAYESIAN_INFERENCE_TARGET_ESS", 400)
+    checkpoint_interval = _env_float("BAYESIAN_CHECKPOINT_INTERVAL_SECONDS", 15)
 
     logger.info(
         "bayesian_run_started",
@@ -128,7 +706,10 @@ def run_mcmc_inference(
             "tenant_id": str(tenant),
             "correlation_id": str(correlation),
             "task_id": task_id,
-            "run_seconds": int(run_seconds),
+            "window_start": window_start_dt.isoformat(),
+            "window_end": window_end_dt.isoformat(),
+            "model_version": model_version,
+            "run_seconds": run_seconds,
             "soft_time_limit_s": _TASK_SOFT_LIMIT_S,
             "time_limit_s": _TASK_HARD_LIMIT_S,
         },
@@ -145,41 +726,50 @@ def run_mcmc_inference(
         }
     )
 
-    try:
-        deadline = time.monotonic() + max(1, int(run_seconds))
-        soft_deadline = started_at + float(_TASK_SOFT_LIMIT_S)
-        while time.monotonic() < deadline:
-            if time.monotonic() >= soft_deadline:
-                # Deterministic fallback guardrail in case soft-timeout signaling is delayed.
-                elapsed_ms = int((time.monotonic() - started_at) * 1000)
-                fallback_payload = _emit_fallback_event(
-                    task_id=task_id,
-                    tenant_id=tenant,
-                    correlation_id=correlation,
-                    elapsed_ms=elapsed_ms,
+    run: Optional[dict] = None
+    prior: Optional[NormalPrior] = None
+    states: list[ChainState] = []
+    executor: Optional[_SamplerPool] = None
+
+    def _fallback() -> dict:
+        checkpoint = None
+        if run is not None and states:
+            try:
+                run_in_worker_loop(
+                    _save_checkpoint(
+                        tenant_id=tenant, run_id=run["run_id"], prior=prior, states=states, status="fallback"
+                    ),
+                    timeout=_bridge_timeout(fallback_deadline),
+                    cancel_on_timeout=True,
                 )
-                if continue_after_soft_timeout:
-                    # Keep consuming CPU slot until hard limit kills this worker process.
-                    while True:
-                        time.sleep(0.2)
-                return fallback_payload
-            time.sleep(0.2)
-        elapsed_ms = int((time.monotonic() - started_at) * 1000)
-        return {
-            "status": "completed",
-            "task_id": task_id,
-            "tenant_id": str(tenant),
-            "correlation_id": str(correlation),
-            "elapsed_ms": elapsed_ms,
-            "fallback_triggered": False,
-        }
-    except SoftTimeLimitExceeded:
-        elapsed_ms = int((time.monotonic() - started_at) * 1000)
+            except TimeoutError:
+                # The resume continues from the last periodic checkpoint instead.
+                logger.warning(
+                    "bayesian_fallback_checkpoint_timeout",
+                    extra={"event_type": "bayesian.compute", "tenant_id": str(tenant), "task_id": task_id},
+                )
+            resume = run["attempts"] <= _env_int("BAYESIAN_INFERENCE_MAX_RESUMES", 2)
+            if resume:
+                run_mcmc_inference.apply_async(
+                    kwargs={
+                        "tenant_id": str(tenant),
+                        "correlation_id": str(correlation),
+                        "window_start": window_start_dt.isoformat(),
+                        "window_end": window_end_dt.isoformat(),
+                        "model_version": model_version,
+                    }
+                )
+            checkpoint = {
+                "run_id": str(run["run_id"]),
+                "draws_per_chain": min(len(state.draws) for state in states),
+                "resume_enqueued": resume,
+            }
         fallback_payload = _emit_fallback_event(
             task_id=task_id,
             tenant_id=tenant,
             correlation_id=correlation,
-            elapsed_ms=elapsed_ms,
+            elapsed_ms=int((time.monotonic() - started_at) * 1000),
+            checkpoint=checkpoint,
         )
         if continue_after_soft_timeout:
             # Keep consuming CPU slot until hard limit kills this worker process.
@@ -187,6 +777,141 @@ def run_mcmc_inference(
                 time.sleep(0.2)
         return fallback_payload
 
+    try:
+        channels, data = run_in_worker_loop(
+            _load_session_exposure(tenant, window_start_dt, window_end_dt),
+            timeout=_bridge_timeout(soft_deadline),
+            cancel_on_timeout=True,
+        )
+        resumed = warm_started = False
+        if channels:
+            run = run_in_worker_loop(
+                _prepare_run(
+                    tenant_id=tenant,
+                    window_start=window_start_dt,
+                    window_end=window_end_dt,
+                    model_version=model_version,
+                    channels=channels,
+                    fingerprint=data.fingerprint(channels),
+                    sessions=data.sessions,
+                    correlation_id=correlation,
+                ),
+                timeout=_bridge_timeout(soft_deadline),
+                cancel_on_timeout=True,
+            )
+            if run["checkpoint"] is not None:
+                resumed = True
+                prior = NormalPrior(
+                    mean=np.asarray(run["checkpoint"]["prior"]["mean"]),
+                    sd=np.asarray(run["checkpoint"]["prior"]["sd"]),
+                )
+                states = [ChainState.from_dict(chain) for chain in run["checkpoint"]["chains"]]
+            else:
+                warm_started = run["warm_start_posterior"] is not None
+                prior, states = _initial_chains(
+                    chains=chains,
+                    warmup=_env_int("BAYESIAN_INFERENCE_WARMUP", 400),
+                    seed=int(run["run_id"].int % (2**63)),
+                    channels=channels,
+                    warm_start_posterior=run["warm_start_posterior"],
+                )
+            executor = _sampler_executor(len(states), data, prior)
+
+        block_seconds = 0.0
+        last_checkpoint_at = time.monotonic()
+        while True:
+            now = time.monotonic()
+            if now + block_seconds >= soft_deadline:
+                # Stop before the next block would cross the soft limit; the
+                # soft-timeout signal may also arrive mid-block (handled below).
+                return _fallback()
+            converged = not states
+            if states and min(state.post_warmup_iterations for state in states) >= _MIN_POST_WARMUP_STEPS:
+                _, r_hat, ess = _diagnostics(states)
+                converged = bool(r_hat.max() <= target_r_hat and ess.min() >= target_ess)
+            if converged and (run_seconds is None or now - started_at >= run_seconds):
+                break
+            if not states:
+                time.sleep(0.2)
+                continue
+            block_started = time.monotonic()
+            states, executor = _advance_chains(states, data, prior, max_draws=max_draws, executor=executor)
+            block_seconds = time.monotonic() - block_started
+            if time.monotonic() - last_checkpoint_at >= checkpoint_interval:
+                run_in_worker_loop(
+                    _save_checkpoint(tenant_id=tenant, run_id=run["run_id"], prior=prior, states=states),
+                    timeout=_bridge_timeout(soft_deadline),
+                    cancel_on_timeout=True,
+                )
+                last_checkpoint_at = time.monotonic()
+
+        result = {
+            "status": "completed",
+            "task_id": task_id,
+            "tenant_id": str(tenant),
+            "correlation_id": str(correlation),
+            "window_start": window_start_dt.isoformat(),
+            "window_end": window_end_dt.isoformat(),
+            "model_version": model_version,
+            "sessions": data.sessions,
+            "channels": len(channels),
+            "resumed": resumed,
+            "warm_started": warm_started,
+            "event_count": 0,
+            "allocation_count": 0,
+            "fallback_triggered": False,
+        }
+        if states:
+            draws, r_hat, ess = _diagnostics(states)
+            event_count, allocation_count = run_in_worker_loop(
+                _write_posterior_allocations(
+                    tenant_id=tenant,
+                    window_start=window_start_dt,
+                    window_end=window_end_dt,
+                    model_version=model_version,
+                    channels=channels,
+                    theta_draws=draws.reshape(-1, len(channels)),
+                    r_hat=r_hat,
+                    ess=ess,
+                ),
+                timeout=_bridge_timeout(soft_deadline),
+                cancel_on_timeout=True,
+            )
+            run_in_worker_loop(
+                _finish_run(
+                    tenant_id=tenant,
+                    run_id=run["run_id"],
+                    posterior=posterior_summary(draws, channels),
+                    r_hat_max=float(r_hat.max()),
+                    ess_min=float(ess.min()),
+                    draws_per_chain=draws.shape[1],
+                ),
+                timeout=_bridge_timeout(soft_deadline),
+                cancel_on_timeout=True,
+            )
+            result.update(
+                {
+                    "run_id": str(run["run_id"]),
+                    "chains": len(states),
+                    "sampler_processes": executor.processes if executor is not None else 0,
+                    "draws_per_chain": draws.shape[1],
+                    "r_hat_max": float(r_hat.max()),
+                    "ess_min": float(ess.min()),
+                    "event_count": event_count,
+                    "allocation_count": allocation_count,
+                }
+            )
+        result["elapsed_ms"] = int((time.monotonic() - started_at) * 1000)
+        logger.info("bayesian_run_completed", extra={"event_type": "bayesian.compute", **result})
+        return result
+    except (SoftTimeLimitExceeded, TimeoutError):
+        # A bridge timeout cancels its coroutine, so an unfinished allocation
+        # write rolls back and the resume rewrites the window.
+        return _fallback()
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
 
 @celery_app.task(
     bind=True,
@@ -30,6 +30,15 @@ def _refresh_interval_seconds() -> float:
     return 300.0
 
 
+def _recompute_coalesce_interval_seconds() -> int:
+    """
+    Flush cadence for coalesced post-ingestion recomputes (0 disables coalescing).
+    """
+    from app.core.config import settings
+
+    return settings.ATTRIBUTION_RECOMPUTE_COALESCE_INTERVAL_SECONDS
+
+
 def build_beat_schedule() -> Dict[str, Dict[str, Any]]:
     interval = _refresh_interval_seconds()
     schedule: Dict[str, Dict[str, Any]] = {
@@ -55,6 +64,13 @@ def build_beat_schedule() -> Dict[str, Dict[str, Any]]:
             "options": {"expires": 3600},
         },
     }
+    coalesce_interval = _recompute_coalesce_interval_seconds()
+    if coalesce_interval > 0:
+        schedule["flush-coalesced-attribution-recomputes"] = {
+            "task": "app.tasks.attribution.flush_recompute_windows",
+            "schedule": float(coalesce_interval),
+            "options": {"expires": coalesce_interval * 2},
+        }
     if os.getenv("SKELDIR_B12_P5_DISABLE_DENYLIST_GC_JOB") != "1":
         schedule["auth-denylist-gc"] = {
             "task": "app.tasks.maintenance.gc_expired_access_token_denylist",
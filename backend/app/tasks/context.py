@@ -32,6 +32,9 @@ logger = logging.getLogger(__name__)
 _WORKER_LOOP: asyncio.AbstractEventLoop | None = None
 _WORKER_LOOP_THREAD: threading.Thread | None = None
 _WORKER_LOOP_LOCK = threading.Lock()
+# How long run_in_worker_loop(..., cancel_on_timeout=True) waits for a
+# cancelled coroutine to unwind.
+WORKER_LOOP_CANCEL_GRACE_SECONDS = 10.0
 
 
 def get_worker_event_loop() -> asyncio.AbstractEventLoop:
@@ -63,20 +66,61 @@ def get_worker_event_loop() -> asyncio.AbstractEventLoop:
     return _WORKER_LOOP
 
 
-def run_in_worker_loop(coro: Awaitable[Any]) -> Any:
+def run_in_worker_loop(
+    coro: Awaitable[Any],
+    *,
+    timeout: Optional[float] = 60,
+    cancel_on_timeout: bool = False,
+) -> Any:
     """
     Execute the given coroutine on the dedicated worker loop.
 
     This avoids creating a fresh loop per call (the source of the cross-loop
     Future failure) while keeping execution synchronous for the caller.
+
+    By default a wait that ends early leaves the coroutine running on the loop.
+    With cancel_on_timeout, the coroutine is cancelled instead (on timeout, or
+    a SoftTimeLimitExceeded raised in the task thread) and, for up to
+    WORKER_LOOP_CANCEL_GRACE_SECONDS, awaited until it has stopped, so a retry
+    never overlaps the abandoned attempt's transaction.
     """
     loop = get_worker_event_loop()
     logger.info(
         "tenant_guc_event_loop_selected",
         extra={"loop_id": id(loop), "loop_running": loop.is_running()},
     )
-    future = asyncio.run_coroutine_threadsafe(coro, loop)
-    return future.result(timeout=60)
+    if not cancel_on_timeout:
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        return future.result(timeout=timeout)
+
+    state_lock = threading.Lock()
+    state = {"started": False, "abandoned": False}
+    stopped = threading.Event()
+
+    async def _run() -> Any:
+        with state_lock:
+            if state["abandoned"]:
+                coro.close()
+                return None
+            state["started"] = True
+        try:
+            return await coro
+        finally:
+            stopped.set()
+
+    future = asyncio.run_coroutine_threadsafe(_run(), loop)
+    try:
+        return future.result(timeout=timeout)
+    except BaseException:
+        with state_lock:
+            state["abandoned"] = True
+            started = state["started"]
+        future.cancel()
+        if started and not stopped.wait(WORKER_LOOP_CANCEL_GRACE_SECONDS):
+            logger.warning(
+                "worker_loop_cancel_grace_exceeded", extra={"grace_seconds": WORKER_LOOP_CANCEL_GRACE_SECONDS}
+            )
+        raise
 
 
 def _normalize_tenant_id(value: Any) -> UUID:
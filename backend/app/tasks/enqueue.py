@@ -20,6 +20,9 @@ from app.tasks.authority import (
 TENANT_SCOPED_TASK_NAMES: frozenset[str] = frozenset(
     {
         "app.tasks.attribution.recompute_window",
+        "app.tasks.attribution.recompute_range",
+        "app.tasks.attribution.finalize_recompute_range",
+        "app.tasks.backfill.import_events",
         "app.tasks.llm.route",
         "app.tasks.llm.explanation",
         "app.tasks.llm.investigation",
@@ -11,12 +11,12 @@ from datetime import datetime, timezone
 from typing import Optional
 from uuid import UUID, uuid4
 
-import psycopg2
 from sqlalchemy.engine.url import make_url
 from sqlalchemy import text
 
 from app.celery_app import celery_app
 from app.db.session import engine, set_tenant_guc
+from app.db.sync_pool import sync_connection
 from app.core.secrets import get_database_url
 from app.observability.context import set_request_correlation_id, set_tenant_id
 from app.tasks.context import run_in_worker_loop
@@ -76,15 +76,12 @@ def _fetch_db_user_sync(tenant_id: Optional[UUID] = None) -> str:
             extra={"dsn_host": url.host, "dsn_database": url.database, "dsn_user": url.username}
         )
 
-    conn = psycopg2.connect(dsn)
-    try:
+    with sync_connection(dsn) as conn:
         cur = conn.cursor()
         if tenant_id:
             cur.execute("SELECT set_config('app.current_tenant_id', %s, true)", (str(tenant_id),))
         cur.execute("SELECT current_user")
         return cur.fetchone()[0]
-    finally:
-        conn.close()
 
 
 @celery_app.task(bind=True, name="app.tasks.housekeeping.ping", routing_key="housekeeping.task")
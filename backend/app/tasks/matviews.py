@@ -3,6 +3,14 @@ Matview task wrapper layer (B0.5.4.3).
 
 Delegates to the matview executor and emits logs/metrics/DLQ-triggering
 exceptions without embedding refresh SQL in tasks.
+
+refresh_all_for_tenant goes through the deduplicating scheduler
+(app.matviews.scheduler): it marks the tenant's views dirty and refreshes only
+those whose staleness budget has elapsed. pulse_matviews_global dispatches
+refresh_all_for_tenant only to tenants that have a due view and publishes the
+per-view freshness gauges. Scheduled refreshes skip views whose source tables
+are unchanged (SKIPPED_UNCHANGED counts as success; its metrics outcome is
+"skipped").
 """
 from __future__ import annotations
 
@@ -14,8 +22,15 @@ from uuid import UUID, uuid4
 from sqlalchemy.engine.url import make_url
 
 from app.celery_app import celery_app
-from app.matviews.executor import RefreshOutcome, RefreshResult, refresh_all_for_tenant, refresh_single
+from app.matviews.executor import RefreshOutcome, RefreshResult, refresh_single, refresh_views
+from app.matviews.scheduler import (
+    record_refresh_results,
+    request_refresh,
+    tenants_with_due_views,
+    view_freshness,
+)
 from app.core.secrets import get_database_url
+from app.db.sync_pool import sync_connection
 from app.observability import metrics
 from app.observability.context import set_request_correlation_id, set_tenant_id
 from app.observability.metrics_policy import normalize_view_name
@@ -44,6 +59,7 @@ class MatviewTaskFailure(RuntimeError):
 _OUTCOME_STRATEGY_MAP: dict[RefreshOutcome, TaskOutcomeStrategy] = {
     RefreshOutcome.SUCCESS: TaskOutcomeStrategy.SUCCESS,
     RefreshOutcome.SKIPPED_LOCK_HELD: TaskOutcomeStrategy.SILENT_SKIP,
+    RefreshOutcome.SKIPPED_UNCHANGED: TaskOutcomeStrategy.SUCCESS,
     RefreshOutcome.FAILED: TaskOutcomeStrategy.DEAD_LETTER,
 }
 
@@ -60,6 +76,7 @@ def _map_refresh_outcome_to_policy(outcome: RefreshOutcome) -> str:
     mapping = {
         RefreshOutcome.SUCCESS: "success",
         RefreshOutcome.SKIPPED_LOCK_HELD: "skipped",
+        RefreshOutcome.SKIPPED_UNCHANGED: "skipped",
         RefreshOutcome.FAILED: "failure",
     }
     return mapping.get(outcome, "failure")
@@ -117,16 +134,21 @@ def _build_sync_dsn() -> str:
 
 
 def _fetch_tenant_ids_sync() -> list[UUID]:
-    import psycopg2
-    dsn = _build_sync_dsn()
-    conn = psycopg2.connect(dsn)
-    try:
+    with sync_connection(_build_sync_dsn()) as conn:
         cur = conn.cursor()
         cur.execute("SELECT id FROM tenants ORDER BY id")
         rows = cur.fetchall()
         return [UUID(str(row[0])) for row in rows]
-    finally:
-        conn.close()
+
+
+def _record_freshness_gauges(tenant_ids: list[UUID]) -> None:
+    """Publish per-view age and skip ratio across tenants (view_name label only)."""
+    for view_name, (age_seconds, skip_ratio) in view_freshness(tenant_ids).items():
+        label = normalize_view_name(view_name)
+        if age_seconds is not None:
+            metrics.matview_refresh_age_seconds.labels(view_name=label).set(age_seconds)
+        if skip_ratio is not None:
+            metrics.matview_refresh_skip_ratio.labels(view_name=label).set(skip_ratio)
 
 
 def _log_start(
@@ -281,6 +303,7 @@ def matview_refresh_all_for_tenant(
     *,
     correlation_id: Optional[str] = None,
     schedule_class: Optional[str] = None,
+    mark_dirty: bool = True,
 ) -> dict:
     tenant_uuid = _normalize_tenant_id(task_tenant_id(self))
     correlation_id = correlation_id or str(uuid4())
@@ -293,9 +316,25 @@ def matview_refresh_all_for_tenant(
             "tenant_id": str(tenant_uuid),
             "correlation_id": correlation_id,
             "schedule_class": schedule_class,
+            "mark_dirty": mark_dirty,
         },
     )
-    results = refresh_all_for_tenant(tenant_uuid, correlation_id)
+    claimed = request_refresh(tenant_uuid, mark_dirty=mark_dirty)
+    if not claimed:
+        logger.info(
+            "matview_refresh_all_task_deferred",
+            extra={
+                "task_id": self.request.id,
+                "tenant_id": str(tenant_uuid),
+                "correlation_id": correlation_id,
+                "schedule_class": schedule_class,
+            },
+        )
+        set_tenant_id(None)
+        set_request_correlation_id(None)
+        return {"status": "deferred", "results": [], "strategy": TaskOutcomeStrategy.SUCCESS.value}
+    results = refresh_views(claimed, tenant_uuid, correlation_id, skip_unchanged=True)
+    record_refresh_results(tenant_uuid, results)
     strategies: list[TaskOutcomeStrategy] = []
     for result in results:
         strategy = strategy_for_refresh_result(result)
@@ -367,13 +406,16 @@ def pulse_matviews_global(
             },
         )
         tenant_ids = _fetch_tenant_ids_sync()
-        for tenant_id in tenant_ids:
+        _record_freshness_gauges(tenant_ids)
+        due_tenant_ids = tenants_with_due_views(tenant_ids)
+        for tenant_id in due_tenant_ids:
             enqueue_tenant_task(
                 matview_refresh_all_for_tenant,
                 envelope=SystemAuthorityEnvelope(tenant_id=tenant_id),
                 kwargs={
                     "correlation_id": correlation_id,
                     "schedule_class": schedule_class,
+                    "mark_dirty": False,
                 },
             )
         logger.info(
@@ -382,9 +424,15 @@ def pulse_matviews_global(
                 "task_id": self.request.id,
                 "correlation_id": correlation_id,
                 "tenant_count": len(tenant_ids),
+                "dispatched_tenant_count": len(due_tenant_ids),
                 "schedule_class": schedule_class,
             },
         )
-        return {"status": "ok", "tenant_count": len(tenant_ids), "correlation_id": correlation_id}
+        return {
+            "status": "ok",
+            "tenant_count": len(tenant_ids),
+            "dispatched_tenant_count": len(due_tenant_ids),
+            "correlation_id": correlation_id,
+        }
     finally:
         set_request_correlation_id(None)
@@ -5,6 +5,7 @@ Provides tenant creation/cleanup fixtures to satisfy FK constraints.
 """
 import os
 import logging
+from typing import Optional
 from uuid import uuid4
 from urllib.parse import urlparse
 
@@ -265,3 +266,107 @@ async def test_tenant_pair():
             except Exception:
                 pass
             # Skip tenants (FK constraints)
+
+
+@pytest.fixture
+def eager_celery():
+    """Run Celery tasks inline (task_always_eager) for the duration of a test."""
+    from app.celery_app import celery_app
+
+    original_eager = celery_app.conf.task_always_eager
+    celery_app.conf.task_always_eager = True
+    try:
+        yield
+    finally:
+        celery_app.conf.task_always_eager = original_eager
+
+
+async def _seed_conversion_event(
+    tenant_id,
+    *,
+    occurred_at,
+    idempotency_key: Optional[str] = None,
+    session_id=None,
+    channel: str = "direct",
+    revenue_cents: int = 1000,
+):
+    """Insert one conversion into attribution_events in the tenant's RLS context; returns its id."""
+    from app.db.session import set_tenant_guc
+
+    event_id = uuid4()
+    async with engine.begin() as conn:
+        await set_tenant_guc(conn, tenant_id, local=True)
+        # RAW_SQL_ALLOWLIST: seed attribution events for recompute and summary tests
+        await conn.execute(
+            text(
+                """
+                INSERT INTO attribution_events (
+                    id, tenant_id, session_id, occurred_at, event_timestamp,
+                    idempotency_key, event_type, channel, revenue_cents, raw_payload
+                ) VALUES (
+                    :id, :tenant_id, :session_id, :occurred_at, :occurred_at,
+                    :idempotency_key, 'conversion', :channel, :revenue_cents, '{}'::jsonb
+                )
+                """
+            ),
+            {
+                "id": event_id,
+                "tenant_id": tenant_id,
+                "session_id": session_id or uuid4(),
+                "occurred_at": occurred_at,
+                "idempotency_key": idempotency_key or f"seed:{uuid4()}",
+                "channel": channel,
+                "revenue_cents": revenue_cents,
+            },
+        )
+    return event_id
+
+
+def _recompute_window(tenant_id, *, window_start, window_end, **kwargs) -> dict:
+    """Run recompute_window for [window_start, window_end) through the tenant task envelope."""
+    from app.tasks.attribution import recompute_window
+    from app.tasks.authority import SystemAuthorityEnvelope
+    from app.tasks.enqueue import enqueue_tenant_task
+
+    return enqueue_tenant_task(
+        recompute_window,
+        envelope=SystemAuthorityEnvelope(tenant_id=tenant_id),
+        kwargs={"window_start": window_start.isoformat(), "window_end": window_end.isoformat(), **kwargs},
+    ).get()
+
+
+async def _age_matview_refresh_state(tenant_id, seconds: int) -> None:
+    """Move the tenant's matview_refresh_state.last_refreshed_at back by ``seconds``."""
+    from app.db.session import set_tenant_guc
+
+    async with engine.begin() as conn:
+        await set_tenant_guc(conn, tenant_id, local=True)
+        await conn.execute(
+            text(
+                """
+                UPDATE matview_refresh_state
+                SET last_refreshed_at = last_refreshed_at - make_interval(secs => :seconds)
+                WHERE tenant_id = :tenant_id
+                """
+            ),
+            {"tenant_id": tenant_id, "seconds": seconds},
+        )
+
+
+def _refresh_result(view_name, tenant_id, outcome):
+    """A matview executor RefreshResult with the given outcome and no error."""
+    from datetime import datetime, timezone
+
+    from app.matviews import executor
+
+    return executor.RefreshResult(
+        view_name=view_name,
+        tenant_id=tenant_id,
+        correlation_id=None,
+        outcome=outcome,
+        started_at=datetime.now(timezone.utc),
+        duration_ms=0,
+        error_type=None,
+        error_message=None,
+        lock_key_debug=None,
+    )
@@ -0,0 +1,141 @@
+"""
+Columnar allocation builder (app.services.attribution_allocations).
+
+The bulk builder must produce exactly the rows the per-allocation loop in the
+baseline recompute produced: same deterministic IDs (uuid5), same integer
+revenue split, same column order.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import UUID, uuid4
+
+import numpy as np
+import pytest
+from hypothesis import given, settings as hypothesis_settings, strategies as st
+
+from app.services.attribution_allocations import (
+    build_even_split_allocation_rows,
+    deterministic_allocation_ids,
+    pairwise_allocation_ids,
+    split_revenue_cents_evenly,
+)
+from app.tasks.attribution import (
+    BASELINE_CHANNELS,
+    _deterministic_allocation_id,
+    _split_revenue_cents_evenly,
+)
+
+_TS = datetime(2025, 1, 2, tzinfo=timezone.utc)
+
+
+def _reference_rows(tenant_id, events, channels, model_version) -> dict[str, list]:
+    """The per-allocation loop the builder replaces."""
+    rows: dict[str, list] = {
+        key: []
+        for key in (
+            "ids",
+            "tenant_ids",
+            "event_ids",
+            "channel_codes",
+            "allocation_ratios",
+            "model_versions",
+            "model_types",
+            "confidence_scores",
+            "verifieds",
+            "allocated_revenue_cents",
+            "created_ats",
+            "updated_ats",
+        )
+    }
+    for event_id, revenue_cents in events:
+        allocated = _split_revenue_cents_evenly(int(revenue_cents), len(channels))
+        for channel_code, allocated_revenue_cents in zip(channels, allocated, strict=True):
+            rows["ids"].append(
+                _deterministic_allocation_id(
+                    tenant_id=tenant_id,
+                    event_id=event_id,
+                    model_version=model_version,
+                    channel_code=channel_code,
+                )
+            )
+            rows["tenant_ids"].append(tenant_id)
+            rows["event_ids"].append(event_id)
+            rows["channel_codes"].append(channel_code)
+            rows["allocation_ratios"].append("0.33333")
+            rows["model_versions"].append(model_version)
+            rows["model_types"].append("deterministic_baseline")
+            rows["confidence_scores"].append("0.333")
+            rows["verifieds"].append(False)
+            rows["allocated_revenue_cents"].append(int(allocated_revenue_cents))
+            rows["created_ats"].append(_TS)
+            rows["updated_ats"].append(_TS)
+    return rows
+
+
+@hypothesis_settings(max_examples=200, deadline=None)
+@given(
+    revenues=st.lists(st.integers(min_value=0, max_value=2**31 - 1), max_size=40),
+    channels=st.lists(st.sampled_from(["direct", "email", "organic", "referral"]), min_size=1, max_size=4),
+    model_version=st.sampled_from(["1.0.0", "2.1.0-beta", "ümlaut"]),
+)
+def test_builder_matches_per_allocation_loop(revenues, channels, model_version):
+    tenant_id = uuid4()
+    events = [(uuid4(), revenue) for revenue in revenues]
+
+    built = build_even_split_allocation_rows(
+        tenant_id=tenant_id,
+        event_ids=[event_id for event_id, _ in events],
+        revenue_cents=[revenue for _, revenue in events],
+        channel_codes=channels,
+        model_version=model_version,
+        model_type="deterministic_baseline",
+        allocation_ratio=Decimal("0.33333"),
+        confidence_score=Decimal("0.333"),
+        timestamp=_TS,
+    )
+    expected = _reference_rows(tenant_id, events, channels, model_version)
+
+    assert [UUID(value) for value in built["ids"]] == expected["ids"]
+    assert {key: value for key, value in built.items() if key != "ids"} == {
+        key: value for key, value in expected.items() if key != "ids"
+    }
+    assert all(type(value) is int for value in built["allocated_revenue_cents"])
+
+
+def test_ids_match_uuid5_for_baseline_channels():
+    tenant_id, event_ids = uuid4(), [uuid4() for _ in range(50)]
+    ids = deterministic_allocation_ids(
+        tenant_id=tenant_id, event_ids=event_ids, model_version="1.0.0", channel_codes=BASELINE_CHANNELS
+    )
+    assert ids == [
+        _deterministic_allocation_id(
+            tenant_id=tenant_id, event_id=event_id, model_version="1.0.0", channel_code=channel_code
+        ).hex
+        for event_id in event_ids
+        for channel_code in BASELINE_CHANNELS
+    ]
+
+
+def test_pairwise_ids_match_uuid5_for_aligned_pairs():
+    tenant_id, event_ids = uuid4(), [uuid4() for _ in range(20)]
+    channel_codes = ["direct", "email", "organic", "referral"] * 5
+    ids = pairwise_allocation_ids(
+        tenant_id=tenant_id, event_ids=event_ids, model_version="linear-1.0.0", channel_codes=channel_codes
+    )
+    assert ids == [
+        _deterministic_allocation_id(
+            tenant_id=tenant_id, event_id=event_id, model_version="linear-1.0.0", channel_code=channel_code
+        ).hex
+        for event_id, channel_code in zip(event_ids, channel_codes)
+    ]
+
+
+def test_even_split_validates_like_scalar_split():
+    with pytest.raises(ValueError, match="parts must be >= 1"):
+        split_revenue_cents_evenly(np.array([10]), 0)
+    with pytest.raises(ValueError, match="revenue_cents must be >= 0"):
+        split_revenue_cents_evenly(np.array([10, -1]), 3)
+    assert split_revenue_cents_evenly(np.array([], dtype=np.int64), 3).shape == (0, 3)
@@ -0,0 +1,164 @@
+"""
+Allocation writers (unnest bind arrays vs COPY into a staging table).
+
+Both writers feed the same upsert statement, so they must leave identical
+allocation rows, be idempotent on rerun, and keep the statement-level
+allocation sum-equality triggers in force.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from app.core.db import engine
+from app.db.session import set_tenant_guc
+from app.services.attribution_allocations import build_even_split_allocation_rows
+from app.tasks.attribution import _write_allocation_rows
+
+_TIMESTAMP = datetime(2025, 10, 1, tzinfo=timezone.utc)
+_CHANNELS = ["direct", "email", "organic"]
+
+
+async def _seed_conversions(tenant_id, revenues: list[int]) -> list:
+    event_ids = [uuid4() for _ in revenues]
+    async with engine.begin() as conn:
+        await set_tenant_guc(conn, tenant_id, local=True)
+        for event_id, revenue_cents in zip(event_ids, revenues):
+            # RAW_SQL_ALLOWLIST: seed conversions for allocation writer equivalence
+            await conn.execute(
+                text(
+                    """
+                    INSERT INTO attribution_events (
+                        id, tenant_id, session_id, occurred_at, event_timestamp,
+                        idempotency_key, event_type, channel, revenue_cents, raw_payload
+                    ) VALUES (
+                        :id, :tenant_id, :session_id, :occurred_at, :occurred_at,
+                        :idempotency_key, 'conversion', 'direct', :revenue_cents, '{}'::jsonb
+                    )
+                    """
+                ),
+                {
+                    "id": event_id,
+                    "tenant_id": tenant_id,
+                    "session_id": uuid4(),
+                    "occurred_at": _TIMESTAMP,
+                    "idempotency_key": f"writer:{event_id}",
+                    "revenue_cents": revenue_cents,
+                },
+            )
+    return event_ids
+
+
+def _rows(tenant_id, event_ids, revenues, model_version: str) -> dict[str, list]:
+    return build_even_split_allocation_rows(
+        tenant_id=tenant_id,
+        event_ids=event_ids,
+        revenue_cents=revenues,
+        channel_codes=_CHANNELS,
+        model_version=model_version,
+        model_type="deterministic_even_split",
+        allocation_ratio=Decimal("0.33333"),
+        confidence_score=Decimal("0.333"),
+        timestamp=_TIMESTAMP,
+    )
+
+
+async def _write(tenant, rows, **kwargs) -> str:
+    async with engine.begin() as conn:
+        await set_tenant_guc(conn, tenant, local=True)
+        return await _write_allocation_rows(conn, rows, **kwargs)
+
+
+async def _allocations(tenant_id, model_version: str) -> list[tuple]:
+    async with engine.begin() as conn:
+        await set_tenant_guc(conn, tenant_id, local=True)
+        rows = await conn.execute(
+            text(
+                """
+                SELECT id, event_id, channel_code, allocation_ratio, confidence_score,
+                       allocated_revenue_cents, created_at, updated_at
+                FROM attribution_allocations
+                WHERE tenant_id = :tenant_id AND model_version = :model_version
+                ORDER BY id
+                """
+            ),
+            {"tenant_id": tenant_id, "model_version": model_version},
+        )
+        return [tuple(row) for row in rows.fetchall()]
+
+
+@pytest.mark.asyncio
+async def test_unnest_and_copy_writers_leave_identical_allocations(test_tenant):
+    revenues = [1000, 2501, 7]
+    event_ids = await _seed_conversions(test_tenant, revenues)
+
+    assert await _write(test_tenant, _rows(test_tenant, event_ids, revenues, "1.0.0"), writer="unnest") == "unnest"
+    assert await _write(test_tenant, _rows(test_tenant, event_ids, revenues, "2.0.0"), writer="copy") == "copy"
+    # A rerun through the other writer is a no-op upsert.
+    await _write(test_tenant, _rows(test_tenant, event_ids, revenues, "1.0.0"), writer="copy")
+
+    # Ids are derived from model_version, so compare everything else.
+    by_unnest = sorted(row[1:] for row in await _allocations(test_tenant, "1.0.0"))
+    by_copy = sorted(row[1:] for row in await _allocations(test_tenant, "2.0.0"))
+    assert len(by_unnest) == 9
+    assert by_unnest == by_copy
+
+
+@pytest.mark.asyncio
+async def test_writer_is_selected_by_batch_size(test_tenant, monkeypatch):
+    revenues = [300, 600]
+    event_ids = await _seed_conversions(test_tenant, revenues)
+    rows = _rows(test_tenant, event_ids, revenues, "1.0.0")
+
+    monkeypatch.setenv("ATTRIBUTION_ALLOCATION_COPY_MIN_ROWS", "7")
+    assert await _write(test_tenant, rows) == "unnest"
+    monkeypatch.setenv("ATTRIBUTION_ALLOCATION_COPY_MIN_ROWS", "6")
+    assert await _write(test_tenant, rows) == "copy"
+    assert await _write(test_tenant, _rows(test_tenant, [], [], "1.0.0")) == "none"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("writer", ["unnest", "copy"])
+async def test_replace_deletes_superseded_rows(test_tenant, writer):
+    revenues = [900]
+    event_ids = await _seed_conversions(test_tenant, revenues)
+    await _write(test_tenant, _rows(test_tenant, event_ids, revenues, "1.0.0"), writer=writer)
+
+    rows = build_even_split_allocation_rows(
+        tenant_id=test_tenant,
+        event_ids=event_ids,
+        revenue_cents=revenues,
+        channel_codes=["referral"],
+        model_version="1.0.0",
+        model_type="deterministic_even_split",
+        allocation_ratio=Decimal("1.00000"),
+        confidence_score=Decimal("1.000"),
+        timestamp=_TIMESTAMP,
+    )
+    await _write(
+        test_tenant,
+        rows,
+        replace_event_ids=event_ids,
+        tenant_id=test_tenant,
+        model_version="1.0.0",
+        writer=writer,
+    )
+
+    assert [row[2:6:3] for row in await _allocations(test_tenant, "1.0.0")] == [("referral", 900)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("writer", ["unnest", "copy"])
+async def test_sum_trigger_rejects_mismatched_batch(test_tenant, writer):
+    event_ids = await _seed_conversions(test_tenant, [1000])
+    rows = _rows(test_tenant, event_ids, [4000], "1.0.0")
+
+    with pytest.raises(DBAPIError, match="(?i)allocation"):
+        await _write(test_tenant, rows, writer=writer)
+    assert await _allocations(test_tenant, "1.0.0") == []
@@ -0,0 +1,225 @@
+"""
+GET /api/attribution/allocations: keyset pagination, filters and projection.
+
+Walking every page with the returned cursor must visit each allocation exactly
+once in (created_at, id) descending order, including rows that share a
+created_at, while filters, ``fields=`` projection and tenant isolation hold.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from uuid import UUID, uuid4
+
+from app.testing.jwt_rs256 import private_ring_payload, public_ring_payload
+
+os.environ["AUTH_JWT_SECRET"] = private_ring_payload()
+os.environ["AUTH_JWT_PUBLIC_KEY_RING"] = public_ring_payload()
+os.environ["AUTH_JWT_ALGORITHM"] = "RS256"
+os.environ["AUTH_JWT_ISSUER"] = "https://issuer.skeldir.test"
+os.environ["AUTH_JWT_AUDIENCE"] = "skeldir-api"
+
+import jwt
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+
+from app.core.db import engine
+from app.core.secrets import (
+    get_jwt_signing_material,
+    get_jwt_validation_config,
+    reset_crypto_secret_caches_for_testing,
+    reset_jwt_verification_pg_cache_for_testing,
+    seed_jwt_verification_pg_cache_for_testing,
+)
+from app.db.session import set_tenant_guc
+from app.main import app
+from app.services.attribution_allocation_query import AllocationCursor
+
+_BASE = datetime(2025, 10, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def _reset_jwt_verifier_state() -> None:
+    reset_crypto_secret_caches_for_testing()
+    reset_jwt_verification_pg_cache_for_testing()
+    try:
+        cfg = get_jwt_validation_config()
+        if cfg.public_key_ring:
+            seed_jwt_verification_pg_cache_for_testing(raw_ring=cfg.public_key_ring)
+    except Exception:
+        pass
+    yield
+    reset_crypto_secret_caches_for_testing()
+    reset_jwt_verification_pg_cache_for_testing()
+
+
+def _build_token(tenant_id: UUID) -> str:
+    signing = get_jwt_signing_material()
+    now = int(time.time())
+    user_id = str(uuid4())
+    payload = {
+        "sub": user_id,
+        "user_id": user_id,
+        "role": "viewer",
+        "roles": ["viewer"],
+        "scopes": ["viewer"],
+        "iss": signing.issuer or os.environ["AUTH_JWT_ISSUER"],
+        "aud": signing.audience or os.environ["AUTH_JWT_AUDIENCE"],
+        "iat": now,
+        "jti": str(uuid4()),
+        "exp": now + 3600,
+        "tenant_id": str(tenant_id),
+    }
+    return jwt.encode(payload, signing.key, algorithm=signing.algorithm, headers={"kid": signing.kid})
+
+
+async def _get(tenant_id: UUID, params: dict | list) -> tuple[int, dict]:
+    transport = ASGITransport(app=app, raise_app_exceptions=True)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get(
+            "/api/attribution/allocations",
+            params=params,
+            headers={
+                "X-Correlation-ID": str(uuid4()),
+                "Authorization": f"Bearer {_build_token(tenant_id)}",
+            },
+        )
+    return resp.status_code, resp.json()
+
+
+async def _seed_allocations(tenant_id: UUID, count: int) -> list[tuple[datetime, str, str, str]]:
+    """Insert ``count`` allocations, three per created_at, alternating channel and model."""
+    rows = [
+        (
+            _BASE + timedelta(hours=8 * (index // 3)),
+            "email" if index % 2 else "direct",
+            "linear-1.0.0" if index % 5 == 0 else "1.0.0",
+        )
+        for index in range(count)
+    ]
+    seeded = []
+    async with engine.begin() as conn:
+        await set_tenant_guc(conn, tenant_id, local=True)
+        for created_at, channel_code, model_version in rows:
+            # RAW_SQL_ALLOWLIST: seed allocations for keyset pagination API
+            allocation_id = (
+                await conn.execute(
+                    text(
+                        """
+                        INSERT INTO attribution_allocations (
+                            tenant_id, created_at, updated_at, channel_code, allocated_revenue_cents,
+                            allocation_ratio, model_version, model_type, confidence_score
+                        ) VALUES (
+                            :tenant_id, :created_at, :created_at, :channel_code, 100,
+                            0.5, :model_version, 'deterministic', 0.9
+                        )
+                        RETURNING id
+                        """
+                    ),
+                    {
+                        "tenant_id": tenant_id,
+                        "created_at": created_at,
+                        "channel_code": channel_code,
+                        "model_version": model_version,
+                    },
+                )
+            ).scalar_one()
+            seeded.append((created_at, str(allocation_id), channel_code, model_version))
+    return sorted(seeded, key=lambda row: (row[0], row[1]), reverse=True)
+
+
+async def _walk(tenant_id: UUID, params: list[tuple[str, str]]) -> tuple[list[dict], int]:
+    items, pages, cursor = [], 0, None
+    while True:
+        status, body = await _get(tenant_id, params + ([("cursor", cursor)] if cursor else []))
+        assert status == 200, body
+        items.extend(body["items"])
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return items, pages
+
+
+@pytest.mark.asyncio
+async def test_cursor_walk_visits_every_allocation_once_in_keyset_order(test_tenant):
+    seeded = await _seed_allocations(test_tenant, 23)
+
+    items, pages = await _walk(test_tenant, [("limit", "5")])
+
+    assert pages == 5
+    assert [item["id"] for item in items] == [row[1] for row in seeded]
+    assert set(items[0]) == {
+        "id",
+        "event_id",
+        "channel_code",
+        "model_version",
+        "model_type",
+        "allocated_revenue_cents",
+        "allocation_ratio",
+        "confidence_score",
+        "credible_interval_lower_cents",
+        "credible_interval_upper_cents",
+        "convergence_r_hat",
+        "verified",
+        "created_at",
+    }
+    assert (items[0]["allocation_ratio"], items[0]["confidence_score"]) == (0.5, 0.9)
+
+
+@pytest.mark.asyncio
+async def test_filters_and_projection_apply_across_pages(test_tenant):
+    seeded = await _seed_allocations(test_tenant, 30)
+    day_two = (_BASE + timedelta(days=1), _BASE + timedelta(days=2))
+
+    items, pages = await _walk(
+        test_tenant,
+        [
+            ("channel", "email"),
+            ("model_version", "1.0.0"),
+            ("start_date", "2025-10-02"),
+            ("end_date", "2025-10-02"),
+            ("fields", "channel_code,id"),
+            ("limit", "2"),
+        ],
+    )
+    both_channels, _ = await _walk(test_tenant, [("channel", "email"), ("channel", "direct"), ("fields", "id")])
+
+    expected = [
+        row[1]
+        for row in seeded
+        if row[2] == "email" and row[3] == "1.0.0" and day_two[0] <= row[0] < day_two[1]
+    ]
+    assert (len(expected), pages) == (4, 2)
+    assert [item["id"] for item in items] == expected
+    assert all(item == {"id": item["id"], "channel_code": "email"} for item in items)
+    assert [item["id"] for item in both_channels] == [row[1] for row in seeded]
+
+
+@pytest.mark.asyncio
+async def test_allocations_are_tenant_isolated(test_tenant_pair):
+    tenant_a, tenant_b = test_tenant_pair
+    await _seed_allocations(tenant_a, 4)
+
+    status, body = await _get(tenant_b, {})
+
+    assert (status, body) == (200, {"items": [], "next_cursor": None})
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor_and_unknown_field_are_rejected(test_tenant):
+    bad_cursor_status, bad_cursor = await _get(test_tenant, {"cursor": "not-a-cursor"})
+    bad_field_status, bad_field = await _get(test_tenant, {"fields": "id,raw_payload"})
+    bad_range_status, _ = await _get(test_tenant, {"start_date": "2025-10-02", "end_date": "2025-10-01"})
+
+    assert (bad_cursor_status, bad_cursor["detail"]) == (400, "Invalid cursor.")
+    assert (bad_field_status, bad_field["detail"]) == (400, "Unknown allocation fields: raw_payload")
+    assert bad_range_status == 400
+
+
+def test_cursor_round_trips_its_keyset_position():
+    cursor = AllocationCursor(created_at=_BASE + timedelta(microseconds=7), id=uuid4())
+
+    assert AllocationCursor.decode(cursor.encode()) == cursor
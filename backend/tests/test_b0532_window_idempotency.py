@@ -48,6 +48,7 @@ def _enqueue_recompute_window(
     window_start: str,
     window_end: str,
     model_version: str,
+    full_rebuild: bool = False,
 ):
     return enqueue_tenant_task(
         recompute_window,
@@ -56,6 +57,7 @@ def _enqueue_recompute_window(
             "window_start": window_start,
             "window_end": window_end,
             "model_version": model_version,
+            "full_rebuild": full_rebuild,
         },
     ).get()
 
@@ -139,12 +141,14 @@ class TestWindowIdempotency:
             assert run_count_first == 1, f"First execution must have run_count=1, got {run_count_first}"
             assert status_first == "succeeded", f"First execution must succeed, got status={status_first}"
 
-            # Second execution - reuses job identity (idempotency proof)
+            # Second execution - reuses job identity (idempotency proof). The
+            # window is unchanged, so force a real rerun past the fingerprint skip.
             result2 = _enqueue_recompute_window(
                 tenant_id=test_tenant_id,
                 window_start=window_start,
                 window_end=window_end,
                 model_version=model_version,
+                full_rebuild=True,
             )
 
             # Query job row after second execution
@@ -341,11 +345,13 @@ class TestWindowIdempotency:
                 )
                 count_first = count_first_result.scalar()
 
+            # Unchanged window: force a real recompute past the fingerprint skip.
             result2 = _enqueue_recompute_window(
                 tenant_id=test_tenant_id,
                 window_start=window_start,
                 window_end=window_end,
                 model_version=model_version,
+                full_rebuild=True,
             )
 
             async with engine.begin() as conn:
@@ -209,7 +209,7 @@ async def test_b0536_attribution_e2e_true_worker(celery_worker_proc):
         assert len(allocations_first) == 6
         assert allocations_first == _expected_rows()
 
-        # Execution B — idempotency proof
+        # Execution B — idempotency proof (unchanged window: skipped by fingerprint)
         second_result = schedule_recompute_window(
             tenant_id=TENANT_ID,
             window_start=WINDOW_START,
@@ -219,7 +219,7 @@ async def test_b0536_attribution_e2e_true_worker(celery_worker_proc):
         second_payload = second_result.get(timeout=60)
         allocations_second = await _fetch_allocations()
 
-        assert second_payload["status"] == "succeeded"
+        assert second_payload["status"] == "skipped_unchanged"
         assert len(allocations_second) == len(allocations_first) == 6
         assert allocations_second == allocations_first
 
@@ -9,6 +9,7 @@ import pytest
 from app.celery_app import celery_app
 # Force registration for test-only representative tenant task.
 from app.tasks import attribution as _tasks_attribution  # noqa: F401
+from app.tasks import backfill as _tasks_backfill  # noqa: F401
 from app.tasks import llm as _tasks_llm  # noqa: F401
 from app.tasks import maintenance as _tasks_maintenance  # noqa: F401
 from app.tasks import matviews as _tasks_matviews  # noqa: F401
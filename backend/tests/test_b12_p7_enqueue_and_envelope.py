@@ -9,6 +9,7 @@ import pytest
 from app.celery_app import celery_app
 # Force task registration for direct task lookups in this module.
 from app.tasks import attribution as _tasks_attribution  # noqa: F401
+from app.tasks import backfill as _tasks_backfill  # noqa: F401
 from app.tasks import health as _tasks_health  # noqa: F401
 from app.tasks import housekeeping as _tasks_housekeeping  # noqa: F401
 from app.tasks import llm as _tasks_llm  # noqa: F401
@@ -0,0 +1,329 @@
+"""
+Bayesian attribution inference (noisy-OR channel model sampled by HMC).
+
+The sampler must recover known per-touch conversion probabilities, continue
+from a serialised checkpoint exactly as if it had never stopped, and the task
+must persist the run ledger, warm-start the next window and write allocations
+that keep the revenue sum invariant.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import multiprocessing
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from billiard.exceptions import WorkerLostError
+from sqlalchemy import text
+
+from app.core.db import engine
+from app.db.session import set_tenant_guc
+from app.services.bayesian_attribution import (
+    BAYESIAN_MODEL_VERSION,
+    ChainState,
+    advance_chain,
+    default_prior,
+    effective_sample_size,
+    init_chain,
+    pooled_draws,
+    posterior_credit,
+    session_exposure,
+    split_r_hat,
+)
+from app.tasks import bayesian
+from app.tasks.bayesian import _advance_chains, _prepare_run, _save_checkpoint, run_mcmc_inference
+
+_WINDOW_START = datetime(2025, 8, 1, tzinfo=timezone.utc)
+_CHANNELS = ["direct", "email", "google_search_paid"]
+_TRUE_Q = np.array([0.02, 0.08, 0.15])
+
+
+def _synthetic_sessions(sessions: int, seed: int) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    counts = rng.poisson(0.7, size=(sessions, len(_TRUE_Q)))
+    counts[counts.sum(axis=1) == 0, 0] = 1
+    converted = rng.random(sessions) < 1.0 - np.prod((1.0 - _TRUE_Q) ** counts, axis=1)
+    return counts, converted
+
+
+def _sample(data, *, chains: int, steps: int, warmup: int) -> list[ChainState]:
+    prior = default_prior(data.counts.shape[1])
+    return [
+        advance_chain(init_chain(prior, seed=7, chain=chain, warmup=warmup), data, prior, steps=steps, max_draws=1000)
+        for chain in range(chains)
+    ]
+
+
+def test_sampler_recovers_per_touch_conversion_probabilities():
+    data = session_exposure(*_synthetic_sessions(20000, seed=1))
+    draws = pooled_draws(_sample(data, chains=2, steps=500, warmup=200))
+
+    q_mean = (1.0 / (1.0 + np.exp(-draws))).mean(axis=(0, 1))
+    np.testing.assert_allclose(q_mean, _TRUE_Q, atol=0.015)
+    assert split_r_hat(draws).max() < 1.05
+    assert effective_sample_size(draws).min() > 100
+
+
+def test_checkpointed_chain_continues_exactly_like_an_uninterrupted_one():
+    data = session_exposure(*_synthetic_sessions(2000, seed=2))
+    prior = default_prior(len(_CHANNELS))
+    state = init_chain(prior, seed=11, chain=0, warmup=60)
+
+    uninterrupted = advance_chain(state, data, prior, steps=120, max_draws=1000)
+    halfway = advance_chain(state, data, prior, steps=70, max_draws=1000)
+    restored = ChainState.from_dict(json.loads(json.dumps(halfway.to_dict())))
+    resumed = advance_chain(restored, data, prior, steps=50, max_draws=1000)
+
+    assert resumed.draws == uninterrupted.draws
+    assert resumed.to_dict() == uninterrupted.to_dict()
+
+
+def test_posterior_credit_splits_revenue_exactly_with_credible_bounds():
+    theta_draws = np.random.default_rng(3).normal(loc=[-3.0, -2.0, -1.5], scale=0.1, size=(400, 3))
+    path_counts = np.array([[1, 0, 2], [0, 0, 1], [3, 1, 0]])
+    revenue_cents = np.array([1001, 250, 7])
+
+    credit = posterior_credit(theta_draws, path_counts, revenue_cents)
+
+    sums = np.bincount(credit.conversion_index, weights=credit.allocated_revenue_cents, minlength=3)
+    assert sums.tolist() == revenue_cents.tolist()
+    assert (credit.credible_lower_cents <= credit.allocated_revenue_cents).all()
+    assert (credit.allocated_revenue_cents <= credit.credible_upper_cents).all()
+    assert credit.allocated_revenue_cents[credit.conversion_index == 1].tolist() == [250]
+
+
+@pytest.fixture
+def small_sampler(monkeypatch):
+    monkeypatch.setenv("BAYESIAN_INFERENCE_CHAINS", "2")
+    monkeypatch.setenv("BAYESIAN_INFERENCE_WORKERS", "1")
+    monkeypatch.setenv("BAYESIAN_INFERENCE_WARMUP", "150")
+    monkeypatch.setenv("BAYESIAN_INFERENCE_TARGET_ESS", "60")
+    monkeypatch.setenv("BAYESIAN_INFERENCE_TARGET_R_HAT", "1.1")
+
+
+async def _seed_window(tenant_id, window_start: datetime, sessions: int, seed: int) -> None:
+    counts, converted = _synthetic_sessions(sessions, seed)
+    session_ids, channels, revenues, offsets = [], [], [], []
+    for session, (row, did_convert) in enumerate(zip(counts, converted)):
+        session_id = uuid4()
+        touches = [channel for channel, count in zip(_CHANNELS, row) for _ in range(count)]
+        for position, channel in enumerate(touches):
+            last = position == len(touches) - 1
+            session_ids.append(session_id)
+            channels.append(channel)
+            revenues.append(int(1000 + session) if did_convert and last else 0)
+            offsets.append(session * 10 + position)
+    async with engine.begin() as conn:
+        await set_tenant_guc(conn, tenant_id, local=True)
+        # RAW_SQL_ALLOWLIST: seed synthetic touch paths for Bayesian inference
+        await conn.execute(
+            text(
+                """
+                INSERT INTO attribution_events (
+                    tenant_id, session_id, occurred_at, event_timestamp,
+                    idempotency_key, event_type, channel, revenue_cents, raw_payload
+                )
+                SELECT
+                    :tenant_id, s.session_id, s.occurred_at, s.occurred_at,
+                    'bayes:' || gen_random_uuid(),
+                    CASE WHEN s.revenue_cents > 0 THEN 'conversion' ELSE 'touchpoint' END,
+                    s.channel, s.revenue_cents, '{}'::jsonb
+                FROM unnest(
+                    CAST(:session_ids AS uuid[]),
+                    CAST(:channels AS text[]),
+                    CAST(:revenues AS int[]),
+                    CAST(:offsets AS int[])
+                ) AS u(session_id, channel, revenue_cents, offset_s)
+                CROSS JOIN LATERAL (
+                    SELECT
+                        u.*,
+                        CAST(:window_start AS timestamptz) + u.offset_s * interval '1 second' AS occurred_at
+                ) AS s
+                """
+            ),
+            {
+                "tenant_id": tenant_id,
+                "window_start": window_start,
+                "session_ids": session_ids,
+                "channels": channels,
+                "revenues": revenues,
+                "offsets": offsets,
+            },
+        )
+
+
+async def _fetch(tenant_id, sql: str, **params) -> list:
+    async with engine.begin() as conn:
+        await set_tenant_guc(conn, tenant_id, local=True)
+        return (await conn.execute(text(sql), {"tenant_id": tenant_id, **params})).fetchall()
+
+
+def _run(tenant_id, window_start: datetime) -> dict:
+    return run_mcmc_inference.apply(
+        kwargs={
+            "tenant_id": str(tenant_id),
+            "correlation_id": str(uuid4()),
+            "window_start": window_start.isoformat(),
+            "window_end": (window_start + timedelta(days=1)).isoformat(),
+        }
+    ).get()
+
+
+@pytest.mark.asyncio
+async def test_inference_writes_allocations_and_warm_starts_next_window(test_tenant, small_sampler):
+    await _seed_window(test_tenant, _WINDOW_START, 1500, seed=4)
+    await _seed_window(test_tenant, _WINDOW_START + timedelta(days=1), 1500, seed=5)
+
+    first = _run(test_tenant, _WINDOW_START)
+    second = _run(test_tenant, _WINDOW_START + timedelta(days=1))
+
+    assert first["status"] == second["status"] == "completed"
+    assert (first["warm_started"], second["warm_started"]) == (False, True)
+    assert first["r_hat_max"] <= 1.1 and first["ess_min"] >= 60
+    assert first["event_count"] > 0 and first["allocation_count"] >= first["event_count"]
+
+    runs = await _fetch(
+        test_tenant,
+        """
+        SELECT id, status, converged, chain_states, posterior, warm_start_run_id
+        FROM attribution_bayesian_runs WHERE tenant_id = :tenant_id ORDER BY window_start
+        """,
+    )
+    assert [(row.status, row.converged, row.chain_states) for row in runs] == [("succeeded", True, None)] * 2
+    assert set(runs[0].posterior) == set(_CHANNELS)
+    assert runs[1].warm_start_run_id == runs[0].id
+
+    mismatched = await _fetch(
+        test_tenant,
+        """
+        SELECT e.id
+        FROM attribution_events e
+        JOIN attribution_allocations a ON a.event_id = e.id AND a.model_version = :model_version
+        WHERE e.tenant_id = :tenant_id
+        GROUP BY e.id, e.revenue_cents
+        HAVING sum(a.allocated_revenue_cents) <> e.revenue_cents
+            OR bool_or(a.credible_interval_lower_cents IS NULL OR a.convergence_r_hat IS NULL)
+        """,
+        model_version=BAYESIAN_MODEL_VERSION,
+    )
+    assert mismatched == []
+
+
+@pytest.mark.asyncio
+async def test_allocation_write_is_cancelled_at_the_soft_deadline_and_resumed(test_tenant, small_sampler, monkeypatch):
+    await _seed_window(test_tenant, _WINDOW_START, 800, seed=9)
+    monkeypatch.setattr(bayesian, "_TASK_SOFT_LIMIT_S", 5)
+    real_write = bayesian._write_posterior_allocations
+    writes: list[str] = []
+
+    async def _write_outlasting_the_deadline(**kwargs):
+        if writes:
+            writes.append("resumed")
+            return await real_write(**kwargs)
+        writes.append("started")
+        try:
+            await asyncio.sleep(3600)
+        except asyncio.CancelledError:
+            writes.append("cancelled")
+            raise
+
+    resumes: list[dict] = []
+    monkeypatch.setattr(bayesian, "_write_posterior_allocations", _write_outlasting_the_deadline)
+    monkeypatch.setattr(run_mcmc_inference, "apply_async", lambda kwargs: resumes.append(kwargs))
+
+    fallback = _run(test_tenant, _WINDOW_START)
+
+    assert fallback["fallback_triggered"] is True
+    assert fallback["resume_enqueued"] is True and len(resumes) == 1
+    assert writes == ["started", "cancelled"]
+
+    resumed = run_mcmc_inference.apply(kwargs=resumes[0]).get()
+
+    assert resumed["status"] == "completed" and resumed["resumed"] is True
+    assert writes[-1] == "resumed" and resumed["allocation_count"] >= resumed["event_count"] > 0
+
+
+def _run_in_child(tenant_id: str, window_start: str, results) -> None:
+    try:
+        results.put(_run(tenant_id, datetime.fromisoformat(window_start)))
+    except BaseException as exc:
+        results.put(f"err:{type(exc).__name__}:{exc}")
+
+
+@pytest.mark.asyncio
+async def test_inference_samples_in_parallel_inside_a_daemonic_worker(test_tenant, small_sampler, monkeypatch):
+    # Celery prefork children are daemonic; the sampler pool must still start there.
+    monkeypatch.setenv("BAYESIAN_INFERENCE_WORKERS", "2")
+    await _seed_window(test_tenant, _WINDOW_START, 800, seed=6)
+
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    child = ctx.Process(
+        target=_run_in_child,
+        args=(str(test_tenant), _WINDOW_START.isoformat(), results),
+        daemon=True,
+    )
+    child.start()
+    outcome = results.get(timeout=240)
+    child.join(timeout=30)
+
+    assert child.exitcode == 0
+    assert isinstance(outcome, dict), outcome
+    assert outcome["status"] == "completed" and outcome["chains"] == 2
+    assert outcome["sampler_processes"] == 2
+    assert outcome["allocation_count"] >= outcome["event_count"] > 0
+
+
+class _BrokenPool:
+    def __init__(self) -> None:
+        self.shut_down = False
+
+    def map(self, fn, *iterables):
+        raise WorkerLostError("Worker exited prematurely: signal 9 (SIGKILL).")
+
+    def shutdown(self):
+        self.shut_down = True
+
+
+def test_advance_chains_falls_back_in_process_when_the_pool_breaks():
+    data = session_exposure(*_synthetic_sessions(500, seed=8))
+    prior = default_prior(len(_CHANNELS))
+    states = [init_chain(prior, seed=3, chain=chain, warmup=20) for chain in range(2)]
+    pool = _BrokenPool()
+
+    advanced, executor = _advance_chains(states, data, prior, max_draws=1000, executor=pool)
+    expected, _ = _advance_chains(states, data, prior, max_draws=1000, executor=None)
+
+    assert executor is None and pool.shut_down
+    assert [state.to_dict() for state in advanced] == [state.to_dict() for state in expected]
+
+
+@pytest.mark.asyncio
+async def test_prepare_run_resumes_checkpoint_only_for_unchanged_data(test_tenant):
+    prior = default_prior(len(_CHANNELS))
+    states = [init_chain(prior, seed=1, chain=chain, warmup=10) for chain in range(2)]
+    identity = {
+        "tenant_id": test_tenant,
+        "window_start": _WINDOW_START,
+        "window_end": _WINDOW_START + timedelta(days=1),
+        "model_version": BAYESIAN_MODEL_VERSION,
+        "channels": _CHANNELS,
+        "sessions": 10,
+    }
+
+    first = await _prepare_run(**identity, fingerprint="a", correlation_id=uuid4())
+    assert (first["attempts"], first["checkpoint"]) == (1, None)
+    await _save_checkpoint(tenant_id=test_tenant, run_id=first["run_id"], prior=prior, states=states, status="fallback")
+
+    resumed = await _prepare_run(**identity, fingerprint="a", correlation_id=uuid4())
+    assert (resumed["run_id"], resumed["attempts"]) == (first["run_id"], 2)
+    assert [ChainState.from_dict(chain).to_dict() for chain in resumed["checkpoint"]["chains"]] == [
+        state.to_dict() for state in states
+    ]
+
+    restarted = await _prepare_run(**identity, fingerprint="b", correlation_id=uuid4())
+    assert (restarted["attempts"], restarted["checkpoint"]) == (3, None)
@@ -0,0 +1,180 @@
+"""
+Compiled channel resolver and live taxonomy code set.
+
+The compiled (vendor, indicator) resolver must return exactly what the
+per-vendor probe sequence over channel_mapping.yaml returns; normalize_many
+must agree with normalize_channel; and the valid-code set must follow
+channel_taxonomy changes through NOTIFY.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from unittest.mock import patch
+
+import psycopg2
+import pytest
+from hypothesis import given, settings as hypothesis_settings, strategies as st
+
+from app.ingestion import channel_normalization
+from app.ingestion.channel_normalization import (
+    ChannelResolver,
+    ChannelTaxonomyRuntime,
+    load_channel_mapping,
+    normalize_channel,
+    normalize_many,
+)
+from app.core.secrets import get_database_url
+from app.security.revocation_runtime import _to_sync_dsn
+
+
+def _probe_reference(mapping: dict, vendor: str, utm_source: str, utm_medium: str):
+    """The original per-call lookup sequence against the nested YAML mapping."""
+    vendor_mapping = mapping[vendor]
+    canonical_code = None
+    if utm_source:
+        canonical_code = vendor_mapping.get(utm_source.upper())
+    if not canonical_code and utm_source and utm_medium:
+        canonical_code = vendor_mapping.get(f"{utm_source.upper()}_{utm_medium.upper()}")
+    if not canonical_code and utm_medium:
+        canonical_code = vendor_mapping.get(utm_medium.upper())
+    if not canonical_code:
+        for key in [utm_source, utm_medium, f"{utm_source}_{utm_medium}"]:
+            if key:
+                canonical_code = vendor_mapping.get(key)
+                if canonical_code:
+                    break
+    return canonical_code
+
+
+_MAPPING = load_channel_mapping()
+_INDICATOR_PARTS = sorted(
+    {part for vendor_mapping in _MAPPING.values() for key in vendor_mapping for part in [key, *key.split("_")]}
+)
+_indicator = st.one_of(
+    st.just(""),
+    st.sampled_from(_INDICATOR_PARTS),
+    st.sampled_from(_INDICATOR_PARTS).map(str.lower),
+    st.text(alphabet="abcXYZ_", max_size=6),
+)
+
+
+@hypothesis_settings(max_examples=500, deadline=None)
+@given(vendor=st.sampled_from(sorted(_MAPPING)), utm_source=_indicator, utm_medium=_indicator)
+def test_compiled_resolver_matches_probe_sequence(vendor, utm_source, utm_medium):
+    resolver = ChannelResolver(_MAPPING)
+    assert resolver.resolve(vendor, utm_source, utm_medium) == _probe_reference(
+        _MAPPING, vendor, utm_source, utm_medium
+    )
+
+
+def test_resolver_memoizes_hot_triples():
+    resolver = ChannelResolver(_MAPPING, memo_size=8)
+    for _ in range(100):
+        assert resolver.resolve("google_ads", "google", "search") == "google_search_paid"
+    info = resolver.resolve.cache_info()
+    assert (info.hits, info.misses) == (99, 1)
+
+
+def test_normalize_many_matches_normalize_channel_and_logs_once_per_triple():
+    triples = [
+        ("google", "search", "google_ads"),
+        ("FB_ADS", None, "facebook_ads"),
+        (None, None, None),
+        ("bing", "cpc", "bing_ads"),
+        ("google", "search", "google_ads"),
+        ("bing", "cpc", "bing_ads"),
+        ("", "", "shopify"),
+    ]
+    expected = [normalize_channel(s, m, v, tenant_id="t") for s, m, v in triples]
+
+    with patch("app.ingestion.channel_normalization.log_unmapped_channel") as mock_log:
+        assert normalize_many(triples, tenant_id="t") == expected
+    logged_keys = [call.args[0] for call in mock_log.call_args_list]
+    assert logged_keys == ["bing_ads/bing/cpc", "shopify"]
+
+
+def test_mapped_code_outside_taxonomy_falls_back_to_unknown(monkeypatch):
+    monkeypatch.setattr(
+        channel_normalization,
+        "get_valid_taxonomy_codes",
+        lambda: frozenset({"unknown", "direct"}),
+    )
+    assert normalize_channel("google", "search", "google_ads") == "unknown"
+    assert normalize_many([("google", "search", "google_ads"), (None, None, None)]) == ["unknown", "direct"]
+
+
+def _wait_for(predicate, timeout: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_taxonomy_runtime_follows_notify(monkeypatch):
+    monkeypatch.delenv("SKELDIR_CHANNEL_TAXONOMY_DISABLE_EVENT_LISTENER", raising=False)
+    runtime = ChannelTaxonomyRuntime(runtime_name="test-notify")
+    conn = psycopg2.connect(_to_sync_dsn(get_database_url()))
+    conn.set_session(autocommit=True)
+    try:
+        runtime.ensure_started()
+        assert _wait_for(lambda: runtime.runtime_state()["listening"])
+        assert "email" in runtime.codes()
+
+        with conn.cursor() as cur:
+            cur.execute("UPDATE channel_taxonomy SET is_active = false WHERE code = 'email'")
+        assert _wait_for(lambda: "email" not in runtime.codes())
+        assert "unknown" in runtime.codes()
+    finally:
+        with conn.cursor() as cur:
+            cur.execute("UPDATE channel_taxonomy SET is_active = true WHERE code = 'email'")
+        conn.close()
+    try:
+        assert _wait_for(lambda: "email" in runtime.codes())
+    finally:
+        runtime.close()
+
+
+def _unreachable(*args, **kwargs):
+    raise psycopg2.OperationalError("database unavailable")
+
+
+def test_taxonomy_runtime_falls_back_when_table_unreadable(monkeypatch):
+    monkeypatch.setenv("SKELDIR_CHANNEL_TAXONOMY_DISABLE_EVENT_LISTENER", "1")
+    monkeypatch.setattr(channel_normalization.psycopg2, "connect", _unreachable)
+    runtime = ChannelTaxonomyRuntime(runtime_name="test-fallback")
+    try:
+        assert runtime.reload() == channel_normalization._FALLBACK_TAXONOMY_CODES
+        assert runtime.codes() == channel_normalization._FALLBACK_TAXONOMY_CODES
+    finally:
+        runtime.close()
+
+
+def test_taxonomy_codes_never_connect_on_the_calling_thread(monkeypatch):
+    monkeypatch.setenv("SKELDIR_CHANNEL_TAXONOMY_DISABLE_EVENT_LISTENER", "1")
+    connecting_threads = []
+    real_connect = psycopg2.connect
+
+    def _recording_connect(*args, **kwargs):
+        connecting_threads.append(threading.current_thread())
+        return real_connect(*args, **kwargs)
+
+    monkeypatch.setattr(channel_normalization.psycopg2, "connect", _recording_connect)
+    runtime = ChannelTaxonomyRuntime(runtime_name="test-hot-path")
+    try:
+        # Served from the built-in set until the background load lands.
+        assert "unknown" in runtime.codes()
+        assert _wait_for(lambda: runtime.runtime_state()["code_count"] > 0)
+        assert "email" in runtime.codes()
+
+        # A failed re-read keeps the last-known set.
+        loaded = runtime.codes()
+        monkeypatch.setattr(channel_normalization.psycopg2, "connect", _unreachable)
+        assert runtime.reload() == loaded
+    finally:
+        runtime.close()
+    assert connecting_threads
+    assert threading.current_thread() not in connecting_threads
@@ -0,0 +1,452 @@
+"""
+COPY-based historical backfill importer tests (app.ingestion.backfill).
+
+Covers the staging COPY + idempotent merge, DLQ routing of rejected records
+(PII keys stripped) and of malformed NDJSON lines, value parity with the single-event ingestion path,
+checkpointed resume and its guard against concurrent runs, the scoped
+worker-context INSERT grant, and the tenant-scoped Celery task, which imports
+in time-bounded slices.
+"""
+
+import asyncio
+import csv
+import json
+import time
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import DBAPIError
+
+import app.ingestion.backfill as backfill
+from app.celery_app import celery_app
+from app.db.session import get_session
+from app.ingestion.backfill import run_event_backfill
+from app.ingestion.dlq_handler import DLQHandler
+from app.ingestion.event_service import EventIngestionService
+from app.models import AttributionEvent, DeadEvent
+from app.tasks import backfill as tasks_backfill
+from app.tasks.authority import AUTHORITY_ENVELOPE_HEADER, SystemAuthorityEnvelope
+from app.tasks.context import run_in_worker_loop
+
+
+def _record(index: int, prefix: str, **overrides) -> dict:
+    record = {
+        "idempotency_key": f"{prefix}_{index}",
+        "event_type": "purchase",
+        "event_timestamp": f"2025-03-01T00:{index % 60:02d}:00+00:00",
+        "revenue_amount": f"{index + 1}.25",
+        "session_id": str(uuid4()),
+        "vendor": "shopify",
+        "utm_source": "google" if index % 2 else "facebook",
+        "utm_medium": "cpc",
+        "external_event_id": f"order_{index}",
+    }
+    record.update(overrides)
+    return record
+
+
+def _write_ndjson(path, records) -> None:
+    path.write_text("".join(json.dumps(record) + "\n" for record in records), encoding="utf-8")
+
+
+async def _events_for_prefix(tenant_id, prefix: str) -> list[AttributionEvent]:
+    async with get_session(tenant_id=tenant_id) as session:
+        result = await session.execute(
+            select(AttributionEvent)
+            .where(AttributionEvent.idempotency_key.like(f"{prefix}_%"))
+            .order_by(AttributionEvent.idempotency_key)
+        )
+        return list(result.scalars().all())
+
+
+@pytest.mark.asyncio
+async def test_ndjson_backfill_merges_idempotently_and_routes_rejects(test_tenant, tmp_path):
+    prefix = f"bf_{uuid4().hex[:8]}"
+    service = EventIngestionService()
+    async with get_session(tenant_id=test_tenant) as session:
+        existing = await service.ingest_event(
+            session=session,
+            tenant_id=test_tenant,
+            event_data=_record(0, prefix),
+            idempotency_key=f"{prefix}_0",
+            source="shopify",
+        )
+
+    bad_correlation = uuid4()
+    records = [_record(i, prefix) for i in range(7)]
+    records.append(_record(3, prefix))  # repeated key inside the export
+    records.append({"event_type": "purchase", "correlation_id": str(bad_correlation)})
+    export = tmp_path / "orders.ndjson"
+    _write_ndjson(export, records)
+
+    result = await run_event_backfill(test_tenant, export, "shopify", chunk_size=4)
+
+    assert result["status"] == "completed"
+    assert result["rows_processed"] == 9
+    assert result["rows_inserted"] == 6
+    assert result["rows_duplicate"] == 2
+    assert result["rows_rejected"] == 1
+
+    events = await _events_for_prefix(test_tenant, prefix)
+    assert len(events) == 7
+    assert next(e for e in events if e.idempotency_key == f"{prefix}_0").id == existing.id
+    async with get_session(tenant_id=test_tenant) as session:
+        dead = (
+            await session.execute(select(DeadEvent).where(DeadEvent.correlation_id == bad_correlation))
+        ).scalar_one()
+    assert dead.error_code == "ValidationError"
+
+    rerun = await run_event_backfill(test_tenant, export, "shopify", chunk_size=4)
+    assert rerun["job_id"] == result["job_id"]
+    assert rerun["rows_this_run"] == 0
+    assert len(await _events_for_prefix(test_tenant, prefix)) == 7
+
+
+@pytest.mark.asyncio
+async def test_rejected_records_are_stripped_of_pii_before_dlq(test_tenant, tmp_path):
+    prefix = f"bfpii_{uuid4().hex[:8]}"
+    bad_correlation = uuid4()
+    export = tmp_path / "customers.ndjson"
+    _write_ndjson(
+        export,
+        [
+            _record(0, prefix),
+            {
+                "event_type": "purchase",
+                "correlation_id": str(bad_correlation),
+                "email": "buyer@example.com",
+                "customer": {"phone": "+15550100", "address": "1 Main St", "tier": "gold"},
+            },
+            _record(1, prefix),
+        ],
+    )
+
+    result = await run_event_backfill(test_tenant, export, "shopify")
+
+    assert result["status"] == "completed"
+    assert result["rows_inserted"] == 2
+    assert result["rows_rejected"] == 1
+    async with get_session(tenant_id=test_tenant) as session:
+        dead = (
+            await session.execute(select(DeadEvent).where(DeadEvent.correlation_id == bad_correlation))
+        ).scalar_one()
+    assert dead.raw_payload == {
+        "event_type": "purchase",
+        "correlation_id": str(bad_correlation),
+        "customer": {"tier": "gold"},
+    }
+
+
+@pytest.mark.asyncio
+async def test_csv_backfill_matches_single_event_ingestion_values(test_tenant, tmp_path):
+    prefix = f"bfcsv_{uuid4().hex[:8]}"
+    records = [_record(i, prefix, currency="EUR") for i in range(3)]
+    export = tmp_path / "orders.csv"
+    with export.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=list(records[0].keys()) + ["campaign_id"])
+        writer.writeheader()
+        for record in records:
+            writer.writerow(record)
+
+    await run_event_backfill(test_tenant, export, "shopify")
+
+    imported = {e.idempotency_key: e for e in await _events_for_prefix(test_tenant, prefix)}
+    assert len(imported) == 3
+    service = EventIngestionService()
+    for record in records:
+        expected = service._build_event_values(
+            tenant_id=test_tenant,
+            event_data=record,
+            idempotency_key=record["idempotency_key"],
+            source="shopify",
+            now=imported[record["idempotency_key"]].created_at,
+        )
+        event = imported[record["idempotency_key"]]
+        for column in (
+            "channel",
+            "event_type",
+            "event_timestamp",
+            "occurred_at",
+            "session_id",
+            "revenue_cents",
+            "currency",
+            "raw_payload",
+            "external_event_id",
+            "campaign_id",
+        ):
+            assert getattr(event, column) == expected[column], column
+
+
+def test_staging_columns_cover_every_ingested_column():
+    record = _record(0, "cols")
+    values = EventIngestionService._event_values(
+        tenant_id=uuid4(),
+        event_data=record,
+        validated=EventIngestionService()._validate_schema(record),
+        channel_code="direct",
+        idempotency_key=record["idempotency_key"],
+        now=datetime.now(timezone.utc),
+    )
+    assert sorted(values) == sorted(backfill._STAGING_COLUMNS)
+
+
+@pytest.mark.asyncio
+async def test_backfill_resumes_from_last_committed_chunk(test_tenant, tmp_path, monkeypatch):
+    prefix = f"bfresume_{uuid4().hex[:8]}"
+    export = tmp_path / "history.ndjson"
+    _write_ndjson(export, [_record(i, prefix) for i in range(10)])
+
+    original_merge = backfill._merge_chunk
+    calls = {"n": 0}
+
+    async def _fail_second_chunk(session, **kwargs):
+        calls["n"] += 1
+        if calls["n"] == 2:
+            raise RuntimeError("simulated crash mid-import")
+        return await original_merge(session, **kwargs)
+
+    monkeypatch.setattr(backfill, "_merge_chunk", _fail_second_chunk)
+    with pytest.raises(RuntimeError, match="simulated crash"):
+        await run_event_backfill(test_tenant, export, "shopify", chunk_size=4)
+
+    async with get_session(tenant_id=test_tenant) as session:
+        job = (
+            await session.execute(
+                text(
+                    "SELECT status, rows_processed, last_error FROM event_backfill_jobs "
+                    "WHERE source_uri = :uri"
+                ),
+                {"uri": str(export.resolve())},
+            )
+        ).mappings().one()
+    assert job["status"] == "failed"
+    assert job["rows_processed"] == 4
+    assert "simulated crash" in job["last_error"]
+
+    monkeypatch.setattr(backfill, "_merge_chunk", original_merge)
+    resumed = await run_event_backfill(test_tenant, export, "shopify", chunk_size=4)
+
+    assert resumed["resumed_from"] == 4
+    assert resumed["rows_this_run"] == 6
+    assert resumed["rows_processed"] == 10
+    assert resumed["rows_inserted"] == 10
+    assert resumed["rows_duplicate"] == 0
+    async with get_session(tenant_id=test_tenant) as session:
+        count = await session.scalar(
+            select(func.count())
+            .select_from(AttributionEvent)
+            .where(AttributionEvent.idempotency_key.like(f"{prefix}_%"))
+        )
+    assert count == 10
+
+
+@pytest.mark.asyncio
+async def test_malformed_ndjson_lines_are_rejected_and_checkpointed_past(test_tenant, tmp_path, monkeypatch):
+    prefix = f"bfbad_{uuid4().hex[:8]}"
+    lines = [json.dumps(_record(i, prefix)) for i in range(7)]
+    lines.insert(2, '{"idempotency_key": "truncated')
+    lines.insert(5, "[1, 2]")
+    export = tmp_path / "damaged.ndjson"
+    export.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    original_merge = backfill._merge_chunk
+    calls = {"n": 0}
+
+    async def _fail_second_chunk(session, **kwargs):
+        calls["n"] += 1
+        if calls["n"] == 2:
+            raise RuntimeError("simulated crash after the damaged chunk")
+        return await original_merge(session, **kwargs)
+
+    monkeypatch.setattr(backfill, "_merge_chunk", _fail_second_chunk)
+    with pytest.raises(RuntimeError, match="simulated crash"):
+        await run_event_backfill(test_tenant, export, "shopify", chunk_size=4)
+    monkeypatch.setattr(backfill, "_merge_chunk", original_merge)
+
+    resumed = await run_event_backfill(test_tenant, export, "shopify", chunk_size=4)
+
+    assert resumed["status"] == "completed"
+    assert resumed["resumed_from"] == 4
+    assert (resumed["rows_processed"], resumed["rows_inserted"], resumed["rows_rejected"]) == (9, 7, 2)
+    async with get_session(tenant_id=test_tenant) as session:
+        dead = (
+            await session.execute(
+                select(DeadEvent)
+                .where(DeadEvent.raw_payload.has_key("raw_line"))
+                .order_by(DeadEvent.raw_payload["line_number"].as_integer())
+            )
+        ).scalars().all()
+    assert [event.raw_payload for event in dead] == [
+        {"line_number": 3, "raw_line": '{"idempotency_key": "truncated'},
+        {"line_number": 6, "raw_line": "[1, 2]"},
+    ]
+    assert {event.error_code for event in dead} == {"ValidationError"}
+
+
+@pytest.mark.asyncio
+async def test_backfill_refuses_to_advance_a_checkpoint_another_run_moved(test_tenant, tmp_path, monkeypatch):
+    prefix = f"bfrace_{uuid4().hex[:8]}"
+    export = tmp_path / "race.ndjson"
+    _write_ndjson(export, [_record(i, prefix) for i in range(4)])
+    original_merge = backfill._merge_chunk
+
+    async def _other_run_commits_first(session, **kwargs):
+        async with get_session(tenant_id=test_tenant) as other:
+            await other.execute(
+                text("UPDATE event_backfill_jobs SET rows_processed = rows_processed + 2 WHERE id = :job_id"),
+                {"job_id": str(kwargs["job_id"])},
+            )
+        return await original_merge(session, **kwargs)
+
+    monkeypatch.setattr(backfill, "_merge_chunk", _other_run_commits_first)
+    with pytest.raises(backfill.BackfillCheckpointConflict):
+        await run_event_backfill(test_tenant, export, "shopify", chunk_size=2)
+
+    async with get_session(tenant_id=test_tenant) as session:
+        job = (
+            await session.execute(
+                text("SELECT status, rows_processed, rows_inserted FROM event_backfill_jobs WHERE source_uri = :uri"),
+                {"uri": str(export.resolve())},
+            )
+        ).mappings().one()
+    # The conflicting chunk rolled back; the job is left to the run that moved it.
+    assert dict(job) == {"status": "running", "rows_processed": 2, "rows_inserted": 0}
+    assert await _events_for_prefix(test_tenant, prefix) == []
+
+
+async def _route_to_dlq_as_worker(tenant_id, grant) -> None:
+    async with get_session(tenant_id=tenant_id) as session:
+        await session.execute(
+            text(
+                "SELECT set_config('app.execution_context', 'worker', true), "
+                "set_config('app.worker_ingestion_grant', :grant, true)"
+            ),
+            {"grant": grant},
+        )
+        await DLQHandler().route_many_to_dlq(
+            session, tenant_id, [({"event_type": "purchase"}, ValueError("bad row"), None)], source="shopify"
+        )
+
+
+@pytest.mark.asyncio
+async def test_worker_ingestion_guard_only_exempts_backfill_inserts(test_tenant):
+    with pytest.raises(DBAPIError, match="read-only in worker context"):
+        await _route_to_dlq_as_worker(test_tenant, "")
+
+    await _route_to_dlq_as_worker(test_tenant, backfill.WORKER_INGESTION_GRANT)
+
+    with pytest.raises(DBAPIError, match="read-only in worker context"):
+        async with get_session(tenant_id=test_tenant) as session:
+            await session.execute(
+                text(
+                    "SELECT set_config('app.execution_context', 'worker', true), "
+                    "set_config('app.worker_ingestion_grant', :grant, true)"
+                ),
+                {"grant": backfill.WORKER_INGESTION_GRANT},
+            )
+            # RAW_SQL_ALLOWLIST: proves the grant does not extend to deletes
+            await session.execute(text("DELETE FROM dead_events WHERE source = 'shopify'"))
+
+
+@pytest.mark.asyncio
+async def test_worker_context_backfill_runs_under_the_guard(test_tenant, tmp_path, monkeypatch):
+    prefix = f"bfworker_{uuid4().hex[:8]}"
+    export = tmp_path / "worker.ndjson"
+    _write_ndjson(export, [_record(i, prefix) for i in range(2)])
+
+    monkeypatch.setattr(backfill, "WORKER_INGESTION_GRANT", "not_a_grant")
+    with pytest.raises(DBAPIError, match="read-only in worker context"):
+        await run_event_backfill(test_tenant, export, "shopify", worker_context=True)
+
+    monkeypatch.undo()
+    result = await run_event_backfill(test_tenant, export, "shopify", worker_context=True)
+    assert result["rows_inserted"] == 2
+
+
+def test_worker_loop_timeout_leaves_the_coroutine_running_by_default():
+    finished = asyncio.Event()
+
+    async def _slow_call():
+        await asyncio.sleep(0.5)
+        finished.set()
+
+    with pytest.raises(TimeoutError):
+        run_in_worker_loop(_slow_call(), timeout=0.1)
+
+    async def _wait_finished():
+        await asyncio.wait_for(finished.wait(), timeout=5)
+
+    run_in_worker_loop(_wait_finished())
+    assert finished.is_set()
+
+
+def test_worker_loop_timeout_cancels_the_coroutine_before_returning():
+    state = {"cancelled": False}
+
+    async def _slow_import():
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            await asyncio.sleep(0.2)  # e.g. a transaction rollback
+            state["cancelled"] = True
+            raise
+
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        run_in_worker_loop(_slow_import(), timeout=0.2, cancel_on_timeout=True)
+
+    assert state["cancelled"] is True
+    assert time.monotonic() - started < 5
+
+
+def _apply_backfill_task(tenant_id, **kwargs) -> dict:
+    task = celery_app.tasks["app.tasks.backfill.import_events"]
+    original_eager = celery_app.conf.task_always_eager
+    celery_app.conf.task_always_eager = True
+    try:
+        return task.apply(
+            kwargs=kwargs,
+            headers={
+                AUTHORITY_ENVELOPE_HEADER: SystemAuthorityEnvelope(tenant_id=tenant_id).model_dump(mode="json")
+            },
+        ).get(propagate=True)
+    finally:
+        celery_app.conf.task_always_eager = original_eager
+
+
+def test_backfill_task_runs_tenant_scoped(test_tenant, tmp_path):
+    prefix = f"bftask_{uuid4().hex[:8]}"
+    export = tmp_path / "task.ndjson"
+    _write_ndjson(export, [_record(i, prefix) for i in range(3)])
+
+    result = _apply_backfill_task(test_tenant, source_uri=str(export), source="shopify")
+
+    assert result["tenant_id"] == str(test_tenant)
+    assert result["status"] == "completed"
+    assert result["rows_inserted"] == 3
+
+
+def test_backfill_task_continues_in_bounded_slices(test_tenant, tmp_path, monkeypatch):
+    prefix = f"bfslice_{uuid4().hex[:8]}"
+    export = tmp_path / "slices.ndjson"
+    _write_ndjson(export, [_record(i, prefix) for i in range(5)])
+    budgets = []
+    real_run = tasks_backfill.run_event_backfill
+
+    def _one_chunk_per_run(**kwargs):
+        budgets.append(kwargs["max_seconds"])
+        return real_run(**{**kwargs, "max_seconds": 0})
+
+    monkeypatch.setattr(tasks_backfill, "run_event_backfill", _one_chunk_per_run)
+
+    first = _apply_backfill_task(test_tenant, source_uri=str(export), source="shopify", chunk_size=2)
+
+    assert first["status"] == "running"
+    assert first["rows_this_run"] == 2
+    assert first["continuation_task_id"]
+    # Three slices of 2 + 2 + 1 rows, each within half the soft time limit.
+    assert budgets == [tasks_backfill.settings.CELERY_TASK_SOFT_TIME_LIMIT_S / 2] * 3
+    events = run_in_worker_loop(_events_for_prefix(test_tenant, prefix))
+    assert len(events) == 5
@@ -0,0 +1,126 @@
+"""
+Group-commit write-behind buffer tests (app.ingestion.group_commit).
+
+Concurrent submissions must share one transaction per flush, every caller must
+get its own ingest_many()-shaped result, and tenant isolation must hold when a
+flush spans tenants.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event, select
+
+from app.db.session import engine, get_session
+from app.ingestion.event_service import EventIngestionService
+from app.ingestion.group_commit import GroupCommitBuffer
+from app.models import AttributionEvent
+
+
+def _event(**overrides) -> dict:
+    data = {
+        "event_type": "purchase",
+        "event_timestamp": datetime.now(timezone.utc).isoformat(),
+        "revenue_amount": "7.50",
+        "session_id": str(uuid4()),
+        "vendor": "shopify",
+        "utm_source": "shopify",
+    }
+    data.update(overrides)
+    return data
+
+
+class _CommitCounter:
+    def __init__(self):
+        self.commits = 0
+
+    def __call__(self, conn):
+        self.commits += 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_submits_share_one_commit_across_tenants(test_tenant_pair):
+    tenant_a, tenant_b = test_tenant_pair
+    buffer = GroupCommitBuffer(max_events=64, flush_interval_ms=50)
+    submissions = [
+        (tenant, f"gc_{tenant.hex[:6]}_{i}_{uuid4()}")
+        for i in range(10)
+        for tenant in (tenant_a, tenant_b)
+    ]
+    counter = _CommitCounter()
+    event.listen(engine.sync_engine, "commit", counter)
+    try:
+        results = await asyncio.gather(
+            *(buffer.submit(tenant, _event(), key, "shopify") for tenant, key in submissions)
+        )
+    finally:
+        event.remove(engine.sync_engine, "commit", counter)
+        await buffer.close()
+
+    assert counter.commits == 1
+    assert [r["status"] for r in results] == ["success"] * len(submissions)
+    assert [r["idempotency_key"] for r in results] == [key for _, key in submissions]
+
+    for tenant in (tenant_a, tenant_b):
+        async with get_session(tenant_id=tenant) as session:
+            rows = (
+                await session.execute(
+                    select(AttributionEvent.tenant_id, AttributionEvent.idempotency_key).where(
+                        AttributionEvent.idempotency_key.in_([key for _, key in submissions])
+                    )
+                )
+            ).all()
+        assert sorted(key for _, key in rows) == sorted(key for t, key in submissions if t == tenant)
+        assert {row_tenant for row_tenant, _ in rows} == {tenant}
+
+
+@pytest.mark.asyncio
+async def test_buffer_flushes_when_full_and_reports_dlq_and_duplicates(test_tenant):
+    buffer = GroupCommitBuffer(max_events=3, flush_interval_ms=60_000)
+    key = f"gc_dup_{uuid4()}"
+    invalid_key = f"gc_invalid_{uuid4()}"
+    try:
+        results = await asyncio.wait_for(
+            asyncio.gather(
+                buffer.submit(test_tenant, _event(), key, "shopify"),
+                buffer.submit(test_tenant, _event(), key, "shopify"),
+                buffer.submit(test_tenant, _event(session_id="not-a-uuid"), invalid_key, "shopify"),
+            ),
+            timeout=10,
+        )
+    finally:
+        await buffer.close()
+
+    assert results[0]["status"] == "success"
+    assert results[1]["event_id"] == results[0]["event_id"]
+    assert results[1]["duplicate"] is True
+    assert results[2]["status"] == "error"
+    assert results[2]["dead_event_id"]
+
+
+@pytest.mark.asyncio
+async def test_failed_shared_transaction_falls_back_per_event(test_tenant, monkeypatch):
+    original = EventIngestionService.ingest_many
+    calls = {"n": 0}
+
+    async def _fail_first_batch(self, session, tenant_id, items, source):
+        calls["n"] += 1
+        if calls["n"] == 1:
+            raise RuntimeError("simulated shared-transaction failure")
+        return await original(self, session=session, tenant_id=tenant_id, items=items, source=source)
+
+    monkeypatch.setattr(EventIngestionService, "ingest_many", _fail_first_batch)
+    buffer = GroupCommitBuffer(max_events=16, flush_interval_ms=20)
+    keys = [f"gc_fallback_{i}_{uuid4()}" for i in range(3)]
+    try:
+        results = await asyncio.gather(
+            *(buffer.submit(test_tenant, _event(), key, "shopify") for key in keys)
+        )
+    finally:
+        await buffer.close()
+
+    assert [r["status"] for r in results] == ["success"] * 3
+    assert [r["idempotency_key"] for r in results] == keys
+    assert calls["n"] == 1 + len(keys)
@@ -0,0 +1,131 @@
+"""
+Single-round-trip insert fast path for EventIngestionService.ingest_event.
+
+Verifies the INGESTION_INSERT_FAST_PATH_ENABLED path keeps the default path's
+idempotency and DLQ semantics while issuing one statement per new event.
+"""
+
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event, func, select
+
+from app.core.config import settings
+from app.db.session import engine, get_session
+from app.ingestion.event_service import EventIngestionService, ValidationError
+from app.models import AttributionEvent, DeadEvent
+
+
+def _event(**overrides) -> dict:
+    data = {
+        "event_type": "purchase",
+        "event_timestamp": datetime.now(timezone.utc).isoformat(),
+        "revenue_amount": "42.00",
+        "session_id": str(uuid4()),
+        "vendor": "stripe",
+        "utm_source": "stripe",
+    }
+    data.update(overrides)
+    return data
+
+
+@pytest.fixture
+def fast_path(monkeypatch):
+    monkeypatch.setattr(settings, "INGESTION_INSERT_FAST_PATH_ENABLED", True)
+
+
+async def _ingest_counting_statements(tenant_id, event_data, idempotency_key):
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    service = EventIngestionService()
+    event.listen(engine.sync_engine, "before_cursor_execute", _record)
+    try:
+        async with get_session(tenant_id=tenant_id) as session:
+            ingested = await service.ingest_event(
+                session=session,
+                tenant_id=tenant_id,
+                event_data=event_data,
+                idempotency_key=idempotency_key,
+                source="stripe",
+            )
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", _record)
+    app_statements = [s for s in statements if "attribution_events" in s]
+    return ingested, app_statements
+
+
+@pytest.mark.asyncio
+async def test_fast_path_new_key_is_one_statement(test_tenant, fast_path):
+    key = f"fast_new_{uuid4()}"
+    ingested, statements = await _ingest_counting_statements(test_tenant, _event(), key)
+
+    assert len(statements) == 1
+    assert "ON CONFLICT" in statements[0]
+    async with get_session(tenant_id=test_tenant) as session:
+        stored = await session.get(AttributionEvent, ingested.id)
+    assert stored is not None
+    assert stored.idempotency_key == key
+    assert stored.channel == ingested.channel
+    assert stored.revenue_cents == 4200
+
+
+@pytest.mark.asyncio
+async def test_fast_path_duplicate_returns_existing_without_rollback(test_tenant, fast_path):
+    key = f"fast_dup_{uuid4()}"
+    first, _ = await _ingest_counting_statements(test_tenant, _event(), key)
+    second, statements = await _ingest_counting_statements(test_tenant, _event(), key)
+
+    assert second.id == first.id
+    assert len(statements) == 2
+    async with get_session(tenant_id=test_tenant) as session:
+        count = await session.scalar(
+            select(func.count()).select_from(AttributionEvent).where(
+                AttributionEvent.tenant_id == test_tenant,
+                AttributionEvent.idempotency_key == key,
+            )
+        )
+    assert count == 1
+
+
+@pytest.mark.asyncio
+async def test_fast_path_validation_semantics_match_default(test_tenant, fast_path):
+    service = EventIngestionService()
+    existing_key = f"fast_existing_{uuid4()}"
+    existing, _ = await _ingest_counting_statements(test_tenant, _event(), existing_key)
+
+    # Invalid payload for an existing key still resolves to the stored event.
+    async with get_session(tenant_id=test_tenant) as session:
+        resolved = await service.ingest_event(
+            session=session,
+            tenant_id=test_tenant,
+            event_data=_event(session_id="not-a-uuid"),
+            idempotency_key=existing_key,
+            source="stripe",
+        )
+    assert resolved.id == existing.id
+
+    # Invalid payload for a new key is DLQ-routed and re-raised.
+    invalid_key = f"fast_invalid_{uuid4()}"
+    correlation_id = uuid4()
+    with pytest.raises(ValidationError):
+        async with get_session(tenant_id=test_tenant) as session:
+            try:
+                await service.ingest_event(
+                    session=session,
+                    tenant_id=test_tenant,
+                    event_data=_event(session_id="not-a-uuid", correlation_id=str(correlation_id)),
+                    idempotency_key=invalid_key,
+                    source="stripe",
+                )
+            finally:
+                await session.commit()
+
+    async with get_session(tenant_id=test_tenant) as session:
+        dead = (
+            await session.execute(select(DeadEvent).where(DeadEvent.correlation_id == correlation_id))
+        ).scalar_one()
+    assert dead.error_code == "ValidationError"
@@ -0,0 +1,134 @@
+"""
+Change-detected matview refresh skipping.
+
+Scheduled refreshes compare the view's source-table change counters with the
+fingerprint stored at the tenant's last refresh and skip unchanged views; a
+first skip is confirmed by a second check before the view leaves the dirty
+set. pulse_matviews_global publishes per-view age and skip-ratio gauges.
+"""
+
+from __future__ import annotations
+
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+
+from app.core.db import engine
+from app.db.session import set_tenant_guc
+from app.matviews import executor
+from app.matviews.scheduler import record_refresh_results, request_refresh
+from app.observability import metrics
+from app.tasks import matviews as matview_tasks
+from app.tasks.authority import SystemAuthorityEnvelope
+from app.tasks.enqueue import enqueue_tenant_task
+from tests.conftest import _age_matview_refresh_state, _refresh_result
+
+_LEDGER_VIEW = "mv_daily_revenue_summary"
+
+
+async def _insert_ledger_row(tenant_id) -> None:
+    async with engine.begin() as conn:
+        await set_tenant_guc(conn, tenant_id, local=True)
+        # RAW_SQL_ALLOWLIST: ledger write that must change the view's source fingerprint
+        await conn.execute(
+            text(
+                """
+                INSERT INTO revenue_ledger (
+                    tenant_id, transaction_id, state, amount_cents,
+                    verification_source, verification_timestamp, revenue_cents
+                ) VALUES (
+                    :tenant_id, :transaction_id, 'captured', 2500,
+                    'unit_test', now(), 2500
+                )
+                """
+            ),
+            {"tenant_id": tenant_id, "transaction_id": f"txn_{uuid4()}"},
+        )
+        # Publish this backend's table counters at commit instead of after the flush delay.
+        await conn.execute(text("SELECT pg_stat_force_next_flush()"))
+
+
+async def _state(tenant_id, view_name: str) -> tuple:
+    async with engine.begin() as conn:
+        await set_tenant_guc(conn, tenant_id, local=True)
+        row = await conn.execute(
+            text(
+                """
+                SELECT dirty_since IS NOT NULL, source_fingerprint IS NOT NULL, last_outcome
+                FROM matview_refresh_state
+                WHERE tenant_id = :tenant_id AND view_name = :view_name
+                """
+            ),
+            {"tenant_id": tenant_id, "view_name": view_name},
+        )
+        return tuple(row.one())
+
+
+def _refresh(view_name: str, tenant_id, **kwargs) -> executor.RefreshOutcome:
+    result = executor.refresh_single(view_name, tenant_id, "fingerprint-test", **kwargs)
+    assert result.outcome != executor.RefreshOutcome.FAILED, result.error_message
+    return result.outcome
+
+
+@pytest.mark.asyncio
+async def test_refresh_is_skipped_until_source_tables_change(test_tenant):
+    request_refresh(test_tenant, [_LEDGER_VIEW, "mv_realtime_revenue"])
+
+    assert _refresh(_LEDGER_VIEW, test_tenant, skip_unchanged=True) == executor.RefreshOutcome.SUCCESS
+    assert _refresh(_LEDGER_VIEW, test_tenant, skip_unchanged=True) == executor.RefreshOutcome.SKIPPED_UNCHANGED
+    # Unscheduled callers always refresh.
+    assert _refresh(_LEDGER_VIEW, test_tenant) == executor.RefreshOutcome.SUCCESS
+
+    await _insert_ledger_row(test_tenant)
+
+    assert _refresh(_LEDGER_VIEW, test_tenant, skip_unchanged=True) == executor.RefreshOutcome.SUCCESS
+    assert _refresh(_LEDGER_VIEW, test_tenant, skip_unchanged=True) == executor.RefreshOutcome.SKIPPED_UNCHANGED
+    # mv_realtime_revenue has no source_tables: its freshness column moves with now().
+    for _ in range(2):
+        assert (
+            _refresh("mv_realtime_revenue", test_tenant, skip_unchanged=True) == executor.RefreshOutcome.SUCCESS
+        )
+
+
+@pytest.mark.asyncio
+async def test_first_unchanged_skip_stays_dirty_until_confirmed(test_tenant):
+    request_refresh(test_tenant, [_LEDGER_VIEW])
+    record_refresh_results(test_tenant, [_refresh_result(_LEDGER_VIEW, test_tenant, executor.RefreshOutcome.SUCCESS)])
+
+    record_refresh_results(
+        test_tenant, [_refresh_result(_LEDGER_VIEW, test_tenant, executor.RefreshOutcome.SKIPPED_UNCHANGED)]
+    )
+    assert await _state(test_tenant, _LEDGER_VIEW) == (True, False, "SKIPPED_UNCHANGED")
+
+    # Claimed again once the hourly budget has passed; an unchanged second check confirms the skip.
+    await _age_matview_refresh_state(test_tenant, 7200)
+    assert request_refresh(test_tenant, [_LEDGER_VIEW], mark_dirty=False) == [_LEDGER_VIEW]
+    record_refresh_results(
+        test_tenant, [_refresh_result(_LEDGER_VIEW, test_tenant, executor.RefreshOutcome.SKIPPED_UNCHANGED)]
+    )
+    assert (await _state(test_tenant, _LEDGER_VIEW))[0] is False
+
+
+@pytest.mark.asyncio
+async def test_pulse_publishes_age_and_skip_ratio_gauges(test_tenant, eager_celery, monkeypatch):
+    monkeypatch.setattr(matview_tasks, "_fetch_tenant_ids_sync", lambda: [test_tenant])
+
+    def refresh_all() -> dict:
+        return enqueue_tenant_task(
+            matview_tasks.matview_refresh_all_for_tenant,
+            envelope=SystemAuthorityEnvelope(tenant_id=test_tenant),
+            kwargs={"schedule_class": "minute"},
+        ).get()
+
+    assert refresh_all()["strategy"] == "SUCCESS"
+    await _age_matview_refresh_state(test_tenant, 7200)
+    outcomes = {result["view_name"]: result["outcome"] for result in refresh_all()["results"]}
+    assert outcomes[_LEDGER_VIEW] == "SKIPPED_UNCHANGED"
+    assert outcomes["mv_realtime_revenue"] == "SUCCESS"
+
+    matview_tasks.pulse_matviews_global.apply(kwargs={"schedule_class": "minute"}).get()
+
+    assert metrics.matview_refresh_skip_ratio.labels(view_name=_LEDGER_VIEW)._value.get() == 1.0
+    assert metrics.matview_refresh_skip_ratio.labels(view_name="mv_realtime_revenue")._value.get() == 0.0
+    assert 0 <= metrics.matview_refresh_age_seconds.labels(view_name=_LEDGER_VIEW)._value.get() < 60
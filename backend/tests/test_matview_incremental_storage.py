@@ -0,0 +1,213 @@
+"""
+Incremental matview storage equivalence.
+
+With storage="incremental", recompute keeps attribution_allocation_summary and
+attribution_channel_daily_summary current through delta upserts. After every
+recompute (including one that deletes allocations) each summary table must
+hold exactly the rows REFRESH MATERIALIZED VIEW produces for the tenant, and
+the reconciliation rebuild must leave them unchanged. Concurrent writers of
+one summary key must not overwrite each other's aggregate.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from sqlalchemy import text
+
+from app.core.db import engine
+from app.db.session import set_tenant_guc
+from app.matviews import executor, registry
+from app.services.attribution_allocations import build_allocation_rows
+from app.tasks.attribution import _write_allocation_rows
+from tests.conftest import _recompute_window, _seed_conversion_event
+
+# Recent enough for mv_channel_performance's 90-day window.
+_WINDOW_START = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=2)
+_WINDOW_END = _WINDOW_START + timedelta(days=1)
+_VIEWS = {
+    "mv_allocation_summary": "attribution_allocation_summary",
+    "mv_channel_performance": "attribution_channel_daily_summary",
+}
+
+
+@pytest.fixture
+def incremental_storage(monkeypatch):
+    for view_name in _VIEWS:
+        entry = registry.get_entry(view_name)
+        monkeypatch.setitem(
+            registry._REGISTRY, view_name, dataclasses.replace(entry, storage=registry.STORAGE_INCREMENTAL)
+        )
+
+
+async def _seed_event(tenant_id, *, session_id, hours: float, channel: str, revenue_cents: int) -> None:
+    await _seed_conversion_event(
+        tenant_id,
+        occurred_at=_WINDOW_START + timedelta(hours=hours),
+        session_id=session_id,
+        channel=channel,
+        revenue_cents=revenue_cents,
+    )
+
+
+_recompute = partial(_recompute_window, window_start=_WINDOW_START, window_end=_WINDOW_END)
+
+
+async def _rows(tenant_id, relation: str, *, refresh: bool = False) -> list[tuple]:
+    async with engine.begin() as conn:
+        await set_tenant_guc(conn, tenant_id, local=True)
+        if refresh:
+            # Runs under the tenant's RLS context, so the view holds this tenant's rows.
+            await conn.execute(text(f"REFRESH MATERIALIZED VIEW {relation}"))
+        rows = await conn.execute(
+            text(f"SELECT * FROM {relation} WHERE tenant_id = :tenant_id"),
+            {"tenant_id": tenant_id},
+        )
+        return sorted((tuple(row._mapping.items()) for row in rows), key=repr)
+
+
+async def _assert_equivalent(tenant_id) -> dict[str, list[tuple]]:
+    summaries = {}
+    for view_name, table in _VIEWS.items():
+        summary_rows = await _rows(tenant_id, table)
+        assert summary_rows, table
+        assert summary_rows == await _rows(tenant_id, view_name, refresh=True), view_name
+        summaries[table] = summary_rows
+    return summaries
+
+
+@pytest.mark.asyncio
+async def test_incremental_summaries_match_refreshed_matviews(
+    test_tenant, eager_celery, incremental_storage, monkeypatch
+):
+    converting_session = uuid4()
+    await _seed_event(test_tenant, session_id=converting_session, hours=1, channel="organic", revenue_cents=0)
+    await _seed_event(test_tenant, session_id=converting_session, hours=3, channel="referral", revenue_cents=1000)
+    await _seed_event(test_tenant, session_id=uuid4(), hours=5, channel="direct", revenue_cents=700)
+
+    assert _recompute(test_tenant, model_version="linear-1.0.0")["status"] == "succeeded"
+    assert _recompute(test_tenant, model_version="1.0.0")["status"] == "succeeded"
+    await _assert_equivalent(test_tenant)
+
+    # A 1.2h lookback drops the organic touch: its allocation is deleted and its
+    # channel-day summary row must go with it.
+    monkeypatch.setenv("ATTRIBUTION_MULTI_TOUCH_LOOKBACK_DAYS", "0.05")
+    assert _recompute(test_tenant, model_version="linear-1.0.0", full_rebuild=True)["status"] == "succeeded"
+    summaries = await _assert_equivalent(test_tenant)
+    assert not any(
+        dict(row)["channel_code"] == "organic" for row in summaries["attribution_channel_daily_summary"]
+    )
+
+    for view_name in _VIEWS:
+        result = executor.refresh_single(view_name, test_tenant, "incremental-reconcile")
+        assert result.outcome == executor.RefreshOutcome.SUCCESS, result.error_message
+    assert {table: await _rows(test_tenant, table) for table in _VIEWS.values()} == summaries
+
+
+def _single_channel_rows(tenant_id, event_id, revenue_cents: int, *, timestamp=_WINDOW_END) -> dict[str, list]:
+    return build_allocation_rows(
+        tenant_id=tenant_id,
+        event_ids=[event_id],
+        channel_codes=["direct"],
+        allocated_revenue_cents=np.array([revenue_cents]),
+        allocation_ratios=np.array([1.0]),
+        model_version="concurrent-1.0.0",
+        model_type="deterministic_baseline",
+        timestamp=timestamp,
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writers_of_one_summary_key_keep_both_writes(test_tenant, incremental_storage):
+    for hours, revenue_cents in ((1, 300), (2, 500)):
+        await _seed_event(test_tenant, session_id=uuid4(), hours=hours, channel="direct", revenue_cents=revenue_cents)
+    async with engine.begin() as conn:
+        await set_tenant_guc(conn, test_tenant, local=True)
+        events = (
+            await conn.execute(
+                text("SELECT id, revenue_cents FROM attribution_events WHERE tenant_id = :tenant_id ORDER BY occurred_at"),
+                {"tenant_id": test_tenant},
+            )
+        ).fetchall()
+
+    first_written = asyncio.Event()
+    release_first = asyncio.Event()
+
+    async def _first_writer() -> None:
+        async with engine.begin() as conn:
+            await set_tenant_guc(conn, test_tenant, local=True)
+            await _write_allocation_rows(conn, _single_channel_rows(test_tenant, *events[0]))
+            first_written.set()
+            await release_first.wait()
+
+    async def _second_writer() -> None:
+        await first_written.wait()
+        async with engine.begin() as conn:
+            await set_tenant_guc(conn, test_tenant, local=True)
+            await _write_allocation_rows(conn, _single_channel_rows(test_tenant, *events[1]))
+
+    first = asyncio.create_task(_first_writer())
+    second = asyncio.create_task(_second_writer())
+    await first_written.wait()
+    # The second writer's delta must wait for the first transaction to end.
+    await asyncio.sleep(0.5)
+    assert not second.done()
+    release_first.set()
+    await asyncio.gather(first, second)
+
+    summary = await _rows(test_tenant, "attribution_channel_daily_summary")
+    assert [(dict(row)["total_revenue_cents"], dict(row)["total_allocations"]) for row in summary] == [(800, 2)]
+    assert summary == await _rows(test_tenant, "mv_channel_performance", refresh=True)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writers_reaching_days_in_opposite_orders_do_not_deadlock(test_tenant, incremental_storage):
+    for hours in range(1, 5):
+        await _seed_event(test_tenant, session_id=uuid4(), hours=hours, channel="direct", revenue_cents=100 * hours)
+    async with engine.begin() as conn:
+        await set_tenant_guc(conn, test_tenant, local=True)
+        events = (
+            await conn.execute(
+                text("SELECT id, revenue_cents FROM attribution_events WHERE tenant_id = :tenant_id ORDER BY occurred_at"),
+                {"tenant_id": test_tenant},
+            )
+        ).fetchall()
+    day_one, day_two = _WINDOW_END, _WINDOW_END + timedelta(days=1)
+    first_batch_written = asyncio.Event()
+
+    async def _writer(batches, *, first: bool) -> None:
+        if not first:
+            await first_batch_written.wait()
+        async with engine.begin() as conn:
+            await set_tenant_guc(conn, test_tenant, local=True)
+            for index, (event, timestamp) in enumerate(batches):
+                await _write_allocation_rows(conn, _single_channel_rows(test_tenant, *event, timestamp=timestamp))
+                if first and index == 0:
+                    first_batch_written.set()
+                    # Let the other writer start its first batch before this one's second.
+                    await asyncio.sleep(0.5)
+
+    await asyncio.gather(
+        _writer([(events[0], day_one), (events[1], day_two)], first=True),
+        _writer([(events[2], day_two), (events[3], day_one)], first=False),
+    )
+
+    summary = await _rows(test_tenant, "attribution_channel_daily_summary")
+    assert [(dict(row)["total_revenue_cents"], dict(row)["total_allocations"]) for row in summary] == [
+        (500, 2),
+        (500, 2),
+    ]
+    assert summary == await _rows(test_tenant, "mv_channel_performance", refresh=True)
+
+
+def test_incremental_storage_requires_a_summary_definition():
+    entry = registry.get_entry("mv_realtime_revenue")
+
+    with pytest.raises(ValueError, match="no incremental summary definition"):
+        dataclasses.replace(entry, storage=registry.STORAGE_INCREMENTAL)
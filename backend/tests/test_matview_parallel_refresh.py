@@ -0,0 +1,111 @@
+"""
+Level-parallel refresh_all_for_tenant.
+
+Views are grouped by dependency depth; a level is refreshed concurrently (up
+to MATVIEW_REFRESH_CONCURRENCY at once) and only after every view of the
+previous level has finished. Results stay in topological order.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import threading
+import time
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from app.matviews import executor, registry
+
+_REGISTERED = registry.list_entries()
+
+
+def _entries_with_dependency() -> list[registry.MatviewRegistryEntry]:
+    """Registry entries where mv_channel_performance depends on mv_allocation_summary."""
+    return [
+        dataclasses.replace(entry, dependencies=("mv_allocation_summary",))
+        if entry.name == "mv_channel_performance"
+        else entry
+        for entry in _REGISTERED
+    ]
+
+
+def _result(view_name: str, tenant_id, correlation_id=None) -> executor.RefreshResult:
+    return executor.RefreshResult(
+        view_name=view_name,
+        tenant_id=tenant_id,
+        correlation_id=correlation_id,
+        outcome=executor.RefreshOutcome.SUCCESS,
+        started_at=datetime.now(timezone.utc),
+        duration_ms=0,
+        error_type=None,
+        error_message=None,
+        lock_key_debug=None,
+    )
+
+
+def test_dependency_levels_group_by_depth_in_topological_order():
+    entries = _entries_with_dependency()
+
+    levels = executor._dependency_levels(executor._topological_order(entries))
+
+    assert [[entry.name for entry in level] for level in levels] == [
+        ["mv_allocation_summary", "mv_daily_revenue_summary", "mv_realtime_revenue", "mv_reconciliation_status"],
+        ["mv_channel_performance"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_async_refresh_runs_levels_concurrently_after_dependencies(monkeypatch):
+    spans: dict[str, tuple[float, float]] = {}
+
+    async def fake_refresh_single_async(view_name, tenant_id, correlation_id=None):
+        started = time.monotonic()
+        await asyncio.sleep(0.2)
+        spans[view_name] = (started, time.monotonic())
+        return _result(view_name, tenant_id, correlation_id)
+
+    monkeypatch.setenv("MATVIEW_REFRESH_CONCURRENCY", "4")
+    monkeypatch.setattr(registry, "list_entries", _entries_with_dependency)
+    monkeypatch.setattr(executor, "refresh_single_async", fake_refresh_single_async)
+
+    started = time.monotonic()
+    results = await executor.refresh_all_for_tenant_async(uuid4(), "corr-parallel")
+    elapsed = time.monotonic() - started
+
+    assert [result.view_name for result in results] == [
+        "mv_allocation_summary",
+        "mv_daily_revenue_summary",
+        "mv_realtime_revenue",
+        "mv_reconciliation_status",
+        "mv_channel_performance",
+    ]
+    # Two levels of 0.2s each; serial refresh would take 1.0s.
+    assert elapsed < 0.6
+    assert spans["mv_channel_performance"][0] >= spans["mv_allocation_summary"][1]
+
+
+def test_sync_refresh_bounds_in_flight_refreshes(monkeypatch):
+    lock = threading.Lock()
+    in_flight = [0, 0]
+
+    def fake_refresh_single(view_name, tenant_id, correlation_id=None, *, skip_unchanged=False):
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight[1], in_flight[0])
+        time.sleep(0.1)
+        with lock:
+            in_flight[0] -= 1
+        return _result(view_name, tenant_id, correlation_id)
+
+    monkeypatch.setenv("MATVIEW_REFRESH_CONCURRENCY", "2")
+    monkeypatch.setattr(executor, "refresh_single", fake_refresh_single)
+
+    results = executor.refresh_all_for_tenant(uuid4(), "corr-bounded")
+
+    assert [result.view_name for result in results] == [
+        entry.name for entry in executor._topological_order(registry.list_entries())
+    ]
+    assert in_flight[1] == 2
@@ -0,0 +1,109 @@
+"""
+Deduplicated matview refresh scheduling.
+
+Per-tenant refresh requests mark views dirty and refresh only views whose
+max_staleness_seconds budget has elapsed, so repeated requests cost one
+refresh per view per budget; pulse_matviews_global dispatches only tenants
+that have a due view.
+"""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import text
+
+from app.core.db import engine
+from app.db.session import set_tenant_guc
+from app.matviews import executor, registry
+from app.matviews.scheduler import record_refresh_results, tenants_with_due_views
+from app.tasks import matviews as matview_tasks
+from app.tasks.authority import SystemAuthorityEnvelope
+from app.tasks.enqueue import enqueue_tenant_task
+from tests.conftest import _age_matview_refresh_state, _refresh_result
+
+_ALL_VIEWS = [entry.name for entry in executor._topological_order(registry.list_entries())]
+_MINUTE_VIEWS = [name for name in _ALL_VIEWS if registry.get_entry(name).max_staleness_seconds <= 60]
+
+
+@pytest.fixture
+def refreshed(monkeypatch) -> list[tuple]:
+    calls: list[tuple] = []
+
+    def fake_refresh_views(view_names, tenant_id, correlation_id=None, *, skip_unchanged=False):
+        calls.append((tenant_id, tuple(view_names)))
+        return [_refresh_result(name, tenant_id, executor.RefreshOutcome.SUCCESS) for name in view_names]
+
+    monkeypatch.setattr(matview_tasks, "refresh_views", fake_refresh_views)
+    return calls
+
+
+def _request(tenant_id) -> dict:
+    return enqueue_tenant_task(
+        matview_tasks.matview_refresh_all_for_tenant,
+        envelope=SystemAuthorityEnvelope(tenant_id=tenant_id),
+        kwargs={"schedule_class": "realtime"},
+    ).get()
+
+
+async def _state(tenant_id) -> dict:
+    async with engine.begin() as conn:
+        await set_tenant_guc(conn, tenant_id, local=True)
+        rows = await conn.execute(
+            text(
+                """
+                SELECT view_name, dirty_since IS NOT NULL, last_outcome
+                FROM matview_refresh_state
+                WHERE tenant_id = :tenant_id
+                """
+            ),
+            {"tenant_id": tenant_id},
+        )
+        return {row[0]: (row[1], row[2]) for row in rows}
+
+
+@pytest.mark.asyncio
+async def test_repeated_requests_refresh_each_view_once_per_staleness_budget(
+    test_tenant, eager_celery, refreshed
+):
+    first = _request(test_tenant)
+    repeats = [_request(test_tenant) for _ in range(3)]
+
+    assert first["strategy"] == "SUCCESS"
+    assert [repeat["status"] for repeat in repeats] == ["deferred"] * 3
+    assert refreshed == [(test_tenant, tuple(_ALL_VIEWS))]
+    assert await _state(test_tenant) == {name: (True, "SUCCESS") for name in _ALL_VIEWS}
+
+    # Past the one-minute budgets only: the hourly views stay dirty.
+    await _age_matview_refresh_state(test_tenant, 120)
+    _request(test_tenant)
+
+    assert refreshed[-1] == (test_tenant, tuple(_MINUTE_VIEWS))
+    assert {name for name, (dirty, _) in (await _state(test_tenant)).items() if dirty} == set(_ALL_VIEWS) - set(
+        _MINUTE_VIEWS
+    )
+
+
+@pytest.mark.asyncio
+async def test_pulse_dispatches_only_tenants_with_due_views(test_tenant_pair, eager_celery, refreshed, monkeypatch):
+    fresh_tenant, new_tenant = test_tenant_pair
+    _request(fresh_tenant)
+    monkeypatch.setattr(matview_tasks, "_fetch_tenant_ids_sync", lambda: [fresh_tenant, new_tenant])
+
+    pulse = matview_tasks.pulse_matviews_global.apply(kwargs={"schedule_class": "minute"}).get()
+
+    assert (pulse["tenant_count"], pulse["dispatched_tenant_count"]) == (2, 1)
+    assert refreshed[-1] == (new_tenant, tuple(_ALL_VIEWS))
+    assert tenants_with_due_views([fresh_tenant, new_tenant]) == []
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_is_marked_dirty_again(test_tenant, eager_celery, refreshed):
+    _request(test_tenant)
+    await _age_matview_refresh_state(test_tenant, 120)
+    _request(test_tenant)
+
+    record_refresh_results(
+        test_tenant, [_refresh_result(_MINUTE_VIEWS[0], test_tenant, executor.RefreshOutcome.FAILED)]
+    )
+
+    assert (await _state(test_tenant))[_MINUTE_VIEWS[0]] == (True, "FAILED")
@@ -0,0 +1,243 @@
+"""
+Vectorised multi-touch attribution (app.services.attribution_models).
+
+The engine must agree with a per-conversion reference implementation of each
+model, credit sums to 1 and integer allocations sum to the conversion revenue
+exactly. The recompute path must replace a conversion's allocation rows when a
+late touchpoint changes which channels it credits.
+"""
+
+from __future__ import annotations
+
+import math
+from datetime import datetime, timedelta, timezone
+from uuid import UUID, uuid4
+
+import numpy as np
+import pytest
+from hypothesis import given, settings as hypothesis_settings, strategies as st
+from sqlalchemy import text
+
+from app.core.db import engine
+from app.db.session import set_tenant_guc
+from app.services.attribution_models import MULTI_TOUCH_MODELS, allocate_multi_touch
+from app.tasks.attribution import _compute_allocations_multi_touch, _upsert_job_identity
+
+_HALF_LIFE = 3600.0
+_LOOKBACK = 4 * 3600.0
+
+
+def _reference_credit(model_type, touches, conversion_session, conversion_time) -> dict[int, float]:
+    path = [
+        (time, channel)
+        for session, time, channel in sorted(touches, key=lambda touch: (touch[0], touch[1]))
+        if session == conversion_session and conversion_time - _LOOKBACK <= time <= conversion_time
+    ]
+    length = len(path)
+    weights = []
+    for position, (time, _) in enumerate(path):
+        if model_type == "last_touch":
+            weights.append(1.0 if position == length - 1 else 0.0)
+        elif model_type == "linear":
+            weights.append(1.0 / length)
+        elif model_type == "time_decay":
+            weights.append(2.0 ** (-(conversion_time - time) / _HALF_LIFE))
+        elif length <= 2:
+            weights.append(1.0 / length)
+        else:
+            weights.append(0.4 if position in (0, length - 1) else 0.2 / (length - 2))
+    credit: dict[int, float] = {}
+    for (_, channel), weight in zip(path, weights):
+        if weight > 0:
+            credit[channel] = credit.get(channel, 0.0) + weight
+    total = sum(credit.values())
+    return {channel: value / total for channel, value in credit.items()}
+
+
+_touch = st.tuples(
+    st.integers(min_value=0, max_value=4),
+    st.integers(min_value=0, max_value=12).map(lambda step: step * 1800.0),
+    st.integers(min_value=0, max_value=5),
+)
+
+
+@pytest.mark.parametrize("model_type", sorted(MULTI_TOUCH_MODELS.values()))
+@hypothesis_settings(max_examples=150, deadline=None)
+@given(
+    touches=st.lists(_touch, min_size=1, max_size=30),
+    conversion_picks=st.lists(st.integers(min_value=0, max_value=29), min_size=1, max_size=6),
+    revenues=st.lists(st.integers(min_value=0, max_value=10**7), min_size=6, max_size=6),
+)
+def test_engine_matches_reference_models(model_type, touches, conversion_picks, revenues):
+    conversions = [touches[pick % len(touches)] for pick in conversion_picks]
+    revenue_cents = np.array(revenues[: len(conversions)], dtype=np.int64)
+
+    result = allocate_multi_touch(
+        model_type,
+        touch_session=[touch[0] for touch in touches],
+        touch_time=[touch[1] for touch in touches],
+        touch_channel=[touch[2] for touch in touches],
+        conversion_session=[conversion[0] for conversion in conversions],
+        conversion_time=[conversion[1] for conversion in conversions],
+        conversion_revenue_cents=revenue_cents,
+        lookback_seconds=_LOOKBACK,
+        half_life_seconds=_HALF_LIFE,
+    )
+
+    assert np.all(result.allocated_revenue_cents >= 0)
+    for index, (session, time, _) in enumerate(conversions):
+        rows = result.conversion_index == index
+        expected = _reference_credit(model_type, touches, session, time)
+        actual = dict(zip(result.channel_index[rows].tolist(), result.credit[rows].tolist()))
+        assert actual.keys() == expected.keys()
+        assert all(math.isclose(actual[channel], expected[channel], abs_tol=1e-9) for channel in expected)
+        assert int(result.allocated_revenue_cents[rows].sum()) == int(revenue_cents[index])
+
+
+def test_position_based_and_time_decay_shares():
+    kwargs = dict(
+        touch_session=[0, 0, 0, 0],
+        touch_time=[0.0, 3600.0, 5400.0, 7200.0],
+        touch_channel=[1, 2, 3, 0],
+        conversion_session=[0],
+        conversion_time=[7200.0],
+        conversion_revenue_cents=[10_000],
+        lookback_seconds=_LOOKBACK,
+        half_life_seconds=_HALF_LIFE,
+    )
+    position_based = allocate_multi_touch("position_based", **kwargs)
+    assert position_based.allocated_revenue_cents.tolist() == [4000, 4000, 1000, 1000]
+
+    time_decay = allocate_multi_touch("time_decay", **kwargs)
+    # ages 2h, 1h, 0.5h, 0h with a 1h half-life -> weights 1/4, 1/2, 1/sqrt(2), 1
+    weights = np.array([1.0, 0.25, 0.5, 2**-0.5])
+    assert np.allclose(time_decay.credit, weights / weights.sum())
+
+
+def test_unknown_model_type_is_rejected():
+    with pytest.raises(ValueError, match="Unknown multi-touch model_type"):
+        allocate_multi_touch(
+            "first_touch",
+            touch_session=[0],
+            touch_time=[0.0],
+            touch_channel=[0],
+            conversion_session=[0],
+            conversion_time=[0.0],
+            conversion_revenue_cents=[1],
+            lookback_seconds=_LOOKBACK,
+            half_life_seconds=_HALF_LIFE,
+        )
+
+
+_WINDOW_START = datetime(2025, 8, 1, tzinfo=timezone.utc)
+_WINDOW_END = datetime(2025, 8, 2, tzinfo=timezone.utc)
+
+
+async def _insert_event(tenant_id, session_id, occurred_at, channel, revenue_cents=0, event_id=None):
+    async with engine.begin() as conn:
+        await set_tenant_guc(conn, tenant_id, local=True)
+        # RAW_SQL_ALLOWLIST: seed session touchpoints for multi-touch recompute
+        await conn.execute(
+            text(
+                """
+                INSERT INTO attribution_events (
+                    id, tenant_id, session_id, occurred_at, event_timestamp,
+                    idempotency_key, event_type, channel, revenue_cents, raw_payload
+                ) VALUES (
+                    :id, :tenant_id, :session_id, :occurred_at, :occurred_at,
+                    :idempotency_key, :event_type, :channel, :revenue_cents, '{}'::jsonb
+                )
+                """
+            ),
+            {
+                "id": event_id or uuid4(),
+                "tenant_id": tenant_id,
+                "session_id": session_id,
+                "occurred_at": occurred_at,
+                "idempotency_key": f"mta:{uuid4()}",
+                "event_type": "conversion" if revenue_cents else "page_view",
+                "channel": channel,
+                "revenue_cents": revenue_cents,
+            },
+        )
+
+
+async def _allocations(tenant_id, model_version) -> dict[str, int]:
+    async with engine.begin() as conn:
+        await set_tenant_guc(conn, tenant_id, local=True)
+        rows = await conn.execute(
+            text(
+                """
+                SELECT channel_code, allocated_revenue_cents
+                FROM attribution_allocations
+                WHERE tenant_id = :tenant_id AND model_version = :model_version
+                """
+            ),
+            {"tenant_id": tenant_id, "model_version": model_version},
+        )
+        return dict(rows.fetchall())
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("model_version", "expected"),
+    [
+        ("last_touch-1.0.0", {"direct": 9000}),
+        ("linear-1.0.0", {"email": 3000, "organic": 3000, "direct": 3000}),
+        ("position_based-1.0.0", {"email": 3600, "organic": 1800, "direct": 3600}),
+    ],
+)
+async def test_recompute_writes_session_path_allocations(test_tenant, model_version, expected):
+    session_id = uuid4()
+    # The first touch is before the window: paths reach back over the lookback.
+    await _insert_event(test_tenant, session_id, _WINDOW_START - timedelta(hours=2), "email")
+    await _insert_event(test_tenant, session_id, _WINDOW_START + timedelta(hours=1), "organic")
+    await _insert_event(test_tenant, session_id, _WINDOW_START + timedelta(hours=2), "direct", revenue_cents=9000)
+    await _insert_event(test_tenant, uuid4(), _WINDOW_START + timedelta(hours=3), "referral")
+
+    meta = await _compute_allocations_multi_touch(test_tenant, _WINDOW_START, _WINDOW_END, model_version)
+
+    assert meta == {"event_count": 1, "allocation_count": len(expected), "mode": "full"}
+    assert await _allocations(test_tenant, model_version) == expected
+
+
+@pytest.mark.asyncio
+async def test_incremental_recompute_replaces_superseded_channels(test_tenant, monkeypatch):
+    monkeypatch.setenv("ATTRIBUTION_RECOMPUTE_WATERMARK_LAG_SECONDS", "0")
+    model_version = "last_touch-1.0.0"
+    await _upsert_job_identity(
+        tenant_id=test_tenant,
+        window_start=_WINDOW_START,
+        window_end=_WINDOW_END,
+        model_version=model_version,
+        correlation_id=str(uuid4()),
+    )
+    session_id = uuid4()
+    converted_at = _WINDOW_START + timedelta(hours=5)
+    await _insert_event(test_tenant, session_id, _WINDOW_START + timedelta(hours=1), "email")
+    await _insert_event(
+        test_tenant, session_id, converted_at, "organic", revenue_cents=5000, event_id=UUID(int=uuid4().int >> 8)
+    )
+    first = await _compute_allocations_multi_touch(
+        test_tenant, _WINDOW_START, _WINDOW_END, model_version, incremental=True
+    )
+    assert first["mode"] == "full"
+    assert await _allocations(test_tenant, model_version) == {"organic": 5000}
+
+    # A late touch at the conversion instant that sorts after it becomes the last
+    # touch: the organic row must be replaced, not left next to the new one.
+    await _insert_event(test_tenant, session_id, converted_at, "referral", event_id=UUID(int=(0xFF << 120) | (uuid4().int >> 8)))
+    meta = await _compute_allocations_multi_touch(
+        test_tenant, _WINDOW_START, _WINDOW_END, model_version, incremental=True
+    )
+
+    assert meta == {"event_count": 1, "allocation_count": 1, "mode": "incremental"}
+    assert await _allocations(test_tenant, model_version) == {"referral": 5000}
+
+    await _compute_allocations_multi_touch(test_tenant, _WINDOW_START, _WINDOW_END, model_version)
+    assert await _allocations(test_tenant, model_version) == {"referral": 5000}
+
+    unchanged = await _compute_allocations_multi_touch(
+        test_tenant, _WINDOW_START, _WINDOW_END, model_version, incremental=True
+    )
+    assert unchanged == {"event_count": 0, "allocation_count": 0, "mode": "unchanged"}
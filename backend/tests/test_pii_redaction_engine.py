@@ -0,0 +1,104 @@
+"""
+Path-lazy PII redaction engine (redact_pii_keys) equivalence tests.
+
+redact_pii_keys must serialize byte-identically to strip_pii_keys_recursive and
+report the same redacted paths in the same order, without mutating its input
+and without copying branches that hold no PII key.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from hypothesis import given, settings as hypothesis_settings, strategies as st
+
+from app.main import app
+from app.middleware.pii_stripping import (
+    PII_KEYS,
+    PIIScanLimitExceeded,
+    redact_pii_keys,
+    strip_pii_keys_recursive,
+)
+
+_KEYS = st.one_of(
+    st.sampled_from(sorted(PII_KEYS)),
+    st.sampled_from(sorted(PII_KEYS)).map(str.upper),
+    st.sampled_from(["id", "sku", "0", "a.b", "[1]", "Email ", "line_items", "emails"]),
+    st.text(max_size=8),
+)
+_SCALARS = st.one_of(
+    st.none(),
+    st.booleans(),
+    st.integers(),
+    st.floats(allow_nan=False, allow_infinity=False),
+    st.text(max_size=8),
+)
+_JSON = st.recursive(
+    _SCALARS,
+    lambda children: st.one_of(
+        st.lists(children, max_size=6),
+        st.dictionaries(_KEYS, children, max_size=6),
+    ),
+    max_leaves=60,
+)
+
+
+@hypothesis_settings(max_examples=500, deadline=None)
+@given(_JSON)
+def test_matches_strip_pii_keys_recursive_byte_for_byte(payload):
+    snapshot = copy.deepcopy(payload)
+
+    expected, expected_paths = strip_pii_keys_recursive(payload)
+    actual, actual_paths = redact_pii_keys(payload)
+
+    assert json.dumps(actual).encode("utf-8") == json.dumps(expected).encode("utf-8")
+    assert actual_paths == expected_paths
+    assert payload == snapshot
+
+
+def test_only_branches_with_hits_are_copied():
+    clean_item = {"sku": "a", "properties": [{"name": "gift"}]}
+    dirty_item = {"sku": "b", "shipping_address": {"city": "x"}}
+    payload = {"line_items": [clean_item, dirty_item], "meta": {"k": 1}}
+
+    redacted, paths = redact_pii_keys(payload)
+
+    assert paths == ["root.line_items[1].shipping_address"]
+    assert redacted is not payload
+    assert redacted["line_items"][0] is clean_item
+    assert redacted["meta"] is payload["meta"]
+    assert redacted["line_items"][1] == {"sku": "b"}
+    assert "shipping_address" in dirty_item
+
+    no_pii = {"line_items": [clean_item] * 3}
+    assert redact_pii_keys(no_pii) == (no_pii, [])
+    assert redact_pii_keys(no_pii)[0] is no_pii
+
+
+def test_depth_and_node_limits():
+    nested: object = 1
+    for _ in range(10):
+        nested = [nested]
+    assert redact_pii_keys(nested, max_depth=10)[0] == nested
+    with pytest.raises(PIIScanLimitExceeded):
+        redact_pii_keys(nested, max_depth=9)
+
+    assert redact_pii_keys(list(range(100)), max_nodes=100)[1] == []
+    with pytest.raises(PIIScanLimitExceeded):
+        redact_pii_keys(list(range(101)), max_nodes=100)
+
+
+@pytest.mark.asyncio
+async def test_middleware_rejects_payload_beyond_scan_limits():
+    body = ("[" * 200 + "]" * 200).encode("utf-8")
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post(
+            "/api/webhooks/shopify/order_create",
+            content=body,
+            headers={"content-type": "application/json", "X-Skeldir-Tenant-Key": "any"},
+        )
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid request payload."}
@@ -0,0 +1,50 @@
+"""
+Pure-ASGI PIIStrippingMiddleware / ObservabilityMiddleware contract tests.
+
+The middlewares no longer go through BaseHTTPMiddleware, so the body-size
+guard must also hold for chunked bodies without a Content-Length header and
+the correlation ID must still be echoed on every response.
+"""
+
+from __future__ import annotations
+
+import json
+from uuid import uuid4
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+import app.middleware.pii_stripping as pii_stripping_middleware
+from app.main import app
+
+
+@pytest.mark.asyncio
+async def test_correlation_id_echoed_or_generated():
+    correlation_id = str(uuid4())
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        echoed = await client.get("/health/live", headers={"X-Correlation-ID": correlation_id})
+        generated = await client.get("/health/live")
+
+    assert echoed.headers["X-Correlation-ID"] == correlation_id
+    assert generated.headers["X-Correlation-ID"]
+    assert generated.headers["X-Correlation-ID"] != correlation_id
+
+
+@pytest.mark.asyncio
+async def test_chunked_body_over_limit_is_rejected_without_content_length(monkeypatch):
+    monkeypatch.setattr(pii_stripping_middleware, "WEBHOOK_AUTH_MAX_BODY_BYTES", 64, raising=False)
+
+    async def _chunks():
+        for _ in range(8):
+            yield json.dumps({"pad": "x" * 32}).encode("utf-8")
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post(
+            "/api/webhooks/shopify/order_create",
+            content=_chunks(),
+            headers={"content-type": "application/json", "X-Skeldir-Tenant-Key": "any"},
+        )
+
+    assert "content-length" not in response.request.headers
+    assert response.status_code == 413
+    assert response.headers["X-Correlation-ID"]
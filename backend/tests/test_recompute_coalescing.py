@@ -0,0 +1,95 @@
+"""
+Post-ingestion recompute coalescing (app.services.attribution).
+
+Webhook ingestion must dispatch at most one recompute chain per
+(tenant, window, model_version) per coalesce interval: the first event of a
+quiet window dispatches immediately, later events only mark the window dirty
+and flush_due_recompute_windows dispatches it once.
+"""
+
+from __future__ import annotations
+
+from uuid import uuid4
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.api import webhooks
+from app.core.config import settings
+from app.main import app
+from app.services.attribution import flush_due_recompute_windows, mark_recompute_window_dirty
+from app.tasks.beat_schedule import build_beat_schedule
+
+_WINDOW = ("2026-01-05T00:00:00Z", "2026-01-06T00:00:00Z")
+
+
+async def _flush(tenant_id, interval_seconds: int) -> list:
+    dispatched: list = []
+    await flush_due_recompute_windows(interval_seconds=interval_seconds, dispatch=dispatched.append)
+    return [window for window in dispatched if window.tenant_id == tenant_id]
+
+
+@pytest.mark.asyncio
+async def test_repeated_marks_dispatch_once_then_flush_once(test_tenant):
+    async def _mark(interval_seconds: int = 3600) -> bool:
+        return await mark_recompute_window_dirty(
+            tenant_id=test_tenant,
+            window_start=_WINDOW[0],
+            window_end=_WINDOW[1],
+            model_version="1.0.0",
+            correlation_id=str(uuid4()),
+            interval_seconds=interval_seconds,
+        )
+
+    assert await _mark() is True
+    assert [await _mark() for _ in range(20)] == [False] * 20
+
+    # Interval not yet elapsed since the leading dispatch: nothing is due.
+    assert await _flush(test_tenant, interval_seconds=3600) == []
+    [due] = await _flush(test_tenant, interval_seconds=0)
+    assert (due.model_version, due.window_start.isoformat()) == ("1.0.0", "2026-01-05T00:00:00+00:00")
+    assert await _flush(test_tenant, interval_seconds=0) == []
+
+    # A clean window whose last dispatch is older than the interval dispatches directly.
+    assert await _mark(interval_seconds=0) is True
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("event_count", [3, 30])
+async def test_webhook_dispatch_volume_is_flat_in_event_volume(test_tenant, monkeypatch, event_count):
+    dispatched: list[str] = []
+    monkeypatch.setattr(settings, "ATTRIBUTION_RECOMPUTE_COALESCE_INTERVAL_SECONDS", 3600)
+    monkeypatch.setattr(
+        webhooks,
+        "_schedule_downstream_tasks",
+        lambda *, tenant_id, event_timestamp, correlation_id: dispatched.append(event_timestamp),
+    )
+    app.dependency_overrides[webhooks.shopify_webhook_auth] = lambda: {"tenant_id": test_tenant}
+    base_id = int(uuid4().int % 1_000_000_000)
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            for i in range(event_count):
+                response = await client.post(
+                    "/api/webhooks/shopify/order_create",
+                    json={
+                        "id": base_id + i,
+                        "total_price": "10.00",
+                        "currency": "USD",
+                        "created_at": f"2026-01-05T{i % 24:02d}:00:00Z",
+                    },
+                )
+                assert response.status_code == 200, response.text
+    finally:
+        app.dependency_overrides.pop(webhooks.shopify_webhook_auth, None)
+
+    assert len(dispatched) == 1
+    assert len(await _flush(test_tenant, interval_seconds=0)) == 1
+
+
+def test_flush_task_is_registered_in_beat_schedule(monkeypatch):
+    entry = build_beat_schedule()["flush-coalesced-attribution-recomputes"]
+    assert entry["task"] == "app.tasks.attribution.flush_recompute_windows"
+    assert entry["schedule"] == float(settings.ATTRIBUTION_RECOMPUTE_COALESCE_INTERVAL_SECONDS)
+
+    monkeypatch.setattr(settings, "ATTRIBUTION_RECOMPUTE_COALESCE_INTERVAL_SECONDS", 0)
+    assert "flush-coalesced-attribution-recomputes" not in build_beat_schedule()
@@ -0,0 +1,107 @@
+"""
+Skip-if-unchanged window recompute.
+
+recompute_window fingerprints the window's events (count, max id, revenue sum)
+before reading them; a rerun against the fingerprint of the last successful
+run is reported as "skipped_unchanged" without touching allocations or
+run_count, while any new event, a failed previous run or full_rebuild recomputes.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import text
+
+from app.core.db import engine
+from app.db.session import set_tenant_guc
+from app.tasks.attribution import _mark_job_status
+from tests.conftest import _recompute_window, _seed_conversion_event
+
+_WINDOW_START = datetime(2025, 11, 1, tzinfo=timezone.utc)
+_WINDOW_END = datetime(2025, 11, 2, tzinfo=timezone.utc)
+# Seeded conversions carry 2500 cents unless a test says otherwise.
+_seed_event = partial(_seed_conversion_event, revenue_cents=2500)
+_recompute = partial(_recompute_window, window_start=_WINDOW_START, window_end=_WINDOW_END)
+
+
+async def _job(tenant_id, model_version: str = "1.0.0"):
+    async with engine.begin() as conn:
+        await set_tenant_guc(conn, tenant_id, local=True)
+        return (
+            await conn.execute(
+                text(
+                    """
+                    SELECT status, run_count, fingerprint_event_count, fingerprint_revenue_cents
+                    FROM attribution_recompute_jobs
+                    WHERE tenant_id = :tenant_id AND window_start = :start AND model_version = :model_version
+                    """
+                ),
+                {"tenant_id": tenant_id, "start": _WINDOW_START, "model_version": model_version},
+            )
+        ).one()
+
+
+async def _allocation_updated_ats(tenant_id) -> list:
+    async with engine.begin() as conn:
+        await set_tenant_guc(conn, tenant_id, local=True)
+        rows = await conn.execute(
+            text("SELECT id, updated_at FROM attribution_allocations WHERE tenant_id = :tenant_id ORDER BY id"),
+            {"tenant_id": tenant_id},
+        )
+        return rows.fetchall()
+
+
+@pytest.mark.asyncio
+async def test_unchanged_rerun_is_skipped_until_an_event_arrives(test_tenant, eager_celery):
+    await _seed_event(test_tenant, occurred_at=_WINDOW_START + timedelta(hours=1))
+    await _seed_event(test_tenant, occurred_at=_WINDOW_START + timedelta(hours=2), revenue_cents=700)
+
+    first = _recompute(test_tenant)
+    allocations = await _allocation_updated_ats(test_tenant)
+    skipped = _recompute(test_tenant)
+
+    assert (first["status"], first["run_count"], first["event_count"]) == ("succeeded", 1, 2)
+    assert (skipped["status"], skipped["run_count"], skipped["mode"]) == ("skipped_unchanged", 1, "skipped")
+    assert tuple(await _job(test_tenant)) == ("skipped_unchanged", 1, 2, 3200)
+    assert await _allocation_updated_ats(test_tenant) == allocations
+
+    await _seed_event(test_tenant, occurred_at=_WINDOW_START + timedelta(hours=3))
+    rerun = _recompute(test_tenant)
+
+    assert (rerun["status"], rerun["run_count"]) == ("succeeded", 2)
+    assert tuple(await _job(test_tenant)) == ("succeeded", 2, 3, 5700)
+    assert len(await _allocation_updated_ats(test_tenant)) == 9
+
+
+@pytest.mark.asyncio
+async def test_failed_run_and_full_rebuild_are_never_skipped(test_tenant, eager_celery):
+    await _seed_event(test_tenant, occurred_at=_WINDOW_START + timedelta(hours=1))
+    first = _recompute(test_tenant)
+
+    assert _recompute(test_tenant, full_rebuild=True)["status"] == "succeeded"
+
+    await _mark_job_status(job_id=UUID(first["job_id"]), tenant_id=test_tenant, status="failed")
+    after_failure = _recompute(test_tenant)
+
+    assert (after_failure["status"], after_failure["run_count"]) == ("succeeded", 3)
+    assert _recompute(test_tenant)["status"] == "skipped_unchanged"
+
+
+@pytest.mark.asyncio
+async def test_multi_touch_fingerprint_covers_lookback_touches(test_tenant, eager_celery):
+    session_id = uuid4()
+    await _seed_event(test_tenant, occurred_at=_WINDOW_START + timedelta(hours=5), session_id=session_id)
+    assert _recompute(test_tenant, model_version="linear-1.0.0")["status"] == "succeeded"
+    assert _recompute(test_tenant, model_version="linear-1.0.0")["status"] == "skipped_unchanged"
+
+    # A late touch before window_start changes the session's credit.
+    await _seed_event(
+        test_tenant, occurred_at=_WINDOW_START - timedelta(days=2), session_id=session_id, revenue_cents=0
+    )
+    rerun = _recompute(test_tenant, model_version="linear-1.0.0")
+
+    assert (rerun["status"], rerun["run_count"]) == ("succeeded", 2)
@@ -0,0 +1,108 @@
+"""
+Keyset-paginated event reader for the deterministic baseline recompute.
+
+Window events are streamed in (occurred_at, id) pages of
+ATTRIBUTION_BASELINE_BATCH_EVENTS rows; pages must never skip or repeat an
+event, including runs of events that share an occurred_at timestamp.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+
+from app.core.db import engine
+from app.db.session import set_tenant_guc
+from app.tasks.attribution import _compute_allocations_deterministic_baseline, _iter_window_event_batches
+
+_WINDOW_START = datetime(2025, 6, 1, tzinfo=timezone.utc)
+_WINDOW_END = datetime(2025, 6, 2, tzinfo=timezone.utc)
+
+
+async def _seed_events(tenant_id) -> list:
+    tied = _WINDOW_START + timedelta(hours=3)
+    occurred = [tied, tied, tied, tied, _WINDOW_START, _WINDOW_START + timedelta(hours=9), _WINDOW_END]
+    async with engine.begin() as conn:
+        await set_tenant_guc(conn, tenant_id, local=True)
+        for index, occurred_at in enumerate(occurred):
+            # RAW_SQL_ALLOWLIST: seed window events for keyset reader pagination
+            await conn.execute(
+                text(
+                    """
+                    INSERT INTO attribution_events (
+                        id, tenant_id, session_id, occurred_at, event_timestamp,
+                        idempotency_key, event_type, channel, revenue_cents, raw_payload
+                    ) VALUES (
+                        :id, :tenant_id, :session_id, :occurred_at, :occurred_at,
+                        :idempotency_key, 'conversion', 'direct', :revenue_cents, '{}'::jsonb
+                    )
+                    """
+                ),
+                {
+                    "id": uuid4(),
+                    "tenant_id": tenant_id,
+                    "session_id": uuid4(),
+                    "occurred_at": occurred_at,
+                    "idempotency_key": f"keyset:{tenant_id}:{index}",
+                    "revenue_cents": 1000 + index,
+                },
+            )
+        rows = await conn.execute(
+            text(
+                """
+                SELECT id FROM attribution_events
+                WHERE tenant_id = :tenant_id AND occurred_at >= :start AND occurred_at < :end
+                ORDER BY occurred_at ASC, id ASC
+                """
+            ),
+            {"tenant_id": tenant_id, "start": _WINDOW_START, "end": _WINDOW_END},
+        )
+        return [row[0] for row in rows]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("batch_size", [1, 2, 3, 6, 50])
+async def test_pages_cover_window_once_in_key_order(test_tenant, batch_size):
+    expected_ids = await _seed_events(test_tenant)
+
+    pages = []
+    async with engine.begin() as conn:
+        await set_tenant_guc(conn, test_tenant, local=True)
+        async for page in _iter_window_event_batches(
+            conn,
+            tenant_id=test_tenant,
+            window_start=_WINDOW_START,
+            window_end=_WINDOW_END,
+            batch_size=batch_size,
+        ):
+            pages.append(page)
+
+    assert all(len(page) <= batch_size for page in pages)
+    assert [row[0] for page in pages for row in page] == expected_ids
+
+
+@pytest.mark.asyncio
+async def test_baseline_allocates_every_event_once_across_pages(test_tenant, monkeypatch):
+    monkeypatch.setenv("ATTRIBUTION_BASELINE_BATCH_EVENTS", "2")
+    expected_ids = await _seed_events(test_tenant)
+
+    meta = await _compute_allocations_deterministic_baseline(test_tenant, _WINDOW_START, _WINDOW_END)
+
+    assert meta == {"event_count": 6, "allocation_count": 18, "mode": "full"}
+    async with engine.begin() as conn:
+        await set_tenant_guc(conn, test_tenant, local=True)
+        rows = await conn.execute(
+            text(
+                """
+                SELECT event_id, count(*) FROM attribution_allocations
+                WHERE tenant_id = :tenant_id AND model_version = '1.0.0'
+                GROUP BY event_id
+                """
+            ),
+            {"tenant_id": test_tenant},
+        )
+        per_event = dict(rows.fetchall())
+    assert per_event == {event_id: 3 for event_id in expected_ids}
@@ -0,0 +1,138 @@
+"""
+Range recompute fan-out (recompute_range -> shard lanes -> chord callback).
+
+A range is split into aligned day/hour shards, each recomputed as its own
+recompute_window job identity, and the chord callback records the range
+outcome in attribution_recompute_ranges.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+
+from app.core.db import engine
+from app.db.session import set_tenant_guc
+from app.services.attribution import (
+    create_recompute_range_run,
+    finalize_recompute_range_run,
+    recompute_range_shards,
+    schedule_recompute_range,
+)
+from app.tasks.attribution import _mark_job_status, _upsert_job_identity
+from tests.conftest import _seed_conversion_event
+
+_RANGE_START = datetime(2025, 9, 1, tzinfo=timezone.utc)
+
+
+def test_shards_align_to_unit_boundaries_and_clip_to_range():
+    start = datetime(2025, 9, 1, 22, 30, tzinfo=timezone.utc)
+    end = datetime(2025, 9, 3, 1, 15, tzinfo=timezone.utc)
+
+    days = recompute_range_shards(start, end, "day")
+    assert days == [
+        (start, datetime(2025, 9, 2, tzinfo=timezone.utc)),
+        (datetime(2025, 9, 2, tzinfo=timezone.utc), datetime(2025, 9, 3, tzinfo=timezone.utc)),
+        (datetime(2025, 9, 3, tzinfo=timezone.utc), end),
+    ]
+    hours = recompute_range_shards(start, end, "hour")
+    assert len(hours) == 28
+    assert hours[0] == (start, datetime(2025, 9, 1, 23, tzinfo=timezone.utc))
+    assert all(prev[1] == cur[0] for prev, cur in zip(hours, hours[1:]))
+
+    with pytest.raises(ValueError, match="shard_unit"):
+        recompute_range_shards(start, end, "week")
+    with pytest.raises(ValueError, match="must be <"):
+        recompute_range_shards(end, start, "day")
+
+
+@pytest.mark.asyncio
+async def test_range_fan_out_runs_every_shard_and_records_completion(test_tenant, eager_celery):
+    # One conversion per day shard.
+    for day in range(3):
+        await _seed_conversion_event(
+            test_tenant, occurred_at=_RANGE_START + timedelta(days=day, hours=6), revenue_cents=3000
+        )
+
+    dispatched = schedule_recompute_range(
+        test_tenant,
+        _RANGE_START,
+        _RANGE_START + timedelta(days=3),
+        shard_unit="day",
+        max_concurrency=2,
+    ).get()
+
+    assert (dispatched["shard_count"], dispatched["lane_count"]) == (3, 2)
+    async with engine.begin() as conn:
+        await set_tenant_guc(conn, test_tenant, local=True)
+        jobs = (
+            await conn.execute(
+                text(
+                    """
+                    SELECT window_start, status, run_count
+                    FROM attribution_recompute_jobs
+                    WHERE tenant_id = :tenant_id
+                    ORDER BY window_start
+                    """
+                ),
+                {"tenant_id": test_tenant},
+            )
+        ).fetchall()
+        run = (
+            await conn.execute(
+                text(
+                    """
+                    SELECT status, shard_count, shards_succeeded, shards_failed, finished_at
+                    FROM attribution_recompute_ranges
+                    WHERE id = :range_id
+                    """
+                ),
+                {"range_id": dispatched["range_id"]},
+            )
+        ).one()
+        allocations = (
+            await conn.execute(
+                text("SELECT count(*) FROM attribution_allocations WHERE tenant_id = :tenant_id"),
+                {"tenant_id": test_tenant},
+            )
+        ).scalar_one()
+
+    assert [(row[0], row[1], row[2]) for row in jobs] == [
+        (_RANGE_START + timedelta(days=day), "succeeded", 1) for day in range(3)
+    ]
+    assert (run.status, run.shard_count, run.shards_succeeded, run.shards_failed) == ("succeeded", 3, 3, 0)
+    assert run.finished_at is not None
+    assert allocations == 9
+
+
+@pytest.mark.asyncio
+async def test_finalize_marks_range_failed_when_a_shard_did_not_succeed(test_tenant):
+    range_end = _RANGE_START + timedelta(days=2)
+    range_id = await create_recompute_range_run(
+        tenant_id=test_tenant,
+        range_start=_RANGE_START,
+        range_end=range_end,
+        shard_unit="day",
+        model_version="1.0.0",
+        shard_count=2,
+        max_concurrency=2,
+        correlation_id=None,
+    )
+    for day, status in ((0, "succeeded"), (1, "failed")):
+        job_id, _, _ = await _upsert_job_identity(
+            tenant_id=test_tenant,
+            window_start=_RANGE_START + timedelta(days=day),
+            window_end=_RANGE_START + timedelta(days=day + 1),
+            model_version="1.0.0",
+            correlation_id=str(uuid4()),
+        )
+        await _mark_job_status(job_id=job_id, tenant_id=test_tenant, status=status)
+
+    result = await finalize_recompute_range_run(tenant_id=test_tenant, range_id=range_id)
+
+    assert result == {"status": "failed", "shard_count": 2, "shards_succeeded": 1, "shards_failed": 1}
+    # The chord callback and its error callback may both run; only the first records.
+    assert await finalize_recompute_range_run(tenant_id=test_tenant, range_id=range_id) is None
@@ -0,0 +1,120 @@
+"""
+Single-transaction recompute_window (ATTRIBUTION_RECOMPUTE_SINGLE_TRANSACTION=1).
+
+Identity claim, allocation compute and status mark share one transaction: the
+outcome must match the per-phase mode with fewer transactions and round trips,
+and a failure must roll back every phase before the job is marked failed.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from functools import partial
+
+import pytest
+from sqlalchemy import text
+
+from app.core.db import engine
+from app.db.session import set_tenant_guc
+from app.tasks import attribution as attribution_tasks
+from tests.conftest import _recompute_window, _seed_conversion_event
+
+_WINDOW_START = datetime(2025, 12, 1, tzinfo=timezone.utc)
+_WINDOW_END = datetime(2025, 12, 2, tzinfo=timezone.utc)
+
+
+async def _seed_events(tenant_id, count: int) -> None:
+    for index in range(count):
+        await _seed_conversion_event(
+            tenant_id, occurred_at=_WINDOW_START + timedelta(minutes=index), revenue_cents=1000 + index
+        )
+
+
+_recompute = partial(_recompute_window, window_start=_WINDOW_START, window_end=_WINDOW_END)
+
+
+async def _state(tenant_id) -> tuple:
+    async with engine.begin() as conn:
+        await set_tenant_guc(conn, tenant_id, local=True)
+        job = (
+            await conn.execute(
+                text(
+                    """
+                    SELECT status, run_count, fingerprint_event_count
+                    FROM attribution_recompute_jobs
+                    WHERE tenant_id = :tenant_id AND window_start = :start
+                    """
+                ),
+                {"tenant_id": tenant_id, "start": _WINDOW_START},
+            )
+        ).one_or_none()
+        allocations = (
+            await conn.execute(
+                text(
+                    """
+                    SELECT event_id, channel_code, allocated_revenue_cents
+                    FROM attribution_allocations
+                    WHERE tenant_id = :tenant_id
+                    ORDER BY event_id, channel_code
+                    """
+                ),
+                {"tenant_id": tenant_id},
+            )
+        ).fetchall()
+    return (None if job is None else tuple(job)), [tuple(row) for row in allocations]
+
+
+@pytest.mark.asyncio
+async def test_single_transaction_matches_per_phase_with_fewer_round_trips(
+    test_tenant_pair, eager_celery, monkeypatch
+):
+    per_phase_tenant, single_tenant = test_tenant_pair
+    for tenant_id in test_tenant_pair:
+        await _seed_events(tenant_id, 4)
+
+    per_phase = _recompute(per_phase_tenant)
+    monkeypatch.setenv("ATTRIBUTION_RECOMPUTE_SINGLE_TRANSACTION", "1")
+    single = _recompute(single_tenant)
+    skipped = _recompute(single_tenant)
+
+    assert (per_phase["transaction_mode"], per_phase["transactions"]) == ("per_phase", 4)
+    assert (single["transaction_mode"], single["transactions"]) == ("single", 1)
+    assert single["round_trips"] < per_phase["round_trips"]
+    assert set(single["phase_ms"]) == set(per_phase["phase_ms"]) == {"fingerprint", "identity", "compute", "status"}
+    assert (skipped["status"], skipped["transactions"], set(skipped["phase_ms"])) == (
+        "skipped_unchanged",
+        1,
+        {"fingerprint"},
+    )
+
+    per_phase_job, per_phase_allocations = await _state(per_phase_tenant)
+    single_job, single_allocations = await _state(single_tenant)
+    assert per_phase_job == ("succeeded", 1, 4)
+    assert single_job == ("skipped_unchanged", 1, 4)
+    assert len(single_allocations) == len(per_phase_allocations) == 12
+    assert sorted(row[1:] for row in single_allocations) == sorted(row[1:] for row in per_phase_allocations)
+
+
+@pytest.mark.asyncio
+async def test_single_transaction_failure_rolls_back_every_phase(test_tenant, eager_celery, monkeypatch):
+    await _seed_events(test_tenant, 3)
+    compute = attribution_tasks._compute_allocations_deterministic_baseline
+
+    async def _compute_then_fail(**kwargs):
+        await compute(**kwargs)
+        raise RuntimeError("allocation compute failed after writing")
+
+    monkeypatch.setenv("ATTRIBUTION_RECOMPUTE_SINGLE_TRANSACTION", "1")
+    monkeypatch.setattr(attribution_tasks, "_compute_allocations_deterministic_baseline", _compute_then_fail)
+    with pytest.raises(RuntimeError, match="after writing"):
+        _recompute(test_tenant)
+
+    job, allocations = await _state(test_tenant)
+    # The identity claim rolled back with the writes; the failure is recorded
+    # on a fresh claim without a fingerprint, so the next run recomputes.
+    assert job == ("failed", 1, None)
+    assert allocations == []
+
+    monkeypatch.setattr(attribution_tasks, "_compute_allocations_deterministic_baseline", compute)
+    rerun = _recompute(test_tenant)
+    assert (rerun["status"], rerun["run_count"], rerun["event_count"]) == ("succeeded", 2, 3)
@@ -0,0 +1,147 @@
+"""
+Watermark-based incremental window recompute.
+
+A rerun of the same (tenant, window, model_version) only allocates events
+ingested after the job row's (created_at, id) watermark; allocations must be
+identical to a full rebuild, and a rerun with nothing new reports "unchanged".
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+
+from app.core.db import engine
+from app.db.session import set_tenant_guc
+from app.tasks.attribution import _compute_allocations_deterministic_baseline, _upsert_job_identity
+
+_WINDOW_START = datetime(2025, 7, 1, tzinfo=timezone.utc)
+_WINDOW_END = datetime(2025, 7, 2, tzinfo=timezone.utc)
+
+
+async def _seed_events(tenant_id, count: int, *, offset: int = 0, occurred_at=None) -> None:
+    async with engine.begin() as conn:
+        await set_tenant_guc(conn, tenant_id, local=True)
+        for index in range(offset, offset + count):
+            # RAW_SQL_ALLOWLIST: seed window events for incremental recompute watermark
+            await conn.execute(
+                text(
+                    """
+                    INSERT INTO attribution_events (
+                        id, tenant_id, session_id, occurred_at, event_timestamp,
+                        idempotency_key, event_type, channel, revenue_cents, raw_payload
+                    ) VALUES (
+                        :id, :tenant_id, :session_id, :occurred_at, :occurred_at,
+                        :idempotency_key, 'conversion', 'direct', :revenue_cents, '{}'::jsonb
+                    )
+                    """
+                ),
+                {
+                    "id": uuid4(),
+                    "tenant_id": tenant_id,
+                    "session_id": uuid4(),
+                    "occurred_at": occurred_at or _WINDOW_START + timedelta(minutes=index),
+                    "idempotency_key": f"watermark:{tenant_id}:{index}",
+                    "revenue_cents": 1000 + index,
+                },
+            )
+
+
+async def _allocations(tenant_id) -> list[tuple]:
+    async with engine.begin() as conn:
+        await set_tenant_guc(conn, tenant_id, local=True)
+        rows = await conn.execute(
+            text(
+                """
+                SELECT id, event_id, channel_code, allocated_revenue_cents
+                FROM attribution_allocations
+                WHERE tenant_id = :tenant_id AND model_version = '1.0.0'
+                ORDER BY id
+                """
+            ),
+            {"tenant_id": tenant_id},
+        )
+        return rows.fetchall()
+
+
+async def _watermark(tenant_id) -> tuple:
+    async with engine.begin() as conn:
+        await set_tenant_guc(conn, tenant_id, local=True)
+        row = await conn.execute(
+            text(
+                """
+                SELECT watermark_created_at, watermark_event_id
+                FROM attribution_recompute_jobs
+                WHERE tenant_id = :tenant_id AND window_start = :start AND window_end = :end
+                """
+            ),
+            {"tenant_id": tenant_id, "start": _WINDOW_START, "end": _WINDOW_END},
+        )
+        return tuple(row.one())
+
+
+async def _recompute(tenant_id, *, incremental: bool = True) -> dict:
+    return await _compute_allocations_deterministic_baseline(
+        tenant_id, _WINDOW_START, _WINDOW_END, incremental=incremental
+    )
+
+
+@pytest.fixture
+async def window_job(test_tenant, monkeypatch):
+    monkeypatch.setenv("ATTRIBUTION_RECOMPUTE_WATERMARK_LAG_SECONDS", "0")
+    monkeypatch.setenv("ATTRIBUTION_BASELINE_BATCH_EVENTS", "2")
+    await _upsert_job_identity(
+        tenant_id=test_tenant,
+        window_start=_WINDOW_START,
+        window_end=_WINDOW_END,
+        model_version="1.0.0",
+        correlation_id=str(uuid4()),
+    )
+    return test_tenant
+
+
+@pytest.mark.asyncio
+async def test_rerun_allocates_only_events_after_watermark(window_job):
+    await _seed_events(window_job, 5)
+    assert await _recompute(window_job) == {"event_count": 5, "allocation_count": 15, "mode": "full"}
+    first_watermark = await _watermark(window_job)
+    assert first_watermark[0] is not None
+
+    # Late arrival: occurred early in the window, ingested after the first run.
+    await _seed_events(window_job, 3, offset=5, occurred_at=_WINDOW_START)
+    assert await _recompute(window_job) == {"event_count": 3, "allocation_count": 9, "mode": "incremental"}
+    assert await _watermark(window_job) > first_watermark
+
+    incremental_allocations = await _allocations(window_job)
+    assert len(incremental_allocations) == 24
+
+    assert await _recompute(window_job, incremental=False) == {
+        "event_count": 8,
+        "allocation_count": 24,
+        "mode": "full",
+    }
+    assert await _allocations(window_job) == incremental_allocations
+
+
+@pytest.mark.asyncio
+async def test_rerun_without_new_events_is_unchanged(window_job):
+    await _seed_events(window_job, 4)
+    await _recompute(window_job)
+    watermark = await _watermark(window_job)
+
+    assert await _recompute(window_job) == {"event_count": 0, "allocation_count": 0, "mode": "unchanged"}
+    assert await _watermark(window_job) == watermark
+
+
+@pytest.mark.asyncio
+async def test_watermark_holds_back_unsettled_events(window_job, monkeypatch):
+    monkeypatch.setenv("ATTRIBUTION_RECOMPUTE_WATERMARK_LAG_SECONDS", "3600")
+    await _seed_events(window_job, 3)
+
+    assert (await _recompute(window_job))["event_count"] == 3
+    assert await _watermark(window_job) == (None, None)
+    # Nothing settled yet, so the rerun still reads the whole window.
+    assert await _recompute(window_job) == {"event_count": 3, "allocation_count": 9, "mode": "full"}
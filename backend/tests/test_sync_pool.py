@@ -0,0 +1,118 @@
+"""
+Per-process psycopg2 connection pool for sync worker paths.
+
+Borrowed connections are reused across calls, reset on return (no leaked
+transactions or session GUCs), replaced when dead, bounded per process, and
+rebuilt after fork; the sync matview executor refreshes on pooled
+connections.
+"""
+
+from __future__ import annotations
+
+import psycopg2
+import pytest
+
+from app.db import sync_pool
+from app.matviews import executor
+
+
+@pytest.fixture
+def dsn() -> str:
+    return executor._build_sync_dsn()
+
+
+@pytest.fixture
+def fresh_pools(monkeypatch):
+    monkeypatch.setattr(sync_pool, "_POOLS", {})
+
+
+@pytest.fixture
+def connect_calls(monkeypatch) -> list[str]:
+    calls: list[str] = []
+    real_connect = psycopg2.connect
+
+    def counting_connect(dsn, *args, **kwargs):
+        calls.append(dsn)
+        return real_connect(dsn, *args, **kwargs)
+
+    monkeypatch.setattr(sync_pool.psycopg2, "connect", counting_connect)
+    return calls
+
+
+def _backend_pid(conn) -> int:
+    cur = conn.cursor()
+    cur.execute("SELECT pg_backend_pid()")
+    return cur.fetchone()[0]
+
+
+def test_connections_are_reused_and_reset_on_return(dsn, fresh_pools, connect_calls):
+    with sync_pool.sync_connection(dsn) as conn:
+        first_pid = _backend_pid(conn)
+        cur = conn.cursor()
+        cur.execute("SELECT set_config('app.current_tenant_id', %s, false)", ("leaked-session-guc",))
+        conn.commit()
+        conn.autocommit = True
+
+    with sync_pool.sync_connection(dsn) as conn:
+        assert _backend_pid(conn) == first_pid
+        assert conn.autocommit is False
+        cur = conn.cursor()
+        cur.execute("SELECT current_setting('app.current_tenant_id', true)")
+        assert cur.fetchone()[0] == ""
+        with pytest.raises(psycopg2.errors.DivisionByZero):
+            cur.execute("SELECT 1 / 0")
+
+    with sync_pool.sync_connection(dsn) as conn:
+        assert conn.info.transaction_status == psycopg2.extensions.TRANSACTION_STATUS_IDLE
+        assert _backend_pid(conn) == first_pid
+
+    assert len(connect_calls) == 1
+
+
+def test_dead_pooled_connection_is_replaced(dsn, fresh_pools, connect_calls):
+    with sync_pool.sync_connection(dsn) as conn:
+        dead_pid = _backend_pid(conn)
+    with psycopg2.connect(dsn) as killer:
+        killer.cursor().execute("SELECT pg_terminate_backend(%s)", (dead_pid,))
+    killer.close()
+
+    with sync_pool.sync_connection(dsn) as conn:
+        assert _backend_pid(conn) != dead_pid
+
+    # Pooled connection, the killer connection, and the replacement.
+    assert len(connect_calls) == 3
+
+
+def test_pool_is_bounded(dsn):
+    pool = sync_pool.SyncConnectionPool(dsn, max_size=1, timeout_seconds=0.1)
+
+    with pool.connection():
+        with pytest.raises(sync_pool.SyncPoolTimeout):
+            with pool.connection():
+                pass
+
+    with pool.connection() as conn:
+        assert conn.closed == 0
+    pool.close()
+    assert pool.idle_count() == 0
+
+
+def test_forked_process_builds_its_own_pool(dsn, fresh_pools, monkeypatch):
+    parent_pool = sync_pool.get_sync_pool(dsn)
+    with parent_pool.connection():
+        pass
+
+    monkeypatch.setattr(sync_pool, "_POOLS_PID", -1)
+
+    assert sync_pool.get_sync_pool(dsn) is not parent_pool
+    # Inherited connections are dropped, not closed: they belong to the parent.
+    assert parent_pool.idle_count() == 1
+    parent_pool.close()
+
+
+def test_sync_refreshes_share_pooled_connections(fresh_pools, connect_calls):
+    for _ in range(3):
+        result = executor.refresh_single("mv_realtime_revenue", None, "sync-pool-test")
+        assert result.outcome == executor.RefreshOutcome.SUCCESS, result.error_message
+
+    assert len(connect_calls) == 1
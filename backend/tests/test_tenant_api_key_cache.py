@@ -0,0 +1,192 @@
+"""
+Tenant API key resolution cache tests (app.security.tenant_key_runtime).
+
+A warm key must resolve with zero DB statements, a key/secret rotation must
+evict the entry over LISTEN/NOTIFY, and a miss that raced an invalidation must
+not publish what it read. Decrypted secrets are only held by the tenant
+webhook secret cache; the key cache keeps the tenant id and version token.
+"""
+
+import asyncio
+import dataclasses
+import hashlib
+import time
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event, text
+
+import app.core.tenant_context as tenant_context
+from app.core.tenant_context import get_tenant_with_webhook_secrets
+from app.db.session import engine
+from app.security.auth import AuthError
+from app.security.tenant_key_runtime import CachedTenantKeyResolution, TenantApiKeyRuntimeCache
+from app.services import tenant_webhook_secrets
+from tests.helpers.webhook_secret_seed import (
+    webhook_secret_insert_columns,
+    webhook_secret_insert_params,
+    webhook_secret_insert_values_sql,
+)
+
+
+def _hash(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+
+class _StatementCounter:
+    def __init__(self):
+        self.statements = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements += 1
+
+
+async def _wait_until(predicate, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached before timeout")
+        await asyncio.sleep(0.05)
+
+
+@pytest.fixture
+def key_cache(monkeypatch):
+    cache = TenantApiKeyRuntimeCache(runtime_name="test")
+    monkeypatch.setattr(tenant_context, "get_tenant_api_key_runtime_cache", lambda: cache)
+    cache.ensure_started()
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+async def keyed_tenant():
+    tenant_id = uuid4()
+    api_key = f"sk_test_{uuid4().hex}"
+    async with engine.begin() as conn:
+        # RAW_SQL_ALLOWLIST: tenant fixture with a known API key hash
+        await conn.execute(
+            text(
+                "INSERT INTO tenants (id, name, api_key_hash, notification_email) "
+                "VALUES (:id, :name, :api_key_hash, :email)"
+            ),
+            {
+                "id": str(tenant_id),
+                "name": f"Key Cache Tenant {str(tenant_id)[:8]}",
+                "api_key_hash": _hash(api_key),
+                "email": f"keycache_{str(tenant_id)[:8]}@test.local",
+            },
+        )
+    return tenant_id, api_key
+
+
+@pytest.fixture
+async def secret_tenant():
+    tenant_id = uuid4()
+    api_key = f"sk_test_{uuid4().hex}"
+    async with engine.begin() as conn:
+        # RAW_SQL_ALLOWLIST: tenant fixture with a known API key hash and encrypted webhook secrets
+        await conn.execute(
+            text(
+                "INSERT INTO tenants (id, name, api_key_hash, notification_email, "
+                f"{webhook_secret_insert_columns()}) "
+                f"VALUES (:id, :name, :api_key_hash, :email, {webhook_secret_insert_values_sql()})"
+            ),
+            {
+                "id": str(tenant_id),
+                "name": f"Key Cache Secret Tenant {str(tenant_id)[:8]}",
+                "api_key_hash": _hash(api_key),
+                "email": f"keycache_{str(tenant_id)[:8]}@test.local",
+                **webhook_secret_insert_params(
+                    shopify_secret="shopify_s",
+                    stripe_secret="stripe_s",
+                    paypal_secret="paypal_s",
+                    woocommerce_secret="woo_s",
+                ),
+            },
+        )
+    return tenant_id, api_key
+
+
+@pytest.mark.asyncio
+async def test_warm_key_resolves_without_db_round_trip(key_cache, keyed_tenant):
+    tenant_id, api_key = keyed_tenant
+    await _wait_until(lambda: key_cache.runtime_state()["listening"])
+
+    first = await get_tenant_with_webhook_secrets(api_key)
+    counter = _StatementCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+    try:
+        second = await get_tenant_with_webhook_secrets(api_key)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", counter)
+
+    assert first["tenant_id"] == tenant_id
+    assert second == first
+    assert counter.statements == 0
+
+
+@pytest.mark.asyncio
+async def test_key_rotation_evicts_via_notify(key_cache, keyed_tenant):
+    tenant_id, api_key = keyed_tenant
+    await _wait_until(lambda: key_cache.runtime_state()["listening"])
+    await get_tenant_with_webhook_secrets(api_key)
+    assert key_cache.get(_hash(api_key)) is not None
+
+    rotated_key = f"sk_test_{uuid4().hex}"
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("UPDATE tenants SET api_key_hash = :h WHERE id = :id"),
+            {"h": _hash(rotated_key), "id": str(tenant_id)},
+        )
+
+    await _wait_until(lambda: key_cache.get(_hash(api_key)) is None)
+    with pytest.raises(AuthError) as excinfo:
+        await get_tenant_with_webhook_secrets(api_key)
+    assert excinfo.value.status_code == 401
+    assert (await get_tenant_with_webhook_secrets(rotated_key))["tenant_id"] == tenant_id
+
+
+@pytest.mark.asyncio
+async def test_secrets_are_served_from_the_webhook_secret_cache_only(key_cache, secret_tenant):
+    tenant_id, api_key = secret_tenant
+    await _wait_until(lambda: key_cache.runtime_state()["listening"])
+    assert [field.name for field in dataclasses.fields(CachedTenantKeyResolution)] == ["tenant_id", "version_token"]
+
+    first = await get_tenant_with_webhook_secrets(api_key)
+    assert (first["shopify_webhook_secret"], first["woocommerce_webhook_secret"]) == ("shopify_s", "woo_s")
+
+    async def _statements_for_lookup() -> int:
+        counter = _StatementCounter()
+        event.listen(engine.sync_engine, "before_cursor_execute", counter)
+        try:
+            assert await get_tenant_with_webhook_secrets(api_key) == first
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", counter)
+        return counter.statements
+
+    assert await _statements_for_lookup() == 0
+    # Dropping the decrypted secrets (TTL, LRU or rotation policy) turns a key
+    # cache hit into a DB resolution instead of serving a second copy.
+    tenant_webhook_secrets._CACHE.evict_tenant(tenant_id)
+    assert key_cache.get(_hash(api_key)) is not None
+    assert await _statements_for_lookup() > 0
+    assert await _statements_for_lookup() == 0
+
+
+def test_cache_only_serves_and_publishes_while_listening_and_current():
+    cache = TenantApiKeyRuntimeCache(runtime_name="unit")
+    resolution = CachedTenantKeyResolution(tenant_id=uuid4(), version_token="v1")
+
+    # Listener never started: nothing is cached, nothing is served.
+    assert cache.put("h1", resolution, generation=cache.generation()) is False
+    assert cache.get("h1") is None
+
+    cache._listening = True
+    stale_generation = cache.generation()
+    cache.evict_tenant(resolution.tenant_id)
+    assert cache.put("h1", resolution, generation=stale_generation) is False
+    assert cache.put("h1", resolution, generation=cache.generation()) is True
+    assert cache.get("h1") == resolution
+
+    cache._apply_notification('{"tenant_id": "%s"}' % resolution.tenant_id)
+    assert cache.get("h1") is None
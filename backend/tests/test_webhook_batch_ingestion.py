@@ -0,0 +1,208 @@
+"""
+Batched webhook ingestion tests.
+
+Covers EventIngestionService.ingest_many (set-based idempotency, insert, and
+DLQ routing) and the /api/webhooks/{vendor}/batch routes.
+"""
+
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, func, select
+
+from app.api import webhooks
+from app.db.session import MAX_BIND_PARAMS_PER_STATEMENT, engine, get_session, multi_row_slices
+from app.ingestion.event_service import EventIngestionService
+from app.main import app
+from app.models import AttributionEvent, DeadEvent
+
+
+def _event(**overrides) -> dict:
+    data = {
+        "event_type": "purchase",
+        "event_timestamp": datetime.now(timezone.utc).isoformat(),
+        "revenue_amount": "12.34",
+        "session_id": str(uuid4()),
+        "vendor": "shopify",
+        "utm_source": "shopify",
+    }
+    data.update(overrides)
+    return data
+
+
+class _StatementCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+@pytest.mark.asyncio
+async def test_ingest_many_results_in_request_order(test_tenant):
+    tenant_id = test_tenant
+    existing_key = f"batch_existing_{uuid4()}"
+    new_key = f"batch_new_{uuid4()}"
+    invalid_key = f"batch_invalid_{uuid4()}"
+
+    service = EventIngestionService()
+    async with get_session(tenant_id=tenant_id) as session:
+        existing = await service.ingest_event(
+            session=session,
+            tenant_id=tenant_id,
+            event_data=_event(),
+            idempotency_key=existing_key,
+            source="shopify",
+        )
+        existing_id = str(existing.id)
+
+    items = [
+        (_event(), new_key),
+        (_event(), existing_key),
+        ({**_event(), "session_id": "not-a-uuid", "idempotency_key": invalid_key}, invalid_key),
+        (_event(), new_key),
+    ]
+    async with get_session(tenant_id=tenant_id) as session:
+        results = await service.ingest_many(
+            session=session, tenant_id=tenant_id, items=items, source="shopify"
+        )
+
+    assert [r["status"] for r in results] == ["success", "success", "error", "success"]
+    assert [r["idempotency_key"] for r in results] == [new_key, existing_key, invalid_key, new_key]
+    assert results[0]["duplicate"] is False
+    assert results[1] == {
+        "status": "success",
+        "event_id": existing_id,
+        "channel": existing.channel,
+        "idempotency_key": existing_key,
+        "duplicate": True,
+    }
+    assert results[2]["error_type"] == "validation_error"
+    assert results[3]["event_id"] == results[0]["event_id"]
+    assert results[3]["duplicate"] is True
+
+    async with get_session(tenant_id=tenant_id) as session:
+        count = await session.scalar(
+            select(func.count()).select_from(AttributionEvent).where(
+                AttributionEvent.tenant_id == tenant_id,
+                AttributionEvent.idempotency_key.in_([new_key, existing_key]),
+            )
+        )
+        dead = await session.get(DeadEvent, results[2]["dead_event_id"])
+    assert count == 2
+    assert dead is not None
+    assert dead.error_code == "ValidationError"
+    assert dead.raw_payload["idempotency_key"] == invalid_key
+
+    # Replaying the burst is fully idempotent and returns the same ids.
+    async with get_session(tenant_id=tenant_id) as session:
+        replay = await service.ingest_many(
+            session=session, tenant_id=tenant_id, items=items[:2], source="shopify"
+        )
+    assert [r["event_id"] for r in replay] == [results[0]["event_id"], existing_id]
+    assert all(r["duplicate"] for r in replay)
+
+
+@pytest.mark.asyncio
+async def test_ingest_many_statement_count_is_independent_of_batch_size(test_tenant):
+    tenant_id = test_tenant
+    service = EventIngestionService()
+
+    async def _statements_for(batch_size: int) -> int:
+        items = [(_event(), f"batch_rt_{uuid4()}") for _ in range(batch_size)]
+        items.append(({**_event(), "revenue_amount": "NaN-ish"}, f"batch_rt_bad_{uuid4()}"))
+        counter = _StatementCounter()
+        event.listen(engine.sync_engine, "before_cursor_execute", counter)
+        try:
+            async with get_session(tenant_id=tenant_id) as session:
+                results = await service.ingest_many(
+                    session=session, tenant_id=tenant_id, items=items, source="shopify"
+                )
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", counter)
+        assert [r["status"] for r in results] == ["success"] * batch_size + ["error"]
+        return counter.count
+
+    assert await _statements_for(5) == await _statements_for(200)
+
+
+def test_multi_row_slices_stop_at_the_bind_parameter_limit():
+    row = {f"column_{index}": index for index in range(19)}
+    per_statement = MAX_BIND_PARAMS_PER_STATEMENT // len(row)
+
+    assert [len(rows) for rows in multi_row_slices([row] * per_statement)] == [per_statement]
+    assert [len(rows) for rows in multi_row_slices([row] * (per_statement + 1))] == [per_statement, 1]
+    assert list(multi_row_slices([])) == []
+
+
+@pytest.mark.asyncio
+async def test_ingest_many_past_the_bind_parameter_limit(test_tenant):
+    tenant_id = test_tenant
+    service = EventIngestionService()
+    # One row past a single statement for both attribution_events (19 columns)
+    # and dead_events (14 columns).
+    valid = [(_event(), f"batch_limit_{uuid4()}") for _ in range(MAX_BIND_PARAMS_PER_STATEMENT // 19 + 1)]
+    invalid = [
+        ({**_event(), "session_id": "not-a-uuid"}, f"batch_limit_bad_{uuid4()}")
+        for _ in range(MAX_BIND_PARAMS_PER_STATEMENT // 14 + 1)
+    ]
+
+    async with get_session(tenant_id=tenant_id) as session:
+        results = await service.ingest_many(
+            session=session, tenant_id=tenant_id, items=valid + invalid, source="shopify"
+        )
+
+    assert [r["status"] for r in results] == ["success"] * len(valid) + ["error"] * len(invalid)
+    assert not any(r["duplicate"] for r in results[: len(valid)])
+    async with get_session(tenant_id=tenant_id) as session:
+        inserted = await session.scalar(
+            select(func.count()).select_from(AttributionEvent).where(
+                AttributionEvent.tenant_id == tenant_id,
+                AttributionEvent.idempotency_key.like("batch_limit_%"),
+            )
+        )
+        dead = await session.scalar(
+            select(func.count()).select_from(DeadEvent).where(DeadEvent.tenant_id == tenant_id)
+        )
+    assert inserted == len(valid)
+    assert dead == len(invalid)
+
+
+@pytest.mark.asyncio
+async def test_shopify_batch_route(test_tenant, monkeypatch):
+    tenant_id = test_tenant
+    scheduled: list[str] = []
+    monkeypatch.setattr(
+        webhooks,
+        "_schedule_downstream_tasks",
+        lambda *, tenant_id, event_timestamp, correlation_id: scheduled.append(event_timestamp),
+    )
+    app.dependency_overrides[webhooks.shopify_webhook_auth] = lambda: {"tenant_id": tenant_id}
+    order_id = int(uuid4().int % 1_000_000_000)
+    body = {
+        "events": [
+            {"id": order_id, "total_price": "10.00", "currency": "USD", "created_at": "2026-01-05T10:00:00Z"},
+            {"total_price": "5.00", "currency": "USD"},
+            {"id": order_id + 1, "total_price": "oops", "currency": "USD", "created_at": "2026-01-05T11:00:00Z"},
+            {"id": order_id, "total_price": "10.00", "currency": "USD", "created_at": "2026-01-05T10:00:00Z"},
+        ]
+    }
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            resp = await client.post("/api/webhooks/shopify/batch", json=body)
+            monkeypatch.setattr(webhooks.settings, "WEBHOOK_BATCH_MAX_EVENTS", 2)
+            too_large = await client.post("/api/webhooks/shopify/batch", json=body)
+    finally:
+        app.dependency_overrides.pop(webhooks.shopify_webhook_auth, None)
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["status"] == "partial"
+    assert [r["status"] for r in data["results"]] == ["success", "rejected", "dlq_routed", "success"]
+    assert data["results"][1]["error"] == "Missing order id"
+    assert data["results"][2]["dead_event_id"]
+    assert data["results"][3]["event_id"] == data["results"][0]["event_id"]
+    assert len(scheduled) == 1
+    assert too_large.status_code == 413
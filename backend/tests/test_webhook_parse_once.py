@@ -0,0 +1,164 @@
+"""
+Parse-once webhook body pipeline tests.
+
+PIIStrippingMiddleware parses and sanitizes the JSON body once and leaves the
+object on request.state.parsed_body; Pydantic-bodied webhook routes and the
+Stripe v2 route must consume it without parsing the body again.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import json
+import time
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+import starlette.requests
+from httpx import ASGITransport, AsyncClient
+
+import app.middleware.pii_stripping as pii_stripping_middleware
+from app.api import webhooks as webhooks_api
+from app.core.config import settings
+from app.main import app
+
+
+def _tenant_info() -> dict:
+    return {
+        "tenant_id": uuid4(),
+        "shopify_webhook_secret": "shopify_secret",
+        "stripe_webhook_secret": "stripe_secret",
+        "paypal_webhook_secret": "paypal_secret",
+        "woocommerce_webhook_secret": "woo_secret",
+    }
+
+
+def _stripe_signature(raw_body: bytes, secret: str) -> str:
+    timestamp = str(int(time.time()))
+    signed_payload = f"{timestamp}.{raw_body.decode('utf-8')}".encode("utf-8")
+    digest = hmac.new(secret.encode("utf-8"), signed_payload, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+
+def _shopify_signature(raw_body: bytes, secret: str) -> str:
+    return base64.b64encode(hmac.new(secret.encode("utf-8"), raw_body, hashlib.sha256).digest()).decode("utf-8")
+
+
+@pytest.fixture
+def parse_once_harness(monkeypatch: pytest.MonkeyPatch) -> dict:
+    captured: dict = {"events": [], "middleware_parses": 0}
+    tenant_info = _tenant_info()
+
+    async def _tenant_lookup(api_key: str):
+        return tenant_info
+
+    async def _capture_ingest(tenant_id, event_data: dict, idempotency_key: str, source: str) -> dict:
+        captured["events"].append(event_data)
+        return {"status": "success", "event_id": str(uuid4()), "channel": "direct"}
+
+    original_loads = pii_stripping_middleware._json_loads
+
+    def _counting_loads(body: bytes):
+        captured["middleware_parses"] += 1
+        return original_loads(body)
+
+    async def _no_second_parse(self):
+        raise AssertionError("webhook body parsed a second time")
+
+    def _no_route_json_loads(*args, **kwargs):
+        raise AssertionError("route re-parsed the stripped body")
+
+    monkeypatch.setattr(webhooks_api, "get_tenant_with_webhook_secrets", _tenant_lookup)
+    monkeypatch.setattr(webhooks_api, "_ingest_single_event", _capture_ingest)
+    monkeypatch.setattr(webhooks_api, "_schedule_downstream_tasks", lambda **kwargs: None)
+    monkeypatch.setattr(pii_stripping_middleware, "_json_loads", _counting_loads)
+    monkeypatch.setattr(starlette.requests.Request, "json", _no_second_parse)
+    monkeypatch.setattr(
+        webhooks_api,
+        "json",
+        SimpleNamespace(loads=_no_route_json_loads, dumps=json.dumps, JSONDecodeError=json.JSONDecodeError),
+    )
+    return captured
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["json", "orjson"])
+async def test_pydantic_route_validates_middleware_parsed_body(parse_once_harness, monkeypatch, backend):
+    monkeypatch.setattr(settings, "WEBHOOK_JSON_BACKEND", backend)
+    body = json.dumps(
+        {
+            "id": 4242,
+            "total_price": "12.34",
+            "currency": "EUR",
+            "created_at": "2026-01-01T00:00:00+00:00",
+            "email": "buyer@example.com",
+            "line_items": [{"sku": f"sku-{i}", "shipping_address": "x"} for i in range(200)],
+        }
+    ).encode("utf-8")
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post(
+            "/api/webhooks/shopify/order_create",
+            content=body,
+            headers={
+                "content-type": "application/json",
+                "X-Skeldir-Tenant-Key": "known-key",
+                "X-Shopify-Hmac-Sha256": _shopify_signature(body, "shopify_secret"),
+            },
+        )
+
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == "success"
+    assert parse_once_harness["middleware_parses"] == 1
+    [event_data] = parse_once_harness["events"]
+    assert event_data["revenue_amount"] == "12.34"
+    assert event_data["currency"] == "EUR"
+
+
+@pytest.mark.asyncio
+async def test_stripe_v2_route_consumes_state_payload(parse_once_harness):
+    body = json.dumps(
+        {
+            "id": f"evt_{uuid4().hex[:12]}",
+            "created": 1732631400,
+            "data": {
+                "object": {
+                    "id": f"pi_{uuid4().hex[:12]}",
+                    "amount": 5000,
+                    "currency": "usd",
+                    "metadata": {"utm_source": "google", "utm_medium": "cpc"},
+                }
+            },
+        }
+    ).encode("utf-8")
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post(
+            "/api/webhooks/stripe/payment_intent/succeeded",
+            content=body,
+            headers={
+                "content-type": "application/json",
+                "X-Skeldir-Tenant-Key": "known-key",
+                "Stripe-Signature": _stripe_signature(body, "stripe_secret"),
+            },
+        )
+
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == "success"
+    assert parse_once_harness["middleware_parses"] == 1
+    [event_data] = parse_once_harness["events"]
+    assert event_data["vendor_payload"] == json.loads(body)
+    assert event_data["utm_source"] == "google"
+
+
+def test_orjson_backend_falls_back_to_stdlib_for_inputs_it_rejects(monkeypatch):
+    monkeypatch.setattr(settings, "WEBHOOK_JSON_BACKEND", "orjson")
+    payload, used_orjson = pii_stripping_middleware._json_loads(b'{"n": 123456789012345678901234567890}')
+    assert payload == {"n": 123456789012345678901234567890}
+    assert used_orjson is False
+    payload, used_orjson = pii_stripping_middleware._json_loads(b'{"n": 1}')
+    assert payload == {"n": 1}
+    assert used_orjson is (pii_stripping_middleware.orjson is not None)
@@ -205,6 +205,9 @@ CREATE FUNCTION public.fn_block_worker_ingestion_mutation() RETURNS trigger
     AS $$
 BEGIN
     IF current_setting('app.execution_context', true) = 'worker' THEN
+        IF TG_OP = 'INSERT' AND current_setting('app.worker_ingestion_grant', true) = 'event_backfill' THEN
+            RETURN NEW;
+        END IF;
         RAISE EXCEPTION 'ingestion tables are read-only in worker context (table=%)', TG_TABLE_NAME;
     END IF;
 
@@ -459,6 +462,30 @@ CREATE FUNCTION public.fn_log_revenue_state_change() RETURNS trigger
         END;
         $$;
 
+CREATE FUNCTION public.fn_notify_channel_taxonomy_changed() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+        BEGIN
+            PERFORM pg_notify('skeldir_channel_taxonomy_changed', '');
+            RETURN NULL;
+        END;
+        $$;
+
+CREATE FUNCTION public.fn_notify_tenant_auth_changed() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+        BEGIN
+            PERFORM pg_notify(
+                'skeldir_tenant_auth_changed',
+                json_build_object(
+                    'tenant_id', OLD.id,
+                    'api_key_hash', OLD.api_key_hash
+                )::text
+            );
+            RETURN NULL;
+        END;
+        $$;
+
 CREATE FUNCTION public.fn_scan_pii_contamination() RETURNS integer
     LANGUAGE plpgsql
     AS $$
@@ -604,6 +631,18 @@ CREATE TABLE public.alembic_version (
     version_num character varying(32) NOT NULL
 );
 
+CREATE TABLE public.attribution_allocation_summary (
+    tenant_id uuid NOT NULL,
+    event_id uuid,
+    model_version text NOT NULL,
+    total_allocated_cents bigint NOT NULL,
+    event_revenue_cents integer,
+    is_balanced boolean,
+    drift_cents bigint
+);
+
+ALTER TABLE ONLY public.attribution_allocation_summary FORCE ROW LEVEL SECURITY;
+
 CREATE TABLE public.attribution_allocations (
     id uuid DEFAULT gen_random_uuid() NOT NULL,
     tenant_id uuid NOT NULL,
@@ -633,6 +672,47 @@ CREATE TABLE public.attribution_allocations (
 
 ALTER TABLE ONLY public.attribution_allocations FORCE ROW LEVEL SECURITY;
 
+CREATE TABLE public.attribution_bayesian_runs (
+    id uuid DEFAULT gen_random_uuid() NOT NULL,
+    tenant_id uuid NOT NULL,
+    window_start timestamp with time zone NOT NULL,
+    window_end timestamp with time zone NOT NULL,
+    model_version text NOT NULL,
+    status text DEFAULT 'running'::text NOT NULL,
+    channels text[] NOT NULL,
+    data_fingerprint text NOT NULL,
+    sessions bigint NOT NULL,
+    chain_states jsonb,
+    posterior jsonb,
+    converged boolean,
+    r_hat_max double precision,
+    ess_min double precision,
+    draws_per_chain integer DEFAULT 0 NOT NULL,
+    warm_start_run_id uuid,
+    attempts integer DEFAULT 1 NOT NULL,
+    last_correlation_id uuid,
+    created_at timestamp with time zone DEFAULT now() NOT NULL,
+    updated_at timestamp with time zone DEFAULT now() NOT NULL,
+    finished_at timestamp with time zone,
+    CONSTRAINT ck_attribution_bayesian_runs_bounds_valid CHECK ((window_end > window_start)),
+    CONSTRAINT ck_attribution_bayesian_runs_counts_positive CHECK (((sessions >= 0) AND (draws_per_chain >= 0) AND (attempts > 0))),
+    CONSTRAINT ck_attribution_bayesian_runs_status_valid CHECK ((status = ANY (ARRAY['running'::text, 'fallback'::text, 'succeeded'::text])))
+);
+
+ALTER TABLE ONLY public.attribution_bayesian_runs FORCE ROW LEVEL SECURITY;
+
+CREATE TABLE public.attribution_channel_daily_summary (
+    tenant_id uuid NOT NULL,
+    channel_code text NOT NULL,
+    allocation_date timestamp with time zone NOT NULL,
+    total_conversions bigint NOT NULL,
+    total_revenue_cents bigint NOT NULL,
+    avg_confidence_score numeric NOT NULL,
+    total_allocations bigint NOT NULL
+);
+
+ALTER TABLE ONLY public.attribution_channel_daily_summary FORCE ROW LEVEL SECURITY;
+
 CREATE TABLE public.attribution_events (
     id uuid DEFAULT gen_random_uuid() NOT NULL,
     tenant_id uuid NOT NULL,
@@ -662,6 +742,19 @@ CREATE TABLE public.attribution_events (
 
 ALTER TABLE ONLY public.attribution_events FORCE ROW LEVEL SECURITY;
 
+CREATE TABLE public.attribution_recompute_dirty_windows (
+    tenant_id uuid NOT NULL,
+    window_start timestamp with time zone NOT NULL,
+    window_end timestamp with time zone NOT NULL,
+    model_version text NOT NULL,
+    last_dispatched_at timestamp with time zone DEFAULT now() NOT NULL,
+    dirty_since timestamp with time zone,
+    last_correlation_id text,
+    CONSTRAINT ck_attribution_recompute_dirty_windows_bounds_valid CHECK ((window_end > window_start))
+);
+
+ALTER TABLE ONLY public.attribution_recompute_dirty_windows FORCE ROW LEVEL SECURITY;
+
 CREATE TABLE public.attribution_recompute_jobs (
     id uuid DEFAULT gen_random_uuid() NOT NULL,
     tenant_id uuid NOT NULL,
@@ -675,13 +768,43 @@ CREATE TABLE public.attribution_recompute_jobs (
     updated_at timestamp with time zone DEFAULT now() NOT NULL,
     started_at timestamp with time zone,
     finished_at timestamp with time zone,
+    watermark_created_at timestamp with time zone,
+    watermark_event_id uuid,
+    fingerprint_event_count bigint,
+    fingerprint_max_event_id uuid,
+    fingerprint_revenue_cents bigint,
+    CONSTRAINT ck_attribution_recompute_jobs_fingerprint_complete CHECK (((fingerprint_event_count IS NULL) = (fingerprint_revenue_cents IS NULL))),
     CONSTRAINT ck_attribution_recompute_jobs_run_count_positive CHECK ((run_count >= 0)),
-    CONSTRAINT ck_attribution_recompute_jobs_status_valid CHECK ((status = ANY (ARRAY['pending'::text, 'running'::text, 'succeeded'::text, 'failed'::text]))),
+    CONSTRAINT ck_attribution_recompute_jobs_status_valid CHECK ((status = ANY (ARRAY['pending'::text, 'running'::text, 'succeeded'::text, 'failed'::text, 'skipped_unchanged'::text]))),
+    CONSTRAINT ck_attribution_recompute_jobs_watermark_pair CHECK (((watermark_created_at IS NULL) = (watermark_event_id IS NULL))),
     CONSTRAINT ck_attribution_recompute_jobs_window_bounds_valid CHECK ((window_end > window_start))
 );
 
 ALTER TABLE ONLY public.attribution_recompute_jobs FORCE ROW LEVEL SECURITY;
 
+CREATE TABLE public.attribution_recompute_ranges (
+    id uuid DEFAULT gen_random_uuid() NOT NULL,
+    tenant_id uuid NOT NULL,
+    range_start timestamp with time zone NOT NULL,
+    range_end timestamp with time zone NOT NULL,
+    shard_unit text NOT NULL,
+    model_version text NOT NULL,
+    shard_count integer NOT NULL,
+    max_concurrency integer NOT NULL,
+    status text DEFAULT 'running'::text NOT NULL,
+    shards_succeeded integer,
+    shards_failed integer,
+    last_correlation_id uuid,
+    created_at timestamp with time zone DEFAULT now() NOT NULL,
+    finished_at timestamp with time zone,
+    CONSTRAINT ck_attribution_recompute_ranges_bounds_valid CHECK ((range_end > range_start)),
+    CONSTRAINT ck_attribution_recompute_ranges_counts_positive CHECK (((shard_count > 0) AND (max_concurrency > 0))),
+    CONSTRAINT ck_attribution_recompute_ranges_shard_unit_valid CHECK ((shard_unit = ANY (ARRAY['day'::text, 'hour'::text]))),
+    CONSTRAINT ck_attribution_recompute_ranges_status_valid CHECK ((status = ANY (ARRAY['running'::text, 'succeeded'::text, 'failed'::text])))
+);
+
+ALTER TABLE ONLY public.attribution_recompute_ranges FORCE ROW LEVEL SECURITY;
+
 CREATE TABLE public.auth_access_token_denylist (
     tenant_id uuid NOT NULL,
     user_id uuid NOT NULL,
@@ -855,6 +978,28 @@ CREATE TABLE public.dead_events_quarantine (
 
 ALTER TABLE ONLY public.dead_events_quarantine FORCE ROW LEVEL SECURITY;
 
+CREATE TABLE public.event_backfill_jobs (
+    id uuid DEFAULT gen_random_uuid() NOT NULL,
+    tenant_id uuid NOT NULL,
+    source text NOT NULL,
+    source_uri text NOT NULL,
+    source_format text NOT NULL,
+    status text DEFAULT 'pending'::text NOT NULL,
+    rows_processed bigint DEFAULT 0 NOT NULL,
+    rows_inserted bigint DEFAULT 0 NOT NULL,
+    rows_duplicate bigint DEFAULT 0 NOT NULL,
+    rows_rejected bigint DEFAULT 0 NOT NULL,
+    last_error text,
+    created_at timestamp with time zone DEFAULT now() NOT NULL,
+    updated_at timestamp with time zone DEFAULT now() NOT NULL,
+    completed_at timestamp with time zone,
+    CONSTRAINT ck_event_backfill_jobs_counters_non_negative CHECK (((rows_processed >= 0) AND (rows_inserted >= 0) AND (rows_duplicate >= 0) AND (rows_rejected >= 0))),
+    CONSTRAINT ck_event_backfill_jobs_source_format_valid CHECK ((source_format = ANY (ARRAY['ndjson'::text, 'csv'::text]))),
+    CONSTRAINT ck_event_backfill_jobs_status_valid CHECK ((status = ANY (ARRAY['pending'::text, 'running'::text, 'completed'::text, 'failed'::text])))
+);
+
+ALTER TABLE ONLY public.event_backfill_jobs FORCE ROW LEVEL SECURITY;
+
 CREATE TABLE public.explanation_cache (
     id uuid DEFAULT gen_random_uuid() NOT NULL,
     tenant_id uuid NOT NULL,
@@ -1159,6 +1304,18 @@ CREATE TABLE public.llm_validation_failures (
 
 ALTER TABLE ONLY public.llm_validation_failures FORCE ROW LEVEL SECURITY;
 
+CREATE TABLE public.matview_refresh_state (
+    tenant_id uuid NOT NULL,
+    view_name text NOT NULL,
+    dirty_since timestamp with time zone,
+    last_refreshed_at timestamp with time zone,
+    last_outcome text,
+    source_fingerprint text,
+    current_as_of timestamp with time zone
+);
+
+ALTER TABLE ONLY public.matview_refresh_state FORCE ROW LEVEL SECURITY;
+
 CREATE SEQUENCE public.message_id_sequence
     START WITH 1
     INCREMENT BY 1
@@ -1577,12 +1734,18 @@ ALTER TABLE ONLY public.alembic_version
 ALTER TABLE ONLY public.attribution_allocations
     ADD CONSTRAINT attribution_allocations_pkey PRIMARY KEY (id);
 
+ALTER TABLE ONLY public.attribution_bayesian_runs
+    ADD CONSTRAINT attribution_bayesian_runs_pkey PRIMARY KEY (id);
+
 ALTER TABLE ONLY public.attribution_events
     ADD CONSTRAINT attribution_events_pkey PRIMARY KEY (id);
 
 ALTER TABLE ONLY public.attribution_recompute_jobs
     ADD CONSTRAINT attribution_recompute_jobs_pkey PRIMARY KEY (id);
 
+ALTER TABLE ONLY public.attribution_recompute_ranges
+    ADD CONSTRAINT attribution_recompute_ranges_pkey PRIMARY KEY (id);
+
 ALTER TABLE ONLY public.auth_refresh_tokens
     ADD CONSTRAINT auth_refresh_tokens_pkey PRIMARY KEY (id);
 
@@ -1694,12 +1857,24 @@ ALTER TABLE ONLY public.oauth_handshake_sessions
 ALTER TABLE ONLY public.pii_audit_findings
     ADD CONSTRAINT pii_audit_findings_pkey PRIMARY KEY (id);
 
+ALTER TABLE ONLY public.attribution_channel_daily_summary
+    ADD CONSTRAINT pk_attribution_channel_daily_summary PRIMARY KEY (tenant_id, channel_code, allocation_date);
+
+ALTER TABLE ONLY public.attribution_recompute_dirty_windows
+    ADD CONSTRAINT pk_attribution_recompute_dirty_windows PRIMARY KEY (tenant_id, window_start, window_end, model_version);
+
 ALTER TABLE ONLY public.auth_access_token_denylist
     ADD CONSTRAINT pk_auth_access_token_denylist PRIMARY KEY (tenant_id, user_id, jti);
 
 ALTER TABLE ONLY public.auth_user_token_cutoffs
     ADD CONSTRAINT pk_auth_user_token_cutoffs PRIMARY KEY (tenant_id, user_id);
 
+ALTER TABLE ONLY public.event_backfill_jobs
+    ADD CONSTRAINT pk_event_backfill_jobs PRIMARY KEY (id);
+
+ALTER TABLE ONLY public.matview_refresh_state
+    ADD CONSTRAINT pk_matview_refresh_state PRIMARY KEY (tenant_id, view_name);
+
 ALTER TABLE ONLY public.platform_connections
     ADD CONSTRAINT platform_connections_pkey PRIMARY KEY (id);
 
@@ -1739,9 +1914,18 @@ ALTER TABLE ONLY public.tenant_memberships
 ALTER TABLE ONLY public.tenants
     ADD CONSTRAINT tenants_pkey PRIMARY KEY (id);
 
+ALTER TABLE ONLY public.attribution_allocation_summary
+    ADD CONSTRAINT uq_attribution_allocation_summary_key UNIQUE NULLS NOT DISTINCT (tenant_id, event_id, model_version);
+
+ALTER TABLE ONLY public.attribution_bayesian_runs
+    ADD CONSTRAINT uq_attribution_bayesian_runs_identity UNIQUE (tenant_id, window_start, window_end, model_version);
+
 ALTER TABLE ONLY public.attribution_events
     ADD CONSTRAINT uq_attribution_events_tenant_idempotency_key UNIQUE (tenant_id, idempotency_key);
 
+ALTER TABLE ONLY public.event_backfill_jobs
+    ADD CONSTRAINT uq_event_backfill_jobs_tenant_source_uri UNIQUE (tenant_id, source_uri);
+
 ALTER TABLE ONLY public.llm_api_calls
     ADD CONSTRAINT uq_llm_api_calls_tenant_request_endpoint UNIQUE (tenant_id, request_id, endpoint);
 
@@ -1775,24 +1959,32 @@ CREATE INDEX idx_attribution_allocations_channel ON public.attribution_allocatio
 
 CREATE INDEX idx_attribution_allocations_event_id ON public.attribution_allocations USING btree (event_id);
 
-CREATE INDEX idx_attribution_allocations_tenant_created_at ON public.attribution_allocations USING btree (tenant_id, created_at DESC);
-
 CREATE INDEX idx_attribution_allocations_tenant_event_model ON public.attribution_allocations USING btree (tenant_id, event_id, model_version);
 
 CREATE UNIQUE INDEX idx_attribution_allocations_tenant_event_model_channel ON public.attribution_allocations USING btree (tenant_id, event_id, model_version, channel_code) WHERE (model_version IS NOT NULL);
 
+CREATE INDEX idx_attribution_allocations_tenant_keyset ON public.attribution_allocations USING btree (tenant_id, created_at DESC, id DESC) INCLUDE (event_id, channel_code, model_version, allocated_revenue_cents, allocation_ratio, confidence_score);
+
 CREATE INDEX idx_attribution_allocations_tenant_model_version ON public.attribution_allocations USING btree (tenant_id, model_version);
 
+CREATE INDEX idx_attribution_bayesian_runs_warm_start ON public.attribution_bayesian_runs USING btree (tenant_id, model_version, window_end DESC) WHERE (status = 'succeeded'::text);
+
 CREATE INDEX idx_attribution_events_session_id ON public.attribution_events USING btree (session_id) WHERE (session_id IS NOT NULL);
 
+CREATE INDEX idx_attribution_events_tenant_created_at_id ON public.attribution_events USING btree (tenant_id, created_at, id);
+
 CREATE INDEX idx_attribution_events_tenant_occurred_at ON public.attribution_events USING btree (tenant_id, occurred_at DESC);
 
+CREATE INDEX idx_attribution_recompute_dirty_windows_pending ON public.attribution_recompute_dirty_windows USING btree (tenant_id, last_dispatched_at) WHERE (dirty_since IS NOT NULL);
+
 CREATE INDEX idx_attribution_recompute_jobs_tenant_created_at ON public.attribution_recompute_jobs USING btree (tenant_id, created_at DESC);
 
 CREATE INDEX idx_attribution_recompute_jobs_tenant_status ON public.attribution_recompute_jobs USING btree (tenant_id, status);
 
 CREATE UNIQUE INDEX idx_attribution_recompute_jobs_window_identity ON public.attribution_recompute_jobs USING btree (tenant_id, window_start, window_end, model_version);
 
+CREATE INDEX idx_attribution_recompute_ranges_tenant_created_at ON public.attribution_recompute_ranges USING btree (tenant_id, created_at DESC);
+
 CREATE INDEX idx_auth_access_token_denylist_expires_at ON public.auth_access_token_denylist USING btree (expires_at DESC);
 
 CREATE INDEX idx_auth_access_token_denylist_jti ON public.auth_access_token_denylist USING btree (jti);
@@ -1879,6 +2071,8 @@ CREATE INDEX idx_llm_monthly_tenant_user_month ON public.llm_monthly_costs USING
 
 CREATE INDEX idx_llm_semantic_cache_tenant_user_endpoint ON public.llm_semantic_cache USING btree (tenant_id, user_id, endpoint, updated_at DESC);
 
+CREATE INDEX idx_matview_refresh_state_dirty ON public.matview_refresh_state USING btree (tenant_id, last_refreshed_at) WHERE (dirty_since IS NOT NULL);
+
 CREATE UNIQUE INDEX idx_mv_allocation_summary_key ON public.mv_allocation_summary USING btree (tenant_id, event_id, model_version);
 
 CREATE UNIQUE INDEX idx_mv_channel_performance_unique ON public.mv_channel_performance USING btree (tenant_id, channel_code, allocation_date);
@@ -1993,6 +2187,8 @@ CREATE TRIGGER trg_block_worker_mutation_dead_events BEFORE INSERT OR DELETE OR
 
 CREATE TRIGGER trg_block_worker_mutation_events BEFORE INSERT OR DELETE OR UPDATE ON public.attribution_events FOR EACH ROW EXECUTE FUNCTION public.fn_block_worker_ingestion_mutation();
 
+CREATE TRIGGER trg_channel_taxonomy_notify_changed AFTER INSERT OR DELETE OR UPDATE OR TRUNCATE ON public.channel_taxonomy FOR EACH STATEMENT EXECUTE FUNCTION public.fn_notify_channel_taxonomy_changed();
+
 CREATE TRIGGER trg_channel_taxonomy_state_audit AFTER UPDATE OF state ON public.channel_taxonomy FOR EACH ROW WHEN (((old.state)::text IS DISTINCT FROM (new.state)::text)) EXECUTE FUNCTION public.fn_log_channel_state_change();
 
 CREATE TRIGGER trg_check_allocation_sum AFTER INSERT ON public.attribution_allocations REFERENCING NEW TABLE AS newrows FOR EACH STATEMENT EXECUTE FUNCTION public.check_allocation_sum_stmt_insert();
@@ -2017,15 +2213,35 @@ CREATE TRIGGER trg_pii_guardrail_revenue_ledger BEFORE INSERT ON public.revenue_
 
 CREATE TRIGGER trg_revenue_ledger_state_audit AFTER UPDATE OF state ON public.revenue_ledger FOR EACH ROW WHEN (((old.state)::text IS DISTINCT FROM (new.state)::text)) EXECUTE FUNCTION public.fn_log_revenue_state_change();
 
+CREATE TRIGGER trg_tenants_notify_auth_changed AFTER DELETE OR UPDATE OF api_key_hash, shopify_webhook_secret_ciphertext, shopify_webhook_secret_key_id, stripe_webhook_secret_ciphertext, stripe_webhook_secret_key_id, paypal_webhook_secret_ciphertext, paypal_webhook_secret_key_id, woocommerce_webhook_secret_ciphertext, woocommerce_webhook_secret_key_id ON public.tenants FOR EACH ROW EXECUTE FUNCTION public.fn_notify_tenant_auth_changed();
+
+ALTER TABLE ONLY public.attribution_allocation_summary
+    ADD CONSTRAINT attribution_allocation_summary_tenant_id_fkey FOREIGN KEY (tenant_id) REFERENCES public.tenants(id) ON DELETE CASCADE;
+
 ALTER TABLE ONLY public.attribution_allocations
     ADD CONSTRAINT attribution_allocations_tenant_id_fkey FOREIGN KEY (tenant_id) REFERENCES public.tenants(id) ON DELETE CASCADE;
 
+ALTER TABLE ONLY public.attribution_bayesian_runs
+    ADD CONSTRAINT attribution_bayesian_runs_tenant_id_fkey FOREIGN KEY (tenant_id) REFERENCES public.tenants(id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.attribution_bayesian_runs
+    ADD CONSTRAINT attribution_bayesian_runs_warm_start_run_id_fkey FOREIGN KEY (warm_start_run_id) REFERENCES public.attribution_bayesian_runs(id) ON DELETE SET NULL;
+
+ALTER TABLE ONLY public.attribution_channel_daily_summary
+    ADD CONSTRAINT attribution_channel_daily_summary_tenant_id_fkey FOREIGN KEY (tenant_id) REFERENCES public.tenants(id) ON DELETE CASCADE;
+
 ALTER TABLE ONLY public.attribution_events
     ADD CONSTRAINT attribution_events_tenant_id_fkey FOREIGN KEY (tenant_id) REFERENCES public.tenants(id) ON DELETE CASCADE;
 
+ALTER TABLE ONLY public.attribution_recompute_dirty_windows
+    ADD CONSTRAINT attribution_recompute_dirty_windows_tenant_id_fkey FOREIGN KEY (tenant_id) REFERENCES public.tenants(id) ON DELETE CASCADE;
+
 ALTER TABLE ONLY public.attribution_recompute_jobs
     ADD CONSTRAINT attribution_recompute_jobs_tenant_id_fkey FOREIGN KEY (tenant_id) REFERENCES public.tenants(id) ON DELETE CASCADE;
 
+ALTER TABLE ONLY public.attribution_recompute_ranges
+    ADD CONSTRAINT attribution_recompute_ranges_tenant_id_fkey FOREIGN KEY (tenant_id) REFERENCES public.tenants(id) ON DELETE CASCADE;
+
 ALTER TABLE ONLY public.auth_access_token_denylist
     ADD CONSTRAINT auth_access_token_denylist_tenant_id_fkey FOREIGN KEY (tenant_id) REFERENCES public.tenants(id) ON DELETE CASCADE;
 
@@ -2059,6 +2275,9 @@ ALTER TABLE ONLY public.dead_events_quarantine
 ALTER TABLE ONLY public.dead_events
     ADD CONSTRAINT dead_events_tenant_id_fkey FOREIGN KEY (tenant_id) REFERENCES public.tenants(id) ON DELETE CASCADE;
 
+ALTER TABLE ONLY public.event_backfill_jobs
+    ADD CONSTRAINT event_backfill_jobs_tenant_id_fkey FOREIGN KEY (tenant_id) REFERENCES public.tenants(id) ON DELETE CASCADE;
+
 ALTER TABLE ONLY public.explanation_cache
     ADD CONSTRAINT explanation_cache_tenant_id_fkey FOREIGN KEY (tenant_id) REFERENCES public.tenants(id) ON DELETE CASCADE;
 
@@ -2116,6 +2335,9 @@ ALTER TABLE ONLY public.llm_semantic_cache
 ALTER TABLE ONLY public.llm_validation_failures
     ADD CONSTRAINT llm_validation_failures_tenant_id_fkey FOREIGN KEY (tenant_id) REFERENCES public.tenants(id) ON DELETE CASCADE;
 
+ALTER TABLE ONLY public.matview_refresh_state
+    ADD CONSTRAINT matview_refresh_state_tenant_id_fkey FOREIGN KEY (tenant_id) REFERENCES public.tenants(id) ON DELETE CASCADE;
+
 ALTER TABLE ONLY public.oauth_handshake_sessions
     ADD CONSTRAINT oauth_handshake_sessions_tenant_id_fkey FOREIGN KEY (tenant_id) REFERENCES public.tenants(id) ON DELETE CASCADE;
 
@@ -2170,14 +2392,24 @@ ALTER TABLE ONLY public.tenant_memberships
 ALTER TABLE ONLY public.worker_side_effects
     ADD CONSTRAINT worker_side_effects_tenant_id_fkey FOREIGN KEY (tenant_id) REFERENCES public.tenants(id) ON DELETE CASCADE;
 
+ALTER TABLE public.attribution_allocation_summary ENABLE ROW LEVEL SECURITY;
+
 ALTER TABLE public.attribution_allocations ENABLE ROW LEVEL SECURITY;
 
+ALTER TABLE public.attribution_bayesian_runs ENABLE ROW LEVEL SECURITY;
+
+ALTER TABLE public.attribution_channel_daily_summary ENABLE ROW LEVEL SECURITY;
+
 ALTER TABLE public.attribution_events ENABLE ROW LEVEL SECURITY;
 
+ALTER TABLE public.attribution_recompute_dirty_windows ENABLE ROW LEVEL SECURITY;
+
 ALTER TABLE public.attribution_recompute_jobs ENABLE ROW LEVEL SECURITY;
 
 CREATE POLICY attribution_recompute_jobs_tenant_isolation ON public.attribution_recompute_jobs USING (((tenant_id)::text = current_setting('app.current_tenant_id'::text, true))) WITH CHECK (((tenant_id)::text = current_setting('app.current_tenant_id'::text, true)));
 
+ALTER TABLE public.attribution_recompute_ranges ENABLE ROW LEVEL SECURITY;
+
 ALTER TABLE public.auth_access_token_denylist ENABLE ROW LEVEL SECURITY;
 
 ALTER TABLE public.auth_refresh_tokens ENABLE ROW LEVEL SECURITY;
@@ -2192,6 +2424,8 @@ ALTER TABLE public.dead_events ENABLE ROW LEVEL SECURITY;
 
 ALTER TABLE public.dead_events_quarantine ENABLE ROW LEVEL SECURITY;
 
+ALTER TABLE public.event_backfill_jobs ENABLE ROW LEVEL SECURITY;
+
 ALTER TABLE public.explanation_cache ENABLE ROW LEVEL SECURITY;
 
 ALTER TABLE public.investigation_jobs ENABLE ROW LEVEL SECURITY;
@@ -2218,6 +2452,8 @@ ALTER TABLE public.llm_semantic_cache ENABLE ROW LEVEL SECURITY;
 
 ALTER TABLE public.llm_validation_failures ENABLE ROW LEVEL SECURITY;
 
+ALTER TABLE public.matview_refresh_state ENABLE ROW LEVEL SECURITY;
+
 ALTER TABLE public.oauth_handshake_sessions ENABLE ROW LEVEL SECURITY;
 
 CREATE POLICY ops_quarantine_select ON public.dead_events_quarantine FOR SELECT USING (((tenant_id IS NULL) AND (CURRENT_USER = 'app_ops'::name)));
@@ -2240,10 +2476,20 @@ ALTER TABLE public.revenue_ledger ENABLE ROW LEVEL SECURITY;
 
 ALTER TABLE public.revenue_state_transitions ENABLE ROW LEVEL SECURITY;
 
+CREATE POLICY tenant_isolation_policy ON public.attribution_allocation_summary USING ((tenant_id = (current_setting('app.current_tenant_id'::text, true))::uuid)) WITH CHECK ((tenant_id = (current_setting('app.current_tenant_id'::text, true))::uuid));
+
 CREATE POLICY tenant_isolation_policy ON public.attribution_allocations USING ((tenant_id = (current_setting('app.current_tenant_id'::text, true))::uuid)) WITH CHECK ((tenant_id = (current_setting('app.current_tenant_id'::text, true))::uuid));
 
+CREATE POLICY tenant_isolation_policy ON public.attribution_bayesian_runs USING ((tenant_id = (current_setting('app.current_tenant_id'::text, true))::uuid)) WITH CHECK ((tenant_id = (current_setting('app.current_tenant_id'::text, true))::uuid));
+
+CREATE POLICY tenant_isolation_policy ON public.attribution_channel_daily_summary USING ((tenant_id = (current_setting('app.current_tenant_id'::text, true))::uuid)) WITH CHECK ((tenant_id = (current_setting('app.current_tenant_id'::text, true))::uuid));
+
 CREATE POLICY tenant_isolation_policy ON public.attribution_events USING ((tenant_id = (current_setting('app.current_tenant_id'::text, true))::uuid)) WITH CHECK ((tenant_id = (current_setting('app.current_tenant_id'::text, true))::uuid));
 
+CREATE POLICY tenant_isolation_policy ON public.attribution_recompute_dirty_windows USING ((tenant_id = (current_setting('app.current_tenant_id'::text, true))::uuid)) WITH CHECK ((tenant_id = (current_setting('app.current_tenant_id'::text, true))::uuid));
+
+CREATE POLICY tenant_isolation_policy ON public.attribution_recompute_ranges USING ((tenant_id = (current_setting('app.current_tenant_id'::text, true))::uuid)) WITH CHECK ((tenant_id = (current_setting('app.current_tenant_id'::text, true))::uuid));
+
 CREATE POLICY tenant_isolation_policy ON public.auth_access_token_denylist USING ((tenant_id = (current_setting('app.current_tenant_id'::text, true))::uuid)) WITH CHECK ((tenant_id = (current_setting('app.current_tenant_id'::text, true))::uuid));
 
 CREATE POLICY tenant_isolation_policy ON public.auth_refresh_tokens USING ((tenant_id = (current_setting('app.current_tenant_id'::text, true))::uuid)) WITH CHECK ((tenant_id = (current_setting('app.current_tenant_id'::text, true))::uuid));
@@ -2256,6 +2502,8 @@ CREATE POLICY tenant_isolation_policy ON public.channel_assignment_corrections U
 
 CREATE POLICY tenant_isolation_policy ON public.dead_events USING ((tenant_id = (current_setting('app.current_tenant_id'::text, true))::uuid)) WITH CHECK ((tenant_id = (current_setting('app.current_tenant_id'::text, true))::uuid));
 
+CREATE POLICY tenant_isolation_policy ON public.event_backfill_jobs USING ((tenant_id = (current_setting('app.current_tenant_id'::text, true))::uuid)) WITH CHECK ((tenant_id = (current_setting('app.current_tenant_id'::text, true))::uuid));
+
 CREATE POLICY tenant_isolation_policy ON public.explanation_cache USING ((tenant_id = (current_setting('app.current_tenant_id'::text, true))::uuid)) WITH CHECK ((tenant_id = (current_setting('app.current_tenant_id'::text, true))::uuid));
 
 CREATE POLICY tenant_isolation_policy ON public.investigation_jobs TO app_user, app_rw, app_ro USING ((tenant_id = (current_setting('app.current_tenant_id'::text, true))::uuid)) WITH CHECK ((tenant_id = (current_setting('app.current_tenant_id'::text, true))::uuid));
@@ -2282,6 +2530,8 @@ CREATE POLICY tenant_isolation_policy ON public.llm_semantic_cache USING (((tena
 
 CREATE POLICY tenant_isolation_policy ON public.llm_validation_failures USING ((tenant_id = (current_setting('app.current_tenant_id'::text, true))::uuid)) WITH CHECK ((tenant_id = (current_setting('app.current_tenant_id'::text, true))::uuid));
 
+CREATE POLICY tenant_isolation_policy ON public.matview_refresh_state USING ((tenant_id = (current_setting('app.current_tenant_id'::text, true))::uuid)) WITH CHECK ((tenant_id = (current_setting('app.current_tenant_id'::text, true))::uuid));
+
 CREATE POLICY tenant_isolation_policy ON public.oauth_handshake_sessions USING ((tenant_id = (current_setting('app.current_tenant_id'::text, true))::uuid)) WITH CHECK ((tenant_id = (current_setting('app.current_tenant_id'::text, true))::uuid));
 
 CREATE POLICY tenant_isolation_policy ON public.platform_connections USING ((tenant_id = (current_setting('app.current_tenant_id'::text, true))::uuid)) WITH CHECK ((tenant_id = (current_setting('app.current_tenant_id'::text, true))::uuid));
@@ -0,0 +1,105 @@
+"""
+Middleware stack overhead benchmark: /health/live and a small webhook.
+
+Issues --requests in-process (ASGI, no network) requests against the full app
+middleware stack and reports latency percentiles for GET /health/live and for
+a signed Shopify order webhook (tenant lookup and ingestion stubbed out), so
+the numbers are dominated by per-request middleware cost rather than I/O.
+
+Usage (from repo root):
+    python scripts/perf/bench_middleware_overhead.py --requests 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "backend"))
+
+_SECRET = "bench_shopify_secret"
+
+
+async def _time_requests(send, requests: int) -> list[float]:
+    timings: list[float] = []
+    for i in range(requests + 50):
+        started = time.perf_counter()
+        response = await send()
+        elapsed = (time.perf_counter() - started) * 1000.0
+        assert response.status_code == 200, response.text
+        if i >= 50:  # warm-up
+            timings.append(elapsed)
+    return sorted(timings)
+
+
+async def _main(requests: int) -> None:
+    from httpx import ASGITransport, AsyncClient
+
+    from app.api import webhooks as webhooks_api
+    from app.main import app
+
+    tenant_info = {"tenant_id": uuid4(), "shopify_webhook_secret": _SECRET}
+
+    async def _tenant_lookup(api_key: str):
+        return tenant_info
+
+    async def _ingest(tenant_id, event_data, idempotency_key, source):
+        return {"status": "success", "event_id": str(uuid4()), "channel": "direct"}
+
+    webhooks_api.get_tenant_with_webhook_secrets = _tenant_lookup
+    webhooks_api._ingest_single_event = _ingest
+    webhooks_api._schedule_downstream_tasks = lambda **kwargs: None
+
+    body = json.dumps(
+        {
+            "id": 987654321,
+            "total_price": "12.34",
+            "currency": "USD",
+            "created_at": "2026-01-01T00:00:00+00:00",
+            "email": "buyer@example.com",
+        }
+    ).encode("utf-8")
+    headers = {
+        "content-type": "application/json",
+        "X-Skeldir-Tenant-Key": "bench",
+        "X-Shopify-Hmac-Sha256": base64.b64encode(
+            hmac.new(_SECRET.encode("utf-8"), body, hashlib.sha256).digest()
+        ).decode("utf-8"),
+    }
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        cases = (
+            ("health_live", lambda: client.get("/health/live")),
+            (
+                "webhook",
+                lambda: client.post("/api/webhooks/shopify/order_create", content=body, headers=headers),
+            ),
+        )
+        for label, send in cases:
+            timings = await _time_requests(send, requests)
+            print(
+                f"{label:<12} requests={requests:<6} "
+                f"p50={statistics.median(timings):7.3f}ms "
+                f"p99={timings[int(len(timings) * 0.99) - 1]:7.3f}ms"
+            )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=int(os.getenv("BENCH_REQUESTS", "2000")))
+    args = parser.parse_args()
+    asyncio.run(_main(args.requests))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,75 @@
+"""
+PII redaction engine benchmark: strip_pii_keys_recursive vs redact_pii_keys.
+
+Times both engines on a Shopify-style order with --line-items line items,
+once with no PII below the top level ("clean") and once with a
+shipping_address on every tenth line item ("sparse"), and checks that both
+engines serialize identically.
+
+Usage (from repo root):
+    python scripts/perf/bench_pii_redaction.py --line-items 2000 --rounds 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "backend"))
+
+
+def _order(line_items: int, every: int | None) -> dict:
+    items = []
+    for i in range(line_items):
+        item = {
+            "id": i,
+            "sku": f"SKU-{i:05d}",
+            "title": f"Product {i}",
+            "quantity": 1 + i % 3,
+            "price": "9.99",
+            "properties": [{"name": "gift", "value": "no"}],
+            "tax_lines": [{"rate": 0.2, "price": "1.99"}],
+        }
+        if every and i % every == 0:
+            item["shipping_address"] = {"city": "Springfield"}
+        items.append(item)
+    return {"id": 987654321, "total_price": "1234.56", "currency": "USD", "line_items": items}
+
+
+def _time(fn, payload, rounds: int) -> list[float]:
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn(payload)
+        timings.append((time.perf_counter() - started) * 1000.0)
+    return sorted(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--line-items", type=int, default=int(os.getenv("BENCH_LINE_ITEMS", "2000")))
+    parser.add_argument("--rounds", type=int, default=int(os.getenv("BENCH_ROUNDS", "200")))
+    args = parser.parse_args()
+
+    from app.middleware.pii_stripping import redact_pii_keys, strip_pii_keys_recursive
+
+    for label, every in (("clean", None), ("sparse", 10)):
+        payload = _order(args.line_items, every)
+        old, new = strip_pii_keys_recursive(payload), redact_pii_keys(payload)
+        assert json.dumps(old[0]) == json.dumps(new[0]) and old[1] == new[1]
+        for engine, fn in (("recursive", strip_pii_keys_recursive), ("path_lazy", redact_pii_keys)):
+            timings = _time(fn, payload, args.rounds)
+            print(
+                f"{label:<7} {engine:<10} line_items={args.line_items:<6} redactions={len(new[1]):<5} "
+                f"p50={statistics.median(timings):8.3f}ms p99={timings[int(len(timings) * 0.99) - 1]:8.3f}ms"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,116 @@
+"""
+Webhook body pipeline benchmark: large Shopify order through middleware + route.
+
+Posts a signed order payload with --line-items line items to
+/api/webhooks/shopify/order_create in-process (ASGI, no network) with tenant
+lookup and ingestion stubbed out, so the timing covers body read, PII
+stripping, JSON parse/serialise and Pydantic validation. Runs once per JSON
+backend (WEBHOOK_JSON_BACKEND=json|orjson).
+
+Usage (from repo root):
+    python scripts/perf/bench_webhook_parse_once.py --requests 300 --line-items 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "backend"))
+
+_SECRET = "bench_shopify_secret"
+
+
+def _order_body(line_items: int) -> bytes:
+    return json.dumps(
+        {
+            "id": 987654321,
+            "total_price": "1234.56",
+            "currency": "USD",
+            "created_at": "2026-01-01T00:00:00+00:00",
+            "email": "buyer@example.com",
+            "line_items": [
+                {
+                    "id": i,
+                    "sku": f"SKU-{i:05d}",
+                    "title": f"Product {i}",
+                    "quantity": 1 + i % 3,
+                    "price": "9.99",
+                    "properties": [{"name": "gift", "value": "no"}],
+                    "shipping_address": {"city": "Springfield"},
+                }
+                for i in range(line_items)
+            ],
+        }
+    ).encode("utf-8")
+
+
+async def _main(requests: int, line_items: int) -> None:
+    from httpx import ASGITransport, AsyncClient
+
+    from app.api import webhooks as webhooks_api
+    from app.core.config import settings
+    from app.main import app
+
+    tenant_info = {"tenant_id": uuid4(), "shopify_webhook_secret": _SECRET}
+
+    async def _tenant_lookup(api_key: str):
+        return tenant_info
+
+    async def _ingest(tenant_id, event_data, idempotency_key, source):
+        return {"status": "success", "event_id": str(uuid4()), "channel": "direct"}
+
+    webhooks_api.get_tenant_with_webhook_secrets = _tenant_lookup
+    webhooks_api._ingest_single_event = _ingest
+    webhooks_api._schedule_downstream_tasks = lambda **kwargs: None
+
+    body = _order_body(line_items)
+    headers = {
+        "content-type": "application/json",
+        "X-Skeldir-Tenant-Key": "bench",
+        "X-Shopify-Hmac-Sha256": base64.b64encode(
+            hmac.new(_SECRET.encode("utf-8"), body, hashlib.sha256).digest()
+        ).decode("utf-8"),
+    }
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        # Trees without the parse-once pipeline only have the stdlib path.
+        backends = ("json", "orjson") if "WEBHOOK_JSON_BACKEND" in type(settings).model_fields else ("json",)
+        for backend in backends:
+            if len(backends) > 1:
+                settings.WEBHOOK_JSON_BACKEND = backend
+            timings: list[float] = []
+            for i in range(requests + 20):
+                started = time.perf_counter()
+                response = await client.post("/api/webhooks/shopify/order_create", content=body, headers=headers)
+                elapsed = (time.perf_counter() - started) * 1000.0
+                assert response.status_code == 200, response.text
+                if i >= 20:  # warm-up
+                    timings.append(elapsed)
+            timings.sort()
+            print(
+                f"backend={backend:<7} body={len(body) / 1024:7.1f}KiB requests={requests:<5} "
+                f"p50={statistics.median(timings):7.3f}ms p99={timings[int(len(timings) * 0.99) - 1]:7.3f}ms"
+            )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=int(os.getenv("BENCH_REQUESTS", "300")))
+    parser.add_argument("--line-items", type=int, default=int(os.getenv("BENCH_LINE_ITEMS", "500")))
+    args = parser.parse_args()
+    asyncio.run(_main(args.requests, args.line_items))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())